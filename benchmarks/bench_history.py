@@ -0,0 +1,103 @@
+# bench_history.py
+"""
+撤销快照基准：在合成存档上应用 unlock_max_everything 再撤销，
+对比结构共享快照与每次编辑前 deepcopy 的耗时和额外内存。
+
+用法: python benchmarks/bench_history.py [--items 3000] [--edits 20]
+"""
+
+import argparse
+import copy
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.save_game_controller import SaveGameController  # noqa: E402
+
+
+def make_save(item_count: int) -> dict:
+    """A save shaped like the real thing: a large backpack plus bulky stats/missions sections."""
+    backpack = {f"slot_{i}": {"serial": f"@Ug{i:08d}abcdefghijklmnop", "state_flags": 1} for i in range(item_count)}
+    return {
+        "state": {
+            "char_name": "Bench",
+            "player_difficulty": "Normal",
+            "currencies": {"cash": 100, "eridium": 5},
+            "experience": [{"type": "Character", "level": 10, "points": 1000},
+                           {"type": "Specialization", "level": 1, "points": 0}],
+            "inventory": {"items": {"backpack": backpack}},
+        },
+        "stats": {"challenge": {f"counter_{i}": i for i in range(2000)}},
+        "missions": {"local_sets": {f"missionset_bench_{i}": {"missions": {f"m{j}": {"status": "completed"} for j in range(20)}}
+                                    for i in range(200)}},
+        "progression": {"graphs": [], "point_pools": {}},
+    }
+
+
+def bench_cow(save: dict, edits: int):
+    ctrl = SaveGameController()
+    ctrl.yaml_obj = save
+    ctrl.history.reset(save)
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    ctrl.apply_unlock_preset("unlock_max_everything")
+    t_preset = time.perf_counter() - t0
+    for i in range(edits):
+        ctrl.apply_character_data({"名称": f"Bench{i}"}, {})
+    t_edits = time.perf_counter() - t0 - t_preset
+    mem = tracemalloc.get_traced_memory()[0]
+
+    t1 = time.perf_counter()
+    while ctrl.undo() is not None:
+        pass
+    t_undo = time.perf_counter() - t1
+    tracemalloc.stop()
+    assert ctrl.yaml_obj is save
+    return t_preset, t_edits, t_undo, mem
+
+
+def bench_deepcopy(save: dict, edits: int):
+    from core import bl4_functions as bl4f
+
+    current = save
+    undo = []
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    undo.append(copy.deepcopy(current))
+    ctrl = SaveGameController()
+    ctrl.yaml_obj = current
+    ctrl._apply_unlock_preset(current, "unlock_max_everything", {})
+    t_preset = time.perf_counter() - t0
+    for i in range(edits):
+        undo.append(copy.deepcopy(current))
+        bl4f.apply_character_and_currency_changes({"名称": f"Bench{i}"}, current, {})
+    t_edits = time.perf_counter() - t0 - t_preset
+    mem = tracemalloc.get_traced_memory()[0]
+
+    t1 = time.perf_counter()
+    while undo:
+        current = undo.pop()
+    t_undo = time.perf_counter() - t1
+    tracemalloc.stop()
+    return t_preset, t_edits, t_undo, mem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=3000)
+    parser.add_argument("--edits", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"synthetic save: {args.items} backpack items, unlock_max_everything + {args.edits} small edits, then undo all")
+    print(f"{'strategy':<12}{'preset':>12}{'edits':>12}{'undo all':>12}{'memory':>12}")
+    for name, fn in (("snapshot", bench_cow), ("deepcopy", bench_deepcopy)):
+        t_preset, t_edits, t_undo, mem = fn(make_save(args.items), args.edits)
+        print(f"{name:<12}{t_preset * 1000:>10.1f}ms{t_edits * 1000:>10.1f}ms{t_undo * 1000:>10.2f}ms{mem / 1024 / 1024:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# bench_import.py
+"""
+导入耗时基准：每个模块都在新的解释器中导入，取中位数
+  core                      —— 只有包本身，不应加载任何子模块
+  core.decoder_logic        —— 序列号编解码
+  core.b_encoder            —— 序列号编码
+  core.save_game_controller —— 存档读写（批处理/工作进程用到的全部功能）
+同时检查导入后没有加载 PyQt6、pkg_resources，也没有解压 unlock_data 的数据。
+
+用法: python benchmarks/bench_import.py [--repeat 5] [--max-ms 300]
+  --max-ms 给出时，任何一项的中位数超过该值或检查失败都以非零状态退出（用于发现回退）。
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = (
+    "core",
+    "core.decoder_logic",
+    "core.b_encoder",
+    "core.save_game_controller",
+)
+
+# 这些模块不应在导入 core 的任何部分时被加载
+FORBIDDEN = ("PyQt6", "pkg_resources")
+
+TIMER = """
+import sys, time
+sys.path.insert(0, {root!r})
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+d = sys.modules.get("core.unlock_data")
+problems = [m for m in {forbidden!r} if m in sys.modules]
+if d is not None and "COLLECTIBLES" in vars(d):
+    problems.append("unlock_data (decompressed)")
+print(elapsed)
+print(",".join(problems))
+"""
+
+
+def run(module: str):
+    code = TIMER.format(root=ROOT, module=module, forbidden=FORBIDDEN)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, cwd=ROOT)
+    lines = out.stdout.splitlines()
+    problems = [p for p in lines[-1].split(",") if p] if len(lines) > 1 else []
+    return float(lines[-2] if len(lines) > 1 else lines[-1]), problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    # 先各导入一次，确保 .pyc 已生成，不把编译时间算进去
+    for module in MODULES:
+        run(module)
+
+    failed = False
+    for module in MODULES:
+        times, problems = [], set()
+        for _ in range(args.repeat):
+            elapsed, loaded = run(module)
+            times.append(elapsed)
+            problems.update(loaded)
+        median_ms = statistics.median(times) * 1000
+        status = ""
+        if problems:
+            status = f"  loaded: {', '.join(sorted(problems))}"
+            failed = True
+        if args.max_ms is not None and median_ms > args.max_ms:
+            status += f"  over {args.max_ms:.0f} ms"
+            failed = True
+        print(f"{module:>27}: {median_ms:8.1f} ms (median of {len(times)}){status}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
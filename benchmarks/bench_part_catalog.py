@@ -0,0 +1,98 @@
+# bench_part_catalog.py
+"""
+武器部件目录基准：对每种武器（m_id）执行武器编辑器解析序列号和武器生成器生成下拉框时的数据查找
+  table   —— 每次调用都筛选整张 Table（以前标签页中的做法）
+  catalog —— 使用 core.part_catalog 预先建立的字典索引
+  build   —— 构建 PartCatalog 本身（每种数据语言一次，包括读取五个 CSV）
+不需要 PyQt6；只比较数据查找，不包括创建控件。
+
+用法: python benchmarks/bench_part_catalog.py [--repeat 5] [--lang zh-CN]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core import part_catalog  # noqa: E402
+from core.part_catalog import M_ID, PartCatalog  # noqa: E402
+
+
+def with_tables(tables, m_id, part_ids):
+    parts, names, rarities = tables
+    # 编辑器：武器名称、稀有度、每个部件的显示信息
+    for pid in part_ids:
+        d = parts.eq(M_ID, m_id).eq('Part ID', pid)
+        if not d.empty and d.first()['Part Type'] == 'Barrel':
+            if not names.eq(M_ID, m_id).eq('Part ID', pid).empty:
+                break
+    rarities.eq(M_ID, m_id).eq('Part ID', part_ids[0]).first()
+    parts.eq(M_ID, m_id).first()
+    for pid in part_ids:
+        parts.eq(M_ID, m_id).eq('Part ID', pid).first()
+    # 生成器：下拉框
+    for _, group in parts.eq(M_ID, m_id).groupby('Part Type'):
+        [f"{pid} - {stat}" for pid, stat in zip(group.column('Part ID'), group.column('Stat'))]
+    rarities.eq(M_ID, m_id).unique('Stat')
+    [r for r in rarities.eq(M_ID, m_id).eq('Stat', 'Legendary') if r['Description'] is not None]
+    rarities.eq(M_ID, m_id).eq('Stat', 'Epic').eq('Description', None).first()
+
+
+def with_catalog(cat: PartCatalog, m_id, part_ids):
+    for pid in part_ids:
+        d = cat.part(m_id, pid)
+        if d is not None and d['Part Type'] == 'Barrel':
+            if cat.weapon_name(m_id, pid) is not None:
+                break
+    cat.rarity(m_id, part_ids[0])
+    cat.weapon(m_id)
+    for pid in part_ids:
+        cat.part(m_id, pid)
+    for _, rows in cat.parts_by_type(m_id).items():
+        [f"{r['Part ID']} - {r['Stat']}" for r in rows]
+    cat.rarity_stats(m_id)
+    cat.legendaries(m_id)
+    cat.rarity_part_id(m_id, 'Epic')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--lang", default="zh-CN")
+    args = parser.parse_args()
+
+    suffix = part_catalog.data_suffix(args.lang)
+    builds = []
+    for _ in range(args.repeat):
+        part_catalog._catalogs.clear()
+        t = time.perf_counter()
+        cat = part_catalog.get_part_catalog(args.lang)
+        builds.append(time.perf_counter() - t)
+    tables = (cat.parts, part_catalog.load_csv_table(part_catalog.data_path('weapon_name.csv', suffix)), cat.rarities)
+
+    # 每种武器：一个稀有度部件 + 该武器的全部部件
+    weapons = []
+    for m_id, group in cat.parts.groupby(M_ID):
+        rarity_ids = cat.rarities.eq(M_ID, m_id).column('Part ID')
+        weapons.append((m_id, rarity_ids[:1] + group.column('Part ID')))
+
+    results = {"table": [], "catalog": []}
+    for _ in range(args.repeat):
+        for name, func, data in (("table", with_tables, tables), ("catalog", with_catalog, cat)):
+            t = time.perf_counter()
+            for m_id, part_ids in weapons:
+                func(data, m_id, part_ids)
+            results[name].append(time.perf_counter() - t)
+
+    print(f"{len(weapons)} weapons, {len(cat.parts)} parts ({args.lang})")
+    print(f"{'build':>7}: {statistics.median(builds) * 1000:8.2f} ms (median of {len(builds)})")
+    for name, times in results.items():
+        print(f"{name:>7}: {statistics.median(times) * 1000:8.2f} ms (median of {len(times)})")
+
+
+if __name__ == "__main__":
+    main()
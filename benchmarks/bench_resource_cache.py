@@ -0,0 +1,110 @@
+# bench_resource_cache.py
+"""
+资源读取缓存基准：在新的解释器中（Qt offscreen）创建八个数据标签页（职业模组、增强、武器编辑器、
+武器生成器、手雷、护盾、修复套件、重武器），再依次切换到 en-US、ru、ua、zh-CN，报告耗时。
+
+  off —— _CACHE_MAX_ENTRIES = 0，每次调用都重新读取并解析（以前的做法）
+  on  —— 默认缓存
+
+最后打印缓存统计，列出被重复请求的资源（hits 即省掉的读取次数），并在本进程中比较
+读取全部 CSV/JSON 一次（未命中）和再读取一次（命中）的耗时。需要 PyQt6。
+
+用法: python benchmarks/bench_resource_cache.py [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core import resource_loader, resource_pack  # noqa: E402
+
+SCRIPT = """
+import io, json, os, sys, time, contextlib
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, {root!r})
+sys.path.insert(1, os.path.join({root!r}, "core"))
+os.chdir({root!r})
+from core import resource_loader
+if not {cache!r}:
+    resource_loader._CACHE_MAX_ENTRIES = 0
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+
+class MainApp:
+    controller = None
+    def log(self, *args): pass
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from tabs.qt_class_mod_editor_tab import QtClassModEditorTab
+    from tabs.qt_enhancement_editor_tab import QtEnhancementEditorTab
+    from tabs.qt_weapon_editor_tab import WeaponEditorTab
+    from tabs.qt_weapon_generator_tab import QtWeaponGeneratorTab
+    from tabs.qt_grenade_editor_tab import QtGrenadeEditorTab
+    from tabs.qt_shield_editor_tab import QtShieldEditorTab
+    from tabs.qt_repkit_editor_tab import QtRepkitEditorTab
+    from tabs.qt_heavy_weapon_editor_tab import QtHeavyWeaponEditorTab
+    t0 = time.perf_counter()
+    tabs = [QtClassModEditorTab(), QtEnhancementEditorTab(), WeaponEditorTab(MainApp()), QtWeaponGeneratorTab(),
+            QtGrenadeEditorTab(), QtShieldEditorTab(), QtRepkitEditorTab(), QtHeavyWeaponEditorTab()]
+    t1 = time.perf_counter()
+    for lang in ("en-US", "ru", "ua", "zh-CN"):
+        for tab in tabs:
+            tab.update_language(lang)
+    t2 = time.perf_counter()
+print(json.dumps([t1 - t0, t2 - t1, resource_loader.resource_cache_stats()]))
+"""
+
+
+def run(cache: bool):
+    out = subprocess.run([sys.executable, "-c", SCRIPT.format(root=ROOT, cache=cache)],
+                         check=True, capture_output=True, text=True, cwd=ROOT)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(True)  # 生成 .pyc
+    for name, cache in (("off", False), ("on", True)):
+        results = [run(cache) for _ in range(args.repeat)]
+        create, switch = (statistics.median(r[i] for r in results) for i in range(2))
+        print(f"{name:>3}: create {create * 1000:7.1f} ms, 4 language switches {switch * 1000:7.1f} ms "
+              f"(median of {len(results)})")
+
+    stats = results[-1][2]
+    print(f"hits {stats['hits']}, loads {stats['misses']}, reloads {stats['reloads']}, "
+          f"evictions {stats['evictions']}, {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KiB")
+    repeated = sorted(stats['resources'].items(), key=lambda kv: -kv[1]['hits'])
+    for name, counts in repeated:
+        if counts['hits']:
+            print(f"  {counts['hits']:4d} hits  {counts['loads']} loads  {name}")
+
+    keys = [p.relative_to(ROOT).as_posix() for p in resource_pack.iter_sources(Path(ROOT))]
+    passes = {"miss": [], "hit": []}
+    for _ in range(args.repeat):
+        resource_loader.clear_resource_cache()
+        for name in passes:
+            t = time.perf_counter()
+            for key in keys:
+                if key.endswith('.csv'):
+                    resource_loader.load_csv_resource(key)
+                else:
+                    resource_loader.load_json_resource(key)
+            passes[name].append(time.perf_counter() - t)
+    source = "pack" if resource_loader.get_resource_pack() is not None else "files"
+    for name, times in passes.items():
+        print(f"{name:>4}: {statistics.median(times) * 1000:7.1f} ms for {len(keys)} resources from {source}")
+
+
+if __name__ == "__main__":
+    main()
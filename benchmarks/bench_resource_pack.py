@@ -0,0 +1,67 @@
+# bench_resource_pack.py
+"""
+资源包基准：每一项都在新的解释器中，通过 resource_loader 读取并解析全部 CSV/JSON 数据
+  files —— 没有资源包，逐个打开并解析源文件（旧的做法）
+  pack  —— 打开 resources.pack，从中解出预先解析好的数据
+先运行 python -m core.resource_pack 构建资源包；基准会在缺少资源包时自动构建。
+
+用法: python benchmarks/bench_resource_pack.py [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core import resource_pack  # noqa: E402
+
+TIMER = """
+import sys, time
+sys.path.insert(0, {root!r})
+from core import resource_loader as rl
+keys = {keys!r}
+t = time.perf_counter()
+if {disable_pack!r}:
+    rl._pack_opened = True  # 不使用资源包
+for key in keys:
+    if key.endswith('.csv'):
+        rl.load_csv_resource(key)
+    else:
+        rl.load_json_resource(key)
+print(time.perf_counter() - t)
+"""
+
+
+def run(keys, disable_pack: bool) -> float:
+    code = TIMER.format(root=ROOT, keys=keys, disable_pack=disable_pack)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, cwd=ROOT)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pack_path = os.path.join(ROOT, resource_pack.PACK_FILE)
+    if not os.path.exists(pack_path):
+        resource_pack.build_pack(ROOT)
+    keys = [p.relative_to(ROOT).as_posix() for p in resource_pack.iter_sources(Path(ROOT))]
+
+    results = {"files": [], "pack": []}
+    for _ in range(args.repeat):
+        results["files"].append(run(keys, True))
+        results["pack"].append(run(keys, False))
+
+    print(f"{len(keys)} resources, pack {os.path.getsize(pack_path) / 1024:.0f} KiB")
+    for name, times in results.items():
+        print(f"{name:>5}: {statistics.median(times) * 1000:8.1f} ms (median of {len(times)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# bench_tab_startup.py
+"""
+数据表标签页启动基准：在新的解释器中（Qt offscreen）导入并创建武器编辑器、武器生成器、
+手雷、护盾、修复套件和重武器六个标签页，报告耗时和进程内存峰值（RSS）。
+
+  import —— 导入六个标签页模块（以前包括导入 pandas）
+  create —— 创建六个标签页（读取 CSV 并填充界面）
+  rss    —— 结束时的内存峰值
+
+--root 可以指向另一份代码（例如 git worktree 检出的旧版本）做前后对比。
+需要 PyQt6；内存峰值依赖 resource 模块（Windows 上不报告）。
+
+用法: python benchmarks/bench_tab_startup.py [--repeat 5] [--root PATH]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import os, sys, time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, {root!r})
+sys.path.insert(1, os.path.join({root!r}, "core"))
+os.chdir({root!r})
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+
+class MainApp:
+    controller = None
+    def log(self, *args): pass
+
+t0 = time.perf_counter()
+from tabs.qt_weapon_editor_tab import WeaponEditorTab
+from tabs.qt_weapon_generator_tab import QtWeaponGeneratorTab
+from tabs.qt_grenade_editor_tab import QtGrenadeEditorTab
+from tabs.qt_shield_editor_tab import QtShieldEditorTab
+from tabs.qt_repkit_editor_tab import QtRepkitEditorTab
+from tabs.qt_heavy_weapon_editor_tab import QtHeavyWeaponEditorTab
+t1 = time.perf_counter()
+tabs = [WeaponEditorTab(MainApp()), QtWeaponGeneratorTab(), QtGrenadeEditorTab(),
+        QtShieldEditorTab(), QtRepkitEditorTab(), QtHeavyWeaponEditorTab()]
+t2 = time.perf_counter()
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    if sys.platform == "darwin":
+        rss /= 1024
+except ImportError:
+    rss = float("nan")
+print(t1 - t0, t2 - t1, rss, "pandas" in sys.modules)
+"""
+
+
+def run(root: str):
+    out = subprocess.run([sys.executable, "-c", SCRIPT.format(root=root)],
+                         check=True, capture_output=True, text=True, cwd=root)
+    imp, create, rss, pandas = out.stdout.strip().splitlines()[-1].split()
+    return float(imp), float(create), float(rss), pandas == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--root", default=ROOT, help="project tree to measure (default: this one)")
+    args = parser.parse_args()
+
+    run(args.root)  # 生成 .pyc
+    results = [run(args.root) for _ in range(args.repeat)]
+    imp, create, rss = (statistics.median(r[i] for r in results) for i in range(3))
+    print(f"tree:   {args.root}")
+    print(f"import: {imp * 1000:8.1f} ms")
+    print(f"create: {create * 1000:8.1f} ms")
+    print(f"total:  {(imp + create) * 1000:8.1f} ms (median of {len(results)})")
+    print(f"rss:    {rss:8.1f} MiB (peak){'  [pandas loaded]' if results[-1][3] else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_unlock_data.py
+"""
+unlock_data 启动开销基准：每一项都在新的解释器中、导入 core 之后测量
+  cold      —— 第一次访问全部数据：解压 + YAML 解析 + 写缓存
+  cached    —— 再次访问全部数据：只读取 marshal 缓存
+  eager     —— 旧的做法在导入 core 时付出的开销：解压并解析全部数据
+现在导入 core 不再访问这些数据，所以每次启动节省 eager 的全部时间；用到预设时再付出 cached（或第一次的 cold）。
+
+用法: python benchmarks/bench_unlock_data.py [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NAMES = "('COLLECTIBLES', 'MISSIONSETS', 'UNLOCKABLES', 'LOCATIONS')"
+
+SCRIPTS = {
+    "access": f"for n in {NAMES}: getattr(d, n)",
+    "eager": f"for n in {NAMES}: d._BLOBS[n][1](d._BLOBS[n][0]())",
+}
+
+TIMER = """
+import sys, time
+sys.path.insert(0, {root!r})
+import yaml
+import core.unlock_data as d
+t = time.perf_counter()
+{body}
+print(time.perf_counter() - t)
+"""
+
+
+def run(body: str) -> float:
+    code = TIMER.format(root=ROOT, body=body)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, cwd=ROOT)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def clear_cache():
+    cache_dir = os.path.join(ROOT, "core", "__pycache__")
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.startswith("unlock_data.") and name.endswith(".marshal"):
+                os.remove(os.path.join(cache_dir, name))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {"cold": [], "cached": [], "eager": []}
+    for _ in range(args.repeat):
+        clear_cache()
+        results["cold"].append(run(SCRIPTS["access"]))
+        results["cached"].append(run(SCRIPTS["access"]))
+        results["eager"].append(run(SCRIPTS["eager"]))
+
+    for name, times in results.items():
+        print(f"{name:>7}: {statistics.median(times) * 1000:8.1f} ms (median of {len(times)})")
+    eager, cached = statistics.median(results["eager"]), statistics.median(results["cached"])
+    print(f"saved per start: {eager * 1000:.1f} ms; saved per start that applies a preset: {(eager - cached) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
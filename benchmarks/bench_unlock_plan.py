@@ -0,0 +1,63 @@
+# bench_unlock_plan.py
+"""
+解锁预设基准：在合成存档上对比依次调用 unlock_logic 函数（旧做法）与合并后的执行计划，
+并按步骤和预设列出耗时和增加的数据量。
+
+用法: python benchmarks/bench_unlock_plan.py [--items 3000] [--repeat 20] [--presets unlock_max_everything]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import unlock_logic, unlock_planner  # noqa: E402
+from bench_history import make_save  # noqa: E402
+
+# 旧做法：每个预设调用对应的 unlock_logic 函数
+SEQUENTIAL = {name: getattr(unlock_logic, name) for name in unlock_planner.PRESETS if name != "set_character_class"}
+
+
+def run_sequential(names, items):
+    data = make_save(items)
+    t0 = time.perf_counter()
+    for name in unlock_planner.expand_presets(names):
+        SEQUENTIAL[name](data)
+    return time.perf_counter() - t0
+
+
+def run_plan(names, items):
+    data = make_save(items)
+    t0 = time.perf_counter()
+    unlock_planner.apply_plan(data, unlock_planner.build_plan(names))
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--presets", nargs="+", default=["unlock_max_everything"])
+    args = parser.parse_args()
+
+    plan = unlock_planner.build_plan(args.presets)
+    print(f"{' + '.join(args.presets)}: {plan}")
+    for name, fn in (("sequential", run_sequential), ("plan", run_plan)):
+        times = [fn(args.presets, args.items) for _ in range(args.repeat)]
+        print(f"{name:<12}{statistics.median(times) * 1000:>10.2f}ms (median of {args.repeat})")
+
+    report = []
+    unlock_planner.apply_plan(make_save(args.items), plan, report)
+    print(f"\n{'step':<56}{'time':>10}{'bytes':>10}  presets")
+    for entry in report:
+        print(f"{entry['step'][:55]:<56}{entry['seconds'] * 1000:>8.2f}ms{entry['bytes']:>10}  {', '.join(entry['presets'])}")
+    print(f"\n{'preset':<34}{'time':>10}{'bytes':>10}{'steps':>7}{'shared':>8}")
+    for preset, row in unlock_planner.summarize(report).items():
+        print(f"{preset:<34}{row['seconds'] * 1000:>8.2f}ms{row['bytes']:>10}{row['steps']:>7}{row['shared']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,84 @@
 # core package
 # Core modules for BL4 Save Editor
 
-from .resource_loader import (
-    get_resource_path,
-    get_ui_localization_file,
-    load_json_resource,
-    load_text_resource,
-    get_image_resource_path,
-    get_class_mods_data_path,
-    load_class_mods_json,
-    load_class_mods_csv,
-    get_class_mods_image_path,
-    load_all_skill_descriptions,
-    load_enhancement_json,
-    load_enhancement_csv,
-    get_enhancement_data,
-    get_weapon_data_path,
-    load_weapon_json,
-    get_grenade_data_path,
-    load_grenade_json,
-    get_shield_data_path,
-    load_shield_json,
-    get_repkit_data_path,
-    load_repkit_json,
-    get_heavy_data_path,
-    load_heavy_json,
-    get_builtin_localization,
+# 导入 core 本身不加载任何子模块：下面的名称在第一次访问时才导入（模块级 __getattr__）。
+# 因此 `import core.decoder_logic`、`from core import SaveGameController` 等只加载各自需要的模块，
+# 命令行/批处理/工作进程不需要 PyQt6，也不会提前解压 unlock_data 或读取资源文件。
+# benchmarks/bench_import.py 检查导入耗时，并确认这些模块没有被意外加载。
+
+import importlib
+
+_RESOURCE_LOADER_EXPORTS = (
+    "get_resource_path",
+    "get_ui_localization_file",
+    "load_json_resource",
+    "load_text_resource",
+    "load_csv_resource",
+    "load_csv_table",
+    "Table",
+    "read_resource_bytes",
+    "open_resource",
+    "resource_exists",
+    "get_resource_pack",
+    "resource_cache_stats",
+    "resource_stamp",
+    "clear_resource_cache",
+    "get_image_resource_path",
+    "get_class_mods_data_path",
+    "load_class_mods_json",
+    "load_class_mods_csv",
+    "get_class_mods_image_path",
+    "load_all_skill_descriptions",
+    "load_enhancement_json",
+    "load_enhancement_csv",
+    "get_enhancement_data",
+    "get_weapon_data_path",
+    "load_weapon_json",
+    "get_grenade_data_path",
+    "load_grenade_json",
+    "get_shield_data_path",
+    "load_shield_json",
+    "get_repkit_data_path",
+    "load_repkit_json",
+    "get_heavy_data_path",
+    "load_heavy_json",
+    "get_builtin_localization",
+)
+
+# 名称 -> 定义它的子模块
+_LAZY_EXPORTS = dict.fromkeys(_RESOURCE_LOADER_EXPORTS, ".resource_loader")
+_LAZY_EXPORTS.update({
+    "SaveGameController": ".save_game_controller",
+    "PartCatalog": ".part_catalog",
+    "get_part_catalog": ".part_catalog",
+    # 界面组件依赖 PyQt6
+    "SaveSelectorWidget": ".save_selector_widget",
+    "ThemeManager": ".theme_manager",
+})
+
+_LAZY_SUBMODULES = (
+    "b_encoder",
+    "bl4_functions",
+    "decoder_logic",
+    "lookup",
+    "part_catalog",
+    "unlock_data",
+    "unlock_logic",
 )
 
-from .save_game_controller import SaveGameController
-from .save_selector_widget import SaveSelectorWidget
-from .theme_manager import ThemeManager
+__all__ = sorted(_LAZY_EXPORTS) + list(_LAZY_SUBMODULES)
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-from . import b_encoder
-from . import bl4_functions
-from . import decoder_logic
-from . import lookup
-from . import unlock_data
-from . import unlock_logic
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
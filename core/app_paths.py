@@ -0,0 +1,37 @@
+# app_paths.py
+"""
+编辑器自己的缓存/索引文件所在的目录（每个用户一个，与当前工作目录无关）。
+
+  Windows —— %LOCALAPPDATA%\\BL4SaveEditor
+  macOS   —— ~/Library/Caches/BL4SaveEditor
+  其他    —— $XDG_CACHE_HOME/BL4SaveEditor（默认 ~/.cache/BL4SaveEditor）
+
+扫描索引、摘要索引和解析缓存都放在这里。
+"""
+
+import os
+import sys
+from pathlib import Path
+
+APP_DIR_NAME = "BL4SaveEditor"
+
+
+def user_cache_dir() -> Path:
+    """缓存目录（不会自动创建）。"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / APP_DIR_NAME
+
+
+def cache_file(name: str) -> str:
+    """缓存目录下的文件路径，并确保目录存在。"""
+    directory = user_cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"Error creating cache directory {directory}: {e}")
+    return str(directory / name)
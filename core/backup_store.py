@@ -0,0 +1,219 @@
+# backup_store.py
+"""
+按内容去重的存档备份。
+
+每个备份目录里有一个 backup_index.json，记录本工具写出的每个 .bak 文件的
+sha256、所属存档（文件名和完整路径）、时间和大小。打开存档时先同步计算哈希：内容与该存档已有的
+某个备份相同时直接复用，不再写新文件；否则在后台线程写出文件、更新索引并按
+保留策略清理旧备份。备份文件仍然是原样的加密存档，文件名与以前相同（名称已被占用时，例如两个档案的
+1.sav 在同一秒备份到同一目录，在 .bak 前加上 -2、-3 …），可以直接改名恢复。
+写入失败的备份不会登记到索引中，错误通过 wait() / error() 报告。
+
+只有索引里记录的文件才会被清理，用户自己放在目录里的 .bak 不受影响。
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+INDEX_NAME = "backup_index.json"
+
+# 保留策略（按存档分别计算；多个档案共用一个自定义备份目录时，各自的 1.sav 互不影响）
+KEEP_LAST = 10             # 最近的 N 个备份
+KEEP_DAILY = 14            # 最近 N 天中每天最新的一个
+MAX_TOTAL_BYTES = 512 * 1024 * 1024  # 整个目录的备份总大小上限
+
+
+class BackupStore:
+    """一个备份目录的索引与写入器。线程安全；写入在后台线程中完成。"""
+
+    def __init__(self, directory: Path, keep_last: int = KEEP_LAST, keep_daily: int = KEEP_DAILY,
+                 max_total_bytes: int = MAX_TOTAL_BYTES):
+        self.directory = Path(directory)
+        self.keep_last = keep_last
+        self.keep_daily = keep_daily
+        self.max_total_bytes = max_total_bytes
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = self._load_index()
+        self._pending: List[threading.Thread] = []
+        # 写入失败的备份：文件名 -> 错误信息
+        self._errors: Dict[str, str] = {}
+
+    # ── 索引 ──────────────────────────────────────────────────────────────
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / INDEX_NAME
+
+    def _load_index(self) -> List[Dict[str, Any]]:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            entries = data.get("backups", []) if isinstance(data, dict) else []
+        except (OSError, ValueError):
+            return []
+        # 丢弃已被手动删除的文件
+        return [e for e in entries if isinstance(e, dict) and (self.directory / e.get("file", "")).is_file()]
+
+    def _save_index(self):
+        tmp = self.index_path.with_name(f"{INDEX_NAME}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({"version": 1, "backups": self._entries}, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def list_backups(self, save: Union[str, Path, None] = None) -> List[Dict[str, Any]]:
+        """
+        Indexed backups, newest first, optionally only those of one save: a path selects that save
+        file; a bare file name such as "1.sav" matches the saves of that name in every profile.
+        """
+        if save is None:
+            match = lambda e: True
+        elif Path(save).parent == Path("."):
+            match = lambda e: e["save"] == Path(save).name
+        else:
+            owner = _owner_of_path(Path(save))
+            match = lambda e: _owner(e) == owner
+        with self._lock:
+            return [dict(e) for e in reversed(self._entries) if match(e)]
+
+    # ── 写入 ──────────────────────────────────────────────────────────────
+
+    def backup(self, save_path: Path, data: bytes, file_name: str) -> str:
+        """
+        Backs up data (the raw encrypted save). Returns the backup file name: an existing one when
+        this save already has a backup with identical content, otherwise file_name (with a counter
+        added if that name is already taken), which is written on a background thread. Use wait()
+        or error() to find out whether the write succeeded.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        owner = _owner_of_path(save_path)
+        with self._lock:
+            for entry in self._entries:
+                if entry["sha256"] == digest and _owner(entry) == owner:
+                    return entry["file"]
+            file_name = self._unique_name(file_name)
+            entry = {
+                "file": file_name,
+                "save": save_path.name,
+                "source": owner,
+                "sha256": digest,
+                "size": len(data),
+                "time": datetime.now().isoformat(timespec="seconds"),
+            }
+            # 先登记，后台写完之前再次打开同一文件也不会重复备份
+            self._entries.append(entry)
+
+        worker = threading.Thread(target=self._write, args=(entry, data), name="backup-writer")
+        worker.start()
+        self._pending = [t for t in self._pending if t.is_alive()] + [worker]
+        return file_name
+
+    def _unique_name(self, file_name: str) -> str:
+        """
+        file_name, or file_name with "-2", "-3", ... before ".bak" when an indexed backup, a failed
+        write or a file in the directory already has that name (e.g. two profiles' 1.sav backed up
+        in the same second). Caller holds the lock.
+        """
+        # 写入失败的名称也不再使用，它们的错误要一直能查到
+        taken = {e["file"] for e in self._entries} | set(self._errors)
+        stem, suffix = (file_name[:-4], ".bak") if file_name.endswith(".bak") else (file_name, "")
+        name, n = file_name, 1
+        while name in taken or (self.directory / name).exists():
+            n += 1
+            name = f"{stem}-{n}{suffix}"
+        return name
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, str]:
+        """
+        Blocks until pending background writes have finished. Returns {file name: error} for every
+        backup of this store whose write failed (those files do not exist and are not indexed).
+        """
+        for worker in list(self._pending):
+            worker.join(timeout)
+        with self._lock:
+            return dict(self._errors)
+
+    def error(self, file_name: str) -> Optional[str]:
+        """The error of a failed write of file_name, None if it succeeded or is still pending."""
+        with self._lock:
+            return self._errors.get(file_name)
+
+    def _write(self, entry: Dict[str, Any], data: bytes):
+        target = self.directory / entry["file"]
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, target)
+        except OSError as e:
+            print(f"写入备份失败 {target}: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            with self._lock:
+                if entry in self._entries:
+                    self._entries.remove(entry)
+                self._errors[entry["file"]] = str(e)
+            return
+        with self._lock:
+            self._prune()
+            try:
+                self._save_index()
+            except OSError as e:
+                print(f"写入备份索引失败: {e}")
+
+    # ── 保留策略 ──────────────────────────────────────────────────────────
+
+    def _prune(self):
+        """Deletes indexed backups outside the retention policy. Caller holds the lock."""
+        # 索引按写入顺序排列，倒序即从新到旧
+        keep = set()
+        by_save: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in reversed(self._entries):
+            by_save.setdefault(_owner(entry), []).append(entry)
+        for entries in by_save.values():
+            keep.update(e["file"] for e in entries[:self.keep_last])
+            days = set()
+            for e in entries:
+                day = e["time"][:10]
+                if day not in days and len(days) < self.keep_daily:
+                    days.add(day)
+                    keep.add(e["file"])
+
+        survivors = [e for e in reversed(self._entries) if e["file"] in keep]
+        # 超出总大小上限时从最旧的开始删除，但每个存档至少保留最新的一个
+        newest = {}
+        for e in survivors:
+            newest.setdefault(_owner(e), e["file"])
+        total = sum(e["size"] for e in survivors)
+        for e in reversed(survivors[:]):
+            if total <= self.max_total_bytes:
+                break
+            if newest[_owner(e)] == e["file"]:
+                continue
+            survivors.remove(e)
+            total -= e["size"]
+
+        kept_files = {e["file"] for e in survivors}
+        for e in self._entries:
+            if e["file"] not in kept_files:
+                try:
+                    (self.directory / e["file"]).unlink()
+                except OSError:
+                    pass
+        self._entries = [e for e in self._entries if e["file"] in kept_files]
+
+
+def _owner_of_path(save_path: Path) -> str:
+    """备份所属的存档：完整的绝对路径（不同档案下同名的 1.sav 是不同的存档）。"""
+    try:
+        return str(Path(save_path).resolve())
+    except OSError:
+        return str(Path(save_path).absolute())
+
+
+def _owner(entry: Dict[str, Any]) -> str:
+    # 旧索引中的条目只记录了文件名，单独成组，不会被其他档案的备份挤掉
+    return entry.get("source") or entry["save"]
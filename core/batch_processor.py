@@ -0,0 +1,363 @@
+# batch_processor.py
+"""
+无界面的批量存档处理，不导入 PyQt。
+
+    python -m core.batch_processor SAVE.sav [SAVE.sav ...] --user-id ID --preset unlock_max_everything --out-dir out/
+
+每个存档在进程池的一个工作进程中独立处理：读取并解密 → 按配方修改 → 加密 → 原子写出（先写临时文件
+再替换），然后返回一份报告。配方中的操作依次为：解锁预设（合并为一个执行计划）、批量添加物品、
+同步背包物品等级。
+
+用户ID可以给多个，依次尝试；没有给出时从存档路径中的目录名推断（游戏的存档目录以 Steam/Epic ID 命名）。
+原地覆盖存档（--in-place）时，主进程会先用与界面相同的去重备份库备份原文件，并确认每个备份文件
+都已写出且 sha256 与原文件一致；备份失败的存档不会被覆盖，直接报告为失败。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TypedDict
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from . import b_encoder
+from .save_game_controller import SaveGameController
+from .unlock_planner import is_known_preset
+
+DEFAULT_ITEM_FLAG = "3"
+
+
+class BatchRecipe:
+    """要对每个存档执行的操作。"""
+
+    __slots__ = ("presets", "params", "items", "item_flag", "sync_levels")
+
+    def __init__(self, presets: Optional[List[str]] = None, params: Optional[Dict[str, Any]] = None,
+                 items: Optional[List[str]] = None, item_flag: str = DEFAULT_ITEM_FLAG, sync_levels: bool = False):
+        self.presets = list(presets or [])
+        self.params = dict(params or {})
+        # Base85 序列号（@U...）或解码后的字符串
+        self.items = list(items or [])
+        self.item_flag = str(item_flag)
+        self.sync_levels = bool(sync_levels)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BatchRecipe":
+        known = {"presets", "params", "items", "item_flag", "sync_levels"}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown recipe keys: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def validate(self):
+        unknown = [name for name in self.presets if not is_known_preset(name)]
+        if unknown:
+            raise ValueError(f"Unknown preset: {', '.join(unknown)}")
+        if not (self.presets or self.items or self.sync_levels):
+            raise ValueError("The recipe does nothing: give presets, items or sync_levels.")
+
+
+def load_recipe(path: Path) -> BatchRecipe:
+    """Reads a recipe from a JSON or YAML file."""
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix.lower() in (".yaml", ".yml"):
+        if yaml is None:
+            raise RuntimeError("PyYAML is required for YAML recipes.")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"Recipe must be a mapping: {path}")
+    return BatchRecipe.from_dict(data)
+
+
+class BatchJob:
+    """一个存档的处理任务（会被 pickle 到工作进程）。"""
+
+    __slots__ = ("path", "output", "user_ids", "recipe", "compression_level")
+
+    def __init__(self, path: Path, output: Path, user_ids: List[str], recipe: BatchRecipe,
+                 compression_level: Optional[int] = None):
+        self.path = Path(path)
+        self.output = Path(output)
+        self.user_ids = user_ids
+        self.recipe = recipe
+        self.compression_level = compression_level
+
+
+class SaveReport(TypedDict):
+    path: str
+    output: str
+    status: str  # ok / unchanged / failed
+    user_id: str
+    platform: str
+    presets: List[str]
+    items_added: int
+    items_failed: int
+    levels_synced: int
+    level_errors: List[str]
+    timings: Dict[str, float]
+    seconds: float
+    error: str
+
+
+def candidate_user_ids(path: Path, user_ids: Iterable[str]) -> List[str]:
+    """The given IDs, then every valid ID among the save's parent directory names (nearest first)."""
+    result = [uid.strip() for uid in user_ids if uid and uid.strip()]
+    for part in reversed(Path(path).resolve().parent.parts):
+        if part not in result and SaveGameController.validate_user_id(part)[0]:
+            result.append(part)
+    return result
+
+
+def _encode_items(items: List[str], report: SaveReport) -> List[str]:
+    serials = []
+    for line in items:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("@U"):
+            serials.append(line)
+            continue
+        serial, err = b_encoder.encode_to_base85(line)
+        if err:
+            report["items_failed"] += 1
+        else:
+            serials.append(serial)
+    return serials
+
+
+def _new_report(job: BatchJob, error: str = "") -> SaveReport:
+    return {
+        "path": str(job.path), "output": str(job.output), "status": "failed", "user_id": "", "platform": "",
+        "presets": [], "items_added": 0, "items_failed": 0, "levels_synced": 0, "level_errors": [],
+        "timings": {}, "seconds": 0.0, "error": error,
+    }
+
+
+def backup_originals(jobs: List[BatchJob], backup_dir: Optional[str] = None) -> Dict[str, str]:
+    """
+    Backs up every job's save (for --in-place) and checks that each backup file exists with the
+    original's sha256. Returns {save path: error} for the saves that must not be overwritten.
+    """
+    # 备份在主进程中完成，各工作进程不会同时改写同一个备份索引
+    if backup_dir:
+        Path(backup_dir).mkdir(parents=True, exist_ok=True)
+    controller = SaveGameController()
+    controller.parse_cache = None
+    expected = {}
+    errors: Dict[str, str] = {}
+    for job in jobs:
+        try:
+            data = job.path.read_bytes()
+            directory, _ = controller.backup_target(job.path, backup_dir)
+            name = controller.backup_save(job.path, data, backup_dir)
+            expected[str(job.path)] = (directory / name, hashlib.sha256(data).hexdigest())
+        except Exception as e:
+            errors[str(job.path)] = f"Backup failed: {type(e).__name__}: {e}"
+    failed = controller.wait_for_backups()
+    for path, (backup_path, digest) in expected.items():
+        if backup_path in failed:
+            errors[path] = f"Backup failed: {backup_path}: {failed[backup_path]}"
+            continue
+        try:
+            ok = hashlib.sha256(backup_path.read_bytes()).hexdigest() == digest
+        except OSError as e:
+            errors[path] = f"Backup missing: {backup_path}: {e}"
+            continue
+        if not ok:
+            errors[path] = f"Backup does not match the original: {backup_path}"
+    return errors
+
+
+def process_save(job: BatchJob) -> SaveReport:
+    """decrypt → apply the recipe → encrypt → atomic write, for one save. Runs in a worker process."""
+    t_start = time.perf_counter()
+    report = _new_report(job)
+    try:
+        controller = SaveGameController()
+        # 批处理不写解析缓存，也不在工作进程中写备份
+        controller.parse_cache = None
+        recipe = job.recipe
+
+        prepared = None
+        errors = []
+        for user_id in job.user_ids:
+            try:
+                prepared = controller.prepare_save(job.path, user_id, timings=report["timings"])
+                break
+            except ValueError as e:
+                errors.append(f"{user_id}: {str(e).splitlines()[-1]}")
+        if prepared is None:
+            raise ValueError("Could not decrypt with any user ID" + (f" ({'; '.join(errors)})" if errors else " (none given)"))
+        controller.adopt_prepared(prepared, backup=False)
+        report["user_id"], report["platform"] = prepared.user_id, prepared.platform
+
+        t0 = time.perf_counter()
+        if recipe.presets:
+            if not controller.apply_unlock_presets(recipe.presets, recipe.params):
+                raise RuntimeError(f"Applying presets failed: {', '.join(recipe.presets)}")
+            report["presets"] = list(recipe.presets)
+        if recipe.items:
+            serials = _encode_items(recipe.items, report)
+            paths = controller.add_items_to_backpack(serials, recipe.item_flag)
+            added = sum(1 for path in paths if path)
+            report["items_added"] = added
+            report["items_failed"] += len(serials) - added
+        if recipe.sync_levels:
+            # 存档之间已经并行，物品不再另开进程池
+            synced, _failed, errors = controller.sync_inventory_levels(workers=1)
+            report["levels_synced"] = synced
+            report["level_errors"] = errors
+        report["timings"]["apply"] = time.perf_counter() - t0
+
+        if not controller.history.can_undo and job.output.resolve() == job.path.resolve():
+            report["status"] = "unchanged"
+        else:
+            job.output.parent.mkdir(parents=True, exist_ok=True)
+            report["timings"].update(controller.write_save(job.output, job.compression_level))
+            report["status"] = "ok"
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    report["seconds"] = time.perf_counter() - t_start
+    return report
+
+
+def run_batch(jobs: List[BatchJob], workers: Optional[int] = None,
+              on_report=None) -> List[SaveReport]:
+    """Processes jobs across a process pool. on_report(report) is called as each save finishes."""
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    reports: List[SaveReport] = []
+    if workers == 1:
+        for job in jobs:
+            reports.append(process_save(job))
+            if on_report:
+                on_report(reports[-1])
+        return reports
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_save, job): job for job in jobs}
+        for future in as_completed(futures):
+            reports.append(future.result())
+            if on_report:
+                on_report(reports[-1])
+    # 按输入顺序返回
+    order = {str(job.path): i for i, job in enumerate(jobs)}
+    reports.sort(key=lambda r: order[r["path"]])
+    return reports
+
+
+def _output_path(path: Path, args: argparse.Namespace) -> Path:
+    if args.in_place:
+        return path
+    # 保留相对于公共父目录的结构，避免不同角色目录下的同名存档互相覆盖
+    return Path(args.out_dir) / path.resolve().relative_to(args.common_root)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m core.batch_processor",
+                                     description="Apply unlock presets, item adds and level sync to many BL4 saves.")
+    parser.add_argument("saves", nargs="+", help=".sav files or directories (searched recursively)")
+    parser.add_argument("--user-id", action="append", default=[], help="Steam/Epic user ID; repeat to try several")
+    parser.add_argument("--recipe", help="JSON/YAML recipe: presets, params, items, item_flag, sync_levels")
+    parser.add_argument("--preset", action="append", default=[], help="unlock preset name; repeat for several")
+    parser.add_argument("--class-key", help="class for the set_character_class preset")
+    parser.add_argument("--items-file", help="file with one serial (or decoded item string) per line to add")
+    parser.add_argument("--item-flag", default=None, help=f"state flag for added items (default {DEFAULT_ITEM_FLAG})")
+    parser.add_argument("--sync-levels", action="store_true", help="set backpack item levels to the character level")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out-dir", help="write modified saves here, keeping their relative paths")
+    target.add_argument("--in-place", action="store_true", help="overwrite the saves (originals are backed up first)")
+    parser.add_argument("--backup-dir", help="backup directory for --in-place (default: next to each save)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--compression-level", type=int, default=None, choices=range(0, 10), metavar="0-9")
+    parser.add_argument("--report", help="write the per-file reports to this JSON file")
+    return parser
+
+
+def _collect_saves(inputs: List[str]) -> List[Path]:
+    found: List[Path] = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            found.extend(sorted(p for p in path.rglob("*.sav") if p.is_file()))
+        else:
+            found.append(path)
+    unique = []
+    seen = set()
+    for path in found:
+        key = path.resolve()
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    recipe = load_recipe(Path(args.recipe)) if args.recipe else BatchRecipe()
+    recipe.presets.extend(args.preset)
+    if args.class_key:
+        recipe.params["class_key"] = args.class_key
+    if args.items_file:
+        recipe.items.extend(Path(args.items_file).read_text(encoding="utf-8").splitlines())
+    if args.item_flag is not None:
+        recipe.item_flag = args.item_flag
+    recipe.sync_levels = recipe.sync_levels or args.sync_levels
+    try:
+        recipe.validate()
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    saves = _collect_saves(args.saves)
+    missing = [str(p) for p in saves if not p.is_file()]
+    if missing or not saves:
+        print(f"error: no such save file: {', '.join(missing) or '(none)'}", file=sys.stderr)
+        return 2
+    args.common_root = Path(os.path.commonpath([str(p.resolve().parent) for p in saves]))
+
+    jobs = [BatchJob(p, _output_path(p, args), candidate_user_ids(p, args.user_id), recipe, args.compression_level)
+            for p in saves]
+
+    skipped: List[SaveReport] = []
+    if args.in_place:
+        backup_errors = backup_originals(jobs, args.backup_dir)
+        skipped = [_new_report(job, backup_errors[str(job.path)]) for job in jobs if str(job.path) in backup_errors]
+        jobs = [job for job in jobs if str(job.path) not in backup_errors]
+
+    def show(report: SaveReport):
+        if report["status"] == "failed":
+            print(f"[failed]    {report['path']}: {report['error']}")
+        else:
+            extra = f", +{report['items_added']} items" if report["items_added"] else ""
+            extra += f", {report['levels_synced']} levels synced" if recipe.sync_levels else ""
+            print(f"[{report['status']}] {' ' * (9 - len(report['status']))}{report['path']} -> {report['output']} "
+                  f"({report['platform']}, {report['seconds']:.2f}s{extra})")
+
+    t0 = time.perf_counter()
+    for report in skipped:
+        show(report)
+    reports = skipped + run_batch(jobs, args.workers, show)
+    failed = sum(1 for r in reports if r["status"] == "failed")
+    print(f"{len(reports) - failed}/{len(reports)} saves processed in {time.perf_counter() - t0:.2f}s")
+
+    if args.report:
+        Path(args.report).write_text(json.dumps({"recipe": recipe.to_dict(), "saves": reports}, indent=2, ensure_ascii=False),
+                                     encoding="utf-8")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,23 @@
 # bl4_functions.py
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import os
 import re
+from functools import partial
 from . import b_encoder
+from .save_history import own_child, own_path
+from .item_index import ItemEntry, ItemIndex, classify_item_path, iter_serial_items, resolve
+from .path_query import KeyIndex, compile_path
 
 
-# Helper to find deeply nested dictionary paths
-def _walk_find(node: Any, target_keys: List[str], path: Optional[List[Union[str, int]]] = None) -> Optional[List[Union[str, int]]]:
-    if path is None:
-        path = []
-    if isinstance(node, dict):
-        for k, v in node.items():
-            if k in target_keys:
-                return path + [k]
-            # Recurse
-            found_path = _walk_find(v, target_keys, path + [k])
-            if found_path:
-                return found_path
-    elif isinstance(node, list):
-        for i, v in enumerate(node):
-            found_path = _walk_find(v, target_keys, path + [i])
-            if found_path:
-                return found_path
-    return None
+# 常用节点的选择器（传入 KeyIndex 时通过倒排索引查找，而不是遍历整棵树）
+CASH_QUERY = compile_path("**.cash|money")
+ERIDIUM_QUERY = compile_path("**.eridium|vaultcoin")
+BACKPACK_QUERY = compile_path("**.backpack")
+
 
 # Locate paths for currencies
-def find_currency_paths(yaml_data: Dict[str, Any]) -> Dict[str, Optional[List[Union[str, int]]]]:
+def find_currency_paths(yaml_data: Dict[str, Any], index: Optional[KeyIndex] = None) -> Dict[str, Optional[List[Union[str, int]]]]:
     """Detects paths for cash and eridium in the save data."""
     paths = {"cash": None, "eridium": None}
     
@@ -35,19 +27,17 @@ def find_currency_paths(yaml_data: Dict[str, Any]) -> Dict[str, Optional[List[Un
             if key in yaml_data["currencies"]:
                 paths[target] = ["currencies", key]
 
-    # Priority 2: Scan the entire tree for common names if paths are still missing
+    # Priority 2: Look up common names anywhere in the tree if paths are still missing
     if not paths["cash"]:
-        paths["cash"] = _walk_find(yaml_data, ["cash", "money"])
+        paths["cash"] = CASH_QUERY.first(yaml_data, index)
     if not paths["eridium"]:
-        paths["eridium"] = _walk_find(yaml_data, ["eridium", "vaultcoin"])
+        paths["eridium"] = ERIDIUM_QUERY.first(yaml_data, index)
         
     return paths
 
 # Generic helper to set a value at a given path
 def _set_by_path(root: Any, toks: List[Union[str, int]], val: Any):
-    cur = root
-    for t in toks[:-1]:
-        cur = cur[t]
+    cur = own_path(root, toks[:-1])
     cur[toks[-1]] = val
 
 # Main function to apply all character and currency changes
@@ -70,16 +60,21 @@ def apply_character_and_currency_changes(data: Dict[str, Any], yaml_data: Dict[s
         root_node = yaml_data.get("state", yaml_data)
         if not isinstance(root_node, dict):
              root_node = yaml_data
+        elif root_node is not yaml_data:
+            root_node = own_child(yaml_data, "state")
 
         if "char_name" in root_node: root_node["char_name"] = char_name
         if "player_difficulty" in root_node: root_node["player_difficulty"] = difficulty
 
         # Experience and levels
-        exp_list = root_node.setdefault("experience", [])
+        root_node.setdefault("experience", [])
+        exp_list = own_child(root_node, "experience")
         if not isinstance(exp_list, list): exp_list = []
         
-        char_exp = next((item for item in exp_list if isinstance(item, dict) and item.get("type") == "Character"), None)
-        spec_exp = next((item for item in exp_list if isinstance(item, dict) and item.get("type") == "Specialization"), None)
+        char_idx = next((i for i, item in enumerate(exp_list) if isinstance(item, dict) and item.get("type") == "Character"), None)
+        spec_idx = next((i for i, item in enumerate(exp_list) if isinstance(item, dict) and item.get("type") == "Specialization"), None)
+        char_exp = own_child(exp_list, char_idx) if char_idx is not None else None
+        spec_exp = own_child(exp_list, spec_idx) if spec_idx is not None else None
 
         if char_exp is None:
             char_exp = {"type": "Character"}
@@ -111,24 +106,22 @@ def apply_character_and_currency_changes(data: Dict[str, Any], yaml_data: Dict[s
 from . import decoder_logic
 from . import lookup
 from typing import TypedDict, List
-from .resource_loader import load_json_resource, get_ui_localization_file
+from .localization import catalog
 
-# 全局本地化缓存
-localization_cache = None
+# 物品名称和同步提示使用的语言（文本本身由 localization.catalog 缓存）
 current_localization_lang = 'zh-CN'
 
 def set_language(lang: str):
-    """Sets the current language and clears the localization cache."""
-    global current_localization_lang, localization_cache
+    """Sets the current language and loads its catalogs (once per language)."""
+    global current_localization_lang
     current_localization_lang = lang
-    localization_cache = None
+    catalog.preload(lang)
 
 def get_sync_localization() -> Dict[str, str]:
-    """加载并返回同步背包等级相关的错误信息本地化字典。"""
-    filename = get_ui_localization_file(current_localization_lang)
-    data = load_json_resource(filename)
-    if data and "sync_errors" in data:
-        return data["sync_errors"]
+    """返回同步背包等级相关的错误信息本地化字典。"""
+    data = catalog.section(current_localization_lang, "sync_errors")
+    if data:
+        return data
     # Fallback to English hardcoded defaults if file read fails
     return {
       "char_level_unknown": "Unable to determine character level.",
@@ -143,21 +136,7 @@ def get_sync_localization() -> Dict[str, str]:
 
 def get_localized_string(key: str) -> str:
     """获取本地化字符串，如果未找到则返回原始键"""
-    global localization_cache
-    if localization_cache is None:
-        if current_localization_lang == 'zh-CN':
-            # 尝试加载武器本地化文件
-            weapon_loc = load_json_resource('weapon_edit/weapon_localization_zh-CN.json') or {}
-            # 尝试加载物品本地化文件
-            item_loc = load_json_resource('i18n/item_localization_zh-CN.json') or {}
-            # 合并字典
-            localization_cache = {**weapon_loc, **item_loc}
-        else:
-            # For English or other languages, assume keys are already English
-            # or load specific EN files if they exist in future
-            localization_cache = {}
-            
-    return localization_cache.get(key, key)
+    return catalog.localize(key, current_localization_lang)
 
 class ProcessedItem(TypedDict):
     name: str
@@ -178,24 +157,91 @@ def _walk_for_serials(node: Any, path: List[str]) -> List[Tuple[List[str], Any]]
     Recursively walks through the YAML object to find all items with a 'serial' key.
     Returns a list of tuples, where each tuple is (path_to_item, item_object).
     """
-    found_items = []
-    if isinstance(node, dict):
-        # If a 'serial' key exists, we've found an item.
-        if 'serial' in node and isinstance(node['serial'], str) and node['serial'].startswith('@U'):
-            found_items.append((path, node))
-        # Otherwise, continue walking through the dictionary.
+    return [(list(item_path), item) for item_path, item, _ in iter_serial_items(node, tuple(path))]
+
+
+def process_item(path: List[str], item_data: Dict[str, Any], entry: Optional[ItemEntry] = None) -> Optional[ProcessedItem]:
+    """
+    Decodes a single item found at `path` and returns its processed data,
+    or None if the item should not be listed. `entry` supplies the already classified container and slot.
+    """
+    # Rule: Ignore items under 'unknown_items'
+    if "unknown_items" in path:
+        return None
+
+    serial = item_data.get("serial", "")
+    if not serial:
+        return None
+
+    try:
+        formatted_str, _, err = decoder_logic.decode_serial_to_string(serial)
+        if err:
+            return None
+    except Exception as e:
+        # This is a hard guard against a C-level crash in the decoder
+        # We log it and move on, preventing a full application crash.
+        print(f"严重解码错误，序列号: {serial}, 错误: {e}")
+        return None
+    
+    split_marker = "||"
+    if split_marker not in formatted_str:
+        return None
+    
+    header_part, parts_part = formatted_str.split(split_marker, 1)
+    
+    try:
+        id_section = header_part.strip().split('|')[0]
+        id_part = id_section.strip().split(',')
+        if len(id_part) < 4:
+            return None
+        item_id = int(id_part[0].strip())
+        item_level = int(id_part[3].strip())
+
+        manufacturer, item_type, found = lookup.get_kind_enums(item_id)
+        if not found:
+            manufacturer, item_type = "Unknown", "Unknown"
+
+        # 应用本地化（每种语言的显示名称只计算一次）
+        display = catalog.item_display_names(current_localization_lang).get(item_id) if found else None
+        if display is not None:
+            localized_manufacturer, localized_item_type = display
         else:
-            for k, v in node.items():
-                found_items.extend(_walk_for_serials(v, path + [str(k)]))
-    elif isinstance(node, list):
-        for i, v in enumerate(node):
-            found_items.extend(_walk_for_serials(v, path + [str(i)]))
-    return found_items
+            localized_manufacturer = get_localized_string(manufacturer)
+            localized_item_type = get_localized_string(item_type)
+        
+        item_name = f"{localized_manufacturer} {localized_item_type}"
+        display_parts = parts_part.strip()
 
+        # Determine container and slot from the path
+        if entry is not None:
+            container_name, slot_key = entry.container, entry.slot
+        else:
+            container_name, slot_key = classify_item_path(path)
+
+        processed_item: ProcessedItem = {
+            "original_path": path,
+            "name": item_name,
+            "type": localized_item_type,
+            "type_en": item_type,
+            "container": container_name,
+            "slot": slot_key,
+            "manufacturer": localized_manufacturer,
+            "manufacturer_en": manufacturer,
+            "id": item_id,
+            "level": item_level,
+            "serial": serial,
+            "decoded_full": formatted_str,
+            "decoded_parts": display_parts,
+        }
+        return processed_item
+
+    except (ValueError, IndexError):
+        return None
 
-def process_and_load_items(yaml_data: Dict[str, Any]) -> List[ProcessedItem]:
+
+def process_and_load_items(yaml_data: Dict[str, Any], index: Optional[ItemIndex] = None) -> List[ProcessedItem]:
     """
-    Scans the YAML data for all items using a recursive walk, decodes their serials,
+    Decodes the serials of all items listed by the item index (a fresh one walks the tree once)
     and returns a structured list of processed item data.
     """
     if not isinstance(yaml_data, dict):
@@ -203,146 +249,137 @@ def process_and_load_items(yaml_data: Dict[str, Any]) -> List[ProcessedItem]:
 
     all_items: List[ProcessedItem] = []
     
-    discovered_items = _walk_for_serials(yaml_data, [])
+    if index is None:
+        index = ItemIndex()
 
-    for path, item_data in discovered_items:
-        # Rule: Ignore items under 'unknown_items'
-        if "unknown_items" in path:
-            continue
+    for entry, item_data in index.items(yaml_data):
+        processed_item = process_item(list(entry.path), item_data, entry)
+        if processed_item is not None:
+            all_items.append(processed_item)
+            
+    return all_items
 
-        serial = item_data.get("serial", "")
-        if not serial:
-            continue
+# 背包容量：基础栏位 + 每级 SDU 背包升级增加的栏位（sdu_upgrades 图中的 Backpack_NN 节点）
+BACKPACK_BASE_SLOTS = 20
+BACKPACK_SLOTS_PER_SDU_LEVEL = 2
 
-        try:
-            formatted_str, _, err = decoder_logic.decode_serial_to_string(serial)
-            if err:
-                continue
-        except Exception as e:
-            # This is a hard guard against a C-level crash in the decoder
-            # We log it and move on, preventing a full application crash.
-            print(f"严重解码错误，序列号: {serial}, 错误: {e}")
-            continue
-        
-        split_marker = "||"
-        if split_marker not in formatted_str:
-            continue
-        
-        header_part, parts_part = formatted_str.split(split_marker, 1)
-        
-        try:
-            id_section = header_part.strip().split('|')[0]
-            id_part = id_section.strip().split(',')
-            if len(id_part) < 4:
+
+def _max_slot_number(backpack_node: Dict[str, Any]) -> int:
+    """Find the highest existing slot number"""
+    max_slot = -1
+    for key in backpack_node.keys():
+        if isinstance(key, str) and key.startswith("slot_"):
+            try:
+                num = int(key.split('_')[1])
+                if num > max_slot:
+                    max_slot = num
+            except (ValueError, IndexError):
                 continue
-            item_id = int(id_part[0].strip())
-            item_level = int(id_part[3].strip())
+    return max_slot
 
-            manufacturer, item_type, found = lookup.get_kind_enums(item_id)
-            if not found:
-                manufacturer, item_type = "Unknown", "Unknown"
 
-            # 应用本地化
-            localized_manufacturer = get_localized_string(manufacturer)
-            localized_item_type = get_localized_string(item_type)
-            
-            item_name = f"{localized_manufacturer} {localized_item_type}"
-            display_parts = parts_part.strip()
-
-            # Determine container and slot from the path
-            container_name = "Unknown"
-            slot_key = "—" # Default for items without a slot, like lost loot
-
-            if "lostloot" in path:
-                container_name = "丢失物品"
-            elif "equipped_inventory" in path or "equipped" in path:
-                container_name = "Equipped"
-            elif "inventory" in path and "backpack" in path:
-                container_name = "Backpack"
-
-            # Only find a slot_key if not in lost loot
-            if container_name != "丢失物品":
-                for p_part in reversed(path):
-                    if p_part.startswith("slot_"):
-                        slot_key = p_part
-                        break
-
-            processed_item: ProcessedItem = {
-                "original_path": path,
-                "name": item_name,
-                "type": localized_item_type,
-                "type_en": item_type,
-                "container": container_name,
-                "slot": slot_key,
-                "manufacturer": localized_manufacturer,
-                "manufacturer_en": manufacturer,
-                "id": item_id,
-                "level": item_level,
-                "serial": serial,
-                "decoded_full": formatted_str,
-                "decoded_parts": display_parts,
-            }
-            all_items.append(processed_item)
+class BackpackSlots:
+    """
+    背包栏位分配器：缓存背包的路径和下一个空闲栏位号。
+    每次使用时只按缓存的路径取得背包节点（编辑事务中会复制该路径），只有背包大小与缓存不符
+    或下一个栏位已被占用时才重新扫描栏位；背包路径失效时才重新查找（有 KeyIndex 时走索引）。
+    """
 
-        except (ValueError, IndexError):
-            continue
-            
-    return all_items
+    def __init__(self, index: Optional[KeyIndex] = None):
+        self.index = index
+        self.path: Optional[List[Union[str, int]]] = None
+        self._next = 0
+        self._size = -1
+
+    def reset(self):
+        self.path = None
+        self._size = -1
+
+    def backpack(self, yaml_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Returns the (owned) backpack node, or None if the save has no backpack."""
+        for _ in range(2):
+            if self.path is None:
+                self.path = BACKPACK_QUERY.first(yaml_data, self.index)
+                if not self.path:
+                    self.path = None
+                    return None
+            try:
+                node = own_path(yaml_data, self.path)
+            except (KeyError, IndexError, TypeError):
+                self.reset()
+                continue
+            if not isinstance(node, dict):
+                self.reset()
+                return None
+            if len(node) != self._size or f"slot_{self._next}" in node:
+                self._next = _max_slot_number(node) + 1
+                self._size = len(node)
+            return node
+        return None
+
+    def put(self, backpack_node: Dict[str, Any], item: Dict[str, Any]) -> List[Union[str, int]]:
+        """Stores item in the next free slot of backpack_node and returns its full path."""
+        key = f"slot_{self._next}"
+        backpack_node[key] = item
+        self._next += 1
+        self._size = len(backpack_node)
+        return list(self.path) + [key]
 
-def add_item_to_backpack(yaml_data: Dict[str, Any], serial: str, state_flags: str) -> Optional[List[Union[str, int]]]:
+
+def add_item_to_backpack(yaml_data: Dict[str, Any], serial: str, state_flags: str,
+                         slots: Optional[BackpackSlots] = None) -> Optional[List[Union[str, int]]]:
     """
     Adds a new item to the first available slot in the backpack.
     Returns the full path to the new item on success, otherwise None.
     """
+    paths = add_items_to_backpack(yaml_data, [serial], state_flags, slots)
+    return paths[0] if paths else None
+
+
+def add_items_to_backpack(yaml_data: Dict[str, Any], serials: Sequence[str], state_flags: Union[str, int, Sequence[Union[str, int]]],
+                          slots: Optional[BackpackSlots] = None) -> List[Optional[List[Union[str, int]]]]:
+    """
+    Adds many items to the backpack in one pass. state_flags is one flag for all items or one per item.
+    Returns the path of each new item (None where the flag was invalid); an empty list if there is no backpack.
+    """
+    if slots is None:
+        slots = BackpackSlots()
     try:
-        # Find the path to the backpack dynamically
-        backpack_path = _walk_find(yaml_data, ["backpack"])
-        if not backpack_path:
-            return None
+        backpack_node = slots.backpack(yaml_data)
+    except Exception:
+        return []
+    if backpack_node is None:
+        return []
 
-        # Get a reference to the backpack node
-        backpack_node = yaml_data
-        temp_path = []
-        for key in backpack_path:
-            backpack_node = backpack_node[key]
-            temp_path.append(key)
-
-        # Find the highest existing slot number
-        max_slot = -1
-        if isinstance(backpack_node, dict):
-            for key in backpack_node.keys():
-                if isinstance(key, str) and key.startswith("slot_"):
-                    try:
-                        num = int(key.split('_')[1])
-                        if num > max_slot:
-                            max_slot = num
-                    except (ValueError, IndexError):
-                        continue
-        
-        # Determine the new slot key
-        new_slot_key = f"slot_{max_slot + 1}"
+    if isinstance(state_flags, (str, int)):
+        state_flags = [state_flags] * len(serials)
 
-        # Create the new item structure
-        new_item = {
-            'serial': serial,
-            'state_flags': int(state_flags)
-        }
-        
-        # Add the new item to the backpack
-        backpack_node[new_slot_key] = new_item
-        
-        # Return the full path to the newly added item
-        return temp_path + [new_slot_key]
+    paths: List[Optional[List[Union[str, int]]]] = []
+    for serial, flag in zip(serials, state_flags):
+        try:
+            # Create the new item structure
+            new_item = {
+                'serial': serial,
+                'state_flags': int(flag)
+            }
+        except (TypeError, ValueError):
+            paths.append(None)
+            continue
+        paths.append(slots.put(backpack_node, new_item))
+    return paths
 
-    except Exception:
-        return None
 
-        
-        # Return the full path to the newly added item
-        return temp_path + [new_slot_key]
+def backpack_capacity(yaml_data: Dict[str, Any]) -> int:
+    """Number of backpack slots the game allows, from the SDU backpack upgrades in the save."""
+    level = 0
+    graphs = yaml_data.get("progression", {}).get("graphs", []) if isinstance(yaml_data, dict) else []
+    if isinstance(graphs, list):
+        for graph in graphs:
+            if isinstance(graph, dict) and graph.get("name") == "sdu_upgrades":
+                level = sum(1 for n in graph.get("nodes", []) or []
+                            if isinstance(n, dict) and str(n.get("name", "")).startswith("Backpack_"))
+    return BACKPACK_BASE_SLOTS + level * BACKPACK_SLOTS_PER_SDU_LEVEL
 
-    except Exception:
-        return None
 
 def update_level_in_decoded_str(decoded_full: str, new_level: int) -> Optional[str]:
     """
@@ -390,23 +427,8 @@ def get_yaml_loader():
 
 
 def find_node_by_path(yaml_data: Dict[str, Any], path_str: str) -> Optional[Any]:
-    """通过点分隔的路径字符串查找节点，例如 'inventory.backpack'。"""
-    keys = path_str.split('.')
-    node = yaml_data
-    try:
-        for key in keys:
-            # 首先尝试作为字典键
-            if isinstance(node, dict) and key in node:
-                node = node[key]
-            # 如果是列表，而键是数字，则尝试作为索引
-            elif isinstance(node, list) and key.isdigit():
-                node = node[int(key)]
-            # 如果都失败，则路径无效
-            else:
-                return None
-    except (KeyError, IndexError, TypeError):
-        return None
-    return node
+    """通过点分隔的路径字符串查找节点，例如 'inventory.backpack'（也可以使用 * 和 **，见 path_query）。"""
+    return compile_path(path_str).node(yaml_data)
 
 
 def find_last_backpack_slot(yaml_data: Dict[str, Any]) -> int:
@@ -432,9 +454,108 @@ def find_last_backpack_slot(yaml_data: Dict[str, Any]) -> int:
     return max_slot
 
 
-def sync_inventory_item_levels(yaml_data: Dict[str, Any]) -> Tuple[int, int, List[str]]:
+# ── Bulk Item Transforms ──────────────────────────────────────────────────────
+
+# 少于这个数量的物品直接在当前进程中处理（启动进程池的开销更大）
+PARALLEL_MIN_ITEMS = 64
+
+TransformFn = Callable[[str], Optional[str]]
+
+
+class TransformReport(TypedDict):
+    path: List[str]
+    slot: str
+    status: str  # ok / unchanged / missing_serial / decode_fail / update_fail / reencode_fail / write_fail / not_committed
+    error: str
+    serial: Optional[str]  # 新的序列号（成功时）
+
+
+def _transform_serial(job: Tuple[Any, TransformFn]) -> Tuple[str, Optional[str], str]:
+    """
+    Decodes a serial, applies fn to the decoded string and re-encodes it. Runs in a worker process.
+    Returns (status, new_serial, error).
+    """
+    serial, fn = job
+    if not isinstance(serial, str) or not serial:
+        return "missing_serial", None, ""
+    try:
+        decoded_full, _, err = decoder_logic.decode_serial_to_string(serial)
+        if err:
+            return "decode_fail", None, str(err)
+        updated = fn(decoded_full)
+        if not updated:
+            return "update_fail", None, ""
+        if updated == decoded_full:
+            return "unchanged", serial, ""
+        new_serial, err = b_encoder.encode_to_base85(updated)
+        if err:
+            return "reencode_fail", None, str(err)
+        return "ok", new_serial, ""
+    except Exception as e:
+        return "decode_fail", None, str(e)
+
+
+def transform_items(yaml_data: Dict[str, Any], predicate: Callable[[ItemEntry, Dict[str, Any]], bool], fn: TransformFn,
+                    workers: Optional[int] = None, index: Optional[ItemIndex] = None,
+                    touched_paths: Optional[List[List[str]]] = None, partial: bool = False) -> Tuple[bool, List[TransformReport]]:
+    """
+    对所有满足 predicate(entry, item_node) 的物品：解码序列号，用 fn(decoded_full) 得到新的解码字符串，再重新编码。
+    解码/编码在进程池中并行进行（fn 必须可以 pickle，例如模块级函数或其 functools.partial）。
+    新的序列号先全部暂存，全部成功后才一次性写回：默认只要有一个物品解码/处理/编码/写回失败，就不修改任何物品。
+    partial=True 需要显式传入：跳过失败的物品，照常写回其余物品（写回失败时仍然全部不写）。
+    Returns (committed, reports); reports are in document order, one per selected item.
+    """
+    if index is None:
+        index = ItemIndex()
+    selected = [(list(entry.path), node) for entry, node in index.items(yaml_data) if predicate(entry, node)]
+    reports: List[TransformReport] = []
+    if not selected:
+        return True, reports
+
+    # 1. Decode, transform, re-encode (in parallel for large selections)
+    jobs = [(node.get("serial"), fn) for _, node in selected]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_ITEMS:
+        from concurrent.futures import ProcessPoolExecutor  # 只在需要时导入（multiprocessing 较慢）
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            results = list(executor.map(_transform_serial, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        results = [_transform_serial(job) for job in jobs]
+
+    for (path, _), (status, new_serial, error) in zip(selected, results):
+        slot = next((p for p in reversed(path) if p.startswith("slot_")), "Slot-?")
+        reports.append({"path": path, "slot": slot, "status": status, "error": error, "serial": new_serial})
+
+    # 2. Stage: every item that changes must still be a writable node in the tree
+    staged = [r for r in reports if r["status"] == "ok"]
+    failed = any(r["status"] not in ("ok", "unchanged") for r in reports)
+    for report in staged:
+        found, node = resolve(yaml_data, report["path"])
+        if not found or not isinstance(node, dict):
+            report["status"] = "write_fail"
+            report["error"] = "/".join(report["path"])
+            failed = True
+    if failed and (not partial or any(r["status"] == "write_fail" for r in reports)):
+        for report in reports:
+            if report["status"] == "ok":
+                report["status"] = "not_committed"
+                report["serial"] = None
+        return False, reports
+
+    # 3. Commit all staged serials
+    for report in staged:
+        own_path(yaml_data, report["path"])["serial"] = report["serial"]
+        if touched_paths is not None:
+            touched_paths.append(report["path"] + ["serial"])
+    return True, reports
+
+
+def sync_inventory_item_levels(yaml_data: Dict[str, Any], touched_paths: Optional[List[List[str]]] = None,
+                               index: Optional[ItemIndex] = None, workers: Optional[int] = None) -> Tuple[int, int, List[str]]:
     """
     Synchronizes the level of all items in the 'inventory' container to the character's level.
+    If touched_paths is given, the path of every rewritten serial is appended to it.
+    Items are processed with transform_items(), so nothing is written if any item fails.
     """
     loc = get_sync_localization()
     
@@ -455,61 +576,30 @@ def sync_inventory_item_levels(yaml_data: Dict[str, Any]) -> Tuple[int, int, Lis
     except (AttributeError, StopIteration):
         return 0, 0, [loc.get("char_data_missing", "Character XP/Level not found in YAML")]
 
-    # 2. Find all items in the inventory
-    # We use the existing walker to find all items, then filter by container.
-    all_discovered_items = _walk_for_serials(yaml_data, [])
-    
-    inventory_items = []
-    for path, item_data in all_discovered_items:
-        # Heuristic to identify backpack items. This should be robust.
-        is_in_inventory = False
-        path_str = '/'.join(map(str, path))
-        if 'inventory' in path and 'backpack' in path_str:
-            is_in_inventory = True
-        
-        if is_in_inventory:
-            inventory_items.append((path, item_data))
+    # 2. Re-encode every backpack item at the character's level
+    committed, reports = transform_items(
+        yaml_data, lambda entry, _node: entry.in_backpack,
+        partial(update_level_in_decoded_str, new_level=character_level),
+        workers=workers, index=index, touched_paths=touched_paths)
 
-    if not inventory_items:
+    if not reports:
         return 0, 0, [loc.get("no_inventory_items", "No items found in backpack")]
 
-    # 3. Iterate, decode, update, re-encode
-    for path, item_data in inventory_items:
-        original_serial = item_data.get("serial")
-        slot_identifier = next((p for p in reversed(path) if p.startswith("slot_")), "Slot-?")
-
-        if not original_serial:
-            fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('missing_serial', 'Missing serial')}")
-            continue
-
-        # Decode
-        decoded_full, _, err = decoder_logic.decode_serial_to_string(original_serial)
-        if err:
-            fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('decode_fail', 'Decode failed')} ({err})")
-            continue
-            
-        # Update level
-        updated_decoded_str = update_level_in_decoded_str(decoded_full, character_level)
-        if not updated_decoded_str:
-            fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('update_level_fail', 'Level update failed')}")
-            continue
-
-        # Re-encode
-        new_serial, err = b_encoder.encode_to_base85(updated_decoded_str)
-        if err:
-            fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('reencode_fail', 'Re-encode failed')} ({err})")
-            continue
-            
-        # Write back to YAML object
-        try:
-            _set_by_path(yaml_data, path + ['serial'], new_serial)
+    messages = {
+        "missing_serial": loc.get("missing_serial", "Missing serial"),
+        "decode_fail": loc.get("decode_fail", "Decode failed"),
+        "update_fail": loc.get("update_level_fail", "Level update failed"),
+        "reencode_fail": loc.get("reencode_fail", "Re-encode failed"),
+        "write_fail": loc.get("write_fail", "Write fail"),
+    }
+    for report in reports:
+        if report["status"] in ("ok", "unchanged"):
             success_count += 1
-        except (KeyError, IndexError) as e:
-            fail_count += 1
-            failed_items_info.append(f"{slot_identifier}: {loc.get('write_fail', 'Write fail')} ({e})")
+            continue
+        fail_count += 1
+        if report["status"] == "not_committed":
+            continue  # 因为其他物品失败而没有写入，只列出真正失败的物品
+        detail = f" ({report['error']})" if report["error"] else ""
+        failed_items_info.append(f"{report['slot']}: {messages[report['status']]}{detail}")
 
     return success_count, fail_count, failed_items_info
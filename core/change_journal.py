@@ -0,0 +1,80 @@
+# change_journal.py
+"""
+存档树的修改日志。
+
+控制器的每个修改操作都会记录它改动过的路径；界面按路径前缀订阅，
+flush() 时只通知与这些路径相关的订阅者，从而只刷新受影响的部分。
+"""
+
+from typing import Any, Callable, Iterable, List, Tuple, Union
+
+Path = Tuple[str, ...]
+Callback = Callable[[List[Path]], None]
+
+
+def _as_key(path: Iterable[Union[str, int]]) -> Path:
+    # 物品路径里的列表下标是字符串，其它地方是整数，统一成字符串比较
+    return tuple(str(p) for p in path)
+
+
+def paths_related(a: Path, b: Path) -> bool:
+    """True if one path is a prefix of (or equal to) the other."""
+    n = min(len(a), len(b))
+    return a[:n] == b[:n]
+
+
+class ChangeJournal:
+    """
+    记录待处理的修改路径并分发给按前缀订阅的监听者。
+    空路径 () 表示整棵树都已改变（例如重新加载或原始YAML编辑）。
+    """
+
+    def __init__(self):
+        self._pending: List[Path] = []
+        self._subscribers: List[Tuple[List[Path], Callback]] = []
+
+    def record(self, path: Iterable[Union[str, int]]):
+        self._pending.append(_as_key(path))
+
+    def record_all(self):
+        self._pending.append(())
+
+    @property
+    def pending(self) -> List[Path]:
+        return list(self._pending)
+
+    def clear(self):
+        self._pending.clear()
+
+    def subscribe(self, prefixes: Iterable[Iterable[Union[str, int]]], callback: Callback) -> Any:
+        """Calls callback with the changed paths related to any of the prefixes on every flush."""
+        token = ([_as_key(p) for p in prefixes], callback)
+        self._subscribers.append(token)
+        return token
+
+    def unsubscribe(self, token: Any):
+        if token in self._subscribers:
+            self._subscribers.remove(token)
+
+    def flush(self) -> List[Path]:
+        """Dispatches and clears the pending changes. Returns the paths that were flushed."""
+        changes = self._dedupe(self._pending)
+        self._pending = []
+        if not changes:
+            return []
+        for prefixes, callback in list(self._subscribers):
+            matched = [p for p in changes if any(paths_related(p, prefix) for prefix in prefixes)]
+            if matched:
+                callback(matched)
+        return changes
+
+    @staticmethod
+    def _dedupe(paths: List[Path]) -> List[Path]:
+        """Drops duplicates and paths already covered by a recorded ancestor."""
+        result: List[Path] = []
+        seen = set(paths)
+        for path in dict.fromkeys(paths):
+            if any(path[:n] in seen for n in range(len(path))):
+                continue
+            result.append(path)
+        return result
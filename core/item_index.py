@@ -0,0 +1,306 @@
+# item_index.py
+"""
+存档中物品（带 '@U' 序列号的节点）的索引。
+
+载入后遍历一次整棵树，记录每个物品的路径、所在容器、栏位和在树中的先后顺序。
+控制器每次 _touch() 都把修改路径交给 touch()，下次查询时只重新扫描这些路径下的子树
+（修改可能改变兄弟节点位置时，例如列表插入/删除或新增物品，扫描它的父节点），
+因此列出物品、同步等级等操作不再需要每次遍历整个存档。修改路径在查询时才按当前根节点
+处理，所以撤销/重做和失败后恢复的编辑也会得到正确的结果。
+"""
+
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+ItemPath = Tuple[str, ...]
+
+LOST_LOOT_CONTAINER = "丢失物品"
+# 待处理路径超过这个数量时，改为重新扫描它们的公共前缀
+BATCH_RESCAN_THRESHOLD = 64
+
+
+def is_item(node: Any) -> bool:
+    if not isinstance(node, dict) or 'serial' not in node:
+        return False
+    serial = node['serial']
+    return isinstance(serial, str) and serial.startswith('@U')
+
+
+def iter_serial_items(node: Any, prefix: ItemPath = (), order: Tuple[int, ...] = ()) -> Iterator[Tuple[ItemPath, Any, Tuple[int, ...]]]:
+    """
+    Yields (path, item_node, order) for every item under node, in document order. Path elements are
+    strings, as in item paths elsewhere; order holds the position of each path element in its parent.
+    """
+    path = list(prefix)
+    positions = list(order)
+
+    def walk(current):
+        if isinstance(current, dict):
+            if is_item(current):
+                yield tuple(path), current, tuple(positions)
+                return
+            children = enumerate(current.items())
+        elif isinstance(current, list):
+            children = enumerate(enumerate(current))
+        else:
+            return
+        for position, (key, value) in children:
+            path.append(str(key))
+            positions.append(position)
+            yield from walk(value)
+            path.pop()
+            positions.pop()
+
+    yield from walk(node)
+
+
+def classify_item_path(path: Sequence[str]) -> Tuple[str, str]:
+    """Returns (container, slot) for an item path."""
+    container_name = "Unknown"
+    slot_key = "—"  # Default for items without a slot, like lost loot
+
+    if "lostloot" in path:
+        container_name = LOST_LOOT_CONTAINER
+    elif "equipped_inventory" in path or "equipped" in path:
+        container_name = "Equipped"
+    elif "inventory" in path and "backpack" in path:
+        container_name = "Backpack"
+
+    # Only find a slot_key if not in lost loot
+    if container_name != LOST_LOOT_CONTAINER:
+        for p_part in reversed(path):
+            if p_part.startswith("slot_"):
+                slot_key = p_part
+                break
+    return container_name, slot_key
+
+
+def _child(node: Any, key: str) -> Any:
+    """node[key] for a string path element; raises KeyError/IndexError/ValueError if missing."""
+    if isinstance(node, list):
+        return node[int(key)]
+    if isinstance(node, dict):
+        if key in node:
+            return node[key]
+        for k in node:
+            if str(k) == key:
+                return node[k]
+    raise KeyError(key)
+
+
+def resolve(root: Any, path: Sequence[str]) -> Tuple[bool, Any]:
+    node = root
+    try:
+        for key in path:
+            node = _child(node, key)
+    except (KeyError, IndexError, ValueError, TypeError):
+        return False, None
+    return True, node
+
+
+def _first_item_prefix(root: Any, path: ItemPath) -> Optional[ItemPath]:
+    """The shortest prefix of path that is an item in root, if any."""
+    node = root
+    for depth, key in enumerate(path, 1):
+        try:
+            node = _child(node, key)
+        except (KeyError, IndexError, ValueError, TypeError):
+            return None
+        if is_item(node):
+            return path[:depth]
+    return None
+
+
+def _common_prefix(paths: Sequence[ItemPath]) -> ItemPath:
+    prefix = paths[0]
+    for path in paths[1:]:
+        n = 0
+        for a, b in zip(prefix, path):
+            if a != b:
+                break
+            n += 1
+        prefix = prefix[:n]
+    return prefix
+
+
+def _positions(root: Any, path: Sequence[str]) -> Optional[Tuple[int, ...]]:
+    """Position of each element of path within its parent, or None if path does not exist."""
+    order = []
+    node = root
+    try:
+        for key in path:
+            if isinstance(node, list):
+                index = int(key)
+                order.append(index)
+                node = node[index]
+            else:
+                position = next(i for i, k in enumerate(node) if str(k) == key)
+                order.append(position)
+                node = _child(node, key)
+    except (KeyError, IndexError, ValueError, TypeError, StopIteration):
+        return None
+    return tuple(order)
+
+
+class ItemEntry:
+    """一个物品在树中的位置。物品节点本身按路径从当前根节点取得。"""
+
+    __slots__ = ("path", "order", "container", "slot", "in_backpack")
+
+    def __init__(self, path: ItemPath, order: Tuple[int, ...]):
+        self.path = path
+        self.order = order
+        self.container, self.slot = classify_item_path(path)
+        # 等级同步使用的判断（比 container == "Backpack" 宽松）
+        self.in_backpack = "inventory" in path and "backpack" in "/".join(path)
+
+    @property
+    def parent_path(self) -> ItemPath:
+        return self.path[:-1]
+
+
+class ItemIndex:
+    """物品路径索引。线程安全；未建立时在第一次查询时遍历整棵树。"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Optional[Dict[ItemPath, ItemEntry]] = None
+        self._pending: List[ItemPath] = []
+        self._ordered: Optional[List[ItemEntry]] = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._entries is not None
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+            self._ordered = None
+            self._pending = []
+
+    def touch(self, path: Sequence[Any]):
+        """Marks a modified path; an empty path invalidates the whole index."""
+        path = tuple(str(k) for k in path)
+        with self._lock:
+            if not path:
+                self.invalidate()
+            elif self._entries is not None:
+                self._pending.append(path)
+
+    # ── 查询 ──────────────────────────────────────────────────────────────
+
+    def entries(self, root: Any) -> List[ItemEntry]:
+        """All items in document order."""
+        with self._lock:
+            self._sync(root)
+            if self._ordered is None:
+                self._ordered = sorted(self._entries.values(), key=lambda e: e.order)
+            return list(self._ordered)
+
+    def items(self, root: Any) -> List[Tuple[ItemEntry, Any]]:
+        """(entry, item node) pairs in document order."""
+        result = []
+        for entry in self.entries(root):
+            found, node = resolve(root, entry.path)
+            if found:
+                result.append((entry, node))
+        return result
+
+    def get(self, root: Any, path: Sequence[Any]) -> Optional[ItemEntry]:
+        with self._lock:
+            self._sync(root)
+            return self._entries.get(tuple(str(k) for k in path))
+
+    def owner(self, root: Any, path: Sequence[Any]) -> Optional[ItemEntry]:
+        """The item that contains path (or is path), if any."""
+        path = tuple(str(k) for k in path)
+        with self._lock:
+            self._sync(root)
+            for depth in range(len(path), 0, -1):
+                entry = self._entries.get(path[:depth])
+                if entry is not None:
+                    return entry
+        return None
+
+    def has_items_under(self, root: Any, path: Sequence[Any]) -> bool:
+        path = tuple(str(k) for k in path)
+        n = len(path)
+        with self._lock:
+            self._sync(root)
+            return any(key[:n] == path for key in self._entries)
+
+    @staticmethod
+    def parent(root: Any, entry: ItemEntry) -> Any:
+        return resolve(root, entry.parent_path)[1]
+
+    # ── 维护 ──────────────────────────────────────────────────────────────
+
+    def _sync(self, root: Any):
+        """Builds the index or applies pending paths against root. Caller holds the lock."""
+        if self._entries is None:
+            self._entries = {path: ItemEntry(path, order) for path, _, order in iter_serial_items(root)}
+            self._ordered = None
+            self._pending = []
+            return
+        if not self._pending:
+            return
+        pending = sorted(set(self._pending), key=len)
+        self._pending = []
+        if len(pending) > BATCH_RESCAN_THRESHOLD:
+            # 大批修改（例如批量添加物品）时只重新扫描一次它们的公共前缀
+            pending = [_common_prefix(pending)]
+            if not pending[0]:
+                self._entries = None
+                self._sync(root)
+                return
+        done: List[ItemPath] = []
+        for path in pending:
+            # 祖先路径已经重新扫描过
+            if any(path[:len(p)] == p for p in done):
+                continue
+            # 修改前和修改后路径上的物品节点（可能不同，例如撤销把物品恢复回来）
+            old = next((path[:d] for d in range(1, len(path) + 1) if path[:d] in self._entries), None)
+            new = _first_item_prefix(root, path)
+            if old is not None and old == new and len(old) < len(path):
+                continue  # 只是物品内部的修改，位置不变
+            path = min((p for p in (old, new, path) if p is not None), key=len)
+            if self._shifts_siblings(root, path):
+                # 兄弟节点的位置可能已经改变，重新扫描父节点
+                path = path[:-1]
+                if not path:
+                    self._entries = None
+                    self._sync(root)
+                    return
+            self._rescan(root, path)
+            done.append(path)
+        self._ordered = None
+
+    def _shifts_siblings(self, root: Any, path: ItemPath) -> bool:
+        """
+        True if rescanning path alone could leave its siblings with stale positions: path is a list
+        element (an insert or delete at that index shifts the later elements), held items that were
+        removed or moved (for example deleted and added again), or is a new key that holds items.
+        Caller holds the lock.
+        """
+        found, parent = resolve(root, path[:-1])
+        if found and isinstance(parent, list):
+            return True
+        n = len(path)
+        stored = next((entry.order[:n] for key, entry in self._entries.items() if key[:n] == path), None)
+        current = _positions(root, path)
+        if stored is not None:
+            return stored != current
+        if current is None:
+            return False
+        return next(iter_serial_items(resolve(root, path)[1]), None) is not None
+
+    def _rescan(self, root: Any, path: ItemPath):
+        n = len(path)
+        for key in [key for key in self._entries if key[:n] == path]:
+            del self._entries[key]
+        order = _positions(root, path)
+        if order is None:
+            return
+        node = resolve(root, path)[1]
+        for item_path, _, item_order in iter_serial_items(node, path, order):
+            self._entries[item_path] = ItemEntry(item_path, item_order)
@@ -0,0 +1,135 @@
+# localization.py
+"""
+本地化目录服务：所有界面文本和物品名称翻译都从这里取得。
+
+每个目录文件（界面 JSON、武器/物品翻译表等）只读取并解析一次，之后一直缓存，
+切换语言时最多读取一次新语言的文件，切换回来不再读盘。反向索引（翻译 -> 英文键）和
+物品ID对应的显示名称（lookup.REVERSE_ID_MAP）也按语言预先计算一次。
+
+table()/ui()/section() 每次核对源文件的大小和修改时间，文件改动后重新读取，并丢弃由旧内容
+算出的反向索引和物品名称。localize()、item_display_names() 是逐个物品调用的热路径，不核对；
+物品翻译表的改动在下一次 preload()（切换语言）时生效。
+
+返回的字典由所有标签页共享，调用方不能修改。
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from . import lookup
+from .resource_loader import get_ui_localization_file, load_json_resource, resource_stamp
+
+# 物品名称翻译表（目前只有中文）
+ITEM_STRING_TABLES = {
+    'zh-CN': ('weapon_edit/weapon_localization_zh-CN.json', 'i18n/item_localization_zh-CN.json'),
+}
+
+
+class LocalizationCatalog:
+    """线程安全的本地化目录缓存。"""
+
+    def __init__(self, loader: Callable[[str], Optional[Dict[str, Any]]] = load_json_resource,
+                 stamp: Callable[[str], Sequence[Any]] = resource_stamp):
+        self._load = loader
+        self._stamp = stamp
+        self._lock = threading.RLock()
+        # 相对路径 -> (源文件状态, 内容)
+        self._tables: Dict[str, Tuple[Sequence[Any], Dict[str, Any]]] = {}
+        self._reverse: Dict[Any, Dict[Any, Any]] = {}
+        self._item_strings: Dict[str, Dict[str, str]] = {}
+        self._display_names: Dict[str, Dict[int, Tuple[str, str]]] = {}
+
+    def table(self, relative_path: str) -> Dict[str, Any]:
+        """A JSON resource, read again only when the file changes. Missing or invalid files give an empty dict."""
+        stamp = self._stamp(relative_path)
+        with self._lock:
+            cached = self._tables.get(relative_path)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            data = self._load(relative_path)
+            if not isinstance(data, dict):
+                data = {}
+            if cached is not None:
+                # 源文件改动：丢弃由旧内容算出的结果
+                self._reverse.clear()
+                self._item_strings.clear()
+                self._display_names.clear()
+            self._tables[relative_path] = (stamp, data)
+            return data
+
+    def reverse_table(self, relative_path: str) -> Dict[Any, Any]:
+        """value -> key for a flat translation table."""
+        with self._lock:
+            table = self.table(relative_path)
+            key = ("table", relative_path)
+            if key not in self._reverse:
+                self._reverse[key] = _invert(table)
+            return self._reverse[key]
+
+    # ── 界面文本 ──────────────────────────────────────────────────────────
+
+    def ui(self, lang: str) -> Dict[str, Any]:
+        """The whole UI catalog for lang."""
+        return self.table(get_ui_localization_file(lang))
+
+    def section(self, lang: str, name: str) -> Dict[str, Any]:
+        """One top-level section of the UI catalog (e.g. 'items_tab'), or {} if it is missing."""
+        data = self.ui(lang).get(name)
+        return data if isinstance(data, dict) else {}
+
+    # ── 物品名称 ──────────────────────────────────────────────────────────
+
+    def item_strings(self, lang: str) -> Dict[str, str]:
+        """English item term -> translated term (weapon and item tables merged)."""
+        with self._lock:
+            merged = self._item_strings.get(lang)
+            if merged is None:
+                merged = {}
+                for path in ITEM_STRING_TABLES.get(lang, ()):
+                    merged.update(self.table(path))
+                self._item_strings[lang] = merged
+            return merged
+
+    def localize(self, key: str, lang: str) -> str:
+        return self.item_strings(lang).get(key, key)
+
+    def english_key(self, value: str, lang: str) -> str:
+        """Translated item term -> English term; unknown values are returned unchanged."""
+        with self._lock:
+            key = ("items", lang)
+            if key not in self._reverse:
+                self._reverse[key] = _invert(self.item_strings(lang))
+            return self._reverse[key].get(value, value)
+
+    def item_display_names(self, lang: str) -> Dict[int, Tuple[str, str]]:
+        """item type id -> (translated manufacturer, translated item type) for every id in lookup.REVERSE_ID_MAP."""
+        with self._lock:
+            names = self._display_names.get(lang)
+            if names is None:
+                strings = self.item_strings(lang)
+                names = {item_id: (strings.get(mfg, mfg), strings.get(item_type, item_type))
+                         for item_id, (mfg, item_type) in lookup.REVERSE_ID_MAP.items()}
+                self._display_names[lang] = names
+            return names
+
+    def preload(self, lang: str):
+        """Reads everything a language switch needs, so the tabs only hit the cache."""
+        self.ui(lang)
+        with self._lock:
+            # 核对物品翻译表，改动过的表在这里重新读取
+            for path in ITEM_STRING_TABLES.get(lang, ()):
+                self.table(path)
+            self.item_display_names(lang)
+
+
+def _invert(mapping: Dict[Any, Any]) -> Dict[Any, Any]:
+    # 多个键翻译相同时保留第一个（与原先线性查找的结果一致）
+    reverse: Dict[Any, Any] = {}
+    for key, value in mapping.items():
+        if isinstance(value, str):
+            reverse.setdefault(value, key)
+    return reverse
+
+
+# 进程内共享的目录
+catalog = LocalizationCatalog()
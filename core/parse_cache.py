@@ -0,0 +1,191 @@
+# parse_cache.py
+"""
+已解析存档的磁盘缓存。
+
+以 sha256(加密文件 + 用户ID + 加载方式) 为键，把 (平台, YAML文本, 节点区间文档, yaml_obj) 用 pickle 保存。
+重新打开同一个未改动的存档时，只需读一个文件并 unpickle，跳过 AES、zlib 和 YAML 解析。
+缓存目录位于用户缓存目录（见 app_paths），有总大小上限，按最近使用时间淘汰。
+
+unpickle 可以执行任意代码，所以只加载本程序自己写出的文件：每次写入后把文件的大小和修改时间
+记录在 manifest.json 中，读取前核对；不在清单中、大小或修改时间不符、损坏或版本不符的文件
+视为未命中并删除，不会被 unpickle。
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import app_paths
+
+# 用户缓存目录下的子目录名
+CACHE_DIR = "parse_cache"
+MANIFEST_FILE = "manifest.json"
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+# 缓存内容结构变化时递增
+CACHE_VERSION = 2
+
+Entry = Tuple[str, str, Any, Any]  # (platform, yaml_text, document, obj)
+
+_KEY_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def cache_key(enc_data: bytes, user_id: str, lazy: bool = True) -> str:
+    """lazy 是加载方式：延迟加载的根（LazySections）和完整加载的根分别缓存。"""
+    h = hashlib.sha256(enc_data)
+    h.update(b"\0" + user_id.strip().encode("utf-8"))
+    if not lazy:
+        h.update(b"\0full")
+    return h.hexdigest()
+
+
+class ParseCache:
+    """pickle 文件缓存，写入在后台线程中完成。"""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = MAX_CACHE_BYTES):
+        self.directory = Path(directory) if directory else app_paths.user_cache_dir() / CACHE_DIR
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # 键 -> [大小, 修改时间(ns), 最近使用时间]，第一次使用时从 manifest.json 读取
+        self._manifest: Optional[Dict[str, List[float]]] = None
+
+    def _path(self, key: str) -> Optional[Path]:
+        # 键只能是 cache_key() 的结果，不能指向缓存目录之外
+        return self.directory / f"{key}.pickle" if _KEY_RE.fullmatch(key) else None
+
+    # ── 清单 ──────────────────────────────────────────────────────────────
+
+    def _entries(self) -> Dict[str, List[float]]:
+        """The manifest, loaded on first use. Caller holds the lock."""
+        if self._manifest is None:
+            self._manifest = {}
+            try:
+                with open(self.directory / MANIFEST_FILE, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+                    self._manifest = {key: record for key, record in data.get("entries", {}).items()
+                                      if _KEY_RE.fullmatch(key) and isinstance(record, list) and len(record) == 3}
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"解析缓存清单读取失败，已忽略: {e}")
+        return self._manifest
+
+    def _save_manifest(self):
+        """Caller holds the lock."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / MANIFEST_FILE
+            tmp = self._temp_path(path)
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"version": CACHE_VERSION, "entries": self._manifest or {}}, f)
+                os.replace(tmp, path)
+            finally:
+                self._discard(tmp)
+        except Exception as e:
+            print(f"解析缓存清单写入失败: {e}")
+
+    def _forget(self, key: str, path: Path):
+        """Deletes an entry and its file. Caller holds the lock."""
+        if self._entries().pop(key, None) is not None:
+            self._save_manifest()
+        self._discard(path)
+
+    # ── 读写 ──────────────────────────────────────────────────────────────
+
+    def load(self, key: str) -> Optional[Entry]:
+        path = self._path(key)
+        if path is None:
+            return None
+        with self._lock:
+            record = self._entries().get(key)
+            try:
+                st = path.stat()
+            except OSError:
+                if record is not None:
+                    self._forget(key, path)
+                return None
+            if record is None or [st.st_size, st.st_mtime_ns] != record[:2]:
+                # 不是本程序写出的文件，或写出后被改过：不 unpickle
+                self._forget(key, path)
+                return None
+            try:
+                with open(path, "rb") as f:
+                    version, stored_key, entry = pickle.load(f)
+            except Exception as e:
+                print(f"解析缓存读取失败，已丢弃: {e}")
+                self._forget(key, path)
+                return None
+            if version != CACHE_VERSION or stored_key != key:
+                self._forget(key, path)
+                return None
+            record[2] = time.time()  # 记录最近使用时间
+            self._save_manifest()
+        return entry
+
+    def store_async(self, key: str, entry: Entry) -> threading.Thread:
+        """
+        Pickles entry on a background thread. entry's obj must not be mutated afterwards; the
+        controller's edits never touch a loaded root in place (see save_history), so this holds.
+        """
+        worker = threading.Thread(target=self._store, args=(key, entry), name="parse-cache-writer")
+        worker.start()
+        return worker
+
+    def _store(self, key: str, entry: Entry):
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            data = pickle.dumps((CACHE_VERSION, key, entry), protocol=pickle.HIGHEST_PROTOCOL)
+            if len(data) > self.max_bytes:
+                return
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp = self._temp_path(path)
+                try:
+                    tmp.write_bytes(data)
+                    os.replace(tmp, path)
+                finally:
+                    self._discard(tmp)
+                st = path.stat()
+                self._entries()[key] = [st.st_size, st.st_mtime_ns, time.time()]
+                self._evict()
+                self._save_manifest()
+        except Exception as e:
+            print(f"解析缓存写入失败: {e}")
+
+    def _evict(self):
+        """
+        Removes files missing from the manifest, then least recently used entries until the
+        directory fits the size cap. Caller holds the lock.
+        """
+        entries = self._entries()
+        for item in self.directory.glob("*.pickle"):
+            if item.stem not in entries:
+                self._discard(item)
+        total = sum(record[0] for record in entries.values())
+        for key, record in sorted(entries.items(), key=lambda kv: kv[1][2]):
+            if total <= self.max_bytes:
+                break
+            del entries[key]
+            self._discard(self.directory / f"{key}.pickle")
+            total -= record[0]
+
+    @staticmethod
+    def _temp_path(path: Path) -> Path:
+        """每个写入者（进程 + 线程）自己的临时文件，多个编辑器实例共用缓存目录时不会互相覆盖。"""
+        return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    @staticmethod
+    def _discard(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
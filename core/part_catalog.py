@@ -0,0 +1,160 @@
+# part_catalog.py
+"""
+武器部件目录：武器编辑器和武器生成器共用的 weapon_edit/ 数据索引。
+
+五个表（部件、元素、武器名称、皮肤、稀有度）每种数据语言只加载一次（源文件改动后重新加载），并预先建立字典索引：
+m_id -> 部件类型 -> 部件，(m_id, Part ID) -> 部件，以及武器名称、稀有度、传奇类型的查找表。
+解析序列号、显示部件列表、生成下拉框都只是按部件逐个查字典，不再每次筛选整张表。
+
+数据语言只有两种（中文文件和 _EN 文件，en-US/ru/ua 共用后者），每种一份目录，由所有标签页共享。
+返回的行是共享的字典，调用方不能修改。
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .resource_loader import Row, Table, load_csv_table, resource_exists, resource_stamp
+
+M_ID = 'Manufacturer & Weapon Type ID'
+
+# 使用 _EN 数据文件的界面语言
+EN_DATA_LANGS = ('en-US', 'ru', 'ua')
+
+
+def data_suffix(lang: str) -> str:
+    return "_EN" if lang in EN_DATA_LANGS else ""
+
+
+def data_path(base_name: str, suffix: str) -> str:
+    """weapon_edit/ 下的数据文件，带语言后缀的文件不存在时使用不带后缀的"""
+    path = f"weapon_edit/{base_name.replace('.csv', f'{suffix}.csv')}"
+    return path if resource_exists(path) else f"weapon_edit/{base_name}"
+
+
+class PartCatalog:
+    """一种数据语言的武器部件索引（只读）"""
+
+    def __init__(self, parts: Table, elementals: Table, names: Table, skins: Table, rarities: Table):
+        # 完整的表仍然保留，添加部件、选择皮肤等窗口按原顺序列出全部数据
+        self.parts = parts
+        self.elementals = elementals
+        self.skins = skins
+        self.rarities = rarities
+
+        # 同一个键有多行时，与 Table.eq(...).first() 一样取第一行
+        self._parts: Dict[Tuple[int, int], Row] = {}
+        self._weapons: Dict[int, Row] = {}
+        self._m_ids: Dict[Tuple[str, str], int] = {}
+        by_type: Dict[int, Dict[str, List[Row]]] = {}
+        for row in parts:
+            m_id = row[M_ID]
+            self._parts.setdefault((m_id, row['Part ID']), row)
+            self._weapons.setdefault(m_id, row)
+            self._m_ids.setdefault((row['Manufacturer'], row['Weapon Type']), m_id)
+            if row['Part Type'] is not None:
+                by_type.setdefault(m_id, {}).setdefault(row['Part Type'], []).append(row)
+        # 部件类型按名称排序（与 Table.groupby 相同）
+        self._by_type = {m_id: {t: types[t] for t in sorted(types)} for m_id, types in by_type.items()}
+        self.manufacturers = tuple(parts.unique('Manufacturer'))
+        self.weapon_types = tuple(parts.unique('Weapon Type'))
+
+        self._names: Dict[Tuple[int, int], str] = {}
+        for row in names:
+            self._names.setdefault((row[M_ID], row['Part ID']), row['Name'])
+        self._skins: Dict[int, Row] = {}
+        for row in skins:
+            self._skins.setdefault(row['Skin_ID'], row)
+        self._elementals: Dict[int, Row] = {}
+        for row in elementals:
+            self._elementals.setdefault(row['Part_ID'], row)
+
+        self._rarity_of_part: Dict[Tuple[int, int], Row] = {}
+        self._rarity_ids: Dict[Tuple[int, str], int] = {}
+        self._rarity_stats: Dict[int, List[str]] = {}
+        self._legendaries: Dict[int, List[Row]] = {}
+        for row in rarities:
+            m_id, stat = row[M_ID], row['Stat']
+            self._rarity_of_part.setdefault((m_id, row['Part ID']), row)
+            stats = self._rarity_stats.setdefault(m_id, [])
+            if stat is not None and stat not in stats:
+                stats.append(stat)
+            if row['Description'] is None:
+                # 普通稀有度部件（传奇部件带有描述）
+                self._rarity_ids.setdefault((m_id, stat), row['Part ID'])
+            elif stat == 'Legendary':
+                self._legendaries.setdefault(m_id, []).append(row)
+
+    def __repr__(self):
+        return f"PartCatalog({len(self.parts)} parts, {len(self._weapons)} weapons)"
+
+    # ── 武器 ──
+
+    def weapon(self, m_id: int) -> Optional[Row]:
+        """m_id 的第一行部件（用于 Manufacturer / Weapon Type），未知的 m_id 返回 None"""
+        return self._weapons.get(m_id)
+
+    def m_id(self, manufacturer: str, weapon_type: str) -> Optional[int]:
+        return self._m_ids.get((manufacturer, weapon_type))
+
+    def weapon_name(self, m_id: int, part_id: int) -> Optional[str]:
+        """枪管部件对应的武器名称"""
+        return self._names.get((m_id, part_id))
+
+    # ── 部件 ──
+
+    def part(self, m_id: int, part_id: int) -> Optional[Row]:
+        return self._parts.get((m_id, part_id))
+
+    def parts_by_type(self, m_id: int) -> Dict[str, List[Row]]:
+        """部件类型 -> 该武器的部件（按表中顺序），类型按名称排序"""
+        return self._by_type.get(m_id, {})
+
+    def skin(self, skin_id: int) -> Optional[Row]:
+        return self._skins.get(skin_id)
+
+    def elemental(self, part_id: int) -> Optional[Row]:
+        return self._elementals.get(part_id)
+
+    # ── 稀有度 ──
+
+    def rarity(self, m_id: int, part_id: int) -> Optional[Row]:
+        """part_id 是稀有度部件时返回它的稀有度行"""
+        return self._rarity_of_part.get((m_id, part_id))
+
+    def rarity_part_id(self, m_id: int, stat: str) -> Optional[int]:
+        """普通稀有度（Common/Uncommon/Rare/Epic）对应的部件ID"""
+        return self._rarity_ids.get((m_id, stat))
+
+    def rarity_stats(self, m_id: int) -> List[str]:
+        """该武器可用的稀有度（按表中顺序）"""
+        return self._rarity_stats.get(m_id, [])
+
+    def legendaries(self, m_id: int) -> List[Row]:
+        """该武器的传奇类型（带描述的 Legendary 行）"""
+        return self._legendaries.get(m_id, [])
+
+
+_lock = threading.Lock()
+# 数据语言后缀 -> (源文件状态, 目录)
+_catalogs: Dict[str, Tuple[tuple, PartCatalog]] = {}
+
+_TABLES = ('all_weapon_part.csv', 'elemental.csv', 'weapon_name.csv', 'skin.csv', 'weapon_rarity.csv')
+
+
+def get_part_catalog(lang: str = 'zh-CN') -> PartCatalog:
+    """
+    lang 界面语言对应的部件目录。每种数据语言只构建一次，数据文件改动后（大小或修改时间变化）重新构建。
+
+    Raises:
+        FileNotFoundError: 缺少数据文件
+    """
+    suffix = data_suffix(lang)
+    paths = [data_path(name, suffix) for name in _TABLES]
+    stamp = resource_stamp(*paths)
+    cached = _catalogs.get(suffix)
+    if cached is None or cached[0] != stamp:
+        with _lock:
+            cached = _catalogs.get(suffix)
+            if cached is None or cached[0] != stamp:
+                cached = _catalogs[suffix] = (stamp, PartCatalog(*(load_csv_table(path) for path in paths)))
+    return cached[1]
@@ -0,0 +1,337 @@
+# path_query.py
+"""
+存档树的路径查询。
+
+选择器是点分隔的路径，编译一次后可以反复使用：
+    "state.inventory.items.backpack"   逐级的键（列表用数字下标）
+    "state.*.backpack"                 * 匹配任意一个键或下标
+    "**.cash|money"                    ** 匹配任意深度（包括零层），| 分隔可选的键
+
+KeyIndex 是 "键 -> 路径" 的倒排索引。以 "**.键" 开头的选择器会直接从索引中取候选路径，
+而不是遍历整棵树。索引按顶层段分别建立，只在第一次查询到该段时才遍历它（不会让延迟解析的段
+提前解析）；控制器每次 _touch() 都把修改路径交给 touch()，查询时只重新扫描这些路径下的子树。
+"""
+
+import threading
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Sequence, Set, Tuple
+
+Path = Tuple[Any, ...]
+
+_ANY = "*"
+_DEEP = "**"
+
+# 待处理路径超过这个数量时，改为重新扫描它们的公共前缀
+BATCH_RESCAN_THRESHOLD = 64
+
+
+def _step(node: Any, key: str) -> Tuple[bool, Any]:
+    if isinstance(node, dict):
+        if key in node:
+            return True, node[key]
+    elif isinstance(node, list) and isinstance(key, str) and key.isdigit():
+        index = int(key)
+        if index < len(node):
+            return True, node[index]
+    return False, None
+
+
+def _children(node: Any) -> Iterator[Tuple[Any, Any]]:
+    if isinstance(node, dict):
+        return iter(node.items())
+    if isinstance(node, list):
+        return enumerate(node)
+    return iter(())
+
+
+class PathQuery:
+    """一个编译好的选择器。用 compile_path() 取得（同一个选择器只编译一次）。"""
+
+    __slots__ = ("selector", "segments")
+
+    def __init__(self, selector: str):
+        self.selector = selector
+        segments: List[Any] = []
+        for part in selector.split("."):
+            if not part:
+                raise ValueError(f"Empty segment in path selector: {selector!r}")
+            if part == _DEEP:
+                if segments and segments[-1] is _DEEP:
+                    continue
+                segments.append(_DEEP)
+            elif part == _ANY:
+                segments.append(_ANY)
+            else:
+                segments.append(frozenset(part.split("|")))
+        self.segments: Tuple[Any, ...] = tuple(segments)
+
+    def __repr__(self):
+        return f"PathQuery({self.selector!r})"
+
+    def select(self, root: Any, index: Optional["KeyIndex"] = None) -> List[Path]:
+        """All matching paths in document order."""
+        return list(self._iter(root, index))
+
+    def first(self, root: Any, index: Optional["KeyIndex"] = None) -> Optional[List[Any]]:
+        """The first matching path in document order, or None."""
+        for path in self._iter(root, index):
+            return list(path)
+        return None
+
+    def node(self, root: Any, index: Optional["KeyIndex"] = None) -> Optional[Any]:
+        """The node at the first matching path, or None."""
+        path = self.first(root, index)
+        if path is None:
+            return None
+        return _resolve(root, path)
+
+    def _iter(self, root: Any, index: Optional["KeyIndex"]) -> Iterator[Path]:
+        segments = self.segments
+        if index is not None and len(segments) >= 2 and segments[0] is _DEEP and isinstance(segments[1], frozenset):
+            # "**.键..."：从倒排索引取出所有该键的位置，再匹配剩下的部分
+            rest = segments[2:]
+            matches = (match for path, node in index.lookup(root, segments[1]) for match in self._match(node, rest, path))
+            yield from _in_document_order(root, matches, presorted=not rest)
+            return
+        yield from self._match(root, segments, ())
+
+    def _match(self, node: Any, segments: Tuple[Any, ...], path: Path) -> Iterator[Path]:
+        if not segments:
+            yield path
+            return
+        head, rest = segments[0], segments[1:]
+        if head is _DEEP:
+            if len(rest) <= 1:
+                yield from self._deep(node, rest[0] if rest else None, path)
+            else:
+                matches = self._deep_any(node, rest, path)
+                yield from (path + p for p in _in_document_order(node, (m[len(path):] for m in matches), presorted=False))
+        elif head is _ANY:
+            for key, child in _children(node):
+                yield from self._match(child, rest, path + (key,))
+        elif isinstance(node, dict):
+            # 多个可选键时按文档顺序
+            keys = [key for key in node if key in head] if len(head) > 1 else [key for key in head if key in node]
+            for key in keys:
+                yield from self._match(node[key], rest, path + (key,))
+        elif isinstance(node, list):
+            for name in sorted((k for k in head if isinstance(k, str) and k.isdigit()), key=int):
+                found, child = _step(node, name)
+                if found:
+                    yield from self._match(child, rest, path + (int(name),))
+
+    def _deep(self, node: Any, last: Any, path: Path) -> Iterator[Path]:
+        """'**' or '**.key' at the end of the selector: a pre-order walk, so matches come in document order."""
+        if last is None:
+            yield path
+        is_list = isinstance(node, list)
+        for key, child in _children(node):
+            if last is not None and _key_matches(last, key, is_list):
+                yield path + (key,)
+            if isinstance(child, (dict, list)):
+                yield from self._deep(child, last, path + (key,))
+
+    def _deep_any(self, node: Any, rest: Tuple[Any, ...], path: Path) -> Iterator[Path]:
+        yield from self._match(node, rest, path)
+        for key, child in _children(node):
+            if isinstance(child, (dict, list)):
+                yield from self._deep_any(child, rest, path + (key,))
+
+
+def _key_matches(segment: Any, key: Any, in_list: bool) -> bool:
+    if segment is _ANY:
+        return True
+    return str(key) in segment if in_list else key in segment
+
+
+def _in_document_order(root: Any, paths: Iterator[Path], presorted: bool) -> Iterator[Path]:
+    """Drops duplicate paths and, unless they are known to be in order already, sorts them by position."""
+    seen: Set[Path] = set()
+    unique = (p for p in paths if not (p in seen or seen.add(p)))
+    if presorted:
+        yield from unique
+    else:
+        yield from sorted(unique, key=lambda p: _positions(root, p) or ())
+
+
+@lru_cache(maxsize=256)
+def compile_path(selector: str) -> PathQuery:
+    return PathQuery(selector)
+
+
+def _resolve(root: Any, path: Sequence[Any]) -> Any:
+    node = root
+    for key in path:
+        node = node[key]
+    return node
+
+
+class KeyIndex:
+    """
+    dict 键 -> 路径的倒排索引。路径保留原始的键和整数下标，可以直接交给 own_path() 等函数。
+    线程安全；每个顶层段在第一次查询时才建立索引。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # 顶层键 -> 该段的 {路径: 段内的文档顺序}
+        self._sections: Dict[Any, Dict[Path, Tuple[int, ...]]] = {}
+        # 键 -> 路径集合（只包含已建立的段）
+        self._by_key: Dict[Any, Set[Path]] = {}
+        self._pending: Dict[Any, List[Path]] = {}
+
+    def invalidate(self):
+        with self._lock:
+            self._sections = {}
+            self._by_key = {}
+            self._pending = {}
+
+    def touch(self, path: Sequence[Any]):
+        """Marks a modified path; an empty path invalidates the whole index."""
+        path = tuple(path)
+        with self._lock:
+            if not path:
+                self.invalidate()
+            elif path[0] in self._sections:
+                self._pending.setdefault(path[0], []).append(path)
+
+    def lookup(self, root: Any, keys: FrozenSet[Any]) -> Iterator[Tuple[Path, Any]]:
+        """(path, node) for every dict key in keys, in document order. Sections are indexed as they are reached."""
+        if not isinstance(root, dict):
+            return
+        for top in list(root):
+            with self._lock:
+                self._sync_section(root, top)
+                found = sorted((p for key in keys for p in self._by_key.get(key, ()) if p[0] == top),
+                               key=self._sections[top].__getitem__)
+            for path in found:
+                try:
+                    yield path, _resolve(root, path)
+                except (KeyError, IndexError, TypeError):
+                    continue
+
+    # ── 维护 ──────────────────────────────────────────────────────────────
+
+    def _sync_section(self, root: Dict[Any, Any], top: Any):
+        """Builds the section's index or applies its pending paths. Caller holds the lock."""
+        if top not in self._sections:
+            self._sections[top] = {}
+            self._pending.pop(top, None)
+            self._rescan(root, (top,))
+            return
+        pending = self._pending.pop(top, None)
+        if not pending:
+            return
+        entries = self._sections[top]
+        paths = set()
+        for path in pending:
+            path, exists = _normalize(root, path)
+            # 新增、删除或删除后重新加入的键会改变兄弟节点的位置；列表中插入或删除元素会改变后面
+            # 元素的下标（修改过的下标仍然存在，分不出是哪一种）。这些情况都重新扫描父节点
+            if len(path) > 1 and (not exists or entries.get(path) != _positions(root, path)[1:]
+                                  or isinstance(_resolve(root, path[:-1]), list)):
+                path = path[:-1]
+            paths.add(path)
+        pending = sorted(paths, key=len)
+        if len(pending) > BATCH_RESCAN_THRESHOLD:
+            pending = [_common_prefix(pending) or (top,)]
+        done: List[Path] = []
+        for path in pending:
+            if any(path[:len(p)] == p for p in done):
+                continue  # 祖先路径已经重新扫描过
+            self._rescan(root, path)
+            done.append(path)
+
+    def _rescan(self, root: Any, path: Path):
+        entries = self._sections[path[0]]
+        n = len(path)
+        for old in [p for p in entries if p[:n] == path]:
+            del entries[old]
+            paths = self._by_key.get(old[-1])
+            if paths is not None:
+                paths.discard(old)
+        order = _positions(root, path)
+        if order is None:
+            return
+        # 顺序相对于所在的段（顶层键的位置会随其他段的增删而变化）
+        order = order[1:]
+        entries[path] = order
+        if isinstance(_resolve(root, path[:-1]), dict):
+            self._by_key.setdefault(path[-1], set()).add(path)
+        self._walk(entries, _resolve(root, path), list(path), list(order))
+
+    def _walk(self, entries: Dict[Path, Tuple[int, ...]], node: Any, path: List[Any], order: List[int]):
+        if isinstance(node, dict):
+            children = enumerate(node.items())
+            is_dict = True
+        elif isinstance(node, list):
+            children = enumerate(enumerate(node))
+            is_dict = False
+        else:
+            return
+        for position, (key, value) in children:
+            path.append(key)
+            order.append(position)
+            entry = tuple(path)
+            entries[entry] = tuple(order)
+            if is_dict:
+                self._by_key.setdefault(key, set()).add(entry)
+            if isinstance(value, (dict, list)):
+                self._walk(entries, value, path, order)
+            path.pop()
+            order.pop()
+
+
+def _normalize(root: Any, path: Path) -> Tuple[Path, bool]:
+    """
+    Converts string list indices in path to ints (item paths use strings) and returns
+    (path, exists). A missing list index is cut off, so the whole list is rescanned.
+    """
+    node = root
+    out: List[Any] = []
+    for key in path:
+        if isinstance(node, list):
+            try:
+                index = int(key)
+            except (TypeError, ValueError):
+                return tuple(out), True
+            if not 0 <= index < len(node):
+                return tuple(out), True
+            out.append(index)
+            node = node[index]
+        elif isinstance(node, dict) and key in node:
+            out.append(key)
+            node = node[key]
+        else:
+            out.append(key)
+            return tuple(out), False
+    return tuple(out), True
+
+
+def _common_prefix(paths: Sequence[Path]) -> Path:
+    prefix = paths[0]
+    for path in paths[1:]:
+        n = 0
+        for a, b in zip(prefix, path):
+            if a != b:
+                break
+            n += 1
+        prefix = prefix[:n]
+    return prefix
+
+
+def _positions(root: Any, path: Sequence[Any]) -> Optional[Tuple[int, ...]]:
+    """Position of each element of path within its parent, or None if path does not exist."""
+    order = []
+    node = root
+    try:
+        for key in path:
+            if isinstance(node, list):
+                order.append(key)
+                node = node[key]
+            else:
+                order.append(next(i for i, k in enumerate(node) if k == key))
+                node = node[key]
+    except (KeyError, IndexError, TypeError, StopIteration):
+        return None
+    return tuple(order)
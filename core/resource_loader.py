@@ -5,13 +5,16 @@
 """
 
 import sys
+import io
 import json
 import ast
 import csv
+import marshal
+import threading
+from array import array
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-import importlib.resources
-import pkg_resources
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 def get_ui_localization_file(lang: str) -> str:
     """
@@ -50,6 +53,409 @@ def get_resource_path(relative_path: Union[str, Path]) -> Path:
     
     return base_path / relative_path
 
+# ── 资源包 ──────────────────────────────────────────────────────────────
+# 数据目录中的 CSV/JSON 优先从预编译的 resources.pack 读取（见 resource_pack.py），
+# 资源包不存在或某个文件不在包中/已过期时读取源文件。
+
+_pack = None
+_pack_opened = False
+_pack_lock = threading.Lock()
+
+def get_resource_pack():
+    """
+    打开资源包（每个进程只打开一次，只读取索引）
+
+    Returns:
+        ResourcePack，没有可用的资源包时返回None
+    """
+    global _pack, _pack_opened
+    if not _pack_opened:
+        with _pack_lock:
+            if not _pack_opened:
+                from . import resource_pack
+                # 开发环境中检查源文件是否改动过；打包后的程序只有资源包
+                source_root = None if getattr(sys, 'frozen', False) else get_resource_path('')
+                _pack = resource_pack.open_pack(get_resource_path(resource_pack.PACK_FILE), source_root)
+                _pack_opened = True
+    return _pack
+
+def read_resource_bytes(relative_path: Union[str, Path]) -> bytes:
+    """
+    读取资源文件的原始内容（资源包或源文件）
+
+    Args:
+        relative_path: 相对路径
+
+    Returns:
+        文件内容
+
+    Raises:
+        FileNotFoundError: 资源不存在
+    """
+    pack = get_resource_pack()
+    if pack is not None:
+        data = pack.read_bytes(relative_path)
+        if data is not None:
+            return data
+    return get_resource_path(relative_path).read_bytes()
+
+def resource_exists(relative_path: Union[str, Path]) -> bool:
+    """资源是否存在（资源包或源文件）"""
+    pack = get_resource_pack()
+    if pack is not None and relative_path in pack:
+        return True
+    return get_resource_path(relative_path).exists()
+
+def open_resource(relative_path: Union[str, Path]) -> BinaryIO:
+    """
+    以二进制文件对象打开资源
+
+    Raises:
+        FileNotFoundError: 资源不存在
+    """
+    return io.BytesIO(read_resource_bytes(relative_path))
+
+def _read_text(relative_path: Union[str, Path]) -> Optional[str]:
+    """资源的文本内容（与 open(..., 'r') 一样转换换行符），不存在时返回None"""
+    try:
+        data = read_resource_bytes(relative_path)
+    except FileNotFoundError:
+        return None
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+# ── 读取缓存 ────────────────────────────────────────────────────────────
+# load_json_resource / load_text_resource / load_csv_resource（以及基于它们的 class_mods、
+# enhancement 加载函数）和 get_enhancement_data 的结果按资源的绝对路径缓存。标签页在创建和
+# update_language 时会反复读取同样的文件，缓存后每个文件只解析一次。
+# 每次读取前检查源文件的大小和修改时间，改动过就重新读取；打包后的程序没有源文件，内容不会变。
+# 缓存中保存 marshal 序列化的结果，每次返回新解出的对象，调用方修改返回值不会影响缓存（文本直接共享）。
+# 条目数或总字节数超过上限时淘汰最久未使用的条目；_CACHE_MAX_ENTRIES = 0 相当于关闭缓存。
+
+_CACHE_MAX_ENTRIES = 256
+_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+def _source_stamp(relative_path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+    """源文件的 (大小, 修改时间)，没有源文件时为None"""
+    try:
+        st = get_resource_path(relative_path).stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+def resource_stamp(*relative_paths: Union[str, Path]) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """
+    源文件的 (大小, 修改时间)，每个路径一项。在资源缓存之外保存派生结果（索引、合并表）的模块
+    用它判断源文件是否改动过；相等说明可以继续使用。
+    """
+    return tuple(_source_stamp(p) for p in relative_paths)
+
+class _ResourceCache:
+    """线程安全的LRU缓存，记录每个资源的读取和命中次数"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (类型, 绝对路径) -> (源文件状态, 是否为marshal数据, 缓存值, 字节数)
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[Any, bool, Any, int]]' = OrderedDict()
+        self._bytes = 0
+        self._names: Dict[Tuple[str, str], str] = {}
+        self._loads: Dict[Tuple[str, str], int] = {}
+        self._hits: Dict[Tuple[str, str], int] = {}
+        self.hits = self.misses = self.reloads = self.evictions = 0
+
+    def get(self, kind: str, relative_path: Union[str, Path], load: Callable[[], Any],
+            sources: Optional[Sequence[Union[str, Path]]] = None) -> Any:
+        """
+        kind 区分同一文件的不同解析方式；sources 是结果依赖的源文件（默认就是 relative_path）
+        """
+        key = (kind, str(get_resource_path(relative_path)))
+        stamp = resource_stamp(*(sources or (relative_path,)))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._hits[key] = self._hits.get(key, 0) + 1
+                _, packed, value, _ = entry
+                return marshal.loads(value) if packed else value
+        # 在锁外读取，读取较慢的文件时不阻塞其他资源
+        value = load()
+        if value is None or isinstance(value, str):
+            packed, stored, size = False, value, len(value or '')
+        else:
+            try:
+                stored = marshal.dumps(value)
+            except ValueError:
+                stored = None  # 无法序列化的结果不缓存
+            packed, size = True, len(stored or b'')
+        with self._lock:
+            self.misses += 1
+            self._names[key] = f"{kind}:{Path(relative_path).as_posix()}"
+            self._loads[key] = self._loads.get(key, 0) + 1
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.reloads += 1
+                self._bytes -= old[3]
+            if not (packed and stored is None):
+                self._entries[key] = (stamp, packed, stored, size)
+                self._bytes += size
+            while self._entries and (len(self._entries) > _CACHE_MAX_ENTRIES or self._bytes > _CACHE_MAX_BYTES):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._names.clear()
+            self._loads.clear()
+            self._hits.clear()
+            self.hits = self.misses = self.reloads = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'reloads': self.reloads,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'resources': {name: {'loads': self._loads.get(key, 0), 'hits': self._hits.get(key, 0)}
+                              for key, name in sorted(self._names.items(), key=lambda kv: kv[1])},
+            }
+
+_cache = _ResourceCache()
+
+def resource_cache_stats() -> Dict[str, Any]:
+    """
+    读取缓存的统计信息
+
+    Returns:
+        hits（命中）、misses（实际读取）、reloads（源文件改动或重新读取，已计入misses）、
+        evictions（淘汰）、entries、bytes，以及 resources: {"类型:相对路径": {"loads": 读取次数, "hits": 命中次数}}。
+        hits 是省掉的重复读取；loads 大于 1 说明同一资源读取了多次（文件改动或被淘汰）。
+    """
+    return _cache.stats()
+
+def clear_resource_cache():
+    """清空读取缓存和统计"""
+    _cache.clear()
+
+def load_csv_resource(relative_path: Union[str, Path]) -> List[Dict[str, str]]:
+    """
+    加载CSV资源，每行作为一个字典（与csv.DictReader相同）
+
+    Args:
+        relative_path: 相对路径
+
+    Returns:
+        解析后的数据列表（每次返回新的列表，可以修改）
+
+    Raises:
+        FileNotFoundError: 资源不存在
+    """
+    return _cache.get('csv', relative_path, lambda: _load_csv_resource(relative_path))
+
+def _load_csv_resource(relative_path: Union[str, Path]) -> List[Dict[str, str]]:
+    pack = get_resource_pack()
+    if pack is not None:
+        found, rows = pack.load(relative_path)
+        if found and rows is not None:
+            return rows
+    with open(get_resource_path(relative_path), 'r', encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+# ── 数据表 ──────────────────────────────────────────────────────────────
+# 编辑器标签页用到的 CSV 最多约两千行，只需要按列筛选、分组和逐行遍历。
+# Table 按列保存（无缺失值的整数列用 array('q')），相等筛选使用按需建立的哈希索引，
+# 筛选/排序的结果是共享原列数据的视图（只保存行号），不复制数据，也不需要导入 pandas。
+
+# 与 pandas.read_csv 默认相同，这些单元格视为缺失值（None）
+_NA_VALUES = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+
+def _infer_column(cells: List[Optional[str]]) -> Sequence[Any]:
+    """把一列文本转换成 int / float / str 列，缺失值为 None"""
+    values = [None if c is None or c in _NA_VALUES else c for c in cells]
+    present = [v for v in values if v is not None]
+    if not present:
+        return values
+    for convert in (int, float):
+        try:
+            converted = [None if v is None else convert(v) for v in values]
+        except ValueError:
+            continue
+        if convert is int and len(present) == len(values):
+            try:
+                return array('q', converted)
+            except OverflowError:
+                pass
+        return converted
+    return values
+
+Row = Dict[str, Any]
+
+class Table:
+    """
+    只读的列式数据表
+
+    筛选、排序等方法返回新的 Table 视图；遍历得到的每一行是一个普通字典（列名 -> 值）。
+    """
+
+    __slots__ = ('_names', '_columns', '_rows', '_indexes')
+
+    def __init__(self, columns: Dict[str, Sequence[Any]], rows: Optional[Sequence[int]] = None,
+                 _indexes: Optional[Dict[str, Dict[Any, List[int]]]] = None):
+        self._names = tuple(columns)
+        self._columns = columns
+        # None 表示全部行（按原顺序）
+        self._rows = rows
+        # 列名 -> {值: 行号列表}，由同一份数据的所有视图共享
+        self._indexes = {} if _indexes is None else _indexes
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Optional[str]]], columns: Optional[Sequence[str]] = None) -> 'Table':
+        """由 csv.DictReader 的行构建，推断每列的类型"""
+        names = list(columns) if columns is not None else (list(records[0]) if records else [])
+        return cls({name: _infer_column([r.get(name) for r in records]) for name in names})
+
+    def _view(self, rows: Sequence[int]) -> 'Table':
+        return Table(self._columns, rows, self._indexes)
+
+    def _positions(self) -> Sequence[int]:
+        return range(len(next(iter(self._columns.values()), ()))) if self._rows is None else self._rows
+
+    # ── 基本信息 ──
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self._names
+
+    def __len__(self) -> int:
+        return len(self._positions())
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __repr__(self):
+        return f"Table({len(self)} rows, columns={list(self._names)})"
+
+    # ── 读取 ──
+
+    def _row(self, i: int) -> Row:
+        return {name: self._columns[name][i] for name in self._names}
+
+    def __iter__(self) -> Iterator[Row]:
+        for i in self._positions():
+            yield self._row(i)
+
+    def first(self) -> Optional[Row]:
+        """第一行，没有行时返回None"""
+        positions = self._positions()
+        return self._row(positions[0]) if len(positions) else None
+
+    def column(self, name: str) -> List[Any]:
+        col = self._columns[name]
+        return [col[i] for i in self._positions()]
+
+    def unique(self, name: str) -> List[Any]:
+        """列中的不同值（按第一次出现的顺序，不含缺失值）"""
+        return [v for v in dict.fromkeys(self.column(name)) if v is not None]
+
+    # ── 筛选 ──
+
+    def _index(self, name: str) -> Dict[Any, List[int]]:
+        index = self._indexes.get(name)
+        if index is None:
+            index = {}
+            for i, value in enumerate(self._columns[name]):
+                index.setdefault(value, []).append(i)
+            self._indexes[name] = index
+        return index
+
+    def eq(self, name: str, value: Any) -> 'Table':
+        """name 列等于 value 的行"""
+        matches = self._index(name).get(value, ())
+        if self._rows is None:
+            return self._view(matches)
+        if len(matches) < len(self._rows):
+            keep = set(matches)
+            return self._view([i for i in self._rows if i in keep])
+        col = self._columns[name]
+        return self._view([i for i in self._rows if col[i] == value])
+
+    def isin(self, name: str, values) -> 'Table':
+        """name 列的值在 values 中的行"""
+        index = self._index(name)
+        keep = set()
+        for value in values:
+            keep.update(index.get(value, ()))
+        return self._view([i for i in self._positions() if i in keep])
+
+    def notna(self, name: str) -> 'Table':
+        """name 列不是缺失值的行"""
+        col = self._columns[name]
+        return self._view([i for i in self._positions() if col[i] is not None])
+
+    def filter(self, predicate: Callable[[Row], bool]) -> 'Table':
+        """predicate(行) 为真的行"""
+        return self._view([i for i in self._positions() if predicate(self._row(i))])
+
+    def drop_duplicates(self, *names: str) -> 'Table':
+        """按 names 列去重，保留第一次出现的行"""
+        cols = [self._columns[name] for name in names]
+        seen = set()
+        rows = []
+        for i in self._positions():
+            key = tuple(col[i] for col in cols)
+            if key not in seen:
+                seen.add(key)
+                rows.append(i)
+        return self._view(rows)
+
+    # ── 排序和分组 ──
+
+    def sort(self, *names: str, key: Optional[Callable[[Row], Any]] = None) -> 'Table':
+        """按 names 列（缺失值排在最后）或 key(行) 稳定排序"""
+        if key is not None:
+            return self._view(sorted(self._positions(), key=lambda i: key(self._row(i))))
+        cols = [self._columns[name] for name in names]
+        return self._view(sorted(self._positions(),
+                                 key=lambda i: tuple((col[i] is None, col[i] if col[i] is not None else 0) for col in cols)))
+
+    def groupby(self, name: str) -> Iterator[Tuple[Any, 'Table']]:
+        """按 name 列的值分组，按值排序依次返回 (值, 子表)；缺失值不分组"""
+        col = self._columns[name]
+        groups: Dict[Any, List[int]] = {}
+        for i in self._positions():
+            if col[i] is not None:
+                groups.setdefault(col[i], []).append(i)
+        for value in sorted(groups):
+            yield value, self._view(groups[value])
+
+    def with_column(self, name: str, func: Callable[[Any], Any]) -> 'Table':
+        """把 name 列的每个值替换为 func(值) 的新表"""
+        columns = {n: self.column(n) for n in self._names}
+        columns[name] = [func(v) for v in columns[name]]
+        return Table(columns)
+
+def load_csv_table(relative_path: Union[str, Path]) -> Table:
+    """
+    加载CSV资源为 Table（整数/小数列自动转换，空单元格为None）
+
+    Raises:
+        FileNotFoundError: 资源不存在
+    """
+    return Table.from_records(load_csv_resource(relative_path))
+
 def load_json_resource(relative_path: Union[str, Path], 
                       use_literal_eval: bool = False) -> Optional[Dict[str, Any]]:
     """
@@ -62,13 +468,21 @@ def load_json_resource(relative_path: Union[str, Path],
     Returns:
         解析后的数据，失败时返回None
     """
+    kind = 'literal' if use_literal_eval else 'json'
+    return _cache.get(kind, relative_path, lambda: _load_json_resource(relative_path, use_literal_eval))
+
+def _load_json_resource(relative_path: Union[str, Path], use_literal_eval: bool) -> Optional[Dict[str, Any]]:
     try:
-        resource_path = get_resource_path(relative_path)
-        if not resource_path.exists():
-            # print(f"资源文件不存在: {resource_path}")
+        if not use_literal_eval:
+            pack = get_resource_pack()
+            if pack is not None:
+                found, data = pack.load(relative_path)
+                if found:
+                    return data
+        content = _read_text(relative_path)
+        if content is None:
+            # print(f"资源文件不存在: {relative_path}")
             return None
-        with open(resource_path, 'r', encoding='utf-8') as f:
-            content = f.read()
         if use_literal_eval:
             return ast.literal_eval(content)
         else:
@@ -96,13 +510,11 @@ def load_text_resource(relative_path: Union[str, Path]) -> Optional[str]:
     Returns:
         文本内容，失败时返回None
     """
+    return _cache.get('text', relative_path, lambda: _load_text_resource(relative_path))
+
+def _load_text_resource(relative_path: Union[str, Path]) -> Optional[str]:
     try:
-        resource_path = get_resource_path(relative_path)
-        if not resource_path.exists():
-            # print(f"文本资源文件不存在: {resource_path}")
-            return None
-        with open(resource_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return _read_text(relative_path)
     except FileNotFoundError:
         # print(f"文本资源文件不存在: {relative_path}")
         return None
@@ -172,13 +584,10 @@ def load_class_mods_csv(filename: str) -> List[Dict[str, str]]:
         解析后的数据列表，每行作为一个字典，失败时返回空列表
     """
     try:
-        resource_path = get_resource_path(f"class_mods/{filename}")
-        if not resource_path.exists():
-            print(f"CSV文件不存在: {resource_path}")
-            return []
-        with open(resource_path, 'r', encoding='utf-8-sig', newline='') as f:
-            reader = csv.DictReader(f)
-            return list(reader)
+        return load_csv_resource(f"class_mods/{filename}")
+    except FileNotFoundError:
+        print(f"CSV文件不存在: {get_resource_path(f'class_mods/{filename}')}")
+        return []
     except Exception as e:
         print(f"加载CSV文件时发生错误 {filename}: {e}")
         return []
@@ -283,18 +692,18 @@ def load_enhancement_csv(filename: str) -> List[Dict[str, str]]:
         解析后的数据列表，每行作为一个字典，失败时返回空列表
     """
     try:
-        resource_path = get_resource_path(f"enhancement/{filename}")
-        if not resource_path.exists():
-            print(f"Enhancement CSV文件不存在: {resource_path}")
-            return []
-        with open(resource_path, 'r', encoding='utf-8-sig', newline='') as f:
-            reader = csv.DictReader(f)
-            return list(reader)
+        return load_csv_resource(f"enhancement/{filename}")
+    except FileNotFoundError:
+        print(f"Enhancement CSV文件不存在: {get_resource_path(f'enhancement/{filename}')}")
+        return []
     except Exception as e:
         print(f"加载Enhancement CSV文件时发生错误 {filename}: {e}")
         return []
 
 
+# get_enhancement_data 依赖的CSV文件（任一文件改动后重新构建）
+_ENHANCEMENT_CSVS = ("Enhancement_manufacturers.csv", "Enhancement_perk.csv", "Enhancement_rarity.csv")
+
 def get_enhancement_data() -> Optional[Dict[str, Any]]:
     """
     从CSV文件加载enhancement数据并构建与原格式兼容的数据结构
@@ -302,11 +711,13 @@ def get_enhancement_data() -> Optional[Dict[str, Any]]:
     Returns:
         与原enhancement_data.txt格式兼容的数据字典，包含中文翻译
     """
+    sources = [f"enhancement/{name}" for name in _ENHANCEMENT_CSVS]
+    return _cache.get('enhancement_data', 'enhancement', _build_enhancement_data, sources)
+
+def _build_enhancement_data() -> Optional[Dict[str, Any]]:
     try:
         # 加载CSV数据
-        manufacturers_csv = load_enhancement_csv("Enhancement_manufacturers.csv")
-        perks_csv = load_enhancement_csv("Enhancement_perk.csv")
-        rarity_csv = load_enhancement_csv("Enhancement_rarity.csv")
+        manufacturers_csv, perks_csv, rarity_csv = (load_enhancement_csv(name) for name in _ENHANCEMENT_CSVS)
         
         if not manufacturers_csv or not perks_csv or not rarity_csv:
             print("Enhancement CSV文件加载失败")
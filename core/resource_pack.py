@@ -0,0 +1,230 @@
+# resource_pack.py
+"""
+预编译的资源包：把各数据目录中的 CSV/JSON 编译成一个带索引的二进制文件（resources.pack）。
+
+文件结构:
+    MAGIC (8 字节) | 头部长度 (u32, 小端) | 头部 (marshal) | 数据段 ...
+头部是 {"version": FORMAT_VERSION, "entries": {相对路径: Entry}}，每个文件有两个独立的数据段：
+原始字节（open_resource/文本读取使用）和解析结果（JSON 对象，或 CSV 的 csv.DictReader 行列表），
+都是 marshal。打开资源包只读取头部；某个文件的数据段在请求时才从 mmap 中读取。
+数据段不压缩：PyInstaller 打包时本身会压缩数据文件，再压缩一次只会增加启动时的解压时间。
+
+构建:  python -m core.resource_pack [--out resources.pack]
+pyinstaller_config.py 在打包前自动构建，打包后的程序只携带这一个数据文件。
+
+开发环境中每个条目都记录了源文件的大小和修改时间，源文件改动后该条目失效，
+resource_loader 会直接读取源文件，所以忘记重新构建也不会读到旧数据。
+"""
+
+import csv
+import io
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple, Union
+
+MAGIC = b"BL4RPACK"
+# 文件结构或解析结果格式变化时递增；版本不符的资源包被忽略
+FORMAT_VERSION = 1
+PACK_FILE = "resources.pack"
+
+# 打包的数据目录和文件类型（图片仍作为单独文件发布）
+DATA_DIRS = ("class_mods", "enhancement", "weapon_edit", "grenade", "shield", "repkit", "heavy", "i18n")
+EXTENSIONS = (".csv", ".json")
+
+_HEADER_LEN = struct.Struct("<I")
+
+
+class Entry(NamedTuple):
+    kind: str            # "csv" / "json"
+    source_size: int
+    source_mtime_ns: int
+    raw_offset: int
+    raw_length: int
+    data_offset: int     # 解析失败的文件没有解析结果段（长度为 0）
+    data_length: int
+
+
+def normalize(relative_path: Union[str, Path]) -> str:
+    """资源包中的键：使用 / 分隔的相对路径。"""
+    return Path(relative_path).as_posix()
+
+
+def _kind(path: Path) -> str:
+    return path.suffix.lower().lstrip(".")
+
+
+def parse_source(kind: str, raw: bytes) -> Any:
+    """与 resource_loader 读取源文件时相同的解析方式。"""
+    if kind == "json":
+        return json.loads(raw.decode("utf-8"))
+    if kind == "csv":
+        return list(csv.DictReader(io.StringIO(raw.decode("utf-8-sig"), newline="")))
+    raise ValueError(f"unsupported resource type: {kind}")
+
+
+def iter_sources(root: Path) -> Iterator[Path]:
+    for directory in DATA_DIRS:
+        base = root / directory
+        if not base.is_dir():
+            continue
+        for path in sorted(base.rglob("*")):
+            if path.is_file() and path.suffix.lower() in EXTENSIONS:
+                yield path
+
+
+def build_pack(root: Union[str, Path], out_path: Union[str, Path, None] = None) -> Path:
+    """把 root 下的数据文件编译成资源包，返回资源包路径。写入是原子的。"""
+    root = Path(root)
+    out_path = Path(out_path) if out_path is not None else root / PACK_FILE
+
+    entries: Dict[str, Entry] = {}
+    segments = []
+    offset = 0
+
+    def add_segment(value: Any) -> Tuple[int, int]:
+        nonlocal offset
+        blob = marshal.dumps(value)
+        segments.append(blob)
+        start, offset = offset, offset + len(blob)
+        return start, len(blob)
+
+    for path in iter_sources(root):
+        key = path.relative_to(root).as_posix()
+        kind = _kind(path)
+        raw = path.read_bytes()
+        st = path.stat()
+        raw_offset, raw_length = add_segment(raw)
+        try:
+            data_offset, data_length = add_segment(parse_source(kind, raw))
+        except (ValueError, UnicodeDecodeError) as e:
+            # 与直接读取源文件时一样，解析失败的文件当作不存在（原始字节仍可读取）
+            print(f"资源解析失败，只保存原始内容 {key}: {e}")
+            data_offset, data_length = 0, 0
+        entries[key] = Entry(kind, st.st_size, st.st_mtime_ns, raw_offset, raw_length, data_offset, data_length)
+
+    header = marshal.dumps({"version": FORMAT_VERSION, "entries": {k: tuple(v) for k, v in entries.items()}})
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        for blob in segments:
+            f.write(blob)
+    os.replace(tmp, out_path)
+    return out_path
+
+
+class ResourcePack:
+    """只读资源包。线程安全；返回的对象每次都是新解出的，调用方可以修改。"""
+
+    def __init__(self, path: Union[str, Path], source_root: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            path: 资源包文件
+            source_root: 源文件所在目录。给出时，每次读取前检查源文件是否改动过（开发环境）；
+                打包后的程序没有源文件，传 None。
+        """
+        self.path = Path(path)
+        self.source_root = Path(source_root) if source_root is not None else None
+        self._lock = threading.Lock()
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self._map[:len(MAGIC)] != MAGIC:
+                raise ValueError("not a resource pack")
+            (header_len,) = _HEADER_LEN.unpack_from(self._map, len(MAGIC))
+            header_start = len(MAGIC) + _HEADER_LEN.size
+            header = marshal.loads(self._map[header_start:header_start + header_len])
+            if header.get("version") != FORMAT_VERSION:
+                raise ValueError(f"resource pack version {header.get('version')} != {FORMAT_VERSION}")
+        except Exception:
+            self._map.close()
+            raise
+        self._base = header_start + header_len
+        self.entries: Dict[str, Entry] = {k: Entry(*v) for k, v in header["entries"].items()}
+
+    def close(self):
+        with self._lock:
+            self._map.close()
+
+    def __contains__(self, relative_path) -> bool:
+        return self._entry(relative_path) is not None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _entry(self, relative_path) -> Optional[Entry]:
+        entry = self.entries.get(normalize(relative_path))
+        if entry is None or self.source_root is None:
+            return entry
+        try:
+            st = (self.source_root / normalize(relative_path)).stat()
+        except OSError:
+            return None  # 源文件已删除
+        if st.st_size != entry.source_size or st.st_mtime_ns != entry.source_mtime_ns:
+            return None  # 源文件已改动，资源包中的内容过期
+        return entry
+
+    def _segment(self, offset: int, length: int) -> Any:
+        start = self._base + offset
+        with self._lock:
+            blob = self._map[start:start + length]
+        return marshal.loads(blob)
+
+    def read_bytes(self, relative_path) -> Optional[bytes]:
+        """文件的原始内容；不在资源包中（或已过期）时返回 None。"""
+        entry = self._entry(relative_path)
+        if entry is None:
+            return None
+        return self._segment(entry.raw_offset, entry.raw_length)
+
+    def load(self, relative_path) -> Tuple[bool, Any]:
+        """
+        解析后的内容: JSON 为对象，CSV 为 csv.DictReader 的行列表。
+        返回 (found, value)；文件不在资源包中时 found 为 False，解析失败的文件返回 (True, None)。
+        """
+        entry = self._entry(relative_path)
+        if entry is None:
+            return False, None
+        if not entry.data_length:
+            return True, None
+        return True, self._segment(entry.data_offset, entry.data_length)
+
+
+def open_pack(path: Union[str, Path], source_root: Optional[Union[str, Path]] = None) -> Optional[ResourcePack]:
+    """打开资源包；文件不存在、损坏或版本不符时返回 None（调用方改为读取源文件）。"""
+    try:
+        return ResourcePack(path, source_root)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"资源包不可用，改为读取源文件 {path}: {e}")
+        return None
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Compile the editor's CSV/JSON data into one resource pack.")
+    root = Path(__file__).resolve().parent.parent
+    parser.add_argument("--root", type=Path, default=root, help="project root containing the data folders")
+    parser.add_argument("--out", type=Path, default=None, help=f"output file (default: <root>/{PACK_FILE})")
+    args = parser.parse_args(argv)
+
+    out = build_pack(args.root, args.out)
+    pack = ResourcePack(out)
+    try:
+        count = len(pack)
+    finally:
+        pack.close()
+    print(f"Wrote {out} ({count} files, {out.stat().st_size / 1024:.0f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
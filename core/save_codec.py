@@ -0,0 +1,224 @@
+# save_codec.py
+"""
+存档的加密/解密和 YAML 加载器，不依赖控制器状态。
+
+SaveGameController 用它读写存档；摘要索引的工作进程只导入这个模块，
+不必创建完整的控制器（扫描器、摘要索引、解析缓存、预加载器）。
+"""
+
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+_crypto_modules = None
+
+
+def _crypto():
+    """(AES, pad) from PyCryptodome, imported on first use; (None, None) if it is not installed."""
+    global _crypto_modules
+    if _crypto_modules is None:
+        try:
+            from Crypto.Cipher import AES
+            from Crypto.Util.Padding import pad
+            _crypto_modules = (AES, pad)
+        except ImportError:
+            _crypto_modules = (None, None)
+    return _crypto_modules
+
+
+if yaml is not None:
+    class AnyTagLoader(yaml.SafeLoader):
+        """忽略所有自定义标签，按普通标量/序列/映射构造。定义在模块级，延迟解析的文档可以被缓存（pickle）。"""
+        pass
+
+    def _ignore_any(loader: AnyTagLoader, tag_suffix: str, node: 'yaml.Node'):
+        if isinstance(node, yaml.ScalarNode): return loader.construct_scalar(node)
+        if isinstance(node, yaml.SequenceNode): return loader.construct_sequence(node)
+        if isinstance(node, yaml.MappingNode): return loader.construct_mapping(node)
+        return None
+
+    AnyTagLoader.add_multi_constructor("", _ignore_any)
+else:
+    AnyTagLoader = None
+
+PUBLIC_KEY = bytes((0x35, 0xEC, 0x33, 0x77, 0xF3, 0x5D, 0xB0, 0xEA, 0xBE, 0x6B, 0x83, 0x11, 0x54, 0x03, 0xEB, 0xFB,
+                    0x27, 0x25, 0x64, 0x2E, 0xD5, 0x49, 0x06, 0x29, 0x05, 0x78, 0xBD, 0x60, 0xBA, 0x4A, 0xA7, 0x87))
+
+
+def yaml_loader():
+    if yaml is None:
+        raise RuntimeError("PyYAML is not installed. Install with: pip install pyyaml")
+    return AnyTagLoader
+
+
+def adler32(b: bytes) -> int:
+    return zlib.adler32(b) & 0xFFFFFFFF
+
+
+def key_epic(uid: str) -> bytes:
+    wid = uid.strip().encode("utf-16le")
+    k = bytearray(PUBLIC_KEY)
+    n = min(len(wid), len(k))
+    for i in range(n):
+        k[i] ^= wid[i]
+    return bytes(k)
+
+
+def key_steam(uid: str) -> bytes:
+    digits = ''.join(ch for ch in uid if ch.isdigit())
+    sid = int(digits or "0", 10).to_bytes(8, "little", signed=False)
+    k = bytearray(PUBLIC_KEY)
+    for i, b in enumerate(sid):
+        k[i % len(k)] ^= b
+    return bytes(k)
+
+
+def platform_key(platform: str, uid: str) -> bytes:
+    return key_epic(uid) if platform == "epic" else key_steam(uid)
+
+
+def strip_pkcs7(buf: bytes) -> bytes:
+    n = buf[-1]
+    if 1 <= n <= 16 and all(buf[-i] == n for i in range(1, n + 1)):
+        return buf[:-n]
+    return buf
+
+
+def aes_dec(b: bytes, k: bytes) -> bytes:
+    AES, _ = _crypto()
+    if AES is None:
+        raise RuntimeError("PyCryptodome is required for encrypt/decrypt. Install with: pip install pycryptodome")
+    return AES.new(k, AES.MODE_ECB).decrypt(b)
+
+
+def aes_enc(b: bytes, k: bytes) -> bytes:
+    AES, _ = _crypto()
+    if AES is None:
+        raise RuntimeError("PyCryptodome is required for encrypt/decrypt. Install with: pip install pycryptodome")
+    return AES.new(k, AES.MODE_ECB).encrypt(b)
+
+
+def decrypt_payload(key: bytes, enc: bytes) -> bytes:
+    """AES 解密并去掉填充，返回 zlib 数据 + 8 字节尾部。"""
+    try:
+        dec = aes_dec(enc, key)
+    except Exception as e:
+        raise ValueError(f"AES decryption failed: {e}")
+    try:
+        unp = strip_pkcs7(dec)
+    except Exception as e:
+        raise ValueError(f"PKCS7 padding removal failed: {e}")
+    if len(unp) < 8:
+        raise ValueError(f"Data too short after unpadding: {len(unp)} bytes (min 8 required)")
+    return unp
+
+
+def inflate(unp: bytes, checksum_be: bool) -> bytes:
+    trailer = unp[-8:]
+    chk = int.from_bytes(trailer[:4], "big" if checksum_be else "little")
+    ln = int.from_bytes(trailer[4:], "little")
+
+    try:
+        plain = zlib.decompress(unp)
+    except Exception:
+        try:
+            plain = zlib.decompress(unp[:-8])
+        except Exception as e2:
+            raise ValueError(f"Zlib decompression failed: {e2}")
+
+    actual_checksum = adler32(plain)
+    if actual_checksum != chk:
+        pass  # Or log a warning
+    if len(plain) != ln:
+        raise ValueError(f"Length mismatch: got {len(plain)}, expected {ln}")
+    return plain
+
+
+def probe_keys(enc_data: bytes, user_id: str) -> Tuple[List[Tuple[str, bytes, bool]], bool]:
+    """
+    只解密第一个 AES 块来判断哪个密钥是对的（明文应以 zlib 头开始），
+    这样错误的密钥不必解密和解压整个文件。
+    返回 (按可能性排序的 (平台, 密钥, 校验和大端) 列表, 是否有密钥通过了探测)。
+    """
+    user_id = user_id.strip()
+    candidates = [("epic", key_epic(user_id), True), ("steam", key_steam(user_id), False)]
+    if len(enc_data) < 16 or len(enc_data) % 16:
+        return candidates, False
+
+    def looks_like_zlib(block: bytes) -> bool:
+        return (block[0] & 0x0F) == 8 and ((block[0] << 8) | block[1]) % 31 == 0
+
+    try:
+        matched = [c for c in candidates if looks_like_zlib(aes_dec(enc_data[:16], c[1]))]
+    except Exception:
+        return candidates, False
+    return matched + [c for c in candidates if c not in matched], bool(matched)
+
+
+def decrypt_bytes(enc_data: bytes, user_id: str, progress: Optional[Callable[[str], None]] = None,
+                  timings: Optional[Dict[str, float]] = None) -> Tuple[Optional[bytes], Optional[str], Optional[Exception]]:
+    """
+    尝试Epic和Steam密钥解密（先探测出的密钥优先）。
+    返回 (明文, 平台, 错误)；两种都失败时明文和平台为 None。
+    progress(stage) 在 key_probe / decrypt / inflate 各阶段开始时调用，各阶段耗时累加到 timings。
+    """
+    report = progress or (lambda stage: None)
+    timings = timings if timings is not None else {}
+
+    def timed(stage, func, *args):
+        t0 = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - t0
+
+    # progress 抛出的异常（取消）不能被当作解密失败吞掉，所以在 try 之外调用
+    report("key_probe")
+    candidates, probed = timed("key_probe", probe_keys, enc_data, user_id)
+    error = None
+    for platform_id, key, checksum_be in candidates:
+        report("decrypt")
+        try:
+            unp = timed("decrypt", decrypt_payload, key, enc_data)
+        except Exception as e:
+            error = e if error is None or not probed else error
+            continue
+        report("inflate")
+        try:
+            return timed("inflate", inflate, unp, checksum_be), platform_id, None
+        except Exception as e:
+            # 探测命中时保留命中密钥的错误，否则保留最后一个
+            error = e if error is None or not probed else error
+    return None, None, error
+
+
+def encrypt_bytes(plain: bytes, user_id: str, platform: str, compression_level: int,
+                  timings: Optional[Dict[str, float]] = None) -> bytes:
+    """压缩并用 platform 的密钥加密明文；compress / encrypt 耗时写入 timings。"""
+    AES, pad = _crypto()
+    if AES is None or pad is None:
+        raise RuntimeError("PyCryptodome is required for encryption.")
+
+    t0 = time.perf_counter()
+    comp = zlib.compress(plain, compression_level)
+    trailer = adler32(plain).to_bytes(4, "big" if platform == "epic" else "little") + len(plain).to_bytes(4, "little")
+    t1 = time.perf_counter()
+    pt = pad(comp + trailer, 16, style="pkcs7")
+    enc = aes_enc(pt, platform_key(platform, user_id))
+    if timings is not None:
+        timings["compress"] = t1 - t0
+        timings["encrypt"] = time.perf_counter() - t1
+    return enc
+
+
+def decrypt_yaml(enc_data: bytes, user_id: str) -> Tuple[Optional[object], Optional[str], Optional[Exception]]:
+    """解密并用 AnyTagLoader 加载为普通 Python 对象。返回 (对象, 平台, 错误)。"""
+    plain_data, platform_id, error = decrypt_bytes(enc_data, user_id)
+    if plain_data is None:
+        return None, None, error
+    return yaml.load(plain_data.decode("utf-8"), Loader=yaml_loader()), platform_id, None
@@ -1,28 +1,31 @@
-import zlib
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
-
-try:
-    from Crypto.Cipher import AES
-    from Crypto.Util.Padding import pad
-except ImportError:
-    AES = None
-    pad = None
-
-try:
-    import yaml
-except ImportError:
-    yaml = None
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 
 from . import bl4_functions as bl4f
 from . import b_encoder
+from . import save_codec
+from .yaml_document import YamlDocument, dump_yaml
+from .change_journal import ChangeJournal
+from .save_history import SaveHistory, own_path, record_path
+from .backup_store import BackupStore
+from .save_scanner import SaveScanner
+from .save_summary import SummaryIndex
+from .save_preloader import PreparedSave, SavePreloader
+from .parse_cache import ParseCache, cache_key
+from .item_index import ItemIndex
+from .path_query import KeyIndex, compile_path
 import os
 from datetime import datetime
-from . import unlock_logic
-from .unlock_data import CHARACTER_CLASSES
 
-PUBLIC_KEY = bytes((0x35, 0xEC, 0x33, 0x77, 0xF3, 0x5D, 0xB0, 0xEA, 0xBE, 0x6B, 0x83, 0x11, 0x54, 0x03, 0xEB, 0xFB,
-                    0x27, 0x25, 0x64, 0x2E, 0xD5, 0x49, 0x06, 0x29, 0x05, 0x78, 0xBD, 0x60, 0xBA, 0x4A, 0xA7, 0x87))
+if TYPE_CHECKING:
+    # 解锁预设只在应用时才导入：unlock_planner 会加载 unlock_logic / unlock_data
+    from . import unlock_planner
+
+# zlib 压缩等级：游戏接受任何合法的 zlib 流，1 最快，9 最小
+DEFAULT_COMPRESSION_LEVEL = 9
 
 
 class SaveGameController:
@@ -35,90 +38,41 @@ class SaveGameController:
         self.save_path: Optional[Path] = None
         self.platform: Optional[str] = None
         self.yaml_obj: Optional[Any] = None
-
-    def _adler32(self, b: bytes) -> int:
-        return zlib.adler32(b) & 0xFFFFFFFF
+        # 原始文本与节点区间索引，用于增量写出
+        self._document: Optional[YamlDocument] = None
+        # 修改日志：界面按路径前缀订阅，只刷新受影响的部分
+        self.journal = ChangeJournal()
+        # 结构共享的撤销/重做历史
+        self.history = SaveHistory()
+        # 每个备份目录一个去重备份库
+        self._backup_stores: Dict[Path, BackupStore] = {}
+        # 最近一次 backup_save() 的 (备份库, 文件名)
+        self._last_backup: Optional[Tuple[BackupStore, str]] = None
+        self.compression_level = DEFAULT_COMPRESSION_LEVEL
+        # 带持久化索引的存档扫描器
+        self.scanner = SaveScanner()
+        # 存档摘要（角色名、等级等）的磁盘缓存
+        self.summaries = SummaryIndex()
+        # 物品路径索引，载入后建立一次，之后按修改路径增量更新
+        self.item_index = ItemIndex()
+        # 键 -> 路径的倒排索引，供货币、背包等路径查询使用，同样按修改路径增量更新
+        self.key_index = KeyIndex()
+        # 背包栏位分配器，缓存背包路径和下一个空闲栏位
+        self.backpack_slots = bl4f.BackpackSlots(self.key_index)
+        # 打开存档时只索引顶层段，各段在第一次访问时才解析
+        self.lazy_sections = True
+        # 选中存档时在后台预先解密/解析
+        self.preloader = SavePreloader(self.prepare_save)
+        # 已解析存档的磁盘缓存，重新打开未改动的存档时跳过解密和解析（None 表示不使用，例如批处理）
+        self.parse_cache: Optional[ParseCache] = ParseCache()
+        # 保护 yaml_obj / _document 的切换和编辑事务；保存线程在锁内取下根节点和修改标记
+        self._state_lock = threading.RLock()
 
     def _get_yaml_loader(self):
-        if yaml is None:
-            raise RuntimeError("PyYAML is not installed. Install with: pip install pyyaml")
-
-        class AnyTagLoader(yaml.SafeLoader):
-            pass
-
-        def _ignore_any(loader: AnyTagLoader, tag_suffix: str, node: 'yaml.Node'):
-            if isinstance(node, yaml.ScalarNode): return loader.construct_scalar(node)
-            if isinstance(node, yaml.SequenceNode): return loader.construct_sequence(node)
-            if isinstance(node, yaml.MappingNode): return loader.construct_mapping(node)
-            return None
-
-        AnyTagLoader.add_multi_constructor("", _ignore_any)
-        return AnyTagLoader
-
-    def _key_epic(self, uid: str) -> bytes:
-        wid = uid.strip().encode("utf-16le")
-        k = bytearray(PUBLIC_KEY)
-        n = min(len(wid), len(k))
-        for i in range(n):
-            k[i] ^= wid[i]
-        return bytes(k)
-
-    def _key_steam(self, uid: str) -> bytes:
-        digits = ''.join(ch for ch in uid if ch.isdigit())
-        sid = int(digits or "0", 10).to_bytes(8, "little", signed=False)
-        k = bytearray(PUBLIC_KEY)
-        for i, b in enumerate(sid):
-            k[i % len(k)] ^= b
-        return bytes(k)
-
-    def _strip_pkcs7(self, buf: bytes) -> bytes:
-        n = buf[-1]
-        if 1 <= n <= 16 and all(buf[-i] == n for i in range(1, n + 1)):
-            return buf[:-n]
-        return buf
-
-    def _aes_dec(self, b, k):
-        if AES is None:
-            raise RuntimeError("PyCryptodome is required for encrypt/decrypt. Install with: pip install pycryptodome")
-        return AES.new(k, AES.MODE_ECB).decrypt(b)
-
-    def _aes_enc(self, b, k):
-        if AES is None:
-            raise RuntimeError("PyCryptodome is required for encrypt/decrypt. Install with: pip install pycryptodome")
-        return AES.new(k, AES.MODE_ECB).encrypt(b)
-
-    def _try_once(self, key: bytes, enc: bytes, checksum_be: bool) -> bytes:
-        try:
-            dec = self._aes_dec(enc, key)
-        except Exception as e:
-            raise ValueError(f"AES decryption failed: {e}")
-        try:
-            unp = self._strip_pkcs7(dec)
-        except Exception as e:
-            raise ValueError(f"PKCS7 padding removal failed: {e}")
-        if len(unp) < 8:
-            raise ValueError(f"Data too short after unpadding: {len(unp)} bytes (min 8 required)")
+        return save_codec.yaml_loader()
 
-        trailer = unp[-8:]
-        chk = int.from_bytes(trailer[:4], "big" if checksum_be else "little")
-        ln = int.from_bytes(trailer[4:], "little")
-
-        try:
-            plain = zlib.decompress(unp)
-        except Exception:
-            try:
-                plain = zlib.decompress(unp[:-8])
-            except Exception as e2:
-                raise ValueError(f"Zlib decompression failed: {e2}")
-
-        actual_checksum = self._adler32(plain)
-        if actual_checksum != chk:
-            pass  # Or log a warning
-        if len(plain) != ln:
-            raise ValueError(f"Length mismatch: got {len(plain)}, expected {ln}")
-        return plain
-
-    def validate_user_id(self, user_id: str) -> Tuple[bool, str]:
+    @staticmethod
+    def validate_user_id(user_id: str) -> Tuple[bool, str]:
         if not user_id or not user_id.strip():
             return False, "User ID cannot be empty"
         user_id = user_id.strip()
@@ -133,48 +87,65 @@ class SaveGameController:
         return False, "User ID contains invalid characters."
 
     def decrypt_save(self, file_path: Path, user_id: str, custom_backup_dir: Optional[str] = None) -> Tuple[str, str, str]:
-        self.user_id = user_id.strip()
-        self.save_path = file_path
+        # 选择页已经在后台预加载过这个存档时直接换入
+        prepared = self.preloader.take(file_path, user_id)
+        if prepared is None:
+            prepared = self.prepare_save(file_path, user_id)
+        return self.adopt_prepared(prepared, custom_backup_dir)
+
+    def prepare_save(self, file_path: Path, user_id: str,
+                     check_cancelled: Optional[Callable[[], None]] = None,
+                     progress: Optional[Callable[[str], None]] = None,
+                     timings: Optional[Dict[str, float]] = None) -> PreparedSave:
+        """
+        读取、解密并解析存档，但不修改控制器状态，也不写备份，因此可以在后台线程中调用。
+        check_cancelled 在各阶段之间调用，抛出异常即可中止。
+        progress(stage) 在每个阶段开始时调用：read / cache / key_probe / decrypt / inflate / parse；
+        各阶段耗时（秒）写入 timings。
+        """
+        check = check_cancelled or (lambda: None)
+        timings = timings if timings is not None else {}
+
+        def report(stage):
+            check()
+            if progress:
+                progress(stage)
 
-        is_valid, validation_msg = self.validate_user_id(self.user_id)
+        user_id = user_id.strip()
+
+        is_valid, validation_msg = self.validate_user_id(user_id)
         if not is_valid:
             raise ValueError(f"无效的用户ID: {validation_msg}")
 
-        enc_data = self.save_path.read_bytes()
+        report("read")
+        t0 = time.perf_counter()
+        file_path = Path(file_path)
+        st = file_path.stat()
+        enc_data = file_path.read_bytes()
+        timings["read"] = time.perf_counter() - t0
+
+        report("cache")
+        t0 = time.perf_counter()
+        key = cache_key(enc_data, user_id, self.lazy_sections)
+        cached = self.parse_cache.load(key) if self.parse_cache is not None else None
+        timings["cache"] = time.perf_counter() - t0
+        if cached is not None:
+            platform_id, yaml_text, document, obj = cached
+            return PreparedSave(file_path, user_id, st.st_size, st.st_mtime_ns, enc_data, platform_id, yaml_text, document, obj)
 
         # 尝试解密
-        plain_data, platform_id, error = (None, None, None)
-        try:
-            # 尝试Epic
-            plain_data = self._try_once(self._key_epic(self.user_id), enc_data, True)
-            platform_id = "epic"
-        except Exception as e:
-            error = e
-            try:
-                # 尝试Steam
-                plain_data = self._try_once(self._key_steam(self.user_id), enc_data, False)
-                platform_id = "steam"
-                error = None 
-            except Exception as e2:
-                error = e2
+        plain_data, platform_id, error = self.decrypt_bytes(enc_data, user_id, report, timings)
 
         if plain_data is not None and platform_id:
-            # 解密成功后创建备份
-            ts = datetime.now().strftime("%Y-%m-%d-%H%M%S")
-            
-            if custom_backup_dir and os.path.exists(custom_backup_dir) and os.path.isdir(custom_backup_dir):
-                backup_name = f"{file_path.name}.{ts}.bak"
-                backup_path = Path(custom_backup_dir) / backup_name
-            else:
-                backup_path = self.save_path.with_suffix(f".{ts}.bak")
-            
-            backup_path.write_bytes(enc_data)
-
-            self.platform = platform_id
-            self.yaml_obj = yaml.load(plain_data, Loader=self._get_yaml_loader())
-            
-            # 返回YAML内容、平台和备份文件名
-            return plain_data.decode(errors="ignore"), platform_id, backup_path.name
+            report("parse")
+            t0 = time.perf_counter()
+            yaml_text = plain_data.decode("utf-8")
+            load = YamlDocument.load_lazy if self.lazy_sections else YamlDocument.load
+            document, obj = load(yaml_text, self._get_yaml_loader())
+            timings["parse"] = time.perf_counter() - t0
+            if self.parse_cache is not None:
+                self.parse_cache.store_async(key, (platform_id, yaml_text, document, obj))
+            return PreparedSave(file_path, user_id, st.st_size, st.st_mtime_ns, enc_data, platform_id, yaml_text, document, obj)
         else:
             # 如果两种方法都失败，则抛出详细错误
             error_msg = ("解密存档文件失败。这通常意味着:\n"
@@ -184,33 +155,272 @@ class SaveGameController:
                          f"错误详情: {error}")
             raise ValueError(error_msg)
 
-    def encrypt_save(self, yaml_string: str) -> bytes:
+    def adopt_prepared(self, prepared: PreparedSave, custom_backup_dir: Optional[str] = None,
+                       backup: bool = True) -> Tuple[str, str, str]:
+        """
+        把准备好的存档设为当前存档，并为它创建备份。返回 (YAML内容, 平台, 备份文件名)。
+        backup=False 时不写备份（调用方自己负责，例如批处理），备份文件名为空字符串。
+        """
+        self.user_id = prepared.user_id
+        self.save_path = prepared.path
+
+        backup_name = ""
+        self._last_backup = None
+        if backup:
+            backup_name = self.backup_save(prepared.path, prepared.enc_data, custom_backup_dir)
+
+        self.platform = prepared.platform
+        with self._state_lock:
+            self._document, self.yaml_obj = prepared.document, prepared.obj
+        self.item_index.invalidate()
+        self.key_index.invalidate()
+        self.backpack_slots.reset()
+        self.history.reset(self.yaml_obj)
+        self.journal.clear()
+        self.journal.record_all()
+        
+        # 返回YAML内容、平台和备份文件名
+        return prepared.yaml_text, prepared.platform, backup_name
+
+    @staticmethod
+    def backup_target(save_path: Path, custom_backup_dir: Optional[str] = None) -> Tuple[Path, str]:
+        """存档的备份目录和（按当前时间生成的）默认备份文件名。"""
+        save_path = Path(save_path)
+        ts = datetime.now().strftime("%Y-%m-%d-%H%M%S")
+        if custom_backup_dir and os.path.exists(custom_backup_dir) and os.path.isdir(custom_backup_dir):
+            return Path(custom_backup_dir), f"{save_path.name}.{ts}.bak"
+        return save_path.parent, save_path.with_suffix(f".{ts}.bak").name
+
+    def backup_save(self, save_path: Path, enc_data: bytes, custom_backup_dir: Optional[str] = None) -> str:
+        """
+        为存档创建备份（内容未变时复用已有备份，文件在后台写出），返回备份文件名。
+        写入是否成功见 backup_error() / wait_for_backups()。
+        """
+        save_path = Path(save_path)
+        backup_dir, backup_name = self.backup_target(save_path, custom_backup_dir)
+        store = self.get_backup_store(backup_dir)
+        backup_name = store.backup(save_path, enc_data, backup_name)
+        self._last_backup = (store, backup_name)
+        return backup_name
+
+    def backup_error(self, timeout: Optional[float] = None) -> Optional[str]:
+        """等待最近一次 backup_save() 的写入完成；写入失败时返回错误信息。"""
+        if self._last_backup is None:
+            return None
+        store, backup_name = self._last_backup
+        store.wait(timeout)
+        return store.error(backup_name)
+
+    def probe_keys(self, enc_data: bytes, user_id: str) -> Tuple[List[Tuple[str, bytes, bool]], bool]:
+        """见 save_codec.probe_keys。"""
+        return save_codec.probe_keys(enc_data, user_id)
+
+    def decrypt_bytes(self, enc_data: bytes, user_id: str, progress: Optional[Callable[[str], None]] = None,
+                      timings: Optional[Dict[str, float]] = None) -> Tuple[Optional[bytes], Optional[str], Optional[Exception]]:
+        """
+        尝试Epic和Steam密钥解密（见 save_codec.decrypt_bytes），不修改控制器状态。
+        返回 (明文, 平台, 错误)；两种都失败时明文和平台为 None。
+        """
+        return save_codec.decrypt_bytes(enc_data, user_id, progress, timings)
+
+    def wait_for_backups(self, timeout: Optional[float] = None) -> Dict[Path, str]:
+        """
+        Blocks until every backup started by this controller has been written. Returns
+        {backup path: error} for the backups whose write failed.
+        """
+        failed: Dict[Path, str] = {}
+        for directory, store in list(self._backup_stores.items()):
+            for name, error in store.wait(timeout).items():
+                failed[directory / name] = error
+        return failed
+
+    def get_backup_store(self, directory: Path) -> BackupStore:
+        directory = Path(directory).resolve()
+        store = self._backup_stores.get(directory)
+        if store is None:
+            store = self._backup_stores[directory] = BackupStore(directory)
+        return store
+
+    def encrypt_save(self, yaml_string: str, compression_level: Optional[int] = None,
+                     timings: Optional[Dict[str, float]] = None) -> bytes:
         if not self.platform or not self.user_id:
             raise RuntimeError("Cannot encrypt without a decrypted platform and user ID.")
-        if AES is None or pad is None:
-            raise RuntimeError("PyCryptodome is required for encryption.")
-
-        key = self._key_epic(self.user_id) if self.platform == "epic" else self._key_steam(self.user_id)
-        
+        if compression_level is None:
+            compression_level = self.compression_level
         # We use the provided yaml_string to ensure manual edits are included
-        yb = yaml_string.encode("utf-8")
-        comp = zlib.compress(yb, 9)
-        trailer = self._adler32(yb).to_bytes(4, "big" if self.platform == "epic" else "little") + len(yb).to_bytes(4, "little")
-        pt = pad(comp + trailer, 16, style="pkcs7")
-        return self._aes_enc(pt, key)
+        return save_codec.encrypt_bytes(yaml_string.encode("utf-8"), self.user_id, self.platform,
+                                        compression_level, timings)
+
+    def write_save(self, path: Path, compression_level: Optional[int] = None,
+                   progress: Optional[Callable[[str], None]] = None) -> Dict[str, float]:
+        """
+        导出、压缩、加密并写出当前存档，返回各阶段耗时（秒）。
+        可以在工作线程中调用：开始时在锁内取下当前根节点和修改标记（不会取到编辑到一半的根节点），
+        之后的编辑会生成新的根节点并只改动新的修改标记，不影响这次写出。
+        文件先写到同目录的临时文件再替换，中途失败不会损坏原存档。
+        """
+        report = progress or (lambda stage: None)
+        with self._state_lock:
+            root, document = self.yaml_obj, self._document
+            state = document.dirty_state() if document is not None else None
+        timings: Dict[str, float] = {}
+
+        report("dump")
+        t0 = time.perf_counter()
+        yaml_string = self._render_yaml(root, document, state)
+        timings["dump"] = time.perf_counter() - t0
+
+        report("compress")
+        data = self.encrypt_save(yaml_string, compression_level, timings)
+
+        report("write")
+        t0 = time.perf_counter()
+        _atomic_write(Path(path), data)
+        timings["write"] = time.perf_counter() - t0
+        timings["total"] = sum(timings.values())
+        return timings
 
     def get_yaml_string(self) -> str:
-        if not self.yaml_obj:
+        with self._state_lock:
+            root, document = self.yaml_obj, self._document
+            state = document.dirty_state() if document is not None else None
+        return self._render_yaml(root, document, state)
+
+    @staticmethod
+    def _render_yaml(root: Any, document: Optional[YamlDocument], state) -> str:
+        if not root:
             return ""
-        return yaml.safe_dump(self.yaml_obj, sort_keys=False, allow_unicode=True, indent=2)
+        if document is not None:
+            # 只重写被修改过的节点，其余文本保持游戏写出的原样
+            return document.render(root, state=state)
+        return dump_yaml(root)
 
     def update_yaml_object(self, yaml_string: str) -> bool:
         """Updates the internal yaml_obj from a string. Returns True on success."""
         try:
-            self.yaml_obj = yaml.load(yaml_string, Loader=self._get_yaml_loader())
-            return True
+            document, obj = YamlDocument.load(yaml_string, self._get_yaml_loader())
         except Exception:
             return False
+        with self._state_lock:
+            self._replace_yaml_object(document, obj)
+        return True
+
+    def _replace_yaml_object(self, document: YamlDocument, obj: Any):
+        if self.yaml_obj is None:
+            self.yaml_obj = obj
+            self.item_index.invalidate()
+            self.key_index.invalidate()
+            self.backpack_slots.reset()
+            self.history.reset(obj)
+            self.journal.record_all()
+        else:
+            # 整体替换根节点，作为一次可撤销的编辑
+            with self.edit("yaml_edit"):
+                self.yaml_obj = obj
+                self.backpack_slots.reset()
+                self._touch([])
+        self._document = document
+
+    def _touch(self, path: List[Union[str, int]]):
+        """记录一次修改过的路径；空路径表示整棵树都可能改变。"""
+        if self._document is not None:
+            self._document.touch(path)
+        self.item_index.touch(path)
+        self.key_index.touch(path)
+        self.journal.record(path)
+        record_path(path)
+
+    # ── 撤销/重做 ─────────────────────────────────────────────────────────
+
+    @contextmanager
+    def edit(self, label: str):
+        """
+        所有对 yaml_obj 的修改都在编辑事务中进行：事务内的 yaml_obj 是与上一个快照共享子树的新根，
+        成功结束且有修改时成为一个撤销步骤；出错或没有任何修改时恢复原来的根节点。
+        嵌套调用会并入外层事务（例如批量添加时整批只算一步）。
+        事务期间持有 _state_lock，保存线程不会取到修改到一半的根节点。
+        """
+        with self._state_lock:
+            before = self.yaml_obj
+            with self.history.edit(before, label) as txn:
+                self.yaml_obj = txn.root
+                try:
+                    yield txn.root
+                except BaseException:
+                    self.yaml_obj = before
+                    raise
+            if not txn.nested and not txn.paths:
+                self.yaml_obj = before
+
+    def _switch_root(self, root: Any, paths: List[List[Union[str, int]]]):
+        with self._state_lock:
+            self.yaml_obj = root
+            for path in paths:
+                self._touch(path)
+
+    def undo(self) -> Optional[str]:
+        """Restores the state before the last edit. Returns the undone edit's label, or None."""
+        step = self.history.undo(self.yaml_obj)
+        if step is None:
+            return None
+        root, paths, label = step
+        self._switch_root(root, paths)
+        return label
+
+    def redo(self) -> Optional[str]:
+        step = self.history.redo(self.yaml_obj)
+        if step is None:
+            return None
+        root, paths, label = step
+        self._switch_root(root, paths)
+        return label
+
+    def revert_to_loaded(self) -> bool:
+        """Returns to the save as it was decrypted. The revert itself can be undone."""
+        root = self.history.revert(self.yaml_obj)
+        if root is None:
+            return False
+        self._switch_root(root, [[]])
+        return True
+
+    def collect_item_changes(self, paths: List[Tuple[str, ...]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        把修改路径归并到所属的物品上，并只重新解码这些物品。
+        如果某个路径覆盖了多个物品（或已不存在），返回 None，表示需要完整刷新。
+        """
+        if not self.yaml_obj:
+            return []
+        def is_item(node: Any) -> bool:
+            serial = node.get('serial') if isinstance(node, dict) else None
+            return isinstance(serial, str) and serial.startswith('@U')
+
+        item_paths: Dict[Tuple[str, ...], Any] = {}
+        for path in paths:
+            node = self.yaml_obj
+            item_path = None
+            for depth, key in enumerate(path):
+                if is_item(node):
+                    item_path = tuple(path[:depth])
+                    break
+                try:
+                    node = node[int(key)] if isinstance(node, list) else node[key]
+                except (KeyError, IndexError, ValueError, TypeError):
+                    return None
+            else:
+                if is_item(node):
+                    item_path = tuple(path)
+                elif isinstance(node, (dict, list)) and self.item_index.has_items_under(self.yaml_obj, path):
+                    return None
+            if item_path is not None:
+                item_paths[item_path] = node
+
+        items = []
+        for item_path, node in item_paths.items():
+            item = bl4f.process_item(list(item_path), node, self.item_index.get(self.yaml_obj, item_path))
+            if item is None:
+                return None
+            items.append(item)
+        return items
 
     def get_all_items(self) -> List[Dict[str, Any]]:
         if not self.yaml_obj:
@@ -218,17 +428,50 @@ class SaveGameController:
             return []
         print("[CONTROLLER_LOG] get_all_items: YAML object found, calling bl4f.process_and_load_items.")
         try:
-            items = bl4f.process_and_load_items(self.yaml_obj)
+            items = bl4f.process_and_load_items(self.yaml_obj, self.item_index)
             print(f"[CONTROLLER_LOG] get_all_items: Successfully processed {len(items)} items.")
             return items
         except Exception as e:
             print(f"[CONTROLLER_LOG] CRITICAL: Exception in bl4f.process_and_load_items: {e}")
             return []
 
+    def adopt_item_index(self, root: Any, index: ItemIndex):
+        """Uses an index built in the background for root if root is still the current, unedited save."""
+        if root is self.yaml_obj and not self.item_index.is_built:
+            self.item_index = index
+
+    def find_paths(self, selector: str) -> List[Tuple[Any, ...]]:
+        """按选择器（见 path_query）查找路径，以 "**." 开头时使用键索引。"""
+        if self.yaml_obj is None:
+            return []
+        return compile_path(selector).select(self.yaml_obj, self.key_index)
+
     def add_item_to_backpack(self, serial: str, flag: str) -> Optional[List[Union[str, int]]]:
         if not self.yaml_obj:
             return None
-        return bl4f.add_item_to_backpack(self.yaml_obj, serial, flag)
+        with self.edit("add_item"):
+            path = bl4f.add_item_to_backpack(self.yaml_obj, serial, flag, self.backpack_slots)
+            if path:
+                self._touch(path)
+        return path
+
+    def add_items_to_backpack(self, serials: List[str], flags: Union[str, List[str]]) -> List[Optional[List[Union[str, int]]]]:
+        """批量添加物品，整批只算一个撤销步骤。返回每个物品的路径（失败为 None）。"""
+        if not self.yaml_obj or not serials:
+            return []
+        with self.edit("add_items"):
+            paths = bl4f.add_items_to_backpack(self.yaml_obj, serials, flags, self.backpack_slots)
+            for path in paths:
+                if path:
+                    self._touch(path)
+        return paths
+
+    def backpack_usage(self) -> Tuple[int, int]:
+        """(背包中的物品数, 游戏允许的背包容量)"""
+        if not isinstance(self.yaml_obj, dict):
+            return 0, 0
+        used = sum(1 for entry in self.item_index.entries(self.yaml_obj) if entry.container == "Backpack")
+        return used, bl4f.backpack_capacity(self.yaml_obj)
 
     def encode_serial(self, decoded_str: str) -> Tuple[Optional[str], Optional[str]]:
         return b_encoder.encode_to_base85(decoded_str)
@@ -240,7 +483,7 @@ class SaveGameController:
 
         data = {}
         # 查找货币路径
-        cur_paths = bl4f.find_currency_paths(self.yaml_obj)
+        cur_paths = bl4f.find_currency_paths(self.yaml_obj, self.key_index)
         data['cur_paths'] = cur_paths
 
         root_node = self.yaml_obj.get("state", self.yaml_obj)
@@ -279,53 +522,65 @@ class SaveGameController:
             return False
         
         # bl4_functions.apply_character_and_currency_changes 现在直接接收数据字典。
-        return bl4f.apply_character_and_currency_changes(data, self.yaml_obj, cur_paths)
-
-    def sync_inventory_levels(self) -> Tuple[int, int, List[str]]:
-        """同步背包物品等级到角色等级。"""
+        with self.edit("character"):
+            ok = bl4f.apply_character_and_currency_changes(data, self.yaml_obj, cur_paths)
+            if ok:
+                state = self.yaml_obj.get("state")
+                prefix = ["state"] if isinstance(state, dict) else []
+                for key in ("char_name", "player_difficulty", "experience"):
+                    self._touch(prefix + [key])
+                for path in cur_paths.values():
+                    if path:
+                        self._touch(path)
+        return ok
+
+    def transform_items(self, predicate, fn, workers: Optional[int] = None,
+                        partial: bool = False) -> Tuple[bool, List[Dict[str, Any]]]:
+        """批量改写物品（见 bl4f.transform_items），整批作为一个撤销步骤。"""
+        if not self.yaml_obj:
+            return False, []
+        touched: List[List[str]] = []
+        with self.edit("transform_items"):
+            result = bl4f.transform_items(self.yaml_obj, predicate, fn, workers=workers, index=self.item_index,
+                                          touched_paths=touched, partial=partial)
+            for path in touched:
+                self._touch(path)
+        return result
+
+    def sync_inventory_levels(self, workers: Optional[int] = None) -> Tuple[int, int, List[str]]:
+        """同步背包物品等级到角色等级。workers 见 bl4f.transform_items。"""
         if not self.yaml_obj:
             return 0, 0, ["存档未加载"]
         
-        return bl4f.sync_inventory_item_levels(self.yaml_obj)
+        touched: List[List[str]] = []
+        with self.edit("sync_levels"):
+            result = bl4f.sync_inventory_item_levels(self.yaml_obj, touched_paths=touched, index=self.item_index,
+                                                     workers=workers)
+            for path in touched:
+                self._touch(path)
+        return result
+
+    def _save_folder_root(self, custom_path: Optional[str] = None) -> Path:
+        if custom_path and os.path.exists(custom_path) and os.path.isdir(custom_path):
+            return Path(custom_path)
+        documents_path = os.path.expanduser('~/Documents')
+        return Path(documents_path) / "My Games" / "Borderlands 4" / "Saved" / "SaveGames"
+
+    def scan_save_folders(self, custom_path: Optional[str] = None, verify_files: bool = False) -> List[Dict[str, Any]]:
+        """扫描无主之地4存档文件夹并返回找到的存档文件列表（按修改时间从新到旧）。"""
+        try:
+            return self.scanner.scan(self._save_folder_root(custom_path), verify_files=verify_files)
+        except Exception as e:
+            print(f"扫描存档文件夹时出错: {e}")
+            return []
 
-    def scan_save_folders(self, custom_path: Optional[str] = None) -> List[Dict[str, Any]]:
-        """扫描无主之地4存档文件夹并返回找到的存档文件列表。"""
-        found_files = []
+    def poll_save_folders(self, custom_path: Optional[str] = None):
+        """返回自上次扫描以来的 (新增, 删除的路径, 已修改)，没有变化时返回 None。"""
         try:
-            target_path = None
-            if custom_path and os.path.exists(custom_path) and os.path.isdir(custom_path):
-                target_path = Path(custom_path)
-            else:
-                documents_path = os.path.expanduser('~/Documents')
-                target_path = Path(documents_path) / "My Games" / "Borderlands 4" / "Saved" / "SaveGames"
-
-            if not target_path or not target_path.is_dir():
-                return []
-
-            for id_dir in target_path.iterdir():
-                if id_dir.is_dir() and id_dir.name.isalnum(): # 文件夹名通常是ID
-                    platform_id = id_dir.name
-                    # 遍历ID文件夹内的所有.sav文件
-                    for sub_dir, _, files in os.walk(id_dir):
-                        for file in files:
-                            if file.lower().endswith('.sav'):
-                                full_path = Path(sub_dir) / file
-                                try:
-                                    stat = full_path.stat()
-                                    file_info = {
-                                        "name": full_path.name,
-                                        "id": platform_id,
-                                        "modified": datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
-                                        "size_kb": stat.st_size / 1024,
-                                        "full_path": str(full_path)
-                                    }
-                                    found_files.append(file_info)
-                                except FileNotFoundError:
-                                    continue
+            return self.scanner.poll(self._save_folder_root(custom_path))
         except Exception as e:
             print(f"扫描存档文件夹时出错: {e}")
-        
-        return sorted(found_files, key=lambda x: x['modified'], reverse=True)
+            return None
 
     def update_item(self, item_path: List[Any], original_item_data: Dict[str, Any], new_item_data: Dict[str, Any]) -> str:
         """
@@ -335,21 +590,13 @@ class SaveGameController:
         if not self.yaml_obj:
             raise ValueError("存档未加载，无法更新物品。")
         
+        with self.edit("update_item"):
+            return self._update_item(item_path, original_item_data, new_item_data)
+
+    def _update_item(self, item_path: List[Any], original_item_data: Dict[str, Any], new_item_data: Dict[str, Any]) -> str:
         try:
-            # 在YAML对象中定位到物品节点
-            node = self.yaml_obj
-            # Handle path traversal including list indices which might be strings
-            for key in item_path[:-1]:
-                if isinstance(node, list) and isinstance(key, str) and key.isdigit():
-                    node = node[int(key)]
-                else:
-                    node = node[key]
-            
-            last_key = item_path[-1]
-            if isinstance(node, list) and isinstance(last_key, str) and last_key.isdigit():
-                item_node = node[int(last_key)]
-            else:
-                item_node = node[last_key]
+            # 在YAML对象中定位到物品节点（列表下标可能是字符串），沿途复制共享的容器
+            item_node = own_path(self.yaml_obj, item_path)
 
             new_level_val = new_item_data.get("level")
             decoded_id_str = new_item_data.get("decoded_parts", "").strip()
@@ -377,6 +624,7 @@ class SaveGameController:
                     raise ValueError(f"从新等级重新编码失败: {err}")
                 
                 item_node['serial'] = new_serial
+                self._touch(list(item_path) + ['serial'])
                 return f"成功从新等级 {new_level} 重新编码物品。"
 
             # 优先级2: 解码ID改变，需要重编码
@@ -389,6 +637,7 @@ class SaveGameController:
                     raise ValueError(f"从解码ID重新编码失败: {err}")
                 
                 item_node['serial'] = new_serial
+                self._touch(list(item_path) + ['serial'])
                 return "成功从解码ID重新编码物品。"
             
             # 如果没有重编码，只更新序列号
@@ -396,6 +645,7 @@ class SaveGameController:
                 new_serial = new_item_data.get("serial")
                 if new_serial and new_serial != item_node.get('serial'):
                     item_node['serial'] = new_serial
+                    self._touch(list(item_path) + ['serial'])
                     return "成功更新物品序列号。"
 
             return "未检测到任何更改。"
@@ -404,68 +654,55 @@ class SaveGameController:
             raise ValueError(f"在存档中找不到物品路径: {item_path} ({e})")
 
     def apply_unlock_preset(self, preset_name: str, params: Dict[str, Any] = None) -> bool:
+        return self.apply_unlock_presets([preset_name], params)
+
+    def apply_unlock_presets(self, preset_names: List[str], params: Dict[str, Any] = None,
+                             report: Optional[List["unlock_planner.StepReport"]] = None) -> bool:
+        """
+        Applies several presets as one merged plan and one undo step. Pass a list as report to get
+        per-step timings and sizes (see unlock_planner.summarize()).
+        """
         if not self.yaml_obj:
             raise RuntimeError("No save loaded")
-            
-        data = self.yaml_obj
-        params = params or {}
-        
+
+        with self.edit("+".join(preset_names)):
+            return self._apply_unlock_presets(self.yaml_obj, preset_names, params or {}, report)
+
+    def _apply_unlock_preset(self, data: Any, preset_name: str, params: Dict[str, Any]) -> bool:
+        return self._apply_unlock_presets(data, [preset_name], params)
+
+    def _apply_unlock_presets(self, data: Any, preset_names: List[str], params: Dict[str, Any],
+                              report: Optional[List["unlock_planner.StepReport"]] = None) -> bool:
+        from . import unlock_planner
+        unknown = [name for name in preset_names if not unlock_planner.is_known_preset(name)]
+        if unknown:
+            print(f"Unknown preset: {', '.join(unknown)}")
+            return False
         try:
-            if preset_name == "clear_map_fog":
-                unlock_logic.clear_map_fog(data)
-            elif preset_name == "discover_all_locations":
-                unlock_logic.discover_all_locations(data)
-            elif preset_name == "complete_all_safehouse_missions":
-                unlock_logic.complete_all_safehouse_missions(data)
-            elif preset_name == "complete_all_collectibles":
-                unlock_logic.complete_all_collectibles(data)
-            elif preset_name == "complete_all_challenges":
-                unlock_logic.complete_all_challenges(data)
-            elif preset_name == "complete_all_achievements":
-                unlock_logic.complete_all_achievements(data)
-            elif preset_name == "complete_all_story_missions":
-                unlock_logic.complete_all_story_missions(data)
-            elif preset_name == "complete_all_missions":
-                unlock_logic.complete_all_missions(data)
-            elif preset_name == "set_character_class":
-                class_key = params.get("class_key")
-                if class_key:
-                    unlock_logic.set_character_class(data, class_key)
-            elif preset_name == "set_character_to_max_level":
-                unlock_logic.set_character_to_max_level(data)
-            elif preset_name == "set_max_sdu":
-                unlock_logic.set_max_sdu(data)
-            elif preset_name == "unlock_vault_powers":
-                unlock_logic.unlock_vault_powers(data)
-            elif preset_name == "unlock_all_hover_drives":
-                unlock_logic.unlock_all_hover_drives(data)
-            elif preset_name == "unlock_all_specialization":
-                unlock_logic.unlock_all_specialization(data)
-            elif preset_name == "unlock_postgame":
-                unlock_logic.unlock_postgame(data)
-            elif preset_name == "unlock_max_everything":
-                # Implement the combo manually or add a helper in unlock_logic
-                # Based on JS:
-                unlock_logic.max_ammo(data)
-                unlock_logic.max_currency(data)
-                unlock_logic.clear_map_fog(data)
-                unlock_logic.discover_all_locations(data)
-                unlock_logic.complete_all_collectibles(data)
-                unlock_logic.complete_all_achievements(data)
-                unlock_logic.complete_all_missions(data)
-                unlock_logic.set_max_sdu(data)
-                unlock_logic.unlock_vault_powers(data)
-                unlock_logic.unlock_postgame(data)
-                unlock_logic.unlock_all_hover_drives(data)
-                unlock_logic.unlock_all_specialization(data)
-                unlock_logic.complete_all_challenges(data)
-                unlock_logic.set_character_to_max_level(data)
-            else:
-                print(f"Unknown preset: {preset_name}")
-                return False
+            plan = unlock_planner.build_plan(preset_names, params)
+            unlock_planner.apply_plan(data, plan, report)
+            # 预设会深入修改多个顶层分区，整体重写
+            self._touch([])
             return True
         except Exception as e:
-            print(f"Error applying preset {preset_name}: {e}")
+            print(f"Error applying preset {'+'.join(preset_names)}: {e}")
             import traceback
             traceback.print_exc()
             return False
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Writes data next to path and renames it into place, so a crash never leaves a half-written save."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
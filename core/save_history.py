@@ -0,0 +1,170 @@
+# save_history.py
+"""
+结构共享的存档快照，用于撤销/重做。
+
+每次修改都在一个"编辑事务"里进行：事务开始时只浅拷贝根节点，之后修改操作通过
+own_child()/own_path() 取得要写入的容器，沿修改路径逐层复制 dict/list，其余子树
+与上一个快照共享。因此每个快照只额外占用被修改路径上的节点，撤销/重做只是切换根节点。
+
+没有活动事务时 own_child() 直接返回原对象，修改函数的行为与以前完全相同。
+"""
+
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+Key = Union[str, int]
+
+_current_edit: "contextvars.ContextVar[Optional[_Edit]]" = contextvars.ContextVar("save_edit", default=None)
+
+
+class _Edit:
+    """一个编辑事务：记录本次已复制（归本事务所有）的容器以及修改过的路径。"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.root: Any = None
+        self.depth = 0
+        self._owned = set()
+        self.paths: List[List[Key]] = []
+
+    @property
+    def nested(self) -> bool:
+        return self.depth > 1
+
+    def own(self, container: Any) -> Any:
+        if id(container) in self._owned:
+            return container
+        # copy() 保留 dict 子类（延迟解析的根节点）
+        fresh = container.copy() if isinstance(container, dict) else list(container)
+        self._owned.add(id(fresh))
+        return fresh
+
+
+def _index(container: Any, key: Key) -> Key:
+    # 物品路径里的列表下标是字符串
+    if isinstance(container, list) and isinstance(key, str) and key.isdigit():
+        return int(key)
+    return key
+
+
+def own_child(parent: Any, key: Key) -> Any:
+    """
+    Returns parent[key], copied first if it is a container still shared with an older snapshot.
+    parent itself must already be owned by the current edit (the edit root always is).
+    """
+    key = _index(parent, key)
+    child = parent[key]
+    edit = _current_edit.get()
+    if edit is None or not isinstance(child, (dict, list)):
+        return child
+    fresh = edit.own(child)
+    if fresh is not child:
+        parent[key] = fresh
+    return fresh
+
+
+def own_path(root: Any, path: List[Key]) -> Any:
+    """Walks path from the edit root, owning every container on the way; returns the last node."""
+    node = root
+    for key in path:
+        node = own_child(node, key)
+    return node
+
+
+def record_path(path: List[Key]):
+    """Remembers a modified path on the active edit so undo/redo can refresh the same regions."""
+    edit = _current_edit.get()
+    if edit is not None:
+        edit.paths.append(list(path))
+
+
+class SaveHistory:
+    """
+    撤销/重做栈。栈中每一项是 (修改前或修改后的根节点, 修改路径, 标签)，
+    各根节点之间共享未修改的子树。
+    """
+
+    def __init__(self, limit: int = 100):
+        self.limit = limit
+        self.loaded: Any = None
+        self._undo: List[Tuple[Any, List[List[Key]], str]] = []
+        self._redo: List[Tuple[Any, List[List[Key]], str]] = []
+
+    def reset(self, root: Any):
+        """Starts a fresh history at root (the state just loaded from disk)."""
+        self.loaded = root
+        self._undo.clear()
+        self._redo.clear()
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def undo_label(self) -> Optional[str]:
+        return self._undo[-1][2] if self._undo else None
+
+    @property
+    def redo_label(self) -> Optional[str]:
+        return self._redo[-1][2] if self._redo else None
+
+    @contextmanager
+    def edit(self, root: Any, label: str) -> Iterator[_Edit]:
+        """
+        Opens an edit on root; the yielded edit's .root is the copy to mutate.
+        Nested edits join the outer one. The edit becomes one undo step if it recorded any path;
+        if the body raises nothing is pushed, and the caller keeps the old root.
+        """
+        outer = _current_edit.get()
+        if outer is not None:
+            outer.depth += 1
+            try:
+                yield outer
+            finally:
+                outer.depth -= 1
+            return
+
+        edit = _Edit(label)
+        edit.root = edit.own(root) if isinstance(root, (dict, list)) else root
+        edit.depth = 1
+        token = _current_edit.set(edit)
+        try:
+            yield edit
+        finally:
+            _current_edit.reset(token)
+        if edit.paths:
+            self._push(self._undo, (root, edit.paths, label))
+            self._redo.clear()
+
+    def undo(self, current: Any) -> Optional[Tuple[Any, List[List[Key]], str]]:
+        """Returns (previous_root, paths_to_refresh, label), or None if there is nothing to undo."""
+        if not self._undo:
+            return None
+        root, paths, label = self._undo.pop()
+        self._push(self._redo, (current, paths, label))
+        return root, paths, label
+
+    def redo(self, current: Any) -> Optional[Tuple[Any, List[List[Key]], str]]:
+        if not self._redo:
+            return None
+        root, paths, label = self._redo.pop()
+        self._push(self._undo, (current, paths, label))
+        return root, paths, label
+
+    def revert(self, current: Any, label: str = "revert") -> Optional[Any]:
+        """Goes back to the loaded state as one undoable step. Returns the loaded root."""
+        if self.loaded is None or current is self.loaded:
+            return None
+        self._push(self._undo, (current, [[]], label))
+        self._redo.clear()
+        return self.loaded
+
+    def _push(self, stack: List, entry: Tuple[Any, List[List[Key]], str]):
+        stack.append(entry)
+        if self.limit and len(stack) > self.limit:
+            del stack[0]
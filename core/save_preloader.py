@@ -0,0 +1,141 @@
+# save_preloader.py
+"""
+存档预加载：在选择页选中存档时就在后台解密并解析，点击"打开"时直接换入。
+
+只保留最近的一个请求：选择改变后，正在进行的预加载会在下一个阶段边界放弃。
+准备好的结果放在一个很小的 LRU 中，打开前会核对文件大小和修改时间，文件变了就作废。
+备份只在真正打开时才写出（见 SaveGameController.adopt_prepared）。
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+Key = Tuple[str, str]
+
+
+class PreloadCancelled(Exception):
+    """预加载的目标已改变。"""
+
+
+class PreparedSave:
+    """一个已解密、已解析但尚未被控制器采用的存档。"""
+
+    __slots__ = ("path", "user_id", "size", "mtime_ns", "enc_data", "platform", "yaml_text", "document", "obj")
+
+    def __init__(self, path: Path, user_id: str, size: int, mtime_ns: int, enc_data: bytes,
+                 platform: str, yaml_text: str, document: Any, obj: Any):
+        self.path = Path(path)
+        self.user_id = user_id
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.enc_data = enc_data
+        self.platform = platform
+        self.yaml_text = yaml_text
+        self.document = document
+        self.obj = obj
+
+    def is_current(self) -> bool:
+        """True if the file on disk is still the one that was prepared."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+
+class SavePreloader:
+    """后台预加载线程 + 已准备存档的 LRU。"""
+
+    def __init__(self, prepare: Callable[..., PreparedSave], capacity: int = 3):
+        # prepare(path, user_id, check_cancelled) -> PreparedSave
+        self._prepare = prepare
+        self.capacity = capacity
+        self._cond = threading.Condition()
+        self._ready: "OrderedDict[Key, PreparedSave]" = OrderedDict()
+        self._target: Optional[Key] = None
+        self._busy: Optional[Key] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(path: Any, user_id: str) -> Key:
+        return str(Path(path).resolve()), (user_id or "").strip()
+
+    def request(self, path: Any, user_id: str):
+        """Starts preparing path in the background, superseding any earlier request."""
+        if not path or not (user_id or "").strip():
+            return
+        key = self._key(path, user_id)
+        with self._cond:
+            cached = self._ready.get(key)
+            if cached is not None:
+                if cached.is_current():
+                    self._ready.move_to_end(key)
+                    return
+                # 文件已改动：去掉过期的结果，否则后台线程会把它当作已准备好而不再重新加载
+                del self._ready[key]
+            self._target = key
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="save-preloader", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def cancel(self):
+        with self._cond:
+            self._target = None
+            self._cond.notify_all()
+
+    def take(self, path: Any, user_id: str, wait: bool = True) -> Optional[PreparedSave]:
+        """
+        Removes and returns the prepared save for path, waiting for it if it is being prepared right now.
+        Returns None if it is not available (the caller then loads it the normal way).
+        """
+        key = self._key(path, user_id)
+        with self._cond:
+            while wait and self._busy == key and self._target == key:
+                self._cond.wait()
+            prepared = self._ready.pop(key, None)
+            if self._target == key:
+                self._target = None
+        if prepared is not None and not prepared.is_current():
+            return None
+        return prepared
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._target is None or self._target in self._ready:
+                    if self._target is not None:
+                        self._target = None
+                    self._cond.wait(timeout=30)
+                    if self._target is None:
+                        # 空闲一段时间后退出，下次请求时重新启动
+                        self._thread = None
+                        return
+                key = self._target
+                self._busy = key
+
+            def check_cancelled():
+                if self._target != key:
+                    raise PreloadCancelled()
+
+            prepared = None
+            try:
+                prepared = self._prepare(Path(key[0]), key[1], check_cancelled)
+            except PreloadCancelled:
+                pass
+            except Exception as e:
+                # 预加载失败不报错，打开时会走正常流程并显示错误
+                print(f"预加载存档失败: {e}")
+
+            with self._cond:
+                self._busy = None
+                if prepared is not None and self._target == key:
+                    self._ready[key] = prepared
+                    while len(self._ready) > self.capacity:
+                        self._ready.popitem(last=False)
+                if self._target == key:
+                    self._target = None
+                self._cond.notify_all()
@@ -0,0 +1,173 @@
+# save_scanner.py
+"""
+带持久化索引的增量存档扫描器。
+
+索引按目录记录 (目录mtime, 子目录列表, .sav 文件的大小和mtime)。再次扫描时每个目录只
+stat 一次，mtime 没变就直接复用缓存，只有新增/删除/改名过文件的目录才会重新列出并 stat。
+游戏写存档时先写临时文件再改名，这会更新目录的 mtime；手动"刷新"时可以传 verify_files=True
+额外 stat 一遍已知的存档，以防文件被原地覆盖。
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import app_paths
+
+# 索引文件名，位于用户缓存目录（见 app_paths）
+INDEX_FILE = "scan_index.json"
+
+FileInfo = Dict[str, Any]
+
+
+def _file_info(full_path: str, platform_id: str, size: int, mtime_ns: int) -> FileInfo:
+    mtime = mtime_ns / 1e9
+    return {
+        "name": os.path.basename(full_path),
+        "id": platform_id,
+        "modified": datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S'),
+        "mtime": mtime,
+        "size_kb": size / 1024,
+        "full_path": full_path,
+    }
+
+
+class SaveScanner:
+    """扫描 SaveGames/<ID>/... 下的所有 .sav 文件，并在两次扫描之间报告变化。"""
+
+    def __init__(self, index_file: Optional[str] = None):
+        self.index_file = index_file or app_paths.cache_file(INDEX_FILE)
+        # 目录路径 -> {"mtime_ns": int, "subdirs": [name], "files": {name: [size, mtime_ns]}}
+        self._dirs: Dict[str, Dict[str, Any]] = self._load_index()
+        self._index_changed = False
+        # 上一次扫描结果，用于 poll() 计算差异
+        self._last: Dict[str, FileInfo] = {}
+        self._last_root: Optional[str] = None
+
+    # ── 索引持久化 ────────────────────────────────────────────────────────
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.index_file):
+            return {}
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get("dirs", {}) if isinstance(data, dict) else {}
+        except Exception as e:
+            print(f"Error loading scan index: {e}")
+            return {}
+
+    def _save_index(self):
+        if not self._index_changed:
+            return
+        try:
+            tmp = self.index_file + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "dirs": self._dirs}, f, ensure_ascii=False)
+            os.replace(tmp, self.index_file)
+            self._index_changed = False
+        except Exception as e:
+            print(f"Error saving scan index: {e}")
+
+    # ── 扫描 ──────────────────────────────────────────────────────────────
+
+    def scan(self, root: Path, verify_files: bool = False) -> List[FileInfo]:
+        """Returns every save under root, newest first, re-listing only directories that changed."""
+        found = self._collect(str(root), verify_files)
+        self._last = {info["full_path"]: info for info in found}
+        self._last_root = str(root)
+        self._save_index()
+        return sorted(found, key=lambda x: x["mtime"], reverse=True)
+
+    def poll(self, root: Path) -> Optional[Tuple[List[FileInfo], List[str], List[FileInfo]]]:
+        """
+        Rescans root using the index and returns (added, removed_paths, changed) relative to the
+        previous scan, or None if nothing changed. Roots other than the last scanned one are ignored.
+        """
+        if self._last_root != str(root):
+            return None
+        found = {info["full_path"]: info for info in self._collect(str(root), False)}
+        added = [info for path, info in found.items() if path not in self._last]
+        removed = [path for path in self._last if path not in found]
+        changed = [info for path, info in found.items()
+                   if path in self._last and (info["mtime"], info["size_kb"]) != (self._last[path]["mtime"], self._last[path]["size_kb"])]
+        self._last = found
+        self._save_index()
+        if not (added or removed or changed):
+            return None
+        return added, removed, changed
+
+    def _collect(self, root: str, verify_files: bool) -> List[FileInfo]:
+        found: List[FileInfo] = []
+        root_entry = self._refresh_dir(root)
+        if root_entry is None:
+            return found
+        for name in root_entry["subdirs"]:
+            if name.isalnum():  # 文件夹名通常是ID
+                self._walk(os.path.join(root, name), name, found, verify_files)
+        return found
+
+    def _walk(self, path: str, platform_id: str, found: List[FileInfo], verify_files: bool):
+        entry = self._refresh_dir(path)
+        if entry is None:
+            return
+        for name, (size, mtime_ns) in list(entry["files"].items()):
+            full_path = os.path.join(path, name)
+            if verify_files:
+                try:
+                    st = os.stat(full_path)
+                except FileNotFoundError:
+                    del entry["files"][name]
+                    self._index_changed = True
+                    continue
+                if [st.st_size, st.st_mtime_ns] != [size, mtime_ns]:
+                    size, mtime_ns = st.st_size, st.st_mtime_ns
+                    entry["files"][name] = [size, mtime_ns]
+                    self._index_changed = True
+            found.append(_file_info(full_path, platform_id, size, mtime_ns))
+        for name in entry["subdirs"]:
+            self._walk(os.path.join(path, name), platform_id, found, verify_files)
+
+    def _refresh_dir(self, path: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached listing of path, re-listing it only if its mtime changed."""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            if self._dirs.pop(path, None) is not None:
+                self._index_changed = True
+            return None
+        cached = self._dirs.get(path)
+        if cached is not None and cached["mtime_ns"] == mtime_ns:
+            return cached
+
+        subdirs: List[str] = []
+        files: Dict[str, List[int]] = {}
+        try:
+            with os.scandir(path) as it:
+                for item in it:
+                    try:
+                        if item.is_dir():
+                            subdirs.append(item.name)
+                        elif item.name.lower().endswith('.sav'):
+                            st = item.stat()
+                            files[item.name] = [st.st_size, st.st_mtime_ns]
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"扫描存档文件夹时出错: {e}")
+            return None
+        # 移除已不存在的子目录的缓存
+        if cached is not None:
+            for name in set(cached["subdirs"]) - set(subdirs):
+                self._forget(os.path.join(path, name))
+        entry = {"mtime_ns": mtime_ns, "subdirs": subdirs, "files": files}
+        self._dirs[path] = entry
+        self._index_changed = True
+        return entry
+
+    def _forget(self, path: str):
+        prefix = path + os.sep
+        for key in [k for k in self._dirs if k == path or k.startswith(prefix)]:
+            del self._dirs[key]
@@ -1,10 +1,10 @@
 import json
-from . import resource_loader
+from .localization import catalog
 import os
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit,
-    QTreeView, QAbstractItemView, QHeaderView, QFileDialog, QMessageBox
+    QTreeView, QAbstractItemView, QHeaderView, QFileDialog, QMessageBox, QComboBox
 )
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
 from PyQt6.QtCore import pyqtSignal, Qt
@@ -16,8 +16,15 @@ class SaveSelectorWidget(QWidget):
     """
     # 信号：存档路径，用户ID
     open_save_requested = pyqtSignal(str, str)
+    # 信号：选中的存档路径，用户ID（用于后台预加载）
+    save_selected = pyqtSignal(str, str)
     
     CONFIG_FILE = "config.json"
+    # 保存时的 zlib 压缩等级选项：(本地化键, 等级)
+    COMPRESSION_LEVELS = [("fast", 1), ("balanced", 6), ("max", 9)]
+    # 摘要列（来自后台索引），位于 ID 列之后
+    SUMMARY_COLUMNS = ["char_name", "char_class", "level", "cash", "items"]
+    SUMMARY_FIRST_COLUMN = 2
 
     def __init__(self, parent: QWidget = None):
         super().__init__(parent)
@@ -25,6 +32,7 @@ class SaveSelectorWidget(QWidget):
         self.current_save_files = [] # Store for language updates
         self.custom_save_path = None
         self.custom_backup_path = None
+        self.compression_level = 9
         self._load_config()
         self._load_localization()
 
@@ -40,11 +48,17 @@ class SaveSelectorWidget(QWidget):
         self.user_id_label = QLabel(self.loc['labels']['user_id_input'])
         self.user_id_input = QLineEdit()
         self.user_id_input.setPlaceholderText(self.loc['placeholders']['user_id_input'])
+
+        self.compression_label = QLabel(self.loc['labels'].get('compression', "Save Compression:"))
+        self.compression_combo = QComboBox()
+        self._fill_compression_combo()
         
         toolbar_layout.addWidget(self.refresh_button)
         toolbar_layout.addWidget(self.select_save_folder_btn)
         toolbar_layout.addWidget(self.select_backup_folder_btn)
         toolbar_layout.addStretch()
+        toolbar_layout.addWidget(self.compression_label)
+        toolbar_layout.addWidget(self.compression_combo)
         toolbar_layout.addWidget(self.user_id_label)
         toolbar_layout.addWidget(self.user_id_input)
         layout.addLayout(toolbar_layout)
@@ -83,6 +97,8 @@ class SaveSelectorWidget(QWidget):
         self.tree_view.doubleClicked.connect(self._on_tree_double_clicked)
         self.select_save_folder_btn.clicked.connect(self._on_select_save_folder_clicked)
         self.select_backup_folder_btn.clicked.connect(self._on_select_backup_folder_clicked)
+        self.compression_combo.currentIndexChanged.connect(self._on_compression_changed)
+        self.user_id_input.editingFinished.connect(self._emit_save_selected)
 
     def _load_config(self):
         if os.path.exists(self.CONFIG_FILE):
@@ -91,13 +107,15 @@ class SaveSelectorWidget(QWidget):
                     config = json.load(f)
                     self.custom_save_path = config.get("custom_save_path")
                     self.custom_backup_path = config.get("custom_backup_path")
+                    self.compression_level = config.get("compression_level", self.compression_level)
             except Exception as e:
                 print(f"Error loading config: {e}")
 
     def _save_config(self):
         config = {
             "custom_save_path": self.custom_save_path,
-            "custom_backup_path": self.custom_backup_path
+            "custom_backup_path": self.custom_backup_path,
+            "compression_level": self.compression_level
         }
         try:
             with open(self.CONFIG_FILE, 'w', encoding='utf-8') as f:
@@ -106,14 +124,14 @@ class SaveSelectorWidget(QWidget):
             print(f"Error saving config: {e}")
 
     def _load_localization(self):
-        filename = resource_loader.get_ui_localization_file(self.current_lang)
-        localized_data = resource_loader.load_json_resource(filename)
+        localized_data = catalog.ui(self.current_lang)
         if localized_data and "save_selector" in localized_data:
             self.loc = localized_data["save_selector"]
         else:
             # Fallback to hardcoded English if localization file is missing or invalid
             self.loc = {
-                "headers": {"file": "File", "user_id": "Platform 64bit ID", "modified": "Modified", "size": "Size", "path": "Path"},
+                "headers": {"file": "File", "user_id": "Platform 64bit ID", "modified": "Modified", "size": "Size", "path": "Path",
+                            "char_name": "Character", "char_class": "Class", "level": "Level", "cash": "Cash", "items": "Items"},
                 "buttons": {"refresh": "Refresh", "open": "Open Selected Save with ID", "select_save_folder": "Select Save Folder", "select_backup_folder": "Select Backup Folder"},
                 "labels": {
                     "user_id_input": "Manual User ID:", 
@@ -143,29 +161,78 @@ class SaveSelectorWidget(QWidget):
         self.current_save_files = save_files
         self.model.clear()
         headers = self.loc['headers']
-        self.set_header_labels([headers['file'], headers['user_id'], headers['modified'], headers['size'], headers['path']])
+        self.set_header_labels([headers['file'], headers['user_id']] +
+                               [headers.get(key, key) for key in self.SUMMARY_COLUMNS] +
+                               [headers['modified'], headers['size'], headers['path']])
 
         if not save_files:
             self.status_label.setText(self.loc['labels']['status_no_saves'])
             return
 
         for file_info in save_files:
-            row = [
-                QStandardItem(str(file_info.get("name", ""))),
-                QStandardItem(str(file_info.get("id", ""))),
-                QStandardItem(str(file_info.get("modified", ""))),
-                QStandardItem(f"{file_info.get('size_kb', 0):.1f} KB"),
-                QStandardItem(str(file_info.get("full_path", "")))
-            ]
-            
-            # Store full path and id in the first item for easy access
-            row[0].setData(str(file_info.get("full_path", "")), Qt.ItemDataRole.UserRole + 1)
-            row[0].setData(str(file_info.get("id", "")), Qt.ItemDataRole.UserRole + 2)
-            
-            self.model.appendRow(row)
+            self.model.appendRow(self._make_row(file_info))
         
         self.status_label.setText(self.loc['labels']['status_found_saves'].format(count=len(save_files)))
 
+    def _make_row(self, file_info: Dict[str, Any]) -> List[QStandardItem]:
+        row = [
+            QStandardItem(str(file_info.get("name", ""))),
+            QStandardItem(str(file_info.get("id", ""))),
+        ] + [QStandardItem(text) for text in self._summary_texts(file_info.get("summary"))] + [
+            QStandardItem(str(file_info.get("modified", ""))),
+            QStandardItem(f"{file_info.get('size_kb', 0):.1f} KB"),
+            QStandardItem(str(file_info.get("full_path", "")))
+        ]
+        
+        # Store full path and id in the first item for easy access
+        row[0].setData(str(file_info.get("full_path", "")), Qt.ItemDataRole.UserRole + 1)
+        row[0].setData(str(file_info.get("id", "")), Qt.ItemDataRole.UserRole + 2)
+        row[0].setData(file_info.get("mtime", 0), Qt.ItemDataRole.UserRole + 3)
+        return row
+
+    def _summary_texts(self, summary: Dict[str, Any] = None) -> List[str]:
+        if not summary:
+            return [""] * len(self.SUMMARY_COLUMNS)
+        if "error" in summary:
+            locked = self.loc['labels'].get('summary_locked', "(cannot decrypt)")
+            return [locked] + [""] * (len(self.SUMMARY_COLUMNS) - 1)
+        return [str(summary.get(key, "")) for key in self.SUMMARY_COLUMNS]
+
+    def set_summary(self, full_path: str, summary: Dict[str, Any]):
+        """后台索引完成一个存档后更新对应行的摘要列。"""
+        for file_info in self.current_save_files:
+            if file_info.get("full_path") == full_path:
+                file_info["summary"] = summary
+        for row in range(self.model.rowCount()):
+            if self.model.item(row, 0).data(Qt.ItemDataRole.UserRole + 1) == full_path:
+                for offset, text in enumerate(self._summary_texts(summary)):
+                    self.model.item(row, self.SUMMARY_FIRST_COLUMN + offset).setText(text)
+                break
+
+    def apply_scan_changes(self, added: List[Dict[str, Any]], removed: List[str], changed: List[Dict[str, Any]]):
+        """增量更新列表：只移除/插入变化的行，保持选中项和滚动位置。"""
+        gone = set(removed) | {info["full_path"] for info in changed}
+        for row in reversed(range(self.model.rowCount())):
+            if self.model.item(row, 0).data(Qt.ItemDataRole.UserRole + 1) in gone:
+                self.model.removeRow(row)
+
+        # 修改过的文件按新的修改时间重新插入到正确的位置（从新到旧）
+        for file_info in added + changed:
+            mtime = file_info.get("mtime", 0)
+            pos = self.model.rowCount()
+            for row in range(self.model.rowCount()):
+                if (self.model.item(row, 0).data(Qt.ItemDataRole.UserRole + 3) or 0) < mtime:
+                    pos = row
+                    break
+            self.model.insertRow(pos, self._make_row(file_info))
+
+        files = [f for f in self.current_save_files if f.get("full_path") not in gone] + added + changed
+        self.current_save_files = sorted(files, key=lambda x: x.get("mtime", 0), reverse=True)
+        if self.current_save_files:
+            self.status_label.setText(self.loc['labels']['status_found_saves'].format(count=len(self.current_save_files)))
+        else:
+            self.status_label.setText(self.loc['labels']['status_no_saves'])
+
     def update_language(self, lang):
         print(f"DEBUG: Updating language for {self.__class__.__name__} to {lang}...")
         self.current_lang = lang
@@ -178,6 +245,8 @@ class SaveSelectorWidget(QWidget):
         self.user_id_label.setText(self.loc['labels']['user_id_input'])
         self.user_id_input.setPlaceholderText(self.loc['placeholders']['user_id_input'])
         self.open_button.setText(self.loc['buttons']['open'])
+        self.compression_label.setText(self.loc['labels'].get('compression', "Save Compression:"))
+        self._fill_compression_combo()
         self._update_path_labels()
         
         # Re-render the list to update headers and status text
@@ -196,6 +265,17 @@ class SaveSelectorWidget(QWidget):
         # 如果手动输入框为空，则自动填充检测到的ID
         if not self.user_id_input.text().strip():
             self.user_id_input.setText(id_from_selection)
+        self._emit_save_selected()
+
+    def _emit_save_selected(self):
+        selection_model = self.tree_view.selectionModel()
+        if not selection_model.hasSelection():
+            return
+        selected_index = selection_model.selectedRows(0)[0]
+        file_path = self.model.itemFromIndex(selected_index).data(Qt.ItemDataRole.UserRole + 1)
+        user_id = self.user_id_input.text().strip()
+        if file_path and user_id:
+            self.save_selected.emit(file_path, user_id)
 
     def _on_select_save_folder_clicked(self):
         dir_path = QFileDialog.getExistingDirectory(self, self.loc['buttons']['select_save_folder'])
@@ -218,6 +298,25 @@ class SaveSelectorWidget(QWidget):
             self._save_config()
             self._update_path_labels()
 
+    def _fill_compression_combo(self):
+        names = self.loc.get('compression_levels', {})
+        self.compression_combo.blockSignals(True)
+        self.compression_combo.clear()
+        for key, level in self.COMPRESSION_LEVELS:
+            self.compression_combo.addItem(names.get(key, key.capitalize()), level)
+        index = self.compression_combo.findData(self.compression_level)
+        self.compression_combo.setCurrentIndex(index if index >= 0 else len(self.COMPRESSION_LEVELS) - 1)
+        self.compression_combo.blockSignals(False)
+
+    def _on_compression_changed(self, index):
+        level = self.compression_combo.itemData(index)
+        if level is not None and level != self.compression_level:
+            self.compression_level = level
+            self._save_config()
+
+    def get_compression_level(self):
+        return self.compression_level
+
     def get_custom_save_path(self):
         return self.custom_save_path
 
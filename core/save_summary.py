@@ -0,0 +1,184 @@
+# save_summary.py
+"""
+存档摘要索引：为存档选择页提供角色名、职业、等级、金钱和物品数量。
+
+每个存档只在内容变化后解密一次，摘要缓存在用户缓存目录的 summary_index.json 中，
+按 (路径, 大小, 修改时间) 判断是否过期。需要重新索引的存档在进程池中并行解密。
+扫描中不再出现的存档会从索引中删除。工作进程只用 save_codec 解密和加载，不创建控制器。
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import app_paths
+
+SUMMARY_CACHE_FILE = "summary_index.json"
+
+Summary = Dict[str, Any]
+
+
+def summarize_yaml(obj: Any) -> Summary:
+    """Pulls the selector columns out of a parsed save."""
+    from . import bl4_functions as bl4f
+    from .item_index import iter_serial_items
+    from .unlock_data import CHARACTER_CLASSES
+
+    if not isinstance(obj, dict):
+        return {}
+    state = obj.get("state", obj)
+    if not isinstance(state, dict):
+        state = obj
+
+    class_key = str(state.get("class", ""))
+    if class_key.startswith("Char_"):
+        class_key = class_key[5:]
+    class_info = CHARACTER_CLASSES.get(class_key, {})
+
+    exp_list = state.get("experience", [])
+    char_exp = next((item for item in exp_list if isinstance(item, dict) and item.get("type") == "Character"), {}) \
+        if isinstance(exp_list, list) else {}
+
+    cash = ""
+    cash_path = bl4f.find_currency_paths(obj).get("cash")
+    if cash_path:
+        try:
+            node = obj
+            for key in cash_path:
+                node = node[key]
+            cash = node
+        except (KeyError, IndexError, TypeError):
+            cash = ""
+
+    return {
+        "char_name": str(state.get("char_name", "")),
+        "char_class": class_info.get("class", class_key),
+        "level": char_exp.get("level", ""),
+        "cash": cash,
+        "items": sum(1 for _ in iter_serial_items(obj)),
+    }
+
+
+def summarize_save(path: str, user_id: str) -> Summary:
+    """Decrypts and summarizes one save. Runs in a worker process."""
+    from . import save_codec
+    try:
+        obj, platform_id, error = save_codec.decrypt_yaml(Path(path).read_bytes(), user_id)
+        if error is not None:
+            return {"error": str(error).split("\n")[0]}
+        summary = summarize_yaml(obj)
+        summary["platform"] = platform_id
+        return summary
+    except Exception as e:
+        return {"error": str(e).split("\n")[0]}
+
+
+class SummaryIndex:
+    """摘要的磁盘缓存与并行索引器。线程安全。"""
+
+    def __init__(self, cache_file: Optional[str] = None):
+        self.cache_file = cache_file or app_paths.cache_file(SUMMARY_CACHE_FILE)
+        self._lock = threading.Lock()
+        self._cancelled = False
+        # 路径 -> {"size_kb", "mtime", "user_id", "summary"}
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get("saves", {}) if isinstance(data, dict) else {}
+        except Exception as e:
+            print(f"Error loading summary index: {e}")
+            return {}
+
+    def _save(self):
+        with self._lock:
+            payload = {"version": 1, "saves": dict(self._entries)}
+        try:
+            tmp = self.cache_file + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp, self.cache_file)
+        except Exception as e:
+            print(f"Error saving summary index: {e}")
+
+    def attach(self, files: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Sets file_info["summary"] from the cache for every up-to-date file and returns
+        (path, user_id) jobs for the files that need (re)indexing.
+        """
+        jobs = []
+        with self._lock:
+            for info in files:
+                path = info.get("full_path")
+                entry = self._entries.get(path)
+                fresh = entry is not None and entry["size_kb"] == info.get("size_kb") and entry["mtime"] == info.get("mtime")
+                # 用错误的ID解密失败时，换了ID就重试
+                if fresh and "error" in entry["summary"] and entry["user_id"] != info.get("id"):
+                    fresh = False
+                if fresh:
+                    info["summary"] = entry["summary"]
+                else:
+                    jobs.append((path, str(info.get("id", ""))))
+        return jobs
+
+    def retain(self, paths: Iterable[str]):
+        """Drops the entries of every save not in paths (the result of a full scan)."""
+        keep = set(paths)
+        with self._lock:
+            stale = [path for path in self._entries if path not in keep]
+            for path in stale:
+                del self._entries[path]
+        if stale:
+            self._save()
+
+    def discard(self, paths: Iterable[str]):
+        """Drops the entries of deleted saves."""
+        with self._lock:
+            removed = [path for path in paths if self._entries.pop(path, None) is not None]
+        if removed:
+            self._save()
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self, jobs: List[Tuple[str, str]], on_result: Callable[[str, Summary], None],
+            max_workers: Optional[int] = None):
+        """Indexes jobs in parallel worker processes, calling on_result(path, summary) as each finishes."""
+        if not jobs:
+            return
+        self._cancelled = False
+        workers = max(1, min(len(jobs), max_workers or os.cpu_count() or 1))
+        stats = {}
+        for path, _ in jobs:
+            try:
+                st = os.stat(path)
+                stats[path] = (st.st_size / 1024, st.st_mtime_ns / 1e9)
+            except OSError:
+                continue
+
+        from concurrent.futures import ProcessPoolExecutor, as_completed  # 只在需要时导入（multiprocessing 较慢）
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(summarize_save, path, user_id): (path, user_id)
+                       for path, user_id in jobs if path in stats}
+            for future in as_completed(futures):
+                if self._cancelled:
+                    break
+                path, user_id = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    summary = {"error": str(e)}
+                size_kb, mtime = stats[path]
+                with self._lock:
+                    self._entries[path] = {"size_kb": size_kb, "mtime": mtime, "user_id": user_id, "summary": summary}
+                on_result(path, summary)
+        finally:
+            executor.shutdown(wait=not self._cancelled, cancel_futures=True)
+            self._save()
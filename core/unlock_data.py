@@ -1,6 +1,10 @@
 import base64
+import hashlib
+import marshal
+import os
+import threading
 import zlib
-import yaml
+from pathlib import Path
 
 # --- Compressed Blobs from blobs.js ---
 
@@ -23,6 +27,7 @@ def decompress_blob(blob_str):
 
 def load_yaml_blob(blob_str):
     """Loads and parses a compressed YAML blob into a Python object."""
+    import yaml  # 只在需要解析（缓存未命中）时才导入
     decompressed_text = decompress_blob(blob_str)
     if decompressed_text:
         try:
@@ -40,12 +45,73 @@ def load_array_blob(blob_str):
     return []
 
 # --- Loaded Data ---
+# 这些数据在第一次访问 unlock_data.COLLECTIBLES 等属性时才解压和解析（模块级 __getattr__），
+# 解析结果用 marshal 缓存在 __pycache__ 中，以后启动时直接读取，跳过 base64/zlib/YAML。
+# 缓存文件名包含数据的哈希，数据更新后自动失效；目录不可写（例如打包后的程序）时不使用缓存。
 
-COLLECTIBLES = load_yaml_blob(COLLECTIBLES_COMPRESSED)
-MISSIONSETS = load_yaml_blob(MISSIONSETS_COMPRESSED)
-UNLOCKABLES = load_yaml_blob(UNLOCKABLES_COMPRESSED)
-LOCATIONS = load_array_blob(LOCATIONS_COMPRESSED)
-# REWARDS = load_array_blob(REWARDS_COMPRESSED) # Not used in logic
+_BLOBS = {
+    'COLLECTIBLES': (lambda: COLLECTIBLES_COMPRESSED, load_yaml_blob),
+    'MISSIONSETS': (lambda: MISSIONSETS_COMPRESSED, load_yaml_blob),
+    'UNLOCKABLES': (lambda: UNLOCKABLES_COMPRESSED, load_yaml_blob),
+    'LOCATIONS': (lambda: LOCATIONS_COMPRESSED, load_array_blob),
+    # 'REWARDS': (lambda: REWARDS_COMPRESSED, load_array_blob),  # Not used in logic
+}
+CACHE_DIR = Path(__file__).parent / '__pycache__'
+_load_lock = threading.Lock()
+
+def _cache_path(name, blob_str):
+    digest = hashlib.sha1(blob_str.encode('ascii')).hexdigest()[:16]
+    return CACHE_DIR / f'unlock_data.{name}.{digest}.marshal'
+
+def _read_cache(path):
+    try:
+        with open(path, 'rb') as f:
+            return marshal.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error reading unlock data cache {path.name}: {e}")
+        return None
+
+def _write_cache(path, value):
+    tmp = None
+    try:
+        data = marshal.dumps(value)
+        path.parent.mkdir(exist_ok=True)
+        # 每个写入者用自己的临时文件（批处理的多个工作进程会同时写同一个缓存）
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        tmp = None
+        # 删除旧数据留下的缓存
+        for old in path.parent.glob(f"{path.name.rsplit('.', 2)[0]}.*.marshal"):
+            if old != path:
+                old.unlink()
+    except (OSError, ValueError):
+        if tmp is not None:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+def _load(name):
+    blob, parse = _BLOBS[name]
+    blob_str = blob()
+    path = _cache_path(name, blob_str)
+    value = _read_cache(path)
+    if value is None:
+        value = parse(blob_str)
+        if value is not None:
+            _write_cache(path, value)
+    return value
+
+def __getattr__(name):
+    if name not in _BLOBS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _load_lock:
+        if name not in globals():
+            globals()[name] = _load(name)
+    return globals()[name]
 
 # --- Constants from ui.js ---
 
@@ -1,21 +1,21 @@
 import uuid
-import copy
-from .unlock_data import (
-    COLLECTIBLES, MISSIONSETS, UNLOCKABLES, LOCATIONS,
-    CHARACTER_CLASSES, MAX_LEVEL, SAFEHOUSE_SILO_LOCATIONS
-)
+from . import unlock_data
+from .unlock_templates import templates
+from .unlock_data import CHARACTER_CLASSES, MAX_LEVEL, SAFEHOUSE_SILO_LOCATIONS
+from .save_history import own_child
 
 # --- Helper Functions ---
+# 返回的容器可以直接修改：在撤销事务中会先复制与旧快照共享的节点
 
 def get_or_create_dict(d, key):
     if key not in d or not isinstance(d[key], dict):
         d[key] = {}
-    return d[key]
+    return own_child(d, key)
 
 def get_or_create_list(d, key):
     if key not in d or not isinstance(d[key], list):
         d[key] = []
-    return d[key]
+    return own_child(d, key)
 
 # --- Exploration Logic ---
 
@@ -94,7 +94,7 @@ def add_discovered_locations(data, location_substrings):
     existing = [x for x in re.split(r':\d:', existing_blob) if x]
     
     merged = set(existing)
-    for line in LOCATIONS:
+    for line in unlock_data.LOCATIONS:
         for substr in location_substrings:
             if substr in line:
                 merged.add(line)
@@ -106,10 +106,12 @@ def discover_all_locations(data):
     add_discovered_locations(data, [''])
     complete_discovery_achievements(data)
 
-def discover_safehouse_locations(data):
+def safehouse_location_substrings():
     prefix = 'DLMD_World_P_PoAActor_UAID_'
-    location_substrings = [prefix + id_ for id_ in SAFEHOUSE_SILO_LOCATIONS]
-    add_discovered_locations(data, location_substrings)
+    return [prefix + id_ for id_ in SAFEHOUSE_SILO_LOCATIONS]
+
+def discover_safehouse_locations(data):
+    add_discovered_locations(data, safehouse_location_substrings())
 
 # --- Counters & Collectibles Logic ---
 
@@ -131,11 +133,15 @@ def update_stats_counters(data, counters, category='challenge'):
                 cat_dict[key] = value
 
 def complete_all_collectibles(data):
+    merge_collectibles(data)
+    update_sdu_points(data)
+
+def merge_collectibles(data):
     stats = get_or_create_dict(data, 'stats')
     openworld = get_or_create_dict(stats, 'openworld')
     collectibles = get_or_create_dict(openworld, 'collectibles')
     
-    for category, values in COLLECTIBLES.items():
+    for category, values in unlock_data.COLLECTIBLES.items():
         if isinstance(values, dict):
             cat_dict = get_or_create_dict(collectibles, category)
             for k, v in values.items():
@@ -151,8 +157,6 @@ def complete_all_collectibles(data):
     # Eridian/Nyriad ECHO logs
     state = get_or_create_dict(data, 'state')
     state['seen_eridium_logs'] = 262143
-    
-    update_sdu_points(data)
 
 def unlock_vault_powers(data):
     stats = get_or_create_dict(data, 'stats')
@@ -164,12 +168,14 @@ def unlock_vault_powers(data):
     collectibles['vaultpower_mountains'] = 1
 
 def unlock_postgame(data):
+    set_postgame_globals(data)
+    complete_uvh_challenges(data)
+    merge_missionsets_with_prefix(data, 'missionset_main_postgame')
+
+def set_postgame_globals(data):
     globals_ = get_or_create_dict(data, 'globals')
     globals_['highest_unlocked_vault_hunter_level'] = 5
     globals_['vault_hunter_level'] = 1
-    
-    complete_uvh_challenges(data)
-    merge_missionsets_with_prefix(data, 'missionset_main_postgame')
 
 def set_story_values(data):
     globals_ = get_or_create_dict(data, 'globals')
@@ -189,20 +195,21 @@ def set_story_values(data):
 # --- Missions Logic ---
 
 def get_missionsets_with_prefix(prefix):
+    # prefix 也可以是前缀元组（str.startswith 的规则），一次遍历取出所有匹配的任务集
     result = {}
-    for key, value in MISSIONSETS.items():
+    for key, value in unlock_data.MISSIONSETS.items():
         if key.startswith(prefix):
             result[key] = value
     return result
 
 def merge_missionsets_with_prefix(data, prefix):
-    filtered_missionsets = get_missionsets_with_prefix(prefix)
-    
     missions = get_or_create_dict(data, 'missions')
     local_sets = get_or_create_dict(missions, 'local_sets')
     
-    for key, value in filtered_missionsets.items():
-        local_sets[key] = copy.deepcopy(value)
+    # 从共享的冻结模板实例化，不再 deepcopy
+    for key, template in templates('MISSIONSETS').items():
+        if key.startswith(prefix):
+            local_sets[key] = template.instantiate()
 
 def complete_all_missions(data):
     merge_missionsets_with_prefix(data, 'missionset_')
@@ -266,8 +273,9 @@ def open_all_vault_doors(data):
     collectibles = get_or_create_dict(openworld, 'collectibles')
     
     for category in ['vaultdoor', 'vaultlock']:
-        if category in COLLECTIBLES and isinstance(COLLECTIBLES[category], dict):
-             collectibles[category] = copy.deepcopy(COLLECTIBLES[category])
+        template = templates('COLLECTIBLES').get(category)
+        if template is not None and template.is_mapping:
+            collectibles[category] = template.instantiate()
 
 # --- Progression Logic ---
 
@@ -322,12 +330,17 @@ def update_sdu_points(data):
         point_pools['echotokenprogresspoints'] = point_total
 
 def unlock_all_specialization(data):
+    max_specialization(data)
+    stage_epilogue_mission(data)
+
+def max_specialization(data):
     state = get_or_create_dict(data, 'state')
     experience = get_or_create_list(state, 'experience')
     
     found = False
-    for exp in experience:
+    for i, exp in enumerate(experience):
         if exp.get('type') == 'Specialization':
+            exp = own_child(experience, i)
             exp['level'] = 701
             exp['points'] = 7431910510
             found = True
@@ -338,7 +351,8 @@ def unlock_all_specialization(data):
     progression = get_or_create_dict(data, 'progression')
     graphs = get_or_create_list(progression, 'graphs')
     
-    graph = next((g for g in graphs if g.get('name') == 'ProgressGraph_Specializations'), None)
+    graph_idx = next((i for i, g in enumerate(graphs) if g.get('name') == 'ProgressGraph_Specializations'), None)
+    graph = own_child(graphs, graph_idx) if graph_idx is not None else None
     if not graph:
         graph = {
             'name': 'ProgressGraph_Specializations',
@@ -364,8 +378,6 @@ def unlock_all_specialization(data):
     
     point_pools = get_or_create_dict(progression, 'point_pools')
     point_pools['specializationtokenpool'] = 700
-    
-    stage_epilogue_mission(data)
 
 def set_character_to_max_level(data):
     set_character_level(data, MAX_LEVEL)
@@ -404,9 +416,10 @@ def set_character_level(data, level):
             break
     
     if idx != -1:
-        experience[idx]['level'] = level
+        char_exp = own_child(experience, idx)
+        char_exp['level'] = level
         if xp > 0:
-            experience[idx]['points'] = xp
+            char_exp['points'] = xp
 
     progression = get_or_create_dict(data, 'progression')
     point_pools = get_or_create_dict(progression, 'point_pools')
@@ -512,72 +525,80 @@ def complete_all_challenges(data):
     complete_licensed_parts_challenges(data)
     complete_phosphene_challenges(data)
 
+UVH_CHALLENGES = {
+    'mission_uvh_1a': 1, 'mission_uvh_1b': 1, 'mission_uvh_1c': 1,
+    'mission_uvh_2a': 1, 'mission_uvh_2b': 1, 'mission_uvh_2c': 1, 'mission_uvh_2d': 1,
+    'mission_uvh_3a': 1, 'mission_uvh_3b': 1, 'mission_uvh_3c': 1, 'mission_uvh_3d': 1,
+    'mission_uvh_4a': 1, 'mission_uvh_4b': 1, 'mission_uvh_4c': 1, 'mission_uvh_4d': 1,
+    'mission_uvh_5a': 1, 'mission_uvh_5b': 1, 'mission_uvh_5c': 1,
+    'uvh_1_finalchallenge': 1, 'uvh_2_finalchallenge': 1,
+    'uvh_3_finalchallenge': 1, 'uvh_4_finalchallenge': 1, 'uvh_5_finalchallenge': 1,
+}
+
 def complete_uvh_challenges(data):
-    counters = {
-        'mission_uvh_1a': 1, 'mission_uvh_1b': 1, 'mission_uvh_1c': 1,
-        'mission_uvh_2a': 1, 'mission_uvh_2b': 1, 'mission_uvh_2c': 1, 'mission_uvh_2d': 1,
-        'mission_uvh_3a': 1, 'mission_uvh_3b': 1, 'mission_uvh_3c': 1, 'mission_uvh_3d': 1,
-        'mission_uvh_4a': 1, 'mission_uvh_4b': 1, 'mission_uvh_4c': 1, 'mission_uvh_4d': 1,
-        'mission_uvh_5a': 1, 'mission_uvh_5b': 1, 'mission_uvh_5c': 1,
-        'uvh_1_finalchallenge': 1, 'uvh_2_finalchallenge': 1,
-        'uvh_3_finalchallenge': 1, 'uvh_4_finalchallenge': 1, 'uvh_5_finalchallenge': 1,
-    }
-    update_stats_counters(data, counters)
+    update_stats_counters(data, UVH_CHALLENGES)
+
+COMBAT_CHALLENGES = {
+    'general_kill_enemies': 8000, 'general_kill_badass': 500, 'general_kill_crit': 2000,
+    'repkit_uses': 500, 'general_kill_melee': 2000, 'general_kill_groundpound': 200,
+    'general_kill_sliding': 1500, 'general_kill_dashing': 1000, 'general_kill_airborne': 1000,
+    'repkit_lifesteal': 900000, 'revivepartner': 200, 'secondwind': 200, 'secondwindbadassboss': 60,
+}
 
 def complete_combat_challenges(data):
-    counters = {
-        'general_kill_enemies': 8000, 'general_kill_badass': 500, 'general_kill_crit': 2000,
-        'repkit_uses': 500, 'general_kill_melee': 2000, 'general_kill_groundpound': 200,
-        'general_kill_sliding': 1500, 'general_kill_dashing': 1000, 'general_kill_airborne': 1000,
-        'repkit_lifesteal': 900000, 'revivepartner': 200, 'secondwind': 200, 'secondwindbadassboss': 60,
-    }
-    update_stats_counters(data, counters)
+    update_stats_counters(data, COMBAT_CHALLENGES)
+
+CHARACTER_CHALLENGES = {
+    'siren_death_tiered': 1000, 'siren_death_single': 1,
+    'siren_demonology_tiered': 1000, 'siren_demonology_single': 1,
+    'siren_duplicate_tiered': 1000, 'siren_duplicate_single': 1, 'siren_levelup': 50,
+    'exo_autolock_tiered': 1000, 'exo_autolock_single': 1,
+    'exo_buster_tiered': 1000, 'exo_buster_single': 1,
+    'exo_heavyarms_tiered': 1000, 'exo_heavyarms_single': 1, 'exo_levelup': 50,
+    'gravitar_terminal_tiered': 1000, 'gravitar_terminal_single': 1,
+    'gravitar_stasis_tiered': 1000, 'gravitar_stasis_single': 1,
+    'gravitar_exodus_tiered': 1000, 'gravitar_exodus_single': 1, 'gravitar_levelup': 50,
+    'paladin_cybernetics_tiered': 1000, 'paladin_cybernetics_single': 1,
+    'paladin_vengeance_tiered': 1000, 'paladin_vengeance_single': 1,
+    'paladin_weaponmaster_tiered': 1000, 'paladin_weaponmaster_single': 1, 'paladin_levelup': 50,
+}
 
 def complete_character_challenges(data):
-    counters = {
-        'siren_death_tiered': 1000, 'siren_death_single': 1,
-        'siren_demonology_tiered': 1000, 'siren_demonology_single': 1,
-        'siren_duplicate_tiered': 1000, 'siren_duplicate_single': 1, 'siren_levelup': 50,
-        'exo_autolock_tiered': 1000, 'exo_autolock_single': 1,
-        'exo_buster_tiered': 1000, 'exo_buster_single': 1,
-        'exo_heavyarms_tiered': 1000, 'exo_heavyarms_single': 1, 'exo_levelup': 50,
-        'gravitar_terminal_tiered': 1000, 'gravitar_terminal_single': 1,
-        'gravitar_stasis_tiered': 1000, 'gravitar_stasis_single': 1,
-        'gravitar_exodus_tiered': 1000, 'gravitar_exodus_single': 1, 'gravitar_levelup': 50,
-        'paladin_cybernetics_tiered': 1000, 'paladin_cybernetics_single': 1,
-        'paladin_vengeance_tiered': 1000, 'paladin_vengeance_single': 1,
-        'paladin_weaponmaster_tiered': 1000, 'paladin_weaponmaster_single': 1, 'paladin_levelup': 50,
-    }
-    update_stats_counters(data, counters)
+    update_stats_counters(data, CHARACTER_CHALLENGES)
+
+ENEMY_CHALLENGES = {
+    'killenemyarmy_bandits': 5000, 'killenemytype_psycho': 1500, 'killenemytype_guntoter': 1250,
+    'killenemytype_splice': 750, 'killenemytype_meathead': 300, 'killenemytype_phalanx': 250,
+    'killenemyarmy_creatures': 4500, 'killenemytype_cat': 1500, 'killenemytype_bat': 500,
+    'killenemytype_beast': 750, 'killenemytype_creep': 750, 'killenemytype_pangolin': 750,
+    'killenemytype_thresher': 750, 'killenemyarmy_order': 4000, 'killenemytype_grunt': 1500,
+    'killenemytype_soldier': 1500, 'killenemytype_striker': 1500, 'killenemytype_drone': 350,
+    'killenemytype_leader': 750, 'killenemytype_brute': 600, 'general_kill_corrupted': 200,
+}
 
 def complete_enemies_challenges(data):
-    counters = {
-        'killenemyarmy_bandits': 5000, 'killenemytype_psycho': 1500, 'killenemytype_guntoter': 1250,
-        'killenemytype_splice': 750, 'killenemytype_meathead': 300, 'killenemytype_phalanx': 250,
-        'killenemyarmy_creatures': 4500, 'killenemytype_cat': 1500, 'killenemytype_bat': 500,
-        'killenemytype_beast': 750, 'killenemytype_creep': 750, 'killenemytype_pangolin': 750,
-        'killenemytype_thresher': 750, 'killenemyarmy_order': 4000, 'killenemytype_grunt': 1500,
-        'killenemytype_soldier': 1500, 'killenemytype_striker': 1500, 'killenemytype_drone': 350,
-        'killenemytype_leader': 750, 'killenemytype_brute': 600, 'general_kill_corrupted': 200,
-    }
-    update_stats_counters(data, counters)
+    update_stats_counters(data, ENEMY_CHALLENGES)
+
+LOOT_CHALLENGES = {
+    'loot_anylootable': 2500, 'loot_redchest': 250, 'getcash': 3000000, 'geteridium': 10000,
+    'loot_whites': 200, 'loot_greens': 200, 'loot_blues': 150, 'loot_purples': 75,
+    'loot_legendaries': 25, 'loot_weapons': 500, 'loot_gadgets': 200, 'loot_shields': 200,
+    'loot_repkits': 200, 'loot_classmods': 200, 'loot_enhancements': 200,
+}
 
 def complete_loot_challenges(data):
-    counters = {
-        'loot_anylootable': 2500, 'loot_redchest': 250, 'getcash': 3000000, 'geteridium': 10000,
-        'loot_whites': 200, 'loot_greens': 200, 'loot_blues': 150, 'loot_purples': 75,
-        'loot_legendaries': 25, 'loot_weapons': 500, 'loot_gadgets': 200, 'loot_shields': 200,
-        'loot_repkits': 200, 'loot_classmods': 200, 'loot_enhancements': 200,
-    }
-    update_stats_counters(data, counters)
+    update_stats_counters(data, LOOT_CHALLENGES)
+
+WORLD_ACHIEVEMENTS = {
+    '10_worldevents_colosseum': 1, '11_worldevents_airship': 1,
+    '12_worldevents_meteor': 1, '24_missions_side': 98,
+}
 
 def complete_world_challenges(data):
-    counters = {
-        '10_worldevents_colosseum': 1, '11_worldevents_airship': 1,
-        '12_worldevents_meteor': 1, '24_missions_side': 98,
-    }
-    update_stats_counters(data, counters, 'achievements')
-    
+    update_stats_counters(data, WORLD_ACHIEVEMENTS, 'achievements')
+    catch_all_fish(data)
+
+def catch_all_fish(data):
     stats = get_or_create_dict(data, 'stats')
     openworld = get_or_create_dict(stats, 'openworld')
     misc = get_or_create_dict(openworld, 'misc')
@@ -585,152 +606,161 @@ def complete_world_challenges(data):
     if prev_fish is None or prev_fish < 50:
         misc['fish'] = 50
 
+ECONOMY_CHALLENGES = {
+    'economy_maxheld_cash': 1, 'economy_maxheld_morecash': 1,
+    'economy_upgrade_inventory': 1, 'economy_upgrade_inventory_all': 1,
+    'economy_sellloot': 500, 'economy_firmware_set': 1,
+}
+
 def complete_economy_challenges(data):
-    counters = {
-        'economy_maxheld_cash': 1, 'economy_maxheld_morecash': 1,
-        'economy_upgrade_inventory': 1, 'economy_upgrade_inventory_all': 1,
-        'economy_sellloot': 500, 'economy_firmware_set': 1,
-    }
-    update_stats_counters(data, counters)
+    update_stats_counters(data, ECONOMY_CHALLENGES)
+
+ELEMENTAL_CHALLENGES = {
+    'kill_elemental_fire': 2500, 'kill_elemental_shock': 2000,
+    'kill_elemental_corrosive': 1600, 'kill_elemental_radiation': 2500,
+    'kill_elemental_cryo': 1000, 'kill_2_status': 5,
+}
 
 def complete_elemental_challenges(data):
-    counters = {
-        'kill_elemental_fire': 2500, 'kill_elemental_shock': 2000,
-        'kill_elemental_corrosive': 1600, 'kill_elemental_radiation': 2500,
-        'kill_elemental_cryo': 1000, 'kill_2_status': 5,
-    }
-    update_stats_counters(data, counters)
+    update_stats_counters(data, ELEMENTAL_CHALLENGES)
+
+WEAPON_CHALLENGES = {
+    'pistol_kill': 2000, 'pistol_kill_secondwind': 75, 'pistol_hit_crit': 5000,
+    'pistol_kill_crit': 750, 'pistol_kill_scoped': 750, 'pistol_kill_gliding': 400,
+    'smg_kill': 2000, 'smg_kill_secondwind': 75, 'smg_hit_crit': 10000,
+    'smg_kill_crit': 1000, 'smg_kill_dashing': 1500, 'smg_kill_sliding': 750,
+    'assault_kill': 2500, 'assault_kill_secondwind': 75, 'assault_hit_crit': 7500,
+    'assault_kill_crit': 1000, 'assault_kill_scoped': 1500, 'assault_kill_crouched': 500,
+    'shotgun_kill': 2000, 'shotgun_kill_secondwind': 75, 'shotgun_hit_crit': 5000,
+    'shotgun_kill_crit': 750, 'shotgun_kill_sliding': 1000, 'shotgun_kill_dashing': 1000,
+    'shotgun_kill_close': 1500, 'shotgun_kill_distant': 600, 'shotgun_bigshot': 1,
+    'sniper_kill': 2000, 'sniper_kill_secondwind': 75, 'sniper_hit_crit': 4500,
+    'sniper_kill_crit': 750, 'sniper_kill_distant': 1000, 'sniper_kill_oneshot': 150,
+    'sniper_kill_unaware': 300, 'sniper_kill_unscoped': 200, 'sniper_bigshot': 1,
+}
 
 def complete_weapon_challenges(data):
-    counters = {
-        'pistol_kill': 2000, 'pistol_kill_secondwind': 75, 'pistol_hit_crit': 5000,
-        'pistol_kill_crit': 750, 'pistol_kill_scoped': 750, 'pistol_kill_gliding': 400,
-        'smg_kill': 2000, 'smg_kill_secondwind': 75, 'smg_hit_crit': 10000,
-        'smg_kill_crit': 1000, 'smg_kill_dashing': 1500, 'smg_kill_sliding': 750,
-        'assault_kill': 2500, 'assault_kill_secondwind': 75, 'assault_hit_crit': 7500,
-        'assault_kill_crit': 1000, 'assault_kill_scoped': 1500, 'assault_kill_crouched': 500,
-        'shotgun_kill': 2000, 'shotgun_kill_secondwind': 75, 'shotgun_hit_crit': 5000,
-        'shotgun_kill_crit': 750, 'shotgun_kill_sliding': 1000, 'shotgun_kill_dashing': 1000,
-        'shotgun_kill_close': 1500, 'shotgun_kill_distant': 600, 'shotgun_bigshot': 1,
-        'sniper_kill': 2000, 'sniper_kill_secondwind': 75, 'sniper_hit_crit': 4500,
-        'sniper_kill_crit': 750, 'sniper_kill_distant': 1000, 'sniper_kill_oneshot': 150,
-        'sniper_kill_unaware': 300, 'sniper_kill_unscoped': 200, 'sniper_bigshot': 1,
-    }
-    update_stats_counters(data, counters)
+    update_stats_counters(data, WEAPON_CHALLENGES)
+
+EQUIPMENT_CHALLENGES = {
+    'killenemy_grenade': 1000, 'killenemy_grenade_multikill': 300,
+    'killenemy_grenade_mirv': 400, 'killenemy_grenade_artillery': 450,
+    'killenemy_grenade_lingering': 300, 'killenemy_grenade_singularity': 500,
+    'killenemy_grenade_amp': 300,
+    'shield_take_damage': 2000000, 'shield_kills': 750, 'shield_pickup_boosters': 1000,
+    'shield_pickup_shards': 1000, 'shield_kills_nova': 200, 'shield_kills_reflect': 200,
+    'shield_absorb_ammo': 5000, 'shield_kills_amp': 500,
+    'killenemy_heavy_vladof': 250, 'killenemy_heavy_vladof_multikill': 100,
+    'killenemy_heavy_maliwan': 350, 'killenemy_heavy_maliwan_bigshot': 1,
+    'killenemy_heavy_torgue': 300, 'killenemy_heavy_torgue_directhit': 100,
+    'killenemy_heavy_borg': 400, 'killenemy_heavy_borg_multikill': 100,
+    'repkit_healself': 400000, 'repkit_kills': 250, 'repkit_healothers': 400000,
+}
 
 def complete_equipment_challenges(data):
-    counters = {
-        'killenemy_grenade': 1000, 'killenemy_grenade_multikill': 300,
-        'killenemy_grenade_mirv': 400, 'killenemy_grenade_artillery': 450,
-        'killenemy_grenade_lingering': 300, 'killenemy_grenade_singularity': 500,
-        'killenemy_grenade_amp': 300,
-        'shield_take_damage': 2000000, 'shield_kills': 750, 'shield_pickup_boosters': 1000,
-        'shield_pickup_shards': 1000, 'shield_kills_nova': 200, 'shield_kills_reflect': 200,
-        'shield_absorb_ammo': 5000, 'shield_kills_amp': 500,
-        'killenemy_heavy_vladof': 250, 'killenemy_heavy_vladof_multikill': 100,
-        'killenemy_heavy_maliwan': 350, 'killenemy_heavy_maliwan_bigshot': 1,
-        'killenemy_heavy_torgue': 300, 'killenemy_heavy_torgue_directhit': 100,
-        'killenemy_heavy_borg': 400, 'killenemy_heavy_borg_multikill': 100,
-        'repkit_healself': 400000, 'repkit_kills': 250, 'repkit_healothers': 400000,
-    }
-    update_stats_counters(data, counters)
+    update_stats_counters(data, EQUIPMENT_CHALLENGES)
+
+MANUFACTURER_CHALLENGES = {
+    'manufacturer_jakobs_kills': 2000, 'manufacturer_jakobs_underbarrel_kills': 175,
+    'manufacturer_jakobs_ricochetkills': 150, 'manufacturer_jakobs_oneshot': 500,
+    'manufacturer_jakobs_quickdraw': 350, 'manufacturer_jakobs_grenadecrits': 400,
+    'manufacturer_daedalus_kills': 2000, 'manufacturer_daedalus_underbarrel_kills': 150,
+    'manufacturer_daedalus_multiloader_pistol': 500, 'manufacturer_daedalus_multiloader_smg': 750,
+    'manufacturer_daedalus_multiloader_assault': 600, 'manufacturer_daedalus_multiloader_shotgun': 400,
+    'manufacturer_daedalus_multiloader_sniper': 400,
+    'manufacturer_vladof_kills': 2000, 'manufacturer_vladof_extrabarrel': 750,
+    'manufacturer_vladof_explosive_underbarrel': 175, 'manufacturer_vladof_bipod': 750,
+    'manufacturer_vladof_shotgun_underbarrel': 150,
+    'manufacturer_maliwan_kills': 2000, 'manufacturer_maliwan_underbarrel_kills': 175,
+    'manufacturer_maliwan_status_fire': 750, 'manufacturer_maliwan_status_shock': 750,
+    'manufacturer_maliwan_status_corrosive': 400, 'manufacturer_maliwan_status_radiation': 400,
+    'manufacturer_maliwan_status_cryo': 750,
+    'manufacturer_tediore_kills': 1500, 'manufacturer_tediore_underbarrel_kills': 150,
+    'manufacturer_tediore_emptyreload_kills': 750, 'manufacturer_tediore_fullreload_kills': 600,
+    'manufacturer_tediore_comboreload_kills': 200, 'manufacturer_tediore_turret_kills': 500,
+    'manufacturer_torgue_kills': 1300, 'manufacturer_torgue_underbarrel_kills': 125,
+    'manufacturer_torgue_splash_kills': 600, 'manufacturer_torgue_sticky_kills': 750,
+    'manufacturer_torgue_impact_kills': 750, 'manufacturer_torgue_grenade_kills': 400,
+    'manufacturer_borg_kills': 1300, 'manufacturer_borg_underbarrel_kills': 125,
+    'manufacturer_borg_criticalhits': 1500, 'manufacturer_borg_multikills': 450,
+    'manufacturer_order_kills': 1500, 'manufacturer_order_underbarrel_kills': 125,
+    'manufacturer_order_halfcharge_kills': 600, 'manufacturer_order_fullcharge_kills': 750,
+    'manufacturer_order_oneshot_kills': 500, 'manufacturer_order_killorder': 750,
+}
 
 def complete_manufacturer_challenges(data):
-    counters = {
-        'manufacturer_jakobs_kills': 2000, 'manufacturer_jakobs_underbarrel_kills': 175,
-        'manufacturer_jakobs_ricochetkills': 150, 'manufacturer_jakobs_oneshot': 500,
-        'manufacturer_jakobs_quickdraw': 350, 'manufacturer_jakobs_grenadecrits': 400,
-        'manufacturer_daedalus_kills': 2000, 'manufacturer_daedalus_underbarrel_kills': 150,
-        'manufacturer_daedalus_multiloader_pistol': 500, 'manufacturer_daedalus_multiloader_smg': 750,
-        'manufacturer_daedalus_multiloader_assault': 600, 'manufacturer_daedalus_multiloader_shotgun': 400,
-        'manufacturer_daedalus_multiloader_sniper': 400,
-        'manufacturer_vladof_kills': 2000, 'manufacturer_vladof_extrabarrel': 750,
-        'manufacturer_vladof_explosive_underbarrel': 175, 'manufacturer_vladof_bipod': 750,
-        'manufacturer_vladof_shotgun_underbarrel': 150,
-        'manufacturer_maliwan_kills': 2000, 'manufacturer_maliwan_underbarrel_kills': 175,
-        'manufacturer_maliwan_status_fire': 750, 'manufacturer_maliwan_status_shock': 750,
-        'manufacturer_maliwan_status_corrosive': 400, 'manufacturer_maliwan_status_radiation': 400,
-        'manufacturer_maliwan_status_cryo': 750,
-        'manufacturer_tediore_kills': 1500, 'manufacturer_tediore_underbarrel_kills': 150,
-        'manufacturer_tediore_emptyreload_kills': 750, 'manufacturer_tediore_fullreload_kills': 600,
-        'manufacturer_tediore_comboreload_kills': 200, 'manufacturer_tediore_turret_kills': 500,
-        'manufacturer_torgue_kills': 1300, 'manufacturer_torgue_underbarrel_kills': 125,
-        'manufacturer_torgue_splash_kills': 600, 'manufacturer_torgue_sticky_kills': 750,
-        'manufacturer_torgue_impact_kills': 750, 'manufacturer_torgue_grenade_kills': 400,
-        'manufacturer_borg_kills': 1300, 'manufacturer_borg_underbarrel_kills': 125,
-        'manufacturer_borg_criticalhits': 1500, 'manufacturer_borg_multikills': 450,
-        'manufacturer_order_kills': 1500, 'manufacturer_order_underbarrel_kills': 125,
-        'manufacturer_order_halfcharge_kills': 600, 'manufacturer_order_fullcharge_kills': 750,
-        'manufacturer_order_oneshot_kills': 500, 'manufacturer_order_killorder': 750,
-    }
-    update_stats_counters(data, counters)
+    update_stats_counters(data, MANUFACTURER_CHALLENGES)
+
+LICENSED_PARTS_CHALLENGES = {
+    'spareparts_atlas_tracker_pucks': 350, 'spareparts_atlas_tracker_grenades': 600,
+    'spareparts_cov_overheated': 250, 'spareparts_cov_not_overheated': 600,
+    'spareparts_hyperion_amp_shield': 150, 'spareparts_hyperion_absorb_ammo': 3000,
+    'spareparts_hyperion_reflect_shield': 100,
+}
 
 def complete_licensed_parts_challenges(data):
-    counters = {
-        'spareparts_atlas_tracker_pucks': 350, 'spareparts_atlas_tracker_grenades': 600,
-        'spareparts_cov_overheated': 250, 'spareparts_cov_not_overheated': 600,
-        'spareparts_hyperion_amp_shield': 150, 'spareparts_hyperion_absorb_ammo': 3000,
-        'spareparts_hyperion_reflect_shield': 100,
+    update_stats_counters(data, LICENSED_PARTS_CHALLENGES)
+
+PHOSPHENE_CHALLENGES = {
+    'base': {
+        'shiny_anarchy': 1, 'shiny_asher': 1, 'shiny_atlien': 1, 'shiny_ballista': 1,
+        'shiny_beegun': 1, 'shiny_bloodstarved': 1, 'shiny_bod': 1, 'shiny_bonnieclyde': 1,
+        'shiny_boomslang': 1, 'shiny_bugbear': 1, 'shiny_bully': 1, 'shiny_chuck': 1,
+        'shiny_coldshoulder': 1, 'shiny_commbd': 1, 'shiny_complex_root': 1,
+        'shiny_conglomerate': 1, 'shiny_convergence': 1, 'shiny_crowdsourced': 1,
+        'shiny_dividedfocus': 1, 'shiny_dualdamage': 1, 'shiny_finnty': 1, 'shiny_fisheye': 1,
+        'shiny_gmr': 1, 'shiny_goalkeeper': 1, 'shiny_goldengod': 1, 'shiny_goremaster': 1,
+        'shiny_heartgun': 1, 'shiny_heavyturret': 1, 'shiny_hellfire': 1, 'shiny_hellwalker': 1,
+        'shiny_kaleidosplode': 1, 'shiny_kaoson': 1, 'shiny_katagawa': 1,
+        'shiny_kickballer': 1, 'shiny_kingsgambit': 1, 'shiny_leadballoon': 1,
+        'shiny_linebacker': 1, 'Shiny_Loarmaster': 1, 'shiny_lucian': 1, 'shiny_lumberjack': 1,
+        'shiny_luty': 1, 'shiny_noisycricket': 1, 'shiny_ohmigot': 1, 'shiny_om': 1,
+        'shiny_onslaught': 1, 'shiny_phantom_flame': 1, 'shiny_plasmacoil': 1,
+        'shiny_potatothrower': 1, 'shiny_prince': 1, 'shiny_queensrest': 1, 'shiny_quickdraw': 1,
+        'shiny_rainbowvomit': 1, 'shiny_rangefinder': 1, 'shiny_roach': 1, 'shiny_rocketreload': 1,
+        'shiny_rowan': 1, 'shiny_rubysgrasp': 1, 'shiny_seventh_sense': 1, 'shiny_sideshow': 1,
+        'shiny_slugger': 1, 'shiny_star_helix': 1, 'shiny_stopgap': 1, 'shiny_stray': 1,
+        'shiny_sweet_embrace': 1, 'shiny_symmetry': 1, 'shiny_tkswave': 1, 'shiny_truck': 1,
+        'Shiny_Ultimate': 1, 'shiny_vamoose': 1, 'shiny_wf': 1, 'shiny_wombocombo': 1,
+        'shiny_zipgun': 1,
     }
-    update_stats_counters(data, counters)
+}
 
 def complete_phosphene_challenges(data):
-    counters = {
-        'base': {
-            'shiny_anarchy': 1, 'shiny_asher': 1, 'shiny_atlien': 1, 'shiny_ballista': 1,
-            'shiny_beegun': 1, 'shiny_bloodstarved': 1, 'shiny_bod': 1, 'shiny_bonnieclyde': 1,
-            'shiny_boomslang': 1, 'shiny_bugbear': 1, 'shiny_bully': 1, 'shiny_chuck': 1,
-            'shiny_coldshoulder': 1, 'shiny_commbd': 1, 'shiny_complex_root': 1,
-            'shiny_conglomerate': 1, 'shiny_convergence': 1, 'shiny_crowdsourced': 1,
-            'shiny_dividedfocus': 1, 'shiny_dualdamage': 1, 'shiny_finnty': 1, 'shiny_fisheye': 1,
-            'shiny_gmr': 1, 'shiny_goalkeeper': 1, 'shiny_goldengod': 1, 'shiny_goremaster': 1,
-            'shiny_heartgun': 1, 'shiny_heavyturret': 1, 'shiny_hellfire': 1, 'shiny_hellwalker': 1,
-            'shiny_kaleidosplode': 1, 'shiny_kaoson': 1, 'shiny_katagawa': 1,
-            'shiny_kickballer': 1, 'shiny_kingsgambit': 1, 'shiny_leadballoon': 1,
-            'shiny_linebacker': 1, 'Shiny_Loarmaster': 1, 'shiny_lucian': 1, 'shiny_lumberjack': 1,
-            'shiny_luty': 1, 'shiny_noisycricket': 1, 'shiny_ohmigot': 1, 'shiny_om': 1,
-            'shiny_onslaught': 1, 'shiny_phantom_flame': 1, 'shiny_plasmacoil': 1,
-            'shiny_potatothrower': 1, 'shiny_prince': 1, 'shiny_queensrest': 1, 'shiny_quickdraw': 1,
-            'shiny_rainbowvomit': 1, 'shiny_rangefinder': 1, 'shiny_roach': 1, 'shiny_rocketreload': 1,
-            'shiny_rowan': 1, 'shiny_rubysgrasp': 1, 'shiny_seventh_sense': 1, 'shiny_sideshow': 1,
-            'shiny_slugger': 1, 'shiny_star_helix': 1, 'shiny_stopgap': 1, 'shiny_stray': 1,
-            'shiny_sweet_embrace': 1, 'shiny_symmetry': 1, 'shiny_tkswave': 1, 'shiny_truck': 1,
-            'Shiny_Ultimate': 1, 'shiny_vamoose': 1, 'shiny_wf': 1, 'shiny_wombocombo': 1,
-            'shiny_zipgun': 1,
-        }
-    }
-    update_stats_counters(data, counters, 'shinygear')
+    update_stats_counters(data, PHOSPHENE_CHALLENGES, 'shinygear')
+
+ACHIEVEMENTS = {
+    '00_level_10': 1, '01_level_30': 1, '02_level_50': 1, '03_uvh_5': 1,
+    '04_cosmetics_collect': 60, '05_vehicles_collect': 10, '06_legendaries_equip': 1,
+    '07_challenges_gear': 1, '08_challenges_manufacturer': 1,
+    '10_worldevents_colosseum': 1, '11_worldevents_airship': 1, '12_worldevents_meteor': 1,
+    '13_contracts_complete': 80, '14_discovery_grasslands': 54, '15_discovery_mountains': 62,
+    '16_discovery_shatteredlands': 47, '17_discovery_city': 21, '18_worldboss_defeat': 1,
+    '19_vaultguardian_defeat': {
+        '19_vaultguardian_grasslands': 1,
+        '19_vaultguardian_mountains': 1,
+        '19_vaultguardian_shatteredlands': 1,
+    },
+    '20_missions_survivalist': 3, '21_missions_auger': 7, '22_missions_electi': 3,
+    '23_missions_claptrap': 5, '24_missions_side': 98, '25_missions_grasslands': 1,
+    '26_missions_mountains': 1, '27_missions_shatteredlands': 1, '28_missions_elpis': 1,
+    '29_missions_main': 1, '30_moxxi_hidden': 1, '31_tannis_hidden': 1,
+    '32_zane_hidden': 1, '33_oddman_hidden': 1, '34_dave_hidden': 1,
+}
 
 def complete_all_achievements(data):
-    counters = {
-        '00_level_10': 1, '01_level_30': 1, '02_level_50': 1, '03_uvh_5': 1,
-        '04_cosmetics_collect': 60, '05_vehicles_collect': 10, '06_legendaries_equip': 1,
-        '07_challenges_gear': 1, '08_challenges_manufacturer': 1,
-        '10_worldevents_colosseum': 1, '11_worldevents_airship': 1, '12_worldevents_meteor': 1,
-        '13_contracts_complete': 80, '14_discovery_grasslands': 54, '15_discovery_mountains': 62,
-        '16_discovery_shatteredlands': 47, '17_discovery_city': 21, '18_worldboss_defeat': 1,
-        '19_vaultguardian_defeat': {
-            '19_vaultguardian_grasslands': 1,
-            '19_vaultguardian_mountains': 1,
-            '19_vaultguardian_shatteredlands': 1,
-        },
-        '20_missions_survivalist': 3, '21_missions_auger': 7, '22_missions_electi': 3,
-        '23_missions_claptrap': 5, '24_missions_side': 98, '25_missions_grasslands': 1,
-        '26_missions_mountains': 1, '27_missions_shatteredlands': 1, '28_missions_elpis': 1,
-        '29_missions_main': 1, '30_moxxi_hidden': 1, '31_tannis_hidden': 1,
-        '32_zane_hidden': 1, '33_oddman_hidden': 1, '34_dave_hidden': 1,
-    }
-    update_stats_counters(data, counters, 'achievements')
+    update_stats_counters(data, ACHIEVEMENTS, 'achievements')
     merge_missionsets_with_prefix(data, 'missionset_zoneactivity_')
 
+DISCOVERY_ACHIEVEMENTS = {
+    '14_discovery_grasslands': 54,
+    '15_discovery_mountains': 62,
+    '16_discovery_shatteredlands': 47,
+    '17_discovery_city': 21,
+}
+
 def complete_discovery_achievements(data):
-    counters = {
-        '14_discovery_grasslands': 54,
-        '15_discovery_mountains': 62,
-        '16_discovery_shatteredlands': 47,
-        '17_discovery_city': 21,
-    }
-    update_stats_counters(data, counters, 'achievements')
+    update_stats_counters(data, DISCOVERY_ACHIEVEMENTS, 'achievements')
 
 def max_currency(data):
     state = get_or_create_dict(data, 'state')
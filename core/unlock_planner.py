@@ -0,0 +1,365 @@
+# unlock_planner.py
+"""
+解锁预设的执行计划。
+
+每个预设展开为一组步骤，多个预设合并成一个计划后一次执行：
+  - 任务集：所有前缀一起，一次遍历 MISSIONSETS，每个任务集只实例化一次
+  - 地点发现：所有子串一起，一次遍历 LOCATIONS
+  - 统计计数器：同一分类的计数器先合并（取较大值），再一次写入
+  - 其他步骤按 (函数, 参数) 去重
+  - SDU 点数（由任务和收集品推导）只在最后计算一次
+步骤按阶段排序：先写入模板，再写入覆盖模板的值，最后计算派生值，结果与依次调用各个
+unlock_logic 函数相同。唯一的区别是 SDU 点数按最终状态计算：依次调用时，后面的预设再加入
+的活动任务不会计入（例如先收集品后成就），合并执行时会计入，所以点数只会相同或更高。
+
+apply_plan() 可以记录每个步骤的耗时和增加的数据量，summarize() 按预设汇总。
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypedDict
+
+from . import unlock_logic as ul
+from .unlock_data import CHARACTER_CLASSES
+
+# 执行阶段（同一阶段内按请求顺序）
+PHASE_TEMPLATES = 0   # 用模板整体写入的任务集
+PHASE_WRITES = 1      # 普通写入，可能覆盖模板中的值（例如尾声任务）
+PHASE_COUNTERS = 2
+PHASE_LOCATIONS = 3
+PHASE_DERIVED = 4     # 依赖前面结果的值
+
+
+class Step(ABC):
+    """计划中的一个步骤。presets 是请求了这个步骤的预设，按请求顺序。"""
+
+    phase = PHASE_WRITES
+    sections: Tuple[str, ...] = ()
+
+    def __init__(self):
+        self.presets: List[str] = []
+
+    @property
+    @abstractmethod
+    def label(self) -> str:
+        """报告中显示的步骤名称"""
+
+    @abstractmethod
+    def run(self, data: Dict[str, Any]):
+        """在 data 上执行这个步骤"""
+
+
+class CallStep(Step):
+    """调用一个 unlock_logic 函数。相同的函数和参数只执行一次。"""
+
+    def __init__(self, fn: Callable, args: Tuple[Any, ...], sections: Tuple[str, ...]):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.sections = sections
+
+    @property
+    def label(self) -> str:
+        return self.fn.__name__ + (f"{self.args!r}" if self.args else "")
+
+    def run(self, data):
+        self.fn(data, *self.args)
+
+
+class MissionsStep(Step):
+    phase = PHASE_TEMPLATES
+    sections = ("missions",)
+
+    def __init__(self):
+        super().__init__()
+        self.prefixes: List[str] = []
+
+    @property
+    def label(self) -> str:
+        return "merge_missionsets" + repr(tuple(self.prefixes))
+
+    def run(self, data):
+        ul.merge_missionsets_with_prefix(data, tuple(self.prefixes))
+
+
+class LocationsStep(Step):
+    phase = PHASE_LOCATIONS
+    sections = ("gbx_discovery_pg",)
+
+    def __init__(self):
+        super().__init__()
+        self.substrings: List[str] = []
+
+    @property
+    def label(self) -> str:
+        return "add_discovered_locations" + ("(all)" if "" in self.substrings else f"({len(self.substrings)})")
+
+    def run(self, data):
+        # 空字符串匹配所有地点，其他子串无需再逐个比较
+        ul.add_discovered_locations(data, [""] if "" in self.substrings else self.substrings)
+
+
+class CountersStep(Step):
+    phase = PHASE_COUNTERS
+    sections = ("stats",)
+
+    def __init__(self, category: str):
+        super().__init__()
+        self.category = category
+        self.counters: Dict[str, Any] = {}
+
+    @property
+    def label(self) -> str:
+        return f"update_stats_counters({self.category!r}, {len(self.counters)})"
+
+    def merge(self, counters: Dict[str, Any]):
+        # 与 update_stats_counters 依次写入的结果相同：数值取较大的，其他保留先写入的
+        for key, value in counters.items():
+            if isinstance(value, dict):
+                target = self.counters.get(key)
+                if not isinstance(target, dict):
+                    target = self.counters[key] = {}
+                for sub_key, sub_value in value.items():
+                    _merge_counter(target, sub_key, sub_value)
+            else:
+                _merge_counter(self.counters, key, value)
+
+    def run(self, data):
+        ul.update_stats_counters(data, self.counters, self.category)
+
+
+class SduPointsStep(Step):
+    phase = PHASE_DERIVED
+    sections = ("progression",)
+
+    @property
+    def label(self) -> str:
+        return "update_sdu_points"
+
+    def run(self, data):
+        ul.update_sdu_points(data)
+
+
+def _merge_counter(counters: Dict[str, Any], key: str, value: Any):
+    prev = counters.get(key)
+    if prev is None or (isinstance(value, (int, float)) and isinstance(prev, (int, float)) and value > prev):
+        counters[key] = value
+
+
+# ── 预设 ──────────────────────────────────────────────────────────────────
+# 请求：("call", 函数, 参数, 写入的顶层段) / ("missions", 前缀) / ("locations", 子串)
+#       ("counters", 分类, 计数器) / ("sdu",)
+
+Request = Tuple[Any, ...]
+
+
+def _call(fn: Callable, *sections: str, args: Tuple[Any, ...] = ()) -> Request:
+    return ("call", fn, args, sections)
+
+
+_SDU: Request = ("sdu",)
+
+_SAFEHOUSE_MISSIONS = [("missions", "missionset_zoneactivity_safehouse"), ("missions", "missionset_zoneactivity_silo")]
+
+CHALLENGE_COUNTERS = [
+    ("challenge", ul.UVH_CHALLENGES),
+    ("challenge", ul.COMBAT_CHALLENGES),
+    ("challenge", ul.CHARACTER_CHALLENGES),
+    ("challenge", ul.ENEMY_CHALLENGES),
+    ("challenge", ul.LOOT_CHALLENGES),
+    ("achievements", ul.WORLD_ACHIEVEMENTS),
+    ("challenge", ul.ECONOMY_CHALLENGES),
+    ("challenge", ul.ELEMENTAL_CHALLENGES),
+    ("challenge", ul.WEAPON_CHALLENGES),
+    ("challenge", ul.EQUIPMENT_CHALLENGES),
+    ("challenge", ul.MANUFACTURER_CHALLENGES),
+    ("challenge", ul.LICENSED_PARTS_CHALLENGES),
+    ("shinygear", ul.PHOSPHENE_CHALLENGES),
+]
+
+
+def _safehouse_locations() -> List[Request]:
+    return [("locations", s) for s in ul.safehouse_location_substrings()]
+
+
+def _set_character_class(params: Dict[str, Any]) -> List[Request]:
+    class_key = params.get("class_key")
+    if not class_key or class_key not in CHARACTER_CLASSES:
+        return []
+    return [_call(ul.set_character_class, "state", args=(class_key,))]
+
+
+_STORY = [_call(ul.stage_epilogue_mission, "missions"), _call(ul.set_story_values, "globals", "stats", "unlockables")]
+
+# 预设名 -> 请求列表（或根据参数生成请求的函数）。与依次调用对应的 unlock_logic 函数等价。
+PRESETS: Dict[str, Any] = {
+    "clear_map_fog": [_call(ul.clear_map_fog, "gbx_discovery_pc")],
+    "discover_all_locations": [("locations", ""), ("counters", "achievements", ul.DISCOVERY_ACHIEVEMENTS)],
+    "complete_all_safehouse_missions": lambda params: _SAFEHOUSE_MISSIONS + _safehouse_locations() + [_SDU],
+    "complete_all_collectibles": [_call(ul.merge_collectibles, "stats", "state"), _SDU],
+    "complete_all_challenges": [("counters",) + c for c in CHALLENGE_COUNTERS] + [_call(ul.catch_all_fish, "stats")],
+    "complete_all_achievements": [("counters", "achievements", ul.ACHIEVEMENTS), ("missions", "missionset_zoneactivity_")],
+    "complete_all_story_missions": [("missions", "missionset_main_")] + _STORY,
+    "complete_all_missions": lambda params: ([("missions", "missionset_")] + _STORY
+                                             + [_call(ul.open_all_vault_doors, "stats")] + _safehouse_locations() + [_SDU]),
+    "set_character_class": _set_character_class,
+    "set_character_to_max_level": [_call(ul.set_character_to_max_level, "state", "progression")],
+    "set_max_sdu": [_call(ul.set_max_sdu, "progression")],
+    "unlock_vault_powers": [_call(ul.unlock_vault_powers, "stats")],
+    "unlock_all_hover_drives": [_call(ul.unlock_all_hover_drives, "unlockables")],
+    "unlock_all_specialization": [_call(ul.max_specialization, "state", "progression"), _call(ul.stage_epilogue_mission, "missions")],
+    "unlock_postgame": [_call(ul.set_postgame_globals, "globals"), ("counters", "challenge", ul.UVH_CHALLENGES),
+                        ("missions", "missionset_main_postgame")],
+    "max_ammo": [_call(ul.max_ammo, "state")],
+    "max_currency": [_call(ul.max_currency, "state")],
+}
+
+# 组合预设 -> 按顺序包含的预设
+COMPOSITE_PRESETS: Dict[str, List[str]] = {
+    "unlock_max_everything": [
+        "max_ammo", "max_currency", "clear_map_fog", "discover_all_locations", "complete_all_collectibles",
+        "complete_all_achievements", "complete_all_missions", "set_max_sdu", "unlock_vault_powers",
+        "unlock_postgame", "unlock_all_hover_drives", "unlock_all_specialization", "complete_all_challenges",
+        "set_character_to_max_level",
+    ],
+}
+
+
+def is_known_preset(name: str) -> bool:
+    return name in PRESETS or name in COMPOSITE_PRESETS
+
+
+def expand_presets(names: Sequence[str]) -> List[str]:
+    """Expands composite presets into their parts."""
+    result = []
+    for name in names:
+        if name in COMPOSITE_PRESETS:
+            result.extend(expand_presets(COMPOSITE_PRESETS[name]))
+        elif name in PRESETS:
+            result.append(name)
+        else:
+            raise ValueError(f"Unknown preset: {name}")
+    return result
+
+
+# ── 计划 ──────────────────────────────────────────────────────────────────
+
+class UnlockPlan:
+    """合并后的步骤，steps 已按执行顺序排列。"""
+
+    def __init__(self, presets: List[str], steps: List[Step], requested: int):
+        self.presets = presets
+        self.steps = steps
+        # 合并去重前的请求数
+        self.requested = requested
+
+    def __repr__(self):
+        return f"UnlockPlan({len(self.presets)} presets, {self.requested} requests -> {len(self.steps)} steps)"
+
+
+def build_plan(names: Sequence[str], params: Optional[Dict[str, Any]] = None) -> UnlockPlan:
+    """Merges the named presets (composites are expanded) into one plan."""
+    params = params or {}
+    presets = expand_presets(names)
+    steps: List[Step] = []
+    calls: Dict[Tuple[Any, ...], Step] = {}
+    counters: Dict[str, CountersStep] = {}
+    shared: Dict[type, Step] = {}
+    requested = 0
+
+    def singleton(cls):
+        step = shared.get(cls)
+        if step is None:
+            step = shared[cls] = cls()
+            steps.append(step)
+        return step
+
+    for preset in presets:
+        spec = PRESETS[preset]
+        requests = spec(params) if callable(spec) else spec
+        for request in requests:
+            requested += 1
+            kind = request[0]
+            if kind == "call":
+                _, fn, args, sections = request
+                step = calls.get((fn, args))
+                if step is None:
+                    step = calls[(fn, args)] = CallStep(fn, args, sections)
+                    steps.append(step)
+            elif kind == "missions":
+                step = singleton(MissionsStep)
+                if request[1] not in step.prefixes:
+                    step.prefixes.append(request[1])
+            elif kind == "locations":
+                step = singleton(LocationsStep)
+                if request[1] not in step.substrings:
+                    step.substrings.append(request[1])
+            elif kind == "counters":
+                step = counters.get(request[1])
+                if step is None:
+                    step = counters[request[1]] = CountersStep(request[1])
+                    steps.append(step)
+                step.merge(request[2])
+            elif kind == "sdu":
+                step = singleton(SduPointsStep)
+            else:
+                raise ValueError(f"Unknown plan request: {request!r}")
+            if preset not in step.presets:
+                step.presets.append(preset)
+
+    steps.sort(key=lambda s: s.phase)  # 稳定排序，同一阶段内保持请求顺序
+    return UnlockPlan(presets, steps, requested)
+
+
+class StepReport(TypedDict):
+    step: str
+    presets: List[str]
+    seconds: float
+    bytes: int
+
+
+def apply_plan(data: Dict[str, Any], plan: UnlockPlan, report: Optional[List[StepReport]] = None):
+    """
+    Runs the plan's steps against data. If report is a list, one StepReport per step is appended;
+    bytes is the growth of the step's top-level sections as measured by approx_size() (measuring
+    walks those sections, so leave report out when the numbers are not needed).
+    """
+    for step in plan.steps:
+        if report is None:
+            step.run(data)
+            continue
+        before = sum(approx_size(data.get(s)) for s in step.sections)
+        t0 = time.perf_counter()
+        step.run(data)
+        seconds = time.perf_counter() - t0
+        after = sum(approx_size(data.get(s)) for s in step.sections)
+        report.append({"step": step.label, "presets": list(step.presets), "seconds": seconds, "bytes": after - before})
+
+
+def summarize(report: List[StepReport]) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-preset totals: {preset: {"seconds", "bytes", "steps", "shared"}}. A step's cost goes to the
+    first preset that requested it; "shared" counts the steps a preset got from an earlier one.
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    for entry in report:
+        for i, preset in enumerate(entry["presets"]):
+            row = totals.setdefault(preset, {"seconds": 0.0, "bytes": 0, "steps": 0, "shared": 0})
+            if i == 0:
+                row["seconds"] += entry["seconds"]
+                row["bytes"] += entry["bytes"]
+                row["steps"] += 1
+            else:
+                row["shared"] += 1
+    return totals
+
+
+def approx_size(node: Any) -> int:
+    """Rough serialized size of node: key and scalar text lengths plus a separator each."""
+    if isinstance(node, dict):
+        return sum(len(str(k)) + 2 + approx_size(v) for k, v in node.items())
+    if isinstance(node, list):
+        return sum(2 + approx_size(v) for v in node)
+    if node is None:
+        return 0
+    return len(str(node))
@@ -0,0 +1,120 @@
+# unlock_templates.py
+"""
+unlock_data 中整体写入存档的模板（任务集、收集品分类），以冻结结构共享。
+
+每个模板第一次实例化时，把它生成为一个只包含字面量的构造函数并编译一次；之后每次实例化
+只是执行这个函数：dict/list 是新建的（写进存档后可以随意修改），字符串等标量直接引用
+代码对象中的常量，与模板共享。这比 copy.deepcopy 快一个数量级，批量处理多个存档时
+模板本身也只在进程中保存一份。
+
+模板只包含 dict、list 和标量（YAML 解析的结果）；遇到其他类型时退回到普通的递归复制。
+"""
+
+import math
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from . import unlock_data
+
+
+def freeze(value: Any) -> Any:
+    """Read-only copy of a dict/list tree: dicts become mappingproxy, lists become tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """A fresh mutable dict/list tree from a frozen one. Scalars are shared."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+def _literal(value: Any, out: list) -> bool:
+    """Appends Python source that rebuilds value to out. False if value holds anything but plain data."""
+    if isinstance(value, Mapping):
+        out.append("{")
+        for k, v in value.items():
+            if not _literal(k, out):
+                return False
+            out.append(":")
+            if not _literal(v, out):
+                return False
+            out.append(",")
+        out.append("}")
+        return True
+    if isinstance(value, tuple):
+        out.append("[")
+        for v in value:
+            if not _literal(v, out):
+                return False
+            out.append(",")
+        out.append("]")
+        return True
+    if value is None or type(value) in (bool, int, str):
+        out.append(repr(value))
+        return True
+    if type(value) is float and math.isfinite(value):
+        out.append(repr(value))
+        return True
+    return False
+
+
+def _compile_builder(name: str, frozen: Any) -> Callable[[], Any]:
+    parts: list = []
+    if not _literal(frozen, parts):
+        return lambda: thaw(frozen)
+    return eval(compile("lambda: " + "".join(parts), f"<unlock template {name}>", "eval"), {"__builtins__": {}})
+
+
+class Template:
+    """一个冻结的模板。value 是只读视图，instantiate() 每次返回新的可修改副本。"""
+
+    __slots__ = ("name", "value", "_build", "_lock")
+
+    def __init__(self, name: str, value: Any):
+        self.name = name
+        self.value = freeze(value)
+        self._build: Optional[Callable[[], Any]] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Template({self.name!r})"
+
+    @property
+    def is_mapping(self) -> bool:
+        return isinstance(self.value, Mapping)
+
+    def instantiate(self) -> Any:
+        build = self._build
+        if build is None:
+            with self._lock:
+                if self._build is None:
+                    self._build = _compile_builder(self.name, self.value)
+                build = self._build
+        return build()
+
+
+_lock = threading.Lock()
+_groups: Dict[str, Mapping[str, Template]] = {}
+
+
+def templates(group: str) -> Mapping[str, Template]:
+    """
+    Read-only {key: Template} for a top-level unlock_data mapping ("MISSIONSETS", "COLLECTIBLES").
+    Built once per process.
+    """
+    result = _groups.get(group)
+    if result is None:
+        with _lock:
+            result = _groups.get(group)
+            if result is None:
+                source = getattr(unlock_data, group)
+                result = _groups[group] = MappingProxyType({k: Template(f"{group}.{k}", v) for k, v in source.items()})
+    return result
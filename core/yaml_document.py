@@ -0,0 +1,492 @@
+# yaml_document.py
+"""
+保留原始格式的增量YAML写出器。
+
+解析存档时保留解密后的原始文本，并为每个节点记录其在文本中的 (start, end) 区间。
+修改过的路径通过 touch() 标记，写出时只重新生成这些节点对应的文本片段，
+其余部分原样复制，因此单个物品的修改不需要重新 dump 整棵树。
+
+load_lazy() 只扫描顶层 key 所在的行，各顶层段在第一次被访问时才解析（见 LazySections），
+从未访问过的段写出时原样复制。
+"""
+
+import copy
+import re
+import threading
+from collections.abc import ItemsView, ValuesView
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+Path = Tuple[Union[str, int], ...]
+
+# 节点类型
+SCALAR = "scalar"
+BLOCK_MAP = "map"
+BLOCK_SEQ = "seq"
+FLOW = "flow"
+OPAQUE = "opaque"  # 带标签/锚点/别名的节点，不能就地替换
+
+
+def dump_yaml(obj: Any) -> str:
+    """Full dump used when a region cannot be patched in place."""
+    return yaml.safe_dump(obj, sort_keys=False, allow_unicode=True, indent=2)
+
+
+def _render_scalar(value: Any, style: Optional[str]) -> Optional[str]:
+    """Renders a scalar for inline replacement, or None if it needs more than one line."""
+    if style not in ("'", '"'):
+        style = None
+    out = yaml.safe_dump(value, default_style=style, allow_unicode=True, width=float("inf"))
+    if out.endswith("\n...\n"):
+        out = out[:-5]
+    elif out.endswith("\n"):
+        out = out[:-1]
+    if "\n" in out:
+        return None
+    return out
+
+
+# 顶层段的 key 行；只接受不会被解析成其他类型的普通标识符
+_SECTION_KEY = re.compile(r"([A-Za-z_][A-Za-z0-9_]*):(?:[ \t]|\r?$)")
+_NON_STR_KEYS = {"true", "false", "yes", "no", "on", "off", "null", "y", "n"}
+# 锚点/别名可能跨段引用，出现时不使用延迟模式
+_ANCHOR_OR_ALIAS = re.compile(r"(?:^|[\s\[{,])[&*][^\s,\[\]{}]", re.M)
+
+
+def _split_sections(text: str) -> Optional[List[Tuple[str, int, int]]]:
+    """
+    Finds the top-level keys of a block mapping document by scanning column-0 lines.
+    Returns [(key, start, end)] or None if the text is not simple enough to split safely.
+    """
+    if _ANCHOR_OR_ALIAS.search(text):
+        return None
+    starts: List[Tuple[str, int]] = []
+    seen = set()
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        first = line[:1]
+        if first in (" ", "\t", "\r", "\n", "#"):
+            pass
+        elif first == "-" and line[1:2] in (" ", "\r", "\n", "") and starts:
+            pass  # 顶层 key 下不缩进的序列项
+        else:
+            match = _SECTION_KEY.match(line)
+            if not match or match.group(1).lower() in _NON_STR_KEYS or match.group(1) in seen:
+                return None
+            seen.add(match.group(1))
+            starts.append((match.group(1), pos))
+        pos += len(line)
+    if not starts:
+        return None
+    ends = [start for _, start in starts[1:]] + [len(text)]
+    return [(key, start, end) for (key, start), end in zip(starts, ends)]
+
+
+def _content_end(text: str) -> int:
+    """End of the last content line, ignoring trailing blank and comment lines."""
+    end = len(text)
+    while end > 0:
+        line_start = text.rfind("\n", 0, end - 1) + 1
+        line = text[line_start:end].strip()
+        if line and not line.startswith("#"):
+            return line_start + len(text[line_start:end].rstrip())
+        end = line_start
+    return 0
+
+
+def _indent_block(text: str, column: int) -> str:
+    """Indents every line but the first, which continues the line the node starts on."""
+    text = text.rstrip("\n")
+    if column == 0:
+        return text
+    pad = " " * column
+    return ("\n" + pad).join(text.split("\n"))
+
+
+class YamlDocument:
+    """
+    原始YAML文本 + 节点区间索引 + 脏路径集合。
+
+    render() 从当前的 yaml_obj 中读取脏路径的值并只替换对应的文本区间；
+    无法就地修补的修改会向上升级到最近的可重写祖先块，升级到根节点时退化为完整 dump。
+    """
+
+    def __init__(self, text: str, spans: Dict[Path, Tuple[int, int, str, Any]]):
+        self.text = text
+        # path -> (start, end, kind, extra)；extra 对标量是引号风格，对块集合是缩进列
+        self._spans = spans
+        self._dirty: Dict[Path, None] = {}  # 保持插入顺序
+        self._whole = False
+        # 延迟模式：顶层 key -> 段；段解析后把自己的区间并入 _spans
+        self._sections: Dict[Any, _Section] = {}
+        self._loader_cls = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # 用于解析缓存：只保存解析结果，不保存修改标记
+        with self._lock:
+            state = dict(self.__dict__, _spans=dict(self._spans), _dirty={}, _whole=False)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # ── 构建 ──────────────────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, text: str, loader_cls) -> Tuple[Optional["YamlDocument"], Any]:
+        """Parses text once, returning the span document and the constructed object."""
+        loader = loader_cls(text)
+        try:
+            node = loader.get_single_node()
+            obj = loader.construct_document(node) if node is not None else None
+            if not isinstance(node, yaml.MappingNode) or node.flow_style:
+                return None, obj
+            spans: Dict[Path, Tuple[int, int, str, Any]] = {}
+            cls._index(loader, text, node, (), spans, set())
+        finally:
+            loader.dispose()
+        return cls(text, spans), obj
+
+    @classmethod
+    def load_lazy(cls, text: str, loader_cls) -> Tuple[Optional["YamlDocument"], Any]:
+        """
+        Like load(), but only indexes the top-level keys; the returned root is a LazySections
+        that parses each section on first access. Falls back to load() for documents it cannot split.
+        """
+        sections = _split_sections(text)
+        if sections is None:
+            return cls.load(text, loader_cls)
+        document = cls(text, {(): (sections[0][1], _content_end(text), BLOCK_MAP, 0)})
+        document._loader_cls = loader_cls
+        root = LazySections(document)
+        for key, start, end in sections:
+            section = _Section(document, key, start, end)
+            document._sections[key] = section
+            dict.__setitem__(root, key, section)
+        return document, root
+
+    def _parse_section(self, section: "_Section") -> Any:
+        """Parses one top-level section and merges the spans of its subtree into the index."""
+        fragment = self.text[section.start:section.end]
+        loader = self._loader_cls(fragment)
+        try:
+            node = loader.get_single_node()
+            if not isinstance(node, yaml.MappingNode) or len(node.value) != 1 or node.value[0][0].value != section.key:
+                raise ValueError(f"Top-level section '{section.key}' could not be parsed on its own")
+            value = loader.construct_document(node)[section.key]
+            spans: Dict[Path, Tuple[int, int, str, Any]] = {}
+            self._index(loader, fragment, node.value[0][1], (section.key,), spans, set())
+        finally:
+            loader.dispose()
+        offset = section.start
+        with self._lock:
+            for path, (start, end, kind, extra) in spans.items():
+                self._spans[path] = (start + offset, end + offset, kind, extra)
+        return value
+
+    @classmethod
+    def _index(cls, loader, text: str, node, path: Path, spans: Dict, seen: set) -> int:
+        """Records the span of node and its children; returns the end of its content."""
+        start = node.start_mark.index
+        if id(node) in seen or getattr(node, "anchor", None):
+            spans[path] = (start, node.end_mark.index, OPAQUE, None)
+            return node.end_mark.index
+        seen.add(id(node))
+
+        if isinstance(node, yaml.ScalarNode):
+            end = node.end_mark.index
+            # 显式标签的标量直接替换会丢失标签；空标量没有可替换的文本区间
+            kind = OPAQUE if end == start or text[start:start + 1] == "!" else SCALAR
+            spans[path] = (start, end, kind, node.style)
+            return end
+
+        if node.flow_style or not node.value:
+            spans[path] = (start, node.end_mark.index, FLOW, None)
+            return node.end_mark.index
+
+        end = start
+        if isinstance(node, yaml.MappingNode):
+            for key_node, value_node in node.value:
+                if not isinstance(key_node, yaml.ScalarNode):
+                    spans[path] = (start, node.end_mark.index, OPAQUE, None)
+                    return node.end_mark.index
+                key = key_node.value if key_node.tag == "tag:yaml.org,2002:str" else loader.construct_object(key_node)
+                end = cls._index(loader, text, value_node, path + (key,), spans, seen)
+            spans[path] = (start, end, BLOCK_MAP, node.start_mark.column)
+        else:
+            for i, item_node in enumerate(node.value):
+                end = cls._index(loader, text, item_node, path + (i,), spans, seen)
+            spans[path] = (start, end, BLOCK_SEQ, node.start_mark.column)
+        return end
+
+    # ── 修改标记 ──────────────────────────────────────────────────────────
+
+    def touch(self, path: Iterable[Union[str, int]]):
+        """Marks a path as modified. An empty path marks the whole document."""
+        path = tuple(path)
+        with self._lock:
+            if not path:
+                self._whole = True
+            else:
+                self._dirty[path] = None
+
+    def dirty_state(self) -> Tuple[bool, Tuple[Path, ...]]:
+        """
+        (whole, dirty paths) copied under the lock. A save thread takes this together with the root
+        it renders, so touch() calls made on the GUI thread meanwhile do not change that render.
+        """
+        with self._lock:
+            return self._whole, tuple(self._dirty)
+
+    @property
+    def is_clean(self) -> bool:
+        return not self._whole and not self._dirty
+
+    # ── 写出 ──────────────────────────────────────────────────────────────
+
+    def render(self, obj: Any, dump: Callable[[Any], str] = dump_yaml,
+               state: Optional[Tuple[bool, Tuple[Path, ...]]] = None) -> str:
+        """
+        Returns the document text for obj, patching only the touched regions.
+        state is a dirty_state() taken together with obj; by default the current one is used.
+        """
+        whole, dirty = self.dirty_state() if state is None else state
+        if whole:
+            return dump(obj)
+        if not dirty:
+            return self.text
+
+        targets: Dict[Path, str] = {}
+        for path in dirty:
+            path = self._normalize(path, obj)
+            op, target = self._plan(path, obj)
+            if op == "root":
+                return dump(obj)
+            if op is not None and target not in targets:
+                targets[target] = op
+
+        # 祖先已被整体重写的路径不再单独处理
+        chosen: List[Tuple[Path, str]] = []
+        for target in sorted(targets, key=len):
+            if any(target[:n] in targets and targets[target[:n]] == "rewrite" for n in range(len(target))):
+                continue
+            chosen.append((target, targets[target]))
+
+        # (start, end, order, text)；同一位置上先替换，再按从深到浅的顺序插入
+        edits: List[Tuple[int, int, int, str]] = []
+        inserts: Dict[Path, List[Any]] = {}
+        for target, op in chosen:
+            if op == "insert":
+                inserts.setdefault(target[:-1], []).append(target[-1])
+                continue
+            start, end, kind, extra = self._spans[target]
+            value = _resolve(obj, target)[1]
+            if op == "scalar":
+                edits.append((start, end, -1_000_000, _render_scalar(value, extra)))
+            else:
+                edits.append((start, end, -1_000_000, _indent_block(dump(value), extra)))
+
+        for parent_path, keys in inserts.items():
+            _, end, _, column = self._spans[parent_path]
+            parent = _resolve(obj, parent_path)[1]
+            new_keys = set(keys)
+            fragment = {k: parent[k] for k in parent if k in new_keys}
+            text = "\n" + " " * column + _indent_block(dump(fragment), column)
+            edits.append((end, end, -len(parent_path), text))
+
+        edits.sort(key=lambda e: e[:3])
+        pieces = []
+        pos = 0
+        for start, end, _, text in edits:
+            pieces.append(self.text[pos:start])
+            pieces.append(text)
+            pos = end
+        pieces.append(self.text[pos:])
+        return "".join(pieces)
+
+    def _normalize(self, path: Path, obj: Any) -> Path:
+        """Converts digit-string list indices (as used by item paths) into ints."""
+        out = []
+        node = obj
+        for key in path:
+            if isinstance(node, list) and isinstance(key, str) and key.isdigit():
+                key = int(key)
+            out.append(key)
+            try:
+                node = node[key] if isinstance(node, (dict, list)) else None
+            except (KeyError, IndexError, TypeError):
+                node = None
+        return tuple(out)
+
+    def _plan(self, path: Path, obj: Any) -> Tuple[Optional[str], Path]:
+        """Decides how a touched path is written: scalar/rewrite/insert, escalating when needed."""
+        section = self._sections.get(path[0]) if path else None
+        if section is not None:
+            # 段可能被整体替换而从未被读取过，区间仍需建立
+            section.value()
+        while path:
+            exists, value = _resolve(obj, path)
+            span = self._spans.get(path)
+            if span is not None:
+                kind = span[2]
+                if exists and kind == SCALAR and not isinstance(value, (dict, list)):
+                    if _render_scalar(value, span[3]) is not None:
+                        return "scalar", path
+                elif exists and kind == BLOCK_MAP and isinstance(value, dict) and value:
+                    return "rewrite", path
+                elif exists and kind == BLOCK_SEQ and isinstance(value, list) and value:
+                    return "rewrite", path
+                elif exists and kind == FLOW and isinstance(value, (dict, list)) and not value:
+                    # 仍为空集合，原文本不需要改动
+                    return None, path
+            else:
+                if not exists:
+                    # 原本不存在且现在也不存在：无需处理
+                    return None, path
+                parent_span = self._spans.get(path[:-1])
+                if parent_span is not None and parent_span[2] == BLOCK_MAP:
+                    parent_exists, parent = _resolve(obj, path[:-1])
+                    if parent_exists and isinstance(parent, dict):
+                        return "insert", path
+            path = path[:-1]
+        return "root", ()
+
+
+def _resolve(obj: Any, path: Path) -> Tuple[bool, Any]:
+    node = obj
+    for key in path:
+        try:
+            if isinstance(node, dict):
+                node = node[key]
+            elif isinstance(node, list) and isinstance(key, int):
+                node = node[key]
+            else:
+                return False, None
+        except (KeyError, IndexError):
+            return False, None
+    return True, node
+
+
+class _Section:
+    """延迟模式中尚未解析的顶层段：从 key 行开始到下一个顶层 key 之前的文本。"""
+
+    __slots__ = ("document", "key", "start", "end", "_value", "_parsed", "_lock")
+
+    def __init__(self, document: YamlDocument, key: str, start: int, end: int):
+        self.document = document
+        self.key = key
+        self.start = start
+        self.end = end
+        self._value = None
+        self._parsed = False
+        self._lock = threading.Lock()
+
+    def value(self) -> Any:
+        with self._lock:
+            if not self._parsed:
+                self._value = self.document._parse_section(self)
+                self._parsed = True
+            return self._value
+
+    def is_value(self, obj: Any) -> bool:
+        return self._parsed and obj is self._value
+
+    def __getstate__(self):
+        # 只保存位置，解析结果在载入后重新按需生成
+        return {"document": self.document, "key": self.key, "start": self.start, "end": self.end}
+
+    def __setstate__(self, state):
+        self.__init__(state["document"], state["key"], state["start"], state["end"])
+
+    def __repr__(self):
+        return f"<unparsed section {self.key!r}>"
+
+
+class LazySections(dict):
+    """
+    延迟模式的根节点：值为 _Section 的项在第一次访问时解析并替换为真正的对象。
+    下标、get、items()、values()、pop 等都会触发解析，因此其余代码可以把它当作普通 dict 使用；
+    复制请用 copy()（dict(x) 会复制未解析的段）。
+    """
+
+    __slots__ = ("_document",)
+
+    def __init__(self, document: Optional[YamlDocument] = None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._document = document
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) is _Section:
+            value = value.value()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            dict.__delitem__(self, key)
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def copy(self):
+        return LazySections(self._document, dict.items(self))
+
+    def __eq__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self.items()), memo)
+
+    def __reduce__(self):
+        # 仍是原始解析结果的段以未解析的形式保存，与文档中的区间保持一致
+        sections = self._document._sections if self._document is not None else {}
+        items = []
+        for key, value in list(dict.items(self)):
+            section = sections.get(key)
+            if section is not None and section.is_value(value):
+                value = section
+            items.append((key, value))
+        return LazySections, (self._document,), None, None, iter(items)
+
+
+if yaml is not None:
+    yaml.SafeDumper.add_representer(LazySections, lambda dumper, data: dumper.represent_dict(data))
@@ -1,6 +1,7 @@
 
 import sys
 import time
+import multiprocessing
 import itertools
 import os
 from pathlib import Path
@@ -12,12 +13,14 @@ from PyQt6.QtWidgets import (
     QStatusBar, QStackedWidget, QButtonGroup, QSizeGrip, QInputDialog,
     QMenu, QGraphicsBlurEffect, QStackedLayout, QFrame
 )
-from PyQt6.QtGui import QAction, QIcon, QPixmap, QPainter, QBrush, QColor
+from PyQt6.QtGui import QAction, QKeySequence, QIcon, QPixmap, QPainter, QBrush, QColor
 from PyQt6.QtCore import pyqtSlot, QPropertyAnimation, QEasingCurve, Qt, QTimer, QObject, QThread, pyqtSignal
 
 from core import b_encoder
 from core import resource_loader
 from core import bl4_functions as bl4f
+from core.localization import catalog
+from core.item_index import ItemIndex
 from core import SaveGameController, SaveSelectorWidget, ThemeManager
 
 from tabs import (
@@ -159,24 +162,27 @@ class IteratorWorker(QObject):
 
     def _add_items_to_backpack(self, strings):
         self.status_update.emit(self.loc['generated_writing'].format(count=len(strings)))
-        success, fail = 0, 0
+        fail = 0
         total = len(strings)
         flag = self.params['yaml_flag']
 
+        # 先全部编码，再一次性写入背包（整批作为一个撤销步骤）
+        serials = []
         for i, line in enumerate(strings):
-            self.status_update.emit(self.loc['writing_progress'].format(current=i + 1, total=total))
+            if (i + 1) % 20 == 0 or i + 1 == total:
+                self.status_update.emit(self.loc['writing_progress'].format(current=i + 1, total=total))
             try:
                 serial, err = b_encoder.encode_to_base85(line)
-                if err:
-                    fail += 1
-                    continue
-                if self.controller.add_item_to_backpack(serial, flag):
-                    success += 1
-                else:
-                    fail += 1
             except Exception:
+                serial, err = None, True
+            if err:
                 fail += 1
-            time.sleep(0.01)
+                continue
+            serials.append(serial)
+
+        paths = self.controller.add_items_to_backpack(serials, flag)
+        success = sum(1 for path in paths if path)
+        fail += len(serials) - success
         self.finished_add_to_backpack.emit(success, fail)
 
     def _generate_output_text(self, strings):
@@ -212,31 +218,131 @@ class BatchAddWorker(QObject):
         self.flag = flag
 
     def run(self):
-        success_count = 0
         fail_count = 0
         total = len(self.lines)
+        serials = []
         for i, line in enumerate(self.lines):
             try:
                 if line.strip().startswith('@U'):
-                    serial = line
+                    serials.append(line)
                 else:
                     serial, err = b_encoder.encode_to_base85(line)
                     if err:
                         fail_count += 1
-                        continue
-                
-                if self.controller.add_item_to_backpack(serial, self.flag):
-                    success_count += 1
-                else:
-                    fail_count += 1
+                    else:
+                        serials.append(serial)
             except Exception:
                 fail_count += 1
-            finally:
-                self.progress.emit(i + 1, total, success_count, fail_count)
-        
+            if (i + 1) % 20 == 0 or i + 1 == total:
+                self.progress.emit(i + 1, total, len(serials), fail_count)
+
+        # 一次性写入背包，整批作为一个撤销步骤
+        paths = self.controller.add_items_to_backpack(serials, self.flag)
+        success_count = sum(1 for path in paths if path)
+        fail_count += len(serials) - success_count
+        self.progress.emit(total, total, success_count, fail_count)
         self.finished.emit(success_count, fail_count)
 
 
+class SaveWorker(QObject):
+    progress = pyqtSignal(str) # stage: dump / compress / write
+    finished = pyqtSignal(str, dict) # path, timings in seconds
+    error = pyqtSignal(str)
+
+    def __init__(self, controller, path, compression_level):
+        super().__init__()
+        self.controller = controller
+        self.path = path
+        self.compression_level = compression_level
+
+    def run(self):
+        try:
+            timings = self.controller.write_save(self.path, self.compression_level, progress=self.progress.emit)
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+        self.finished.emit(str(self.path), timings)
+
+
+class OpenCancelled(Exception):
+    pass
+
+
+class OpenWorker(QObject):
+    progress = pyqtSignal(str) # stage: read / cache / key_probe / decrypt / inflate / parse / index
+    parsed = pyqtSignal(object, dict) # PreparedSave, timings in seconds
+    items_ready = pyqtSignal(object, object, list, dict) # root the items were decoded from, its ItemIndex, items, timings
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+    def __init__(self, controller, path, user_id):
+        super().__init__()
+        self.controller = controller
+        self.path = path
+        self.user_id = user_id
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _check(self):
+        if self._cancelled:
+            raise OpenCancelled()
+
+    def run(self):
+        timings = {}
+        try:
+            t0 = time.perf_counter()
+            # 选择页已经在后台预加载过这个存档时直接使用
+            prepared = self.controller.preloader.take(self.path, self.user_id)
+            if prepared is not None:
+                timings["preloaded"] = time.perf_counter() - t0
+            else:
+                prepared = self.controller.prepare_save(self.path, self.user_id, self._check, self.progress.emit, timings)
+            self._check()
+        except OpenCancelled:
+            self.cancelled.emit()
+            self.finished.emit()
+            return
+        except Exception as e:
+            self.error.emit(str(e))
+            self.finished.emit()
+            return
+        self.parsed.emit(prepared, dict(timings))
+
+        # 界面已经可以使用，物品解码随后完成。编辑不会原地修改已载入的根节点，因此这里读取是安全的
+        self.progress.emit("index")
+        t0 = time.perf_counter()
+        index = ItemIndex()
+        try:
+            items = bl4f.process_and_load_items(prepared.obj, index)
+        except Exception as e:
+            print(f"Item decoding failed: {e}")
+            items = None
+        timings["index"] = time.perf_counter() - t0
+        if items is not None and not self._cancelled:
+            self.items_ready.emit(prepared.obj, index, items, timings)
+        self.finished.emit()
+
+
+class SummaryWorker(QObject):
+    summary_ready = pyqtSignal(str, dict) # path, summary
+    finished = pyqtSignal()
+
+    def __init__(self, summaries, jobs):
+        super().__init__()
+        self.summaries = summaries
+        self.jobs = jobs
+
+    def run(self):
+        try:
+            self.summaries.run(self.jobs, self.summary_ready.emit)
+        except Exception as e:
+            print(f"Summary indexing failed: {e}")
+        self.finished.emit()
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -321,19 +427,26 @@ class MainWindow(QMainWindow):
         self.size_grip = QSizeGrip(self)
         self.size_grip.setFixedSize(20, 20)
         
+        # _add_tabs() 会点击第一个导航按钮，相关槽函数用到的状态必须先初始化
+        self._yaml_tab_stale = False
+        self._yaml_from_editor = False
+        self.save_thread = self.save_worker = None
+        self.open_thread = self.open_worker = None
+        self._queued_open = None
+        self.summary_thread = self.summary_worker = None
+        self._pending_summary_jobs = []
         self._add_tabs()
+        self._subscribe_to_controller()
         self.scan_for_saves()
+        # 定期检查存档目录的变化，只把新增/删除/修改的存档推送给选择页
+        self.save_watch_timer = QTimer(self)
+        self.save_watch_timer.setInterval(3000)
+        self.save_watch_timer.timeout.connect(self.poll_save_folders)
+        self.save_watch_timer.start()
         self.update_action_states()
     
     def _load_localization(self):
-        lang_map = {
-            'zh-CN': "i18n/ui_localization.json",
-            'en-US': "i18n/ui_localization_EN.json",
-            'ru': "i18n/ui_localization_RU.json",
-            'ua': "i18n/ui_localization_UA.json"
-        }
-        filename = lang_map.get(self.current_language, "i18n/ui_localization_EN.json")
-        data = resource_loader.load_json_resource(filename)
+        data = catalog.ui(self.current_language)
         if data and "main_window" in data:
             self.loc = data["main_window"]
         else:
@@ -341,9 +454,11 @@ class MainWindow(QMainWindow):
             self.loc = {
                 "window_title": "Borderlands 4 Save Editor V{version}",
                 "subtitle": "By SuperExboom",
-                "header": {"title": "BL4 Save Editor", "open": "Open", "save": "Save", "save_as": "Save As..."},
+                "header": {"title": "BL4 Save Editor", "open": "Open", "save": "Save", "save_as": "Save As...",
+                           "undo": "Undo", "redo": "Redo", "revert": "Revert", "revert_tip": "Revert to the loaded save"},
                 "menu": {"open_selector": "Open Selector", "save": "Save", "save_as": "Save As..."},
-                "status": {"welcome": "Welcome"},
+                "status": {"welcome": "Welcome", "undone": "Undone: {label}", "redone": "Redone: {label}",
+                           "reverted": "Reverted", "nothing_to_undo": "Nothing to undo", "nothing_to_redo": "Nothing to redo"},
                 "tabs": {
                     "select_save": "Select Save", "character": "Character", "items": "Items", 
                     "converter": "Converter", "yaml_editor": "YAML", "class_mod": "Class Mod", 
@@ -406,6 +521,24 @@ class MainWindow(QMainWindow):
         self.save_as_action = QAction(self.loc['menu']['save_as'], self)
         self.save_as_action.triggered.connect(lambda: self.encrypt_and_save(save_as=True))
 
+        self.undo_action = QAction(self.loc['header']['undo'], self)
+        self.undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        self.undo_action.triggered.connect(self.undo_edit)
+        self.addAction(self.undo_action)
+
+        self.redo_action = QAction(self.loc['header']['redo'], self)
+        self.redo_action.setShortcuts([QKeySequence.StandardKey.Redo, QKeySequence("Ctrl+Y")])
+        self.redo_action.triggered.connect(self.redo_edit)
+        self.addAction(self.redo_action)
+
+        self.revert_action = QAction(self.loc['header']['revert'], self)
+        self.revert_action.triggered.connect(self.revert_to_loaded)
+
+        self.cancel_open_action = QAction(self.loc['dialogs']['cancel'], self)
+        self.cancel_open_action.setShortcut(QKeySequence(Qt.Key.Key_Escape))
+        self.cancel_open_action.triggered.connect(self.cancel_open)
+        self.addAction(self.cancel_open_action)
+
     def _create_header_bar(self):
         self.header_bar = QWidget()
         self.header_bar.setObjectName("headerBar")
@@ -435,9 +568,24 @@ class MainWindow(QMainWindow):
         self.save_as_button = QPushButton(self.loc['header']['save_as'])
         self.save_as_button.clicked.connect(self.save_as_action.trigger)
 
+        self.undo_button = QPushButton("↶")
+        self.undo_button.setFixedWidth(45)
+        self.undo_button.setToolTip(self.loc['header']['undo'])
+        self.undo_button.clicked.connect(self.undo_action.trigger)
+        self.redo_button = QPushButton("↷")
+        self.redo_button.setFixedWidth(45)
+        self.redo_button.setToolTip(self.loc['header']['redo'])
+        self.redo_button.clicked.connect(self.redo_action.trigger)
+        self.revert_button = QPushButton(self.loc['header']['revert'])
+        self.revert_button.setToolTip(self.loc['header']['revert_tip'])
+        self.revert_button.clicked.connect(self.revert_action.trigger)
+
         header_layout.addWidget(self.open_button)
         header_layout.addWidget(self.save_button)
         header_layout.addWidget(self.save_as_button)
+        header_layout.addWidget(self.undo_button)
+        header_layout.addWidget(self.redo_button)
+        header_layout.addWidget(self.revert_button)
 
         self.lang_button = QPushButton(self._get_lang_button_text())
         self.lang_button.setFixedWidth(60)
@@ -516,7 +664,8 @@ class MainWindow(QMainWindow):
     def _add_tabs(self):
         self.selector_page = SaveSelectorWidget()
         self.selector_page.open_save_requested.connect(self.open_save_from_selector)
-        self.selector_page.refresh_button.clicked.connect(self.scan_for_saves)
+        self.selector_page.save_selected.connect(self.controller.preloader.request)
+        self.selector_page.refresh_button.clicked.connect(lambda: self.scan_for_saves(verify_files=True))
         self.add_tab(self.selector_page, self.loc['tabs']['select_save'], "📁")
 
         self.character_tab = QtCharacterTab()
@@ -598,11 +747,13 @@ class MainWindow(QMainWindow):
                 # Manually set the button as checked. This will not emit `idClicked`.
                 button_to_check.setChecked(True)
             self.update_action_states()
+            self._refresh_yaml_tab_if_visible()
 
     @pyqtSlot(int)
     def handle_nav_click(self, index: int):
         self.content_stack.setCurrentIndex(index)
         self.update_action_states()
+        self._refresh_yaml_tab_if_visible()
 
     def browse_and_open_save(self):
         """
@@ -702,55 +853,131 @@ class MainWindow(QMainWindow):
 
     @pyqtSlot(str, str)
     def open_save_from_selector(self, file_path_str: str, user_id: str):
-        file_path = Path(file_path_str)
-        current_user_id = user_id
-        
-        custom_backup_path = self.selector_page.get_custom_backup_path()
-        
         # 标记是否是第一次尝试，用于控制错误信息的显示
         # 如果一开始就没有ID，不算是一次"失败"的尝试，直接提示输入
-        first_attempt = True
+        self._start_open(Path(file_path_str), user_id, first_attempt=True)
+
+    def _start_open(self, file_path: Path, user_id: str, first_attempt: bool):
+        """在后台线程中读取、解密并解析存档，各阶段进度显示在状态栏，按 Esc 取消。"""
+        if self.open_thread is not None:
+            # 打开另一个存档时放弃正在进行的那个
+            self.open_worker.cancel()
+            self._queued_open = (file_path, user_id, first_attempt)
+            return
+        self._queued_open = None
+        self._open_request = (file_path, user_id, first_attempt)
+        self._open_started = time.perf_counter()
 
-        while True:
-            try:
-                _, platform, backup_name = self.controller.decrypt_save(file_path, current_user_id, custom_backup_path)
-                
-                # Success
-                QMessageBox.information(self, self.loc['dialogs']['success'], 
-                                        self.loc['dialogs']['decrypt_success'].format(platform=platform.upper(), backup_name=backup_name))
-                self.setWindowTitle(f"{self.loc['window_title'].format(version=VERSION)} - {file_path.name}")
-                
-                QTimer.singleShot(0, self.refresh_all_tabs)
-                self.switch_to_tab(1)  # Switch to character tab
-                return # Break loop and exit
-
-            except Exception as e:
-                # Prepare dialog message
-                dialog_title = self.loc['dialogs']['user_id_needed']
-                dialog_msg = self.loc['dialogs']['enter_user_id']
-                
-                # 如果是尝试过一次（且不是因为ID为空导致的验证错误），或者ID本身就不为空但失败了
-                if (not first_attempt) or (current_user_id and str(e) != "User ID cannot be empty"):
-                     # 简化错误信息显示，只显示第一行关键信息
-                    err_lines = str(e).split('\n')
-                    short_err = err_lines[0] if err_lines else str(e)
-                    
-                    dialog_title = self.loc['dialogs']['decrypt_failed']
-                    dialog_msg = self.loc['dialogs']['decrypt_failed_msg'].format(user_id=current_user_id, error=short_err)
-
-                # Popup input dialog
-                text, ok = QInputDialog.getText(self, dialog_title, dialog_msg, QLineEdit.EchoMode.Normal, current_user_id)
-                
-                if ok:
-                    current_user_id = text.strip()
-                    first_attempt = False
-                else:
-                    # User cancelled
-                    # If it was a critical failure during the first automated attempt, maybe show the error?
-                    # But usually cancel means "I give up".
-                    if not first_attempt: # If user gave up after a retry
-                        QMessageBox.warning(self, self.loc['dialogs']['cancel'], self.loc['dialogs']['open_cancelled'])
-                    return
+        self.open_thread = QThread()
+        self.open_worker = OpenWorker(self.controller, file_path, user_id)
+        self.open_worker.moveToThread(self.open_thread)
+
+        self.open_thread.started.connect(self.open_worker.run)
+        self.open_worker.progress.connect(self.on_open_progress)
+        self.open_worker.parsed.connect(self.on_open_parsed)
+        self.open_worker.items_ready.connect(self.on_open_items_ready)
+        self.open_worker.error.connect(self.on_open_failed)
+        self.open_worker.cancelled.connect(self.on_open_cancelled)
+
+        self.open_worker.finished.connect(self.open_thread.quit)
+        self.open_worker.finished.connect(self.open_worker.deleteLater)
+        self.open_thread.finished.connect(self.open_thread.deleteLater)
+        self.open_thread.finished.connect(self._on_open_thread_done)
+
+        self.open_thread.start()
+
+    @pyqtSlot()
+    def cancel_open(self):
+        if self.open_thread is not None:
+            self.open_worker.cancel()
+
+    def on_open_progress(self, stage):
+        self.log(self.loc['dialogs'].get(f'open_stage_{stage}', stage))
+
+    def on_open_parsed(self, prepared, timings):
+        if self._queued_open is not None:
+            return  # 已被新的打开请求取代
+        file_path = prepared.path
+        custom_backup_path = self.selector_page.get_custom_backup_path()
+        try:
+            _, platform, backup_name = self.controller.adopt_prepared(prepared, custom_backup_path)
+        except Exception as e:
+            self.open_worker.cancel()
+            self.on_open_failed(str(e))
+            return
+
+        # 物品解码完成前先显示角色和YAML，物品页随后填充
+        try:
+            self.character_tab.update_fields(self.controller.get_character_data())
+            self._yaml_tab_stale = True
+            self._refresh_yaml_tab_if_visible()
+        except Exception as e:
+            self.log(f"CRITICAL: An exception occurred while showing the save: {e}", force_popup=True)
+        self.controller.journal.clear()
+
+        ms = {k: timings.get(k, 0.0) * 1000 for k in ("read", "cache", "key_probe", "decrypt", "inflate", "parse")}
+        ms["total"] = (time.perf_counter() - self._open_started) * 1000
+        self.log(self.loc['dialogs']['open_timing'].format(**ms))
+        self.setWindowTitle(f"{self.loc['window_title'].format(version=VERSION)} - {file_path.name}")
+        self.switch_to_tab(1)  # Switch to character tab
+
+        # 备份在后台写出，报告成功之前确认它确实写好了
+        backup_error = self.controller.backup_error()
+        if backup_error:
+            self.log(f"Backup failed: {backup_error}")
+            QMessageBox.warning(self, self.loc['dialogs']['error'],
+                                self.loc['dialogs']['backup_failed'].format(platform=platform.upper(), backup_name=backup_name,
+                                                                            error=backup_error))
+            return
+        QMessageBox.information(self, self.loc['dialogs']['success'], 
+                                self.loc['dialogs']['decrypt_success'].format(platform=platform.upper(), backup_name=backup_name))
+
+    def on_open_items_ready(self, root, index, items, timings):
+        self.controller.adopt_item_index(root, index)
+        if root is not self.controller.yaml_obj:
+            # 解码期间已经编辑过，按当前内容重新生成
+            items = self.controller.get_all_items()
+        self.items_tab.update_tree(items)
+        self.weapon_editor_tab.refresh_backpack_items(items)
+        self.log(self.loc['dialogs']['open_items_ready'].format(count=len(items), index=timings.get("index", 0.0) * 1000))
+
+    def on_open_cancelled(self):
+        if self._queued_open is None:
+            self.log(self.loc['dialogs']['open_cancelled'])
+
+    def on_open_failed(self, message):
+        file_path, current_user_id, first_attempt = self._open_request
+        # Prepare dialog message
+        dialog_title = self.loc['dialogs']['user_id_needed']
+        dialog_msg = self.loc['dialogs']['enter_user_id']
+
+        # 如果是尝试过一次（且不是因为ID为空导致的验证错误），或者ID本身就不为空但失败了
+        if (not first_attempt) or (current_user_id and message != "User ID cannot be empty"):
+             # 简化错误信息显示，只显示第一行关键信息
+            err_lines = message.split('\n')
+            short_err = err_lines[0] if err_lines else message
+
+            dialog_title = self.loc['dialogs']['decrypt_failed']
+            dialog_msg = self.loc['dialogs']['decrypt_failed_msg'].format(user_id=current_user_id, error=short_err)
+
+        # Popup input dialog
+        text, ok = QInputDialog.getText(self, dialog_title, dialog_msg, QLineEdit.EchoMode.Normal, current_user_id)
+
+        if ok:
+            # 用新ID重试（若线程尚未结束，会在结束后开始）
+            self._start_open(file_path, text.strip(), False)
+        else:
+            # User cancelled
+            # If it was a critical failure during the first automated attempt, maybe show the error?
+            # But usually cancel means "I give up".
+            if not first_attempt: # If user gave up after a retry
+                QMessageBox.warning(self, self.loc['dialogs']['cancel'], self.loc['dialogs']['open_cancelled'])
+
+    def _on_open_thread_done(self):
+        self.open_thread = None
+        queued, self._queued_open = self._queued_open, None
+        if queued is not None:
+            self._start_open(*queued)
 
     def update_action_states(self):
         is_editor_active = self.content_stack.currentIndex() > 0
@@ -758,10 +985,87 @@ class MainWindow(QMainWindow):
         self.save_as_action.setEnabled(is_editor_active)
 
     @pyqtSlot()
-    def scan_for_saves(self):
+    def undo_edit(self):
+        if not self.controller.yaml_obj: return
+        label = self.controller.undo()
+        if label is None:
+            self.log(self.loc['status']['nothing_to_undo'])
+            return
+        self.refresh_changed_tabs()
+        self.log(self.loc['status']['undone'].format(label=label))
+
+    @pyqtSlot()
+    def redo_edit(self):
+        if not self.controller.yaml_obj: return
+        label = self.controller.redo()
+        if label is None:
+            self.log(self.loc['status']['nothing_to_redo'])
+            return
+        self.refresh_changed_tabs()
+        self.log(self.loc['status']['redone'].format(label=label))
+
+    @pyqtSlot()
+    def revert_to_loaded(self):
+        if not self.controller.yaml_obj: return
+        if self.controller.revert_to_loaded():
+            self.refresh_changed_tabs()
+            self.log(self.loc['status']['reverted'])
+
+    @pyqtSlot()
+    def scan_for_saves(self, verify_files=False):
         custom_path = self.selector_page.get_custom_save_path()
-        saves = self.controller.scan_save_folders(custom_path)
+        saves = self.controller.scan_save_folders(custom_path, verify_files=verify_files)
+        self.controller.summaries.retain(info["full_path"] for info in saves)
+        jobs = self.controller.summaries.attach(saves)
         self.selector_page.update_view(saves)
+        self.start_summary_indexing(jobs)
+
+    @pyqtSlot()
+    def poll_save_folders(self):
+        # 只在选择页可见时检查
+        if self.content_stack.currentWidget() is not self.selector_page:
+            return
+        changes = self.controller.poll_save_folders(self.selector_page.get_custom_save_path())
+        if changes:
+            added, removed, changed = changes
+            self.controller.summaries.discard(removed)
+            jobs = self.controller.summaries.attach(added + changed)
+            self.selector_page.apply_scan_changes(added, removed, changed)
+            self.start_summary_indexing(jobs)
+
+    def start_summary_indexing(self, jobs):
+        """在后台（多进程）解密变化过的存档并填充选择页的摘要列。"""
+        if not jobs:
+            return
+        if self.summary_thread is not None:
+            self._pending_summary_jobs.extend(jobs)
+            return
+
+        self.summary_thread = QThread()
+        self.summary_worker = SummaryWorker(self.controller.summaries, jobs)
+        self.summary_worker.moveToThread(self.summary_thread)
+
+        self.summary_thread.started.connect(self.summary_worker.run)
+        self.summary_worker.summary_ready.connect(self.selector_page.set_summary)
+        self.summary_worker.finished.connect(self.summary_thread.quit)
+        self.summary_worker.finished.connect(self.summary_worker.deleteLater)
+        self.summary_thread.finished.connect(self.summary_thread.deleteLater)
+        self.summary_thread.finished.connect(self._on_summary_thread_done)
+
+        self.summary_thread.start()
+
+    def _on_summary_thread_done(self):
+        self.summary_thread = None
+        jobs, self._pending_summary_jobs = self._pending_summary_jobs, []
+        self.start_summary_indexing(list(dict.fromkeys(jobs)))
+
+    def closeEvent(self, event):
+        if self.summary_thread is not None:
+            self._pending_summary_jobs = []
+            self.controller.summaries.cancel()
+            self.summary_thread.quit()
+            self.summary_thread.wait()
+        super().closeEvent(event)
 
     def refresh_all_tabs(self):
         if not self.controller.yaml_obj: return
@@ -769,18 +1073,64 @@ class MainWindow(QMainWindow):
         try:
             self.character_tab.update_fields(self.controller.get_character_data())
             self.log("  - Character tab refreshed.")
-            self.items_tab.update_tree(self.controller.get_all_items())
+            items = self.controller.get_all_items()
+            self.items_tab.update_tree(items)
             self.log("  - Items tab refreshed.")
             if hasattr(self, 'weapon_editor_tab'):
                 self.log("  - Refreshing weapon editor tab...")
-                self.weapon_editor_tab.refresh_backpack_items()
+                self.weapon_editor_tab.refresh_backpack_items(items)
                 self.log("  - Weapon editor tab refreshed.")
             self.yaml_editor_tab.set_yaml_text(self.controller.get_yaml_string())
+            self._yaml_tab_stale = False
             self.log("  - YAML editor tab refreshed.")
         except Exception as e:
             self.log(f"CRITICAL: An exception occurred during refresh_all_tabs: {e}", force_popup=True)
+        # 所有视图都已是最新，丢弃积压的修改记录
+        self.controller.journal.clear()
         self.log("Main window: Finished refreshing all tabs.")
 
+    def _subscribe_to_controller(self):
+        """各标签页只订阅自己显示的子树。"""
+        journal = self.controller.journal
+        journal.subscribe([("state",), ("currencies",)], self._on_character_changed)
+        journal.subscribe([()], self._on_items_changed)
+        journal.subscribe([()], self._on_yaml_changed)
+
+    def refresh_changed_tabs(self):
+        """把控制器记录的修改分发给订阅的标签页，只刷新受影响的部分。"""
+        if not self.controller.yaml_obj: return
+        try:
+            self.controller.journal.flush()
+        except Exception as e:
+            self.log(f"CRITICAL: An exception occurred during refresh_changed_tabs: {e}", force_popup=True)
+
+    def _on_character_changed(self, paths):
+        self.character_tab.update_fields(self.controller.get_character_data())
+
+    def _on_items_changed(self, paths):
+        changed = self.controller.collect_item_changes(paths)
+        if changed is not None:
+            if not changed:
+                return
+            if self.items_tab.update_items(changed) and self.weapon_editor_tab.update_backpack_items(changed):
+                self.log(f"Refreshed {len(changed)} item row(s).")
+                return
+        items = self.controller.get_all_items()
+        self.items_tab.update_tree(items)
+        self.weapon_editor_tab.refresh_backpack_items(items)
+
+    def _on_yaml_changed(self, paths):
+        # YAML视图是整份文档，只在可见时才重新生成
+        if self._yaml_from_editor:
+            return
+        self._yaml_tab_stale = True
+        self._refresh_yaml_tab_if_visible()
+
+    def _refresh_yaml_tab_if_visible(self):
+        if self._yaml_tab_stale and self.content_stack.currentWidget() is self.yaml_editor_tab:
+            self._yaml_tab_stale = False
+            self.yaml_editor_tab.set_yaml_text(self.controller.get_yaml_string())
+
     def log(self, message, force_popup=False):
         self.status_label.setText(message)
         if force_popup:
@@ -806,13 +1156,21 @@ class MainWindow(QMainWindow):
             path = self.controller.add_item_to_backpack(final_serial, flag)
             if path:
                 QMessageBox.information(self, self.loc['dialogs']['success'], self.loc['dialogs']['add_success'])
-                self.refresh_all_tabs()
+                self.refresh_changed_tabs()
+                self._warn_backpack_capacity()
             else:
                 QMessageBox.critical(self, self.loc['dialogs']['error'], self.loc['dialogs']['add_fail'])
 
         except Exception as e:
             self.log(self.loc['dialogs']['add_error'].format(error=e), force_popup=True)
     
+    def _warn_backpack_capacity(self):
+        """背包物品数超过游戏允许的容量时提示。"""
+        used, capacity = self.controller.backpack_usage()
+        if capacity and used > capacity:
+            QMessageBox.warning(self, self.loc['dialogs']['warning'],
+                                self.loc['dialogs']['backpack_over_capacity'].format(used=used, capacity=capacity))
+
     @pyqtSlot(dict)
     def handle_update_item(self, payload: dict):
         if not self.controller.yaml_obj:
@@ -828,7 +1186,7 @@ class MainWindow(QMainWindow):
             )
             final_msg = payload.get("success_msg", msg)
             QMessageBox.information(self, self.loc['dialogs']['success'], final_msg)
-            self.refresh_all_tabs()
+            self.refresh_changed_tabs()
         except Exception as e:
             # Catch potential crashes from C-extensions and show an error dialog
             self.log(self.loc['dialogs']['update_error'].format(error=e), force_popup=True)
@@ -839,7 +1197,7 @@ class MainWindow(QMainWindow):
         paths = data.pop('cur_paths', {})
         if self.controller.apply_character_data(data, paths):
             QMessageBox.information(self, self.loc['dialogs']['success'], self.loc['dialogs']['char_applied'])
-            self.refresh_all_tabs()
+            self.refresh_changed_tabs()
         else:
             QMessageBox.critical(self, self.loc['dialogs']['error'], self.loc['dialogs']['char_apply_error'])
 
@@ -856,7 +1214,7 @@ class MainWindow(QMainWindow):
             else:
                 QMessageBox.information(self, self.loc['dialogs']['sync_title'], msg)
             
-            if success > 0: self.refresh_all_tabs()
+            if success > 0: self.refresh_changed_tabs()
 
     @pyqtSlot(str, dict)
     def handle_unlock_request(self, preset_name: str, params: dict):
@@ -869,14 +1227,20 @@ class MainWindow(QMainWindow):
         
         if self.controller.apply_unlock_preset(preset_name, params):
             QMessageBox.information(self, self.loc['dialogs']['success'], self.loc['dialogs']['preset_applied'].format(name=preset_name))
-            self.refresh_all_tabs()
+            self.refresh_changed_tabs()
         else:
             QMessageBox.critical(self, self.loc['dialogs']['error'], self.loc['dialogs']['preset_fail'].format(name=preset_name))
 
     @pyqtSlot(str)
     def handle_yaml_update(self, yaml_string: str):
         if self.controller.update_yaml_object(yaml_string):
-            self.refresh_all_tabs()
+            # 文本来自YAML编辑器本身，不需要再回写给它，只更新树视图
+            self._yaml_from_editor = True
+            try:
+                self.controller.journal.flush()
+            finally:
+                self._yaml_from_editor = False
+            self.yaml_editor_tab.parse_yaml_to_tree()
 
     @pyqtSlot(list, str)
     def handle_batch_add(self, lines: list, flag: str):
@@ -904,7 +1268,8 @@ class MainWindow(QMainWindow):
         if success_count > 0:
             QMessageBox.information(self, self.loc['dialogs']['batch_complete'], 
                                     self.loc['dialogs']['batch_success'].format(count=success_count))
-            self.refresh_all_tabs()
+            self.refresh_changed_tabs()
+            self._warn_backpack_capacity()
         else:
             QMessageBox.warning(self, self.loc['dialogs']['batch_fail'], 
                                 self.loc['dialogs']['batch_fail_msg'].format(count=fail_count))
@@ -949,7 +1314,8 @@ class MainWindow(QMainWindow):
         if success > 0:
             QMessageBox.information(self, self.loc['dialogs']['iter_complete'], 
                                     self.loc['dialogs']['iter_success'].format(count=success))
-            self.refresh_all_tabs()
+            self.refresh_changed_tabs()
+            self._warn_backpack_capacity()
         else:
             QMessageBox.warning(self, self.loc['dialogs']['iter_fail'], 
                                 self.loc['dialogs']['iter_fail_msg'].format(count=fail))
@@ -964,13 +1330,47 @@ class MainWindow(QMainWindow):
             if not path: return
             path_to_save = Path(path)
         
-        try:
-            data = self.controller.encrypt_save(self.controller.get_yaml_string())
-            path_to_save.write_bytes(data)
-            QMessageBox.information(self, self.loc['dialogs']['success'], 
-                                    self.loc['dialogs']['save_saved'].format(path=path_to_save))
-        except Exception as e:
-            QMessageBox.critical(self, self.loc['dialogs']['encrypt_failed'], str(e))
+        if self.save_thread is not None:
+            return  # 上一次保存尚未完成
+
+        self.save_button.setEnabled(False)
+        self.save_as_button.setEnabled(False)
+
+        self.save_thread = QThread()
+        self.save_worker = SaveWorker(self.controller, path_to_save, self.selector_page.get_compression_level())
+        self.save_worker.moveToThread(self.save_thread)
+
+        self.save_thread.started.connect(self.save_worker.run)
+        self.save_worker.progress.connect(self.on_save_progress)
+        self.save_worker.finished.connect(self.on_save_finished)
+        self.save_worker.error.connect(self.on_save_failed)
+
+        self.save_worker.finished.connect(self.save_thread.quit)
+        self.save_worker.error.connect(self.save_thread.quit)
+        self.save_worker.finished.connect(self.save_worker.deleteLater)
+        self.save_worker.error.connect(self.save_worker.deleteLater)
+        self.save_thread.finished.connect(self.save_thread.deleteLater)
+        self.save_thread.finished.connect(self._on_save_thread_done)
+
+        self.save_thread.start()
+
+    def on_save_progress(self, stage):
+        self.log(self.loc['dialogs'].get(f'save_stage_{stage}', stage))
+
+    def on_save_finished(self, path, timings):
+        ms = {k: v * 1000 for k, v in timings.items()}
+        self.log(self.loc['dialogs']['save_timing'].format(**ms))
+        QMessageBox.information(self, self.loc['dialogs']['success'], 
+                                self.loc['dialogs']['save_saved'].format(path=path))
+
+    def on_save_failed(self, message):
+        self.log(message)
+        QMessageBox.critical(self, self.loc['dialogs']['encrypt_failed'], message)
+
+    def _on_save_thread_done(self):
+        self.save_thread = None
+        self.save_button.setEnabled(True)
+        self.save_as_button.setEnabled(True)
 
     def _get_lang_button_text(self):
         code_map = {
@@ -1024,9 +1424,16 @@ class MainWindow(QMainWindow):
         self.open_button.setText(self.loc['header']['open'])
         self.save_button.setText(self.loc['header']['save'])
         self.save_as_button.setText(self.loc['header']['save_as'])
+        self.undo_button.setToolTip(self.loc['header']['undo'])
+        self.redo_button.setToolTip(self.loc['header']['redo'])
+        self.revert_button.setText(self.loc['header']['revert'])
+        self.revert_button.setToolTip(self.loc['header']['revert_tip'])
         self.open_action.setText(self.loc['menu']['open_selector'])
         self.save_action.setText(self.loc['menu']['save'])
         self.save_as_action.setText(self.loc['menu']['save_as'])
+        self.undo_action.setText(self.loc['header']['undo'])
+        self.redo_action.setText(self.loc['header']['redo'])
+        self.revert_action.setText(self.loc['header']['revert'])
         self.status_label.setText(self.loc['status']['welcome'])
         self.lang_button.setText(self._get_lang_button_text())
         
@@ -1076,6 +1483,8 @@ class MainWindow(QMainWindow):
         self.theme_button.setToolTip(self._get_theme_tooltip())
 
 def main():
+    # 打包后的程序在摘要索引的子进程中需要
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     icon_path = resource_loader.get_resource_path("assets/BL4.ico")
     if icon_path:
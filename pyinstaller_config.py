@@ -5,50 +5,12 @@ PyInstaller配置文件
 """
 
 import sys
-import glob
 from pathlib import Path
 
-# 动态收集enhancement目录下的所有.csv和.json文件
-enhancement_files = []
-for file_path in glob.glob('enhancement/*'):
-    if file_path.endswith('.csv') or file_path.endswith('.json'):
-        enhancement_files.append((file_path, 'enhancement'))
-        
-# 动态收集weapon_edit目录下的所有.csv和.json文件
-weapon_files = []
-for file_path in glob.glob('weapon_edit/*'):
-    if file_path.endswith('.csv') or file_path.endswith('.json'):
-        weapon_files.append((file_path, 'weapon_edit'))
-
-# 动态收集grenade目录下的所有.csv和.json文件
-grenade_files = []
-for file_path in glob.glob('grenade/*'):
-    if file_path.endswith('.csv') or file_path.endswith('.json'):
-        grenade_files.append((file_path, 'grenade'))
-
-# 动态收集shield目录下的所有.csv和.json文件
-shield_files = []
-for file_path in glob.glob('shield/*'):
-    if file_path.endswith('.csv') or file_path.endswith('.json'):
-        shield_files.append((file_path, 'shield'))
-
-# 动态收集repkit目录下的所有.csv和.json文件
-repkit_files = []
-for file_path in glob.glob('repkit/*'):
-    if file_path.endswith('.csv') or file_path.endswith('.json'):
-        repkit_files.append((file_path, 'repkit'))
-
-# 动态收集heavy目录下的所有.csv和.json文件
-heavy_files = []
-for file_path in glob.glob('heavy/*'):
-    if file_path.endswith('.csv') or file_path.endswith('.json'):
-        heavy_files.append((file_path, 'heavy'))
-
-# 动态收集i18n目录下的所有本地化文件
-i18n_files = []
-for file_path in glob.glob('i18n/*'):
-    if file_path.endswith('.json'):
-        i18n_files.append((file_path, 'i18n'))
+# enhancement、weapon_edit、grenade、shield、repkit、heavy、class_mods 和 i18n 目录下的
+# CSV/JSON 在打包前编译成一个资源包（core/resource_pack.py），程序运行时只读取这一个文件
+PACK_FILE = 'resources.pack'
+data_files = [(PACK_FILE, '.')]
 
 # 收集assets目录下的资源文件
 assets_files = [
@@ -69,16 +31,13 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[
-        ('class_mods/*.json', 'class_mods'),
-        ('class_mods/*.csv', 'class_mods'),
         ('class_mods/Amon/*.png', 'class_mods/Amon'),
         ('class_mods/Harlowe/*.png', 'class_mods/Harlowe'),
         ('class_mods/Rafa/*.png', 'class_mods/Rafa'),
         ('class_mods/Vex/*.png', 'class_mods/Vex'),
-    ] + {enhancement_files} + {weapon_files} + {grenade_files} + {shield_files} + {repkit_files} + {heavy_files} + {i18n_files} + {assets_files},
+    ] + {data_files} + {assets_files},
     hiddenimports=[
         'PIL',
-        'pandas',
         'PIL.Image',
         'PIL.ImageTk',
         'yaml',
@@ -86,6 +45,8 @@ a = Analysis(
         'Crypto.Util.Padding',
         'core',
         'core.resource_loader',
+        'core.resource_pack',
+        'core.part_catalog',
         'core.bl4_functions',
         'core.decoder_logic',
         'core.b_encoder',
@@ -145,6 +106,13 @@ exe = EXE(
 )
 '''
 
+def build_resource_pack():
+    """把数据目录编译成资源包"""
+    from core import resource_pack
+    pack_path = resource_pack.build_pack(Path('.'), Path(PACK_FILE))
+    print(f"Built resource pack: {pack_path}")
+    return pack_path
+
 def create_spec_file():
     """创建PyInstaller spec文件"""
     spec_path = Path('BL4SaveEditor.spec')
@@ -163,6 +131,7 @@ def build_executable():
         import subprocess
         subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'pyinstaller'])
     
+    build_resource_pack()
     spec_path = create_spec_file()
     
     print("Building executable...")
@@ -188,7 +157,7 @@ if __name__ == "__main__":
     print("=== PyInstaller Configuration ===")
     print("This script will help you build a Windows executable for BL4 Save Editor")
     print("Make sure all dependencies are installed:")
-    print("  pip install pyinstaller pillow pyyaml pycryptodome pandas PyQt6")
+    print("  pip install pyinstaller pillow pyyaml pycryptodome PyQt6")
     print()
     
     response = input("Do you want to build the executable now? (y/n): ")
@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import pyqtSignal, Qt
 from typing import Dict, Any
 from core.unlock_data import CHARACTER_CLASSES
-from core import resource_loader
+from core.localization import catalog
 
 class QtCharacterTab(QWidget):
     character_data_changed = pyqtSignal(dict)
@@ -167,8 +167,7 @@ class QtCharacterTab(QWidget):
             self.unlock_requested.emit("set_character_class", {"class_key": class_key})
 
     def _load_localization(self):
-        filename = resource_loader.get_ui_localization_file(self.current_lang)
-        data = resource_loader.load_json_resource(filename)
+        data = catalog.ui(self.current_lang)
         if data and "character_tab" in data:
             self.loc = data["character_tab"]
         else:
@@ -14,6 +14,7 @@ from PyQt6.QtCore import pyqtSignal, Qt, QSize
 
 from core import b_encoder
 from core import resource_loader
+from core.localization import catalog
 
 # Load all skill descriptions at startup
 skill_descriptions = resource_loader.load_all_skill_descriptions()
@@ -206,15 +207,14 @@ class QtClassModEditorTab(QWidget):
         if lang in ['en-US', 'ru', 'ua']:
             return {}
         try:
-            return resource_loader.load_class_mods_json("class_localization.json") or {}
+            return catalog.table("class_mods/class_localization.json")
         except Exception as e:
             print(f"加载本地化文件失败: {e}")
             return {}
 
     def _load_ui_localization(self, lang=None):
         if lang is None: lang = self.current_lang
-        filename = resource_loader.get_ui_localization_file(lang)
-        data = resource_loader.load_json_resource(filename)
+        data = catalog.ui(lang)
         if data and "class_mod_tab" in data:
             return data["class_mod_tab"]
         else:
@@ -381,8 +381,7 @@ class QtClassModEditorTab(QWidget):
         # If we loaded flags_loc (we didn't in this file), we could use it.
         # Let's check if we can load it.
         try:
-            loc_file = resource_loader.get_ui_localization_file(self.current_lang)
-            full_loc = resource_loader.load_json_resource(loc_file) or {}
+            full_loc = catalog.ui(self.current_lang)
             flags_loc = full_loc.get("weapon_editor_tab", {}).get("flags", {})
             if flags_loc:
                 flags_map = {k: flags_loc.get(k, v) for k, v in flags_map.items()}
@@ -776,16 +775,11 @@ class QtClassModEditorTab(QWidget):
         self.update_string()
 
     def _get_current_class_en(self):
-        current_class_display = self.class_combo.currentText()
-        for key, value in self.localization.items():
-            if value == current_class_display:
-                return key
-        return current_class_display # Fallback
+        return self._get_english_key(self.class_combo.currentText())
 
     def _get_english_key(self, localized_value):
-        for key, value in self.localization.items():
-            if value == localized_value: return key
-        return localized_value
+        if not self.localization: return localized_value
+        return catalog.reverse_table("class_mods/class_localization.json").get(localized_value, localized_value)
 
     def _add_to_backpack(self):
         serial = self.base85_output.text()
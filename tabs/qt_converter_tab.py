@@ -9,7 +9,7 @@ from PyQt6.QtCore import pyqtSignal, QTimer, Qt, QObject, QThread
 
 import decoder_logic
 from core import b_encoder
-from core import resource_loader
+from core.localization import catalog
 
 class BatchConverterWorker(QObject):
     """后台工作线程，用于批量转换"""
@@ -590,8 +590,7 @@ class QtConverterTab(QWidget):
                 QMessageBox.critical(self, self.loc['dialogs']['export_fail'], self.loc['dialogs']['write_fail'].format(error=e))
     
     def _load_localization(self):
-        filename = resource_loader.get_ui_localization_file(self.current_lang)
-        data = resource_loader.load_json_resource(filename)
+        data = catalog.ui(self.current_lang)
         if data and "converter_tab" in data:
             self.loc = data["converter_tab"]
         else:
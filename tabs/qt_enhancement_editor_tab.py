@@ -5,6 +5,7 @@ import re
 
 from core import b_encoder
 from core import resource_loader
+from core.localization import catalog
 
 enhancement_data = resource_loader.get_enhancement_data()
 
@@ -55,8 +56,7 @@ class QtEnhancementEditorTab(QWidget):
 
     def _load_ui_localization(self, lang=None):
         if lang is None: lang = self.current_lang
-        filename = resource_loader.get_ui_localization_file(lang)
-        data = resource_loader.load_json_resource(filename)
+        data = catalog.ui(lang)
         if data and "enhancement_tab" in data:
             return data["enhancement_tab"]
         else:
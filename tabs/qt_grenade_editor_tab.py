@@ -1,4 +1,3 @@
-import pandas as pd
 from functools import lru_cache
 import random
 import re
@@ -13,20 +12,20 @@ from PyQt6.QtGui import QColor
 
 from core import b_encoder
 from core import resource_loader
-import lookup
+from core.localization import catalog
 from core import bl4_functions as bl4f
 
 @lru_cache(maxsize=None)
 def load_grenade_data(lang='zh-CN'):
     try:
         suffix = "_EN" if lang in ['en-US', 'ru', 'ua'] else ""
-        df_main = pd.read_csv(resource_loader.get_grenade_data_path(f'grenade_main_perk{suffix}.csv'))
-        df_mfg = pd.read_csv(resource_loader.get_grenade_data_path(f'manufacturer_rarity_perk{suffix}.csv'))
+        df_main = resource_loader.load_csv_table(f'grenade/grenade_main_perk{suffix}.csv')
+        df_mfg = resource_loader.load_csv_table(f'grenade/manufacturer_rarity_perk{suffix}.csv')
         
         # Load localization json if available, mainly for Chinese
         localization = {}
         if lang == 'zh-CN':
-            localization = resource_loader.load_json_resource('grenade/Grenade_localization_zh-CN.json') or {}
+            localization = catalog.table('grenade/Grenade_localization_zh-CN.json')
             
         return df_main, df_mfg, localization
     except Exception as e:
@@ -57,8 +56,7 @@ class QtGrenadeEditorTab(QWidget):
         self.on_mfg_change()
 
     def _load_ui_localization(self):
-        loc_file = resource_loader.get_ui_localization_file(self.current_lang)
-        full_loc = resource_loader.load_json_resource(loc_file) or {}
+        full_loc = catalog.ui(self.current_lang)
         self.ui_loc = full_loc.get("grenade_tab", {})
         self.flags_loc = full_loc.get("weapon_editor_tab", {}).get("flags", {})
 
@@ -233,10 +231,8 @@ class QtGrenadeEditorTab(QWidget):
             sel_list.model().rowsInserted.connect(self.rebuild_output); sel_list.model().rowsRemoved.connect(self.rebuild_output)
 
     def _get_mfg_name(self, mfg_id):
-        if mfg_id in lookup.REVERSE_ID_MAP:
-            mfg_en = lookup.REVERSE_ID_MAP[mfg_id][0]
-            return bl4f.get_localized_string(mfg_en)
-        return "Unknown"
+        names = catalog.item_display_names(bl4f.current_localization_lang).get(mfg_id)
+        return names[0] if names else "Unknown"
 
     def populate_initial_data(self):
         self.mfg_combo.clear()
@@ -245,9 +241,9 @@ class QtGrenadeEditorTab(QWidget):
         self.mfg_combo.addItems([f"{v} - {k}" for k, v in sorted(mfg_map.items(), key=lambda x: x[1])]) # Sort by name? or Keep ID? Original sorted by items() which sorts by ID.
         # Original: sorted(self.mfg_map.items()) -> sorted by ID
         
-        self._populate_radio_buttons(self.element_frame, self.df_main[self.df_main['Part_type'] == 'Element'], self.element_widgets)
-        self._populate_radio_buttons(self.firmware_frame, self.df_main[self.df_main['Part_type'] == 'Firmware'], self.firmware_widgets)
-        self._populate_listbox(self.universal_avail_list, self.df_main[self.df_main['Part_type'] == 'Perk'])
+        self._populate_radio_buttons(self.element_frame, self.df_main.eq('Part_type', 'Element'), self.element_widgets)
+        self._populate_radio_buttons(self.firmware_frame, self.df_main.eq('Part_type', 'Firmware'), self.firmware_widgets)
+        self._populate_listbox(self.universal_avail_list, self.df_main.eq('Part_type', 'Perk'))
         
     def _clear_layout(self, layout):
         while layout.count():
@@ -258,26 +254,26 @@ class QtGrenadeEditorTab(QWidget):
     def _populate_radio_buttons(self, frame, df, widget_list):
         self._clear_layout(frame)
         widget_list.clear(); none_rb = QRadioButton(self.ui_loc['misc']['none']); none_rb.setChecked(True); frame.addWidget(none_rb); widget_list.append(none_rb)
-        for _, r in df.iterrows():
+        for r in df:
             text = self._(r['Stat'])
-            if 'Description' in r and pd.notna(r['Description']): text += f" - {r['Description']}"
+            if r.get('Description') is not None: text += f" - {r['Description']}"
             rb = QRadioButton(text); rb.setProperty("part_id", r['Part_ID']); frame.addWidget(rb); widget_list.append(rb)
         frame.addStretch(); [rb.toggled.connect(self.rebuild_output) for rb in widget_list]
 
     def _populate_checkboxes(self, frame, df, widget_list):
         self._clear_layout(frame)
         widget_list.clear()
-        for _, r in df.iterrows():
+        for r in df:
             text = self._(r['Stat'])
-            if 'Description' in r and pd.notna(r['Description']): text += f" - {r['Description']}"
+            if r.get('Description') is not None: text += f" - {r['Description']}"
             cb = QCheckBox(text); cb.setProperty("part_id", r['Part_ID']); frame.addWidget(cb); widget_list.append(cb)
         frame.addStretch(); [cb.toggled.connect(self.rebuild_output) for cb in widget_list]
 
     def _populate_listbox(self, listbox, df):
         listbox.clear()
-        for _, r in df.iterrows():
+        for r in df:
             text = self._(r['Stat'])
-            if 'Description' in r and pd.notna(r['Description']): text += f" - {r['Description']}"
+            if r.get('Description') is not None: text += f" - {r['Description']}"
             item=QListWidgetItem(text); item.setData(Qt.ItemDataRole.UserRole, r['Part_ID']); listbox.addItem(item)
 
     def on_mfg_change(self, *args):
@@ -289,19 +285,19 @@ class QtGrenadeEditorTab(QWidget):
         
         self.rarity_combo.blockSignals(True)
         self.rarity_combo.clear()
-        for _, r in self.df_mfg[(self.df_mfg['Manufacturer ID'] == mfg_id) & (self.df_mfg['Part_type'] == 'Rarity')].iterrows():
+        for r in self.df_mfg.eq('Manufacturer ID', mfg_id).eq('Part_type', 'Rarity'):
             desc = r['Description']
-            self.rarity_combo.addItem(f"{self._(r['Stat'])} - {desc if pd.notna(desc) else ''}", r['Part_ID'])
+            self.rarity_combo.addItem(f"{self._(r['Stat'])} - {desc if desc is not None else ''}", r['Part_ID'])
         self.rarity_combo.blockSignals(False)
         self.rarity_combo.setFixedWidth(300)  # Re-apply width after populating
         
-        self._populate_checkboxes(self.mfg_perk_frame, self.df_mfg[(self.df_mfg['Manufacturer ID'] == mfg_id) & (self.df_mfg['Part_type'] == 'Perk')], self.mfg_perk_widgets)
+        self._populate_checkboxes(self.mfg_perk_frame, self.df_mfg.eq('Manufacturer ID', mfg_id).eq('Part_type', 'Perk'), self.mfg_perk_widgets)
         self.legendary_avail_list.clear()
-        df_leg = self.df_mfg[self.df_mfg['Part_type'] == 'Legendary Perk']
-        for _, r in df_leg.iterrows():
+        df_leg = self.df_mfg.eq('Part_type', 'Legendary Perk')
+        for r in df_leg:
             desc = r['Description']
             mfg_name = self._get_mfg_name(r['Manufacturer ID'])
-            display_text = f"{mfg_name} - {self._(r['Stat'])} - {desc if pd.notna(desc) else ''}"
+            display_text = f"{mfg_name} - {self._(r['Stat'])} - {desc if desc is not None else ''}"
             item = QListWidgetItem(display_text)
             item.setData(Qt.ItemDataRole.UserRole, (r['Part_ID'], r['Manufacturer ID']))
             self.legendary_avail_list.addItem(item)
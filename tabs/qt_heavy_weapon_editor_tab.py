@@ -1,4 +1,3 @@
-import pandas as pd
 from functools import lru_cache
 import random
 import re
@@ -12,25 +11,24 @@ from PyQt6.QtCore import pyqtSignal, Qt
 
 from core import b_encoder
 from core import resource_loader
-import lookup
+from core.localization import catalog
 from core import bl4_functions as bl4f
 
 @lru_cache(maxsize=None)
 def load_heavy_weapon_data(lang='zh-CN'):
     try:
         suffix = "_EN" if lang in ['en-US', 'ru', 'ua'] else ""
-        main_perk_path = resource_loader.get_heavy_data_path(f'heavy_main_perk{suffix}.csv')
-        mfg_perk_path = resource_loader.get_heavy_data_path(f'heavy_manufacturer_perk{suffix}.csv')
+        main_perk_path = f'heavy/heavy_main_perk{suffix}.csv'
+        mfg_perk_path = f'heavy/heavy_manufacturer_perk{suffix}.csv'
         
-        df_main = pd.read_csv(main_perk_path)
-        df_mfg = pd.read_csv(mfg_perk_path)
-        df_mfg['Manufacturer ID'] = pd.to_numeric(df_mfg['Manufacturer ID'], errors='coerce')
-        df_mfg.dropna(subset=['Manufacturer ID'], inplace=True)
-        df_mfg['Manufacturer ID'] = df_mfg['Manufacturer ID'].astype(int)
+        df_main = resource_loader.load_csv_table(main_perk_path)
+        df_mfg = resource_loader.load_csv_table(mfg_perk_path)
+        # 只保留制造商ID为整数的行
+        df_mfg = df_mfg.filter(lambda r: isinstance(r['Manufacturer ID'], int))
 
         localization = {}
         if lang == 'zh-CN':
-            localization = resource_loader.load_json_resource('heavy/Heavy_localization_zh-CN.json') or {}
+            localization = catalog.table('heavy/Heavy_localization_zh-CN.json')
             
         return df_main, df_mfg, localization
     except Exception as e:
@@ -62,8 +60,7 @@ class QtHeavyWeaponEditorTab(QWidget):
         self._connect_signals()
 
     def _load_ui_localization(self):
-        loc_file = resource_loader.get_ui_localization_file(self.current_lang)
-        full_loc = resource_loader.load_json_resource(loc_file) or {}
+        full_loc = catalog.ui(self.current_lang)
         self.ui_loc = full_loc.get("heavy_weapon_tab", {})
         self.flags_loc = full_loc.get("weapon_editor_tab", {}).get("flags", {})
 
@@ -304,10 +301,8 @@ class QtHeavyWeaponEditorTab(QWidget):
         return group_box
         
     def _get_mfg_name(self, mfg_id):
-        if mfg_id in lookup.REVERSE_ID_MAP:
-            mfg_en = lookup.REVERSE_ID_MAP[mfg_id][0]
-            return bl4f.get_localized_string(mfg_en)
-        return "Unknown"
+        names = catalog.item_display_names(bl4f.current_localization_lang).get(mfg_id)
+        return names[0] if names else "Unknown"
 
     def populate_initial_data(self):
         self.mfg_combo.clear()
@@ -320,8 +315,8 @@ class QtHeavyWeaponEditorTab(QWidget):
         items.sort(key=lambda x: x[1])
         self.mfg_combo.addItems([x[0] for x in items])
 
-        self._populate_radio_buttons(self.element_frame, self.df_main[self.df_main['Heavy_perk_main_ID'] == 1], self.element_widgets)
-        self._populate_radio_buttons(self.firmware_frame, self.df_main[self.df_main['Heavy_perk_main_ID'] == 244], self.firmware_widgets)
+        self._populate_radio_buttons(self.element_frame, self.df_main.eq('Heavy_perk_main_ID', 1), self.element_widgets)
+        self._populate_radio_buttons(self.firmware_frame, self.df_main.eq('Heavy_perk_main_ID', 244), self.firmware_widgets)
         self.on_mfg_change()
 
     def _populate_radio_buttons(self, frame_layout, df, widget_list, name_key='Stat', desc_key='Description'):
@@ -337,14 +332,14 @@ class QtHeavyWeaponEditorTab(QWidget):
         frame_layout.addWidget(none_rb)
         widget_list.append(none_rb)
 
-        for _, row in df.iterrows():
-            desc = row[desc_key] if desc_key in row and pd.notna(row[desc_key]) else ''
+        for row in df:
+            desc = row[desc_key] if row.get(desc_key) is not None else ''
             display_text = f"{self._(row[name_key])} - {desc}" if desc else self._(row[name_key])
             rb = QRadioButton(display_text)
             
             part_id = row['Part_ID']
             # 如果存在 Heavy_perk_main_ID，则将其作为前缀
-            if 'Heavy_perk_main_ID' in row and pd.notna(row['Heavy_perk_main_ID']):
+            if row.get('Heavy_perk_main_ID') is not None:
                 part_id = f"{int(row['Heavy_perk_main_ID'])}:{part_id}"
             
             rb.setProperty("part_id", part_id)
@@ -355,7 +350,7 @@ class QtHeavyWeaponEditorTab(QWidget):
         
     def _populate_barrel_radiobuttons(self):
         mfg_id = int(self.mfg_combo.currentText().split(' - ')[-1])
-        filtered_df = self.df_mfg[(self.df_mfg['Part_type'] == 'Barrel') & (self.df_mfg['Manufacturer ID'] == mfg_id)]
+        filtered_df = self.df_mfg.eq('Part_type', 'Barrel').eq('Manufacturer ID', mfg_id)
         self._populate_radio_buttons(self.barrel_frame, filtered_df, self.barrel_widgets, name_key='Stat', desc_key='Description')
         
     def _connect_signals(self):
@@ -382,10 +377,10 @@ class QtHeavyWeaponEditorTab(QWidget):
         # Populate Rarity
         self.rarity_combo.blockSignals(True)
         self.rarity_combo.clear()
-        rarities_df = self.df_mfg[(self.df_mfg['Manufacturer ID'] == mfg_id) & (self.df_mfg['Part_type'] == 'Rarity')]
-        for _, row in rarities_df.iterrows():
+        rarities_df = self.df_mfg.eq('Manufacturer ID', mfg_id).eq('Part_type', 'Rarity')
+        for row in rarities_df:
             desc_val = row['Description']
-            desc = f" - {desc_val}" if pd.notna(desc_val) else ""
+            desc = f" - {desc_val}" if desc_val is not None else ""
             self.rarity_combo.addItem(f"{self._(row['Stat'])}{desc}", userData=row['Part_ID'])
         self.rarity_combo.blockSignals(False)
         self.rarity_combo.setFixedWidth(300)  # Re-apply width after populating
@@ -404,26 +399,24 @@ class QtHeavyWeaponEditorTab(QWidget):
             # Should not happen with correct key
             return
 
-        barrel_acc_df = self.df_mfg[self.df_mfg['Part_type'] == 'Barrel Accessory'].copy()
-        barrel_acc_df.dropna(subset=['String'], inplace=True)
-        barrel_acc_df = barrel_acc_df.drop_duplicates(subset=['Part_ID', 'Manufacturer ID'])
-        barrel_acc_df = barrel_acc_df[barrel_acc_df['Manufacturer ID'] == mfg_id] # Filter for current manufacturer
-        barrel_acc_df = barrel_acc_df.sort_values(by=['String', 'Part_ID'])
+        barrel_acc_df = self.df_mfg.eq('Part_type', 'Barrel Accessory').notna('String')
+        barrel_acc_df = barrel_acc_df.drop_duplicates('Part_ID', 'Manufacturer ID')
+        barrel_acc_df = barrel_acc_df.eq('Manufacturer ID', mfg_id) # Filter for current manufacturer
+        barrel_acc_df = barrel_acc_df.sort('String', 'Part_ID')
 
         barrel_subtype_names = {}
-        barrel_subtypes_df = self.df_mfg[
-            (self.df_mfg['Part_type'] == 'Barrel') & 
-            (~self.df_mfg['Stat'].str.contains('（', na=False))
-        ]
-        for _, row in barrel_subtypes_df.iterrows():
-            if pd.notna(row['String']):
+        barrel_subtypes_df = self.df_mfg.eq('Part_type', 'Barrel').filter(
+            lambda r: not (isinstance(r['Stat'], str) and '（' in r['Stat'])
+        )
+        for row in barrel_subtypes_df:
+            if row['String'] is not None:
                 barrel_subtype_names[(row['Manufacturer ID'], row['String'])] = row['Stat']
         
-        for _, row in barrel_acc_df.iterrows():
+        for row in barrel_acc_df:
             barrel_string_base = '_'.join(row['String'].split('_')[:2])
             subtype_name = barrel_subtype_names.get((row['Manufacturer ID'], barrel_string_base), '')
             
-            desc = row['Description'] if pd.notna(row['Description']) else ''
+            desc = row['Description'] if row['Description'] is not None else ''
             display_text = f"{subtype_name} - {row['Stat']} - {desc} - ID:{row['Part_ID']}"
 
             item = QListWidgetItem(display_text)
@@ -434,12 +427,12 @@ class QtHeavyWeaponEditorTab(QWidget):
         # --- Body Accessories ---
         if hasattr(self, 'body_acc_avail_list'):
             self.body_acc_avail_list.clear()
-        body_df = self.df_mfg[self.df_mfg['Part_type'] == 'Body Accessory'].copy()
-        body_df = body_df.drop_duplicates(subset=['Part_ID', 'Manufacturer ID'])
-        body_df = body_df[body_df['Manufacturer ID'] == mfg_id] # Filter for current manufacturer
-        body_df = body_df.sort_values(by=['Part_ID'])
+        body_df = self.df_mfg.eq('Part_type', 'Body Accessory')
+        body_df = body_df.drop_duplicates('Part_ID', 'Manufacturer ID')
+        body_df = body_df.eq('Manufacturer ID', mfg_id) # Filter for current manufacturer
+        body_df = body_df.sort('Part_ID')
 
-        for _, row in body_df.iterrows():
+        for row in body_df:
             mfg_name = self._get_mfg_name(row['Manufacturer ID'])
             display_text = f"{mfg_name} - {row['Stat']} - ID:{row['Part_ID']}"
             item = QListWidgetItem(display_text)
@@ -457,8 +450,8 @@ class QtHeavyWeaponEditorTab(QWidget):
         
         if rarity_id: skill_parts.append(f"{{{rarity_id}}}")
         
-        body_row = self.df_mfg[(self.df_mfg['Manufacturer ID'] == mfg_id) & (self.df_mfg['Part_type'] == 'Body')]
-        if not body_row.empty: skill_parts.append(f"{{{body_row.iloc[0]['Part_ID']}}}")
+        body_row = self.df_mfg.eq('Manufacturer ID', mfg_id).eq('Part_type', 'Body')
+        if not body_row.empty: skill_parts.append(f"{{{body_row.first()['Part_ID']}}}")
 
         for rb in self.barrel_widgets + self.element_widgets + self.firmware_widgets:
             if rb.isChecked() and rb.property("part_id"):
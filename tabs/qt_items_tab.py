@@ -6,7 +6,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
 from PyQt6.QtCore import pyqtSignal, Qt, QModelIndex
 from typing import Dict, List, Any, Optional
-from core import resource_loader
+from core.localization import catalog
 
 class QtItemsTab(QWidget):
     add_item_requested = pyqtSignal(str, str)
@@ -20,6 +20,10 @@ class QtItemsTab(QWidget):
         cols = self.loc['columns']
         self.model.setHorizontalHeaderLabels([cols['name'], cols['type'], cols['slot'], cols['level']])
         self.item_lookup = {}
+        # 物品路径 -> 名称列的 QStandardItem，用于按行增量刷新
+        self.row_lookup: Dict[tuple, QStandardItem] = {}
+        # (容器显示名, 类型) -> 类型节点
+        self.type_nodes: Dict[tuple, QStandardItem] = {}
         self.current_selected_item: Optional[Dict[str, Any]] = None
 
         self.ui_labels = {}
@@ -150,6 +154,8 @@ class QtItemsTab(QWidget):
         cols = self.loc['columns']
         self.model.setHorizontalHeaderLabels([cols['name'], cols['type'], cols['slot'], cols['level']])
         self.item_lookup.clear()
+        self.row_lookup.clear()
+        self.type_nodes.clear()
         self.current_selected_item = None
         self._clear_details()
 
@@ -161,11 +167,7 @@ class QtItemsTab(QWidget):
         for i, item in enumerate(items):
             self.item_lookup[i] = item
             
-            container_raw = item.get('container')
-            if not container_raw:
-                container_name = self.loc['defaults']['unknown_container']
-            else:
-                container_name = self.loc.get('containers', {}).get(container_raw, container_raw)
+            container_name = self._container_display_name(item)
             
             item_type = item.get('type', self.loc['defaults']['unknown_type'])
             
@@ -187,25 +189,10 @@ class QtItemsTab(QWidget):
                 type_node = QStandardItem(f"{item_type} ({len(item_list)})")
                 type_node.setEditable(False)
                 container_node.appendRow(type_node)
+                self.type_nodes[(container_name, item_type)] = type_node
 
                 for item in sorted(item_list, key=lambda x: x.get('name', '')):
-                    slot = item.get('slot', '—')
-                    container_slot_text = f"{container_name}/{slot}" if slot != '—' else container_name
-                    
-                    name_item = QStandardItem(item.get("name", ""))
-                    name_item.setData(item, Qt.ItemDataRole.UserRole) # 存储完整数据
-                    name_item.setEditable(False)
-                    
-                    type_item = QStandardItem(item.get("type", ""))
-                    type_item.setEditable(False)
-                    
-                    container_slot_item = QStandardItem(container_slot_text)
-                    container_slot_item.setEditable(False)
-                    
-                    level_item = QStandardItem(str(item.get("level", "")))
-                    level_item.setEditable(False)
-
-                    type_node.appendRow([name_item, type_item, container_slot_item, level_item])
+                    type_node.appendRow(self._make_item_row(item, container_name))
         
         self.tree_view.expandAll()
 
@@ -223,6 +210,69 @@ class QtItemsTab(QWidget):
         for i in range(self.model.columnCount()):
             self.tree_view.resizeColumnToContents(i)
 
+    def _container_display_name(self, item: Dict[str, Any]) -> str:
+        container_raw = item.get('container')
+        if not container_raw:
+            return self.loc['defaults']['unknown_container']
+        return self.loc.get('containers', {}).get(container_raw, container_raw)
+
+    def _make_item_row(self, item: Dict[str, Any], container_name: str) -> List[QStandardItem]:
+        slot = item.get('slot', '—')
+        container_slot_text = f"{container_name}/{slot}" if slot != '—' else container_name
+        
+        name_item = QStandardItem(item.get("name", ""))
+        name_item.setData(item, Qt.ItemDataRole.UserRole) # 存储完整数据
+        name_item.setEditable(False)
+        
+        type_item = QStandardItem(item.get("type", ""))
+        type_item.setEditable(False)
+        
+        container_slot_item = QStandardItem(container_slot_text)
+        container_slot_item.setEditable(False)
+        
+        level_item = QStandardItem(str(item.get("level", "")))
+        level_item.setEditable(False)
+
+        self.row_lookup[tuple(item.get("original_path", []))] = name_item
+        return [name_item, type_item, container_slot_item, level_item]
+
+    def update_items(self, items: List[Dict[str, Any]]) -> bool:
+        """
+        只刷新给定物品所在的行，新物品追加到对应的分组下。
+        如果某个物品的容器或类型发生了变化，返回 False，由调用方执行完整刷新。
+        """
+        for item in items:
+            key = tuple(item.get("original_path", []))
+            name_item = self.row_lookup.get(key)
+            container_name = self._container_display_name(item)
+            item_type = item.get('type', self.loc['defaults']['unknown_type'])
+
+            if name_item is None:
+                type_node = self.type_nodes.get((container_name, item_type))
+                if type_node is None:
+                    return False
+                type_node.appendRow(self._make_item_row(item, container_name))
+                type_node.setText(f"{item_type} ({type_node.rowCount()})")
+                continue
+
+            old = name_item.data(Qt.ItemDataRole.UserRole) or {}
+            if old.get('container') != item.get('container') or old.get('type') != item.get('type'):
+                return False
+
+            parent = name_item.parent()
+            row = name_item.row()
+            name_item.setText(item.get("name", ""))
+            name_item.setData(item, Qt.ItemDataRole.UserRole)
+            parent.child(row, 3).setText(str(item.get("level", "")))
+
+            if self.current_selected_item is not None and \
+                    tuple(self.current_selected_item.get("original_path", [])) == key:
+                self._show_item_details(item)
+
+        if self.search_entry.text():
+            self.filter_tree(self.search_entry.text())
+        return True
+
     def on_item_selected(self, selected, deselected):
         indexes = selected.indexes()
         if not indexes:
@@ -246,6 +296,9 @@ class QtItemsTab(QWidget):
             self._clear_details()
             return
 
+        self._show_item_details(item_data)
+
+    def _show_item_details(self, item_data: Dict[str, Any]):
         self.current_selected_item = item_data
         self.summary_labels["物品"].setText(item_data.get("name", "N/A"))
         
@@ -268,8 +321,7 @@ class QtItemsTab(QWidget):
             field.setText("")
 
     def _load_localization(self):
-        filename = resource_loader.get_ui_localization_file(self.current_lang)
-        data = resource_loader.load_json_resource(filename)
+        data = catalog.ui(self.current_lang)
         if data and "items_tab" in data:
             self.loc = data["items_tab"]
         else:
@@ -1,4 +1,3 @@
-import pandas as pd
 from functools import lru_cache
 import random
 import re
@@ -13,7 +12,7 @@ from PyQt6.QtGui import QColor
 
 from core import b_encoder
 from core import resource_loader
-import lookup
+from core.localization import catalog
 from core import bl4_functions as bl4f
 
 @lru_cache(maxsize=None)
@@ -21,19 +20,19 @@ def load_repkit_data(lang='zh-CN'):
     """使用资源加载器加载修复套件数据。"""
     try:
         suffix = "_EN" if lang in ['en-US', 'ru', 'ua'] else ""
-        main_perk_path = resource_loader.get_repkit_data_path(f'repkit_main_perk{suffix}.csv')
-        mfg_perk_path = resource_loader.get_repkit_data_path(f'repkit_manufacturer_perk{suffix}.csv')
+        main_perk_path = f'repkit/repkit_main_perk{suffix}.csv'
+        mfg_perk_path = f'repkit/repkit_manufacturer_perk{suffix}.csv'
         
         if not main_perk_path or not mfg_perk_path:
             QMessageBox.critical(None, "加载数据失败", "无法找到修复套件CSV文件路径。")
             return None, None, None
 
-        df_main = pd.read_csv(main_perk_path)
-        df_mfg = pd.read_csv(mfg_perk_path)
+        df_main = resource_loader.load_csv_table(main_perk_path)
+        df_mfg = resource_loader.load_csv_table(mfg_perk_path)
         
         localization = {}
         if lang == 'zh-CN':
-            localization = resource_loader.load_json_resource('repkit/Repkit_localization_zh-CN.json')
+            localization = catalog.table('repkit/Repkit_localization_zh-CN.json')
             if not localization:
                 print("警告: 无法加载Repkit_localization_zh-CN.json")
                 localization = {}
@@ -76,8 +75,7 @@ class QtRepkitEditorTab(QWidget):
         self.on_mfg_change()
 
     def _load_ui_localization(self):
-        loc_file = resource_loader.get_ui_localization_file(self.current_lang)
-        full_loc = resource_loader.load_json_resource(loc_file) or {}
+        full_loc = catalog.ui(self.current_lang)
         self.ui_loc = full_loc.get("repkit_tab", {})
         self.flags_loc = full_loc.get("weapon_editor_tab", {}).get("flags", {})
 
@@ -283,10 +281,8 @@ class QtRepkitEditorTab(QWidget):
         self.universal_avail_list.model().rowsRemoved.connect(self.rebuild_output)
 
     def _get_mfg_name(self, mfg_id):
-        if mfg_id in lookup.REVERSE_ID_MAP:
-            mfg_en = lookup.REVERSE_ID_MAP[mfg_id][0]
-            return bl4f.get_localized_string(mfg_en)
-        return "Unknown"
+        names = catalog.item_display_names(bl4f.current_localization_lang).get(mfg_id)
+        return names[0] if names else "Unknown"
 
     def populate_initial_data(self):
         self.mfg_combo.clear()
@@ -299,7 +295,7 @@ class QtRepkitEditorTab(QWidget):
         items.sort(key=lambda x: x[1])
         self.mfg_combo.addItems([x[0] for x in items])
 
-        df_243 = self.df_main[self.df_main['Repkit_perk_main_ID'] == 243]
+        df_243 = self.df_main.eq('Repkit_perk_main_ID', 243)
         
         self.prefix_map = self._get_datamap_from_df(df_243, 'Perfix')
         self._populate_radio_buttons(self.prefix_frame, self.prefix_map, self.prefix_widgets)
@@ -319,9 +315,9 @@ class QtRepkitEditorTab(QWidget):
         self.rarity_combo.blockSignals(True)
         self.rarity_combo.clear()
         self.rarity_map.clear()
-        rarities_df = self.df_mfg[(self.df_mfg['Manufacturer ID'] == mfg_id) & (self.df_mfg['Part_type'] == 'Rarity')]
-        for _, row in rarities_df.iterrows():
-            desc = f" - {row['Description']}" if pd.notna(row['Description']) and row['Description'] else ""
+        rarities_df = self.df_mfg.eq('Manufacturer ID', mfg_id).eq('Part_type', 'Rarity')
+        for row in rarities_df:
+            desc = f" - {row['Description']}" if row['Description'] else ""
             display_text = f"{self._(row['Stat'])}{desc}"
             self.rarity_combo.addItem(display_text, row['Part_ID'])
             self.rarity_map[display_text] = row['Part_ID']
@@ -330,11 +326,10 @@ class QtRepkitEditorTab(QWidget):
 
         self.legendary_avail_list.clear()
         self.legendary_perk_map.clear()
-        legendary_perks_df = self.df_mfg[self.df_mfg['Part_type'] == 'Legendary Perk'].copy()
-        legendary_perks_df['sort_key'] = legendary_perks_df['Manufacturer ID'].apply(lambda x: 0 if x == mfg_id else 1)
-        legendary_perks_df = legendary_perks_df.sort_values(by=['sort_key', 'Manufacturer ID', 'Part_ID'])
+        legendary_perks_df = self.df_mfg.eq('Part_type', 'Legendary Perk').sort(
+            key=lambda r: (0 if r['Manufacturer ID'] == mfg_id else 1, r['Manufacturer ID'], r['Part_ID']))
 
-        for _, row in legendary_perks_df.iterrows():
+        for row in legendary_perks_df:
             mfg_name = self._get_mfg_name(row['Manufacturer ID'])
             display_text = f"{mfg_name} - {row['Stat']} - {row['Description']}"
             item = QListWidgetItem(display_text)
@@ -364,8 +359,8 @@ class QtRepkitEditorTab(QWidget):
         rarity_id = self.rarity_combo.currentData()
         if rarity_id: skill_parts.append(f"{{{rarity_id}}}")
 
-        model_row = self.df_mfg[(self.df_mfg['Manufacturer ID'] == current_mfg_id) & (self.df_mfg['Part_type'] == 'Model')]
-        if not model_row.empty: skill_parts.append(f"{{{model_row.iloc[0]['Part_ID']}}}")
+        model_row = self.df_mfg.eq('Manufacturer ID', current_mfg_id).eq('Part_type', 'Model')
+        if not model_row.empty: skill_parts.append(f"{{{model_row.first()['Part_ID']}}}")
 
         other_mfg_perks = {}
         for i in range(self.legendary_sel_list.count()):
@@ -461,10 +456,10 @@ class QtRepkitEditorTab(QWidget):
     def _populate_listbox(self, listbox, df, part_type):
         listbox.clear()
         item_map = {}
-        items_df = df[df['Part_type'] == part_type]
-        for _, row in items_df.iterrows():
+        items_df = df.eq('Part_type', part_type)
+        for row in items_df:
             name = self._(row['Stat'])
-            desc = row['Description'] if pd.notna(row['Description']) else ''
+            desc = row['Description'] if row['Description'] is not None else ''
             display_text = f"{name} - {desc} [{row['Part_ID']}]" if desc else f"{name} [{row['Part_ID']}]"
             item = QListWidgetItem(display_text)
             item.setData(Qt.ItemDataRole.UserRole, row['Part_ID'])
@@ -475,10 +470,10 @@ class QtRepkitEditorTab(QWidget):
     def _get_datamap_from_df(self, df, part_type, use_desc=True):
         item_map = {}
         if isinstance(part_type, str): part_type = [part_type]
-        items_df = df[df['Part_type'].isin(part_type)]
-        for _, row in items_df.iterrows():
+        items_df = df.isin('Part_type', part_type)
+        for row in items_df:
             stat = self._(row['Stat'])
-            desc = row['Description'] if use_desc and pd.notna(row['Description']) and row['Description'] else ''
+            desc = row['Description'] if use_desc and row['Description'] else ''
             display_text = f"{stat} - {desc}" if desc else f"{stat}"
             item_map[display_text.strip(" -")] = row['Part_ID']
         return item_map
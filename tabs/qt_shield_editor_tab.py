@@ -1,4 +1,3 @@
-import pandas as pd
 from functools import lru_cache
 import random
 import re
@@ -13,21 +12,21 @@ from PyQt6.QtCore import pyqtSignal, Qt
 
 from core import b_encoder
 from core import resource_loader
-import lookup
+from core.localization import catalog
 from core import bl4_functions as bl4f
 
 @lru_cache(maxsize=None)
 def load_shield_data(lang='zh-CN'):
     try:
         suffix = "_EN" if lang in ['en-US', 'ru', 'ua'] else ""
-        main_perk_path = resource_loader.get_shield_data_path(f'shield_main_perk{suffix}.csv')
-        mfg_perk_path = resource_loader.get_shield_data_path(f'manufacturer_perk{suffix}.csv')
-        df_main = pd.read_csv(main_perk_path)
-        df_mfg = pd.read_csv(mfg_perk_path)
+        main_perk_path = f'shield/shield_main_perk{suffix}.csv'
+        mfg_perk_path = f'shield/manufacturer_perk{suffix}.csv'
+        df_main = resource_loader.load_csv_table(main_perk_path)
+        df_mfg = resource_loader.load_csv_table(mfg_perk_path)
         
         localization = {}
         if lang == 'zh-CN':
-            localization = resource_loader.load_json_resource('shield/Shield_localization_zh-CN.json') or {}
+            localization = catalog.table('shield/Shield_localization_zh-CN.json')
             
         return df_main, df_mfg, localization
     except Exception as e:
@@ -50,7 +49,7 @@ class QtShieldEditorTab(QWidget):
         self.mfg_ids = [279, 283, 287, 293, 300, 306, 312, 321]
         # Hardcode types for logic, but localize for display
         self.mfg_type_map_base = {279: "Energy", 283: "Armor", 287: "Armor", 293: "Energy", 300: "Energy", 306: "Armor", 312: "Energy", 321: "Armor"}
-        self.mfg_model_map = {row['Manufacturer ID']: row['Part_ID'] for _, row in self.df_mfg[self.df_mfg['Part_type'] == 'Model'].iterrows()}
+        self.mfg_model_map = {row['Manufacturer ID']: row['Part_ID'] for row in self.df_mfg.eq('Part_type', 'Model')}
         
         self._build_ui()
         self.populate_initial_data()
@@ -58,8 +57,7 @@ class QtShieldEditorTab(QWidget):
         self.on_mfg_change()
 
     def _load_ui_localization(self):
-        loc_file = resource_loader.get_ui_localization_file(self.current_lang)
-        full_loc = resource_loader.load_json_resource(loc_file) or {}
+        full_loc = catalog.ui(self.current_lang)
         self.ui_loc = full_loc.get("shield_tab", {})
         self.flags_loc = full_loc.get("weapon_editor_tab", {}).get("flags", {})
 
@@ -246,10 +244,8 @@ class QtShieldEditorTab(QWidget):
             sel_list.model().rowsInserted.connect(self.rebuild_output); sel_list.model().rowsRemoved.connect(self.rebuild_output)
 
     def _get_mfg_name(self, mfg_id):
-        if mfg_id in lookup.REVERSE_ID_MAP:
-            mfg_en = lookup.REVERSE_ID_MAP[mfg_id][0]
-            return bl4f.get_localized_string(mfg_en)
-        return "Unknown"
+        names = catalog.item_display_names(bl4f.current_localization_lang).get(mfg_id)
+        return names[0] if names else "Unknown"
 
     def populate_initial_data(self):
         self.mfg_combo.clear()
@@ -272,11 +268,11 @@ class QtShieldEditorTab(QWidget):
         
         self.mfg_combo.addItems([x[0] for x in items])
         
-        self._populate_radio_buttons(self.element_frame, self.df_main[self.df_main['Shield_perk_main_ID'] == 246], self.element_widgets, 'Elemental Resistance')
-        self._populate_radio_buttons(self.firmware_frame, self.df_main[self.df_main['Shield_perk_main_ID'] == 246], self.firmware_widgets, 'Firmware')
-        self._populate_listbox(self.universal_avail_list, self.df_main[(self.df_main['Shield_perk_main_ID'] == 246) & (self.df_main['Part_type'] == 'Perk')])
-        self._populate_listbox(self.energy_avail_list, self.df_main[(self.df_main['Shield_perk_main_ID'] == 248) & (self.df_main['Part_type'] == 'Perk')])
-        self._populate_listbox(self.armor_avail_list, self.df_main[(self.df_main['Shield_perk_main_ID'] == 237) & (self.df_main['Part_type'] == 'Perk')])
+        self._populate_radio_buttons(self.element_frame, self.df_main.eq('Shield_perk_main_ID', 246), self.element_widgets, 'Elemental Resistance')
+        self._populate_radio_buttons(self.firmware_frame, self.df_main.eq('Shield_perk_main_ID', 246), self.firmware_widgets, 'Firmware')
+        self._populate_listbox(self.universal_avail_list, self.df_main.eq('Shield_perk_main_ID', 246).eq('Part_type', 'Perk'))
+        self._populate_listbox(self.energy_avail_list, self.df_main.eq('Shield_perk_main_ID', 248).eq('Part_type', 'Perk'))
+        self._populate_listbox(self.armor_avail_list, self.df_main.eq('Shield_perk_main_ID', 237).eq('Part_type', 'Perk'))
         self.on_mfg_change()
 
     def _populate_radio_buttons(self, frame_layout, df, widget_list, part_type):
@@ -286,9 +282,9 @@ class QtShieldEditorTab(QWidget):
                 child.widget().deleteLater()
         widget_list.clear()
         none_rb = QRadioButton(self.ui_loc['misc']['none']); none_rb.setChecked(True); frame_layout.addWidget(none_rb); widget_list.append(none_rb)
-        for _, row in df[df['Part_type'] == part_type].iterrows():
+        for row in df.eq('Part_type', part_type):
             description = row['Description']
-            display_text = f"{self._(row['Stat'])} - {description if pd.notna(description) else ''}"
+            display_text = f"{self._(row['Stat'])} - {description if description is not None else ''}"
             rb = QRadioButton(display_text.strip("- "))
             rb.setProperty("part_id", row['Part_ID'])
             frame_layout.addWidget(rb)
@@ -298,8 +294,8 @@ class QtShieldEditorTab(QWidget):
         
     def _populate_listbox(self, listbox, df):
         listbox.clear()
-        for _, row in df.iterrows():
-            item = QListWidgetItem(f"{self._(row['Stat'])} - {row['Description'] if pd.notna(row['Description']) else ''}")
+        for row in df:
+            item = QListWidgetItem(f"{self._(row['Stat'])} - {row['Description'] if row['Description'] is not None else ''}")
             item.setData(Qt.ItemDataRole.UserRole, row['Part_ID'])
             listbox.addItem(item)
             
@@ -314,19 +310,19 @@ class QtShieldEditorTab(QWidget):
         
         self.rarity_combo.blockSignals(True)
         self.rarity_combo.clear()
-        df_rarities = self.df_mfg[(self.df_mfg['Manufacturer ID'] == mfg_id) & (self.df_mfg['Part_type'] == 'Rarity')]
-        for _, row in df_rarities.iterrows():
+        df_rarities = self.df_mfg.eq('Manufacturer ID', mfg_id).eq('Part_type', 'Rarity')
+        for row in df_rarities:
             description = row['Description']
-            display_text = f"{self._(row['Stat'])} - {description if pd.notna(description) else ''}"
+            display_text = f"{self._(row['Stat'])} - {description if description is not None else ''}"
             self.rarity_combo.addItem(display_text.strip(" - "), row['Part_ID'])
         self.rarity_combo.blockSignals(False)
         self.rarity_combo.setFixedWidth(300)  # Re-apply width after populating
         
         self.legendary_avail_list.clear()
-        df_leg = self.df_mfg[self.df_mfg['Part_type'] == 'Legendary Perk']
-        for _, row in df_leg.iterrows():
+        df_leg = self.df_mfg.eq('Part_type', 'Legendary Perk')
+        for row in df_leg:
             description = row['Description']
-            display_text = f"{self._get_mfg_name(row['Manufacturer ID'])} - {self._(row['Stat'])} - {description if pd.notna(description) else ''}"
+            display_text = f"{self._get_mfg_name(row['Manufacturer ID'])} - {self._(row['Stat'])} - {description if description is not None else ''}"
             item = QListWidgetItem(display_text.strip(" - "))
             item.setData(Qt.ItemDataRole.UserRole, (row['Part_ID'], row['Manufacturer ID']))
             self.legendary_avail_list.addItem(item)
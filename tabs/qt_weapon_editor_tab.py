@@ -1,5 +1,4 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
-import pandas as pd
 import random
 import re
 import sys
@@ -7,7 +6,8 @@ from functools import partial
 
 from core import bl4_functions as bl4f
 from core import b_encoder
-from core import resource_loader
+from core.part_catalog import get_part_catalog
+from core.localization import catalog
 
 class WeaponEditorTab(QtWidgets.QWidget):
     add_to_backpack_requested = QtCore.pyqtSignal(str, str)
@@ -64,14 +64,11 @@ class WeaponEditorTab(QtWidgets.QWidget):
         super().__init__()
         self.main_app = main_app
         self.selected_weapon_path = None
+        self.backpack_buttons = {}  # 物品路径 -> 背包武器按钮
         self.parts_data = []
         self.rarity_part = None
         
-        self.all_weapon_parts_df = None
-        self.elemental_df = None
-        self.weapon_name_df = None
-        self.skin_df = None
-        self.weapon_rarity_df = None
+        self.part_catalog = None
         self.weapon_localization = {}
         
         self.is_handling_change = False
@@ -87,31 +84,15 @@ class WeaponEditorTab(QtWidgets.QWidget):
 
     def load_data(self, lang='zh-CN'):
         try:
-            suffix = "_EN" if lang in ['en-US', 'ru', 'ua'] else ""
-
-            # Helper to get path with fallback
-            def get_path(base_name):
-                # Try with suffix first
-                name_with_suffix = base_name.replace('.csv', f'{suffix}.csv')
-                path = resource_loader.get_weapon_data_path(name_with_suffix)
-                if path and path.exists():
-                    return path
-                # Fallback to base
-                return resource_loader.get_weapon_data_path(base_name)
-
-            self.all_weapon_parts_df = pd.read_csv(get_path('all_weapon_part.csv'))
-            self.elemental_df = pd.read_csv(get_path('elemental.csv')) 
-            self.weapon_name_df = pd.read_csv(get_path('weapon_name.csv'))
-            self.skin_df = pd.read_csv(get_path('skin.csv'))
-            self.weapon_rarity_df = pd.read_csv(get_path('weapon_rarity.csv'))
+            # 与武器生成器共用，每种数据语言只加载一次
+            self.part_catalog = get_part_catalog(lang)
             
             self.weapon_localization = {}
             if lang == 'zh-CN':
-                self.weapon_localization = resource_loader.load_weapon_json('weapon_localization_zh-CN.json') or {}
+                self.weapon_localization = catalog.table('weapon_edit/weapon_localization_zh-CN.json')
             
             # Load UI localization
-            loc_file = resource_loader.get_ui_localization_file(lang)
-            full_loc = resource_loader.load_json_resource(loc_file) or {}
+            full_loc = catalog.ui(lang)
             self.ui_localization = full_loc.get("weapon_editor_tab", {})
             
             # Re-enable if data loaded successfully (in case it was disabled previously)
@@ -404,16 +385,14 @@ class WeaponEditorTab(QtWidgets.QWidget):
             part_id = p.get('id')
             if not part_id:
                 continue
-            part_details = self.all_weapon_parts_df[(self.all_weapon_parts_df['Manufacturer & Weapon Type ID'] == m_id) & (self.all_weapon_parts_df['Part ID'] == part_id)]
-            if not part_details.empty and part_details.iloc[0]['Part Type'] == 'Barrel':
-                name_info = self.weapon_name_df[(self.weapon_name_df['Manufacturer & Weapon Type ID'] == m_id) & (self.weapon_name_df['Part ID'] == part_id)]
-                if not name_info.empty: weapon_name = name_info.iloc[0]['Name']; break
+            part_details = self.part_catalog.part(m_id, part_id)
+            if part_details is not None and part_details['Part Type'] == 'Barrel':
+                if (name := self.part_catalog.weapon_name(m_id, part_id)) is not None: weapon_name = name; break
         simple_parts = [p for p in parts if isinstance(p, dict) and p.get('type') == 'simple']
         if simple_parts and 'id' in simple_parts[0]:
-            rarity_info = self.weapon_rarity_df[(self.weapon_rarity_df['Manufacturer & Weapon Type ID'] == m_id) & (self.weapon_rarity_df['Part ID'] == simple_parts[0]['id'] )]
-            if not rarity_info.empty:
-                details = rarity_info.iloc[0]; rarity, desc = details['Stat'], details['Description']
-                display_rarity = f"{rarity} - {desc}" if rarity == "Legendary" and pd.notna(desc) else rarity
+            if (details := self.part_catalog.rarity(m_id, simple_parts[0]['id'])) is not None:
+                rarity, desc = details['Stat'], details['Description']
+                display_rarity = f"{rarity} - {desc}" if rarity == "Legendary" and desc is not None else rarity
                 rarity_part = simple_parts[0]
         if not rarity_part: display_rarity = rarity = "Legendary"
         if rarity_part: remaining_parts = [p for p in remaining_parts if p is not rarity_part]
@@ -470,9 +449,7 @@ class WeaponEditorTab(QtWidgets.QWidget):
                 rarity_map = {self.get_localized_string(k): k for k in ["Common", "Uncommon", "Rare", "Epic"]}
                 if rarity_en := rarity_map.get(self.rarity_combo.currentText()):
                     m_id = int(updated_str.split('||')[0].strip().split('|')[0].strip().split(',')[0])
-                    info = self.weapon_rarity_df[(self.weapon_rarity_df['Manufacturer & Weapon Type ID'] == m_id) & (self.weapon_rarity_df['Stat'] == rarity_en) & (self.weapon_rarity_df['Part Type'] == 'Rarity')]
-                    if not info.empty:
-                        new_id = info.iloc[0]['Part ID']
+                    if (new_id := self.part_catalog.rarity_part_id(m_id, rarity_en)) is not None:
                         updated_str = updated_str.replace(self.rarity_part['raw'], f"{{{new_id}}}")
                         self.rarity_part['id'], self.rarity_part['raw'] = new_id, f"{{{new_id}}}"
 
@@ -498,7 +475,7 @@ class WeaponEditorTab(QtWidgets.QWidget):
             header_part, component_part = decoded_str.split('||', 1)
             sections = header_part.strip().split('|')
             m_id, level = int(sections[0].strip().split(',')[0]), int(sections[0].strip().split(',')[3])
-            m_info = self.all_weapon_parts_df[self.all_weapon_parts_df['Manufacturer & Weapon Type ID'] == m_id].iloc[0]
+            m_info = self.part_catalog.weapon(m_id)
             self.is_handling_change = True
             self.manufacturer_entry.setText(self.get_localized_string(m_info['Manufacturer']))
             self.item_type_entry.setText(self.get_localized_string(m_info['Weapon Type']))
@@ -549,18 +526,17 @@ class WeaponEditorTab(QtWidgets.QWidget):
         part_id = part_info.get('id'); info = {'type': "未知", 'str': "错误", 'stat': ""}
         is_skin, is_elemental = (part_info.get('type') == 'skin'), (part_info.get('type') == 'elemental')
         if is_skin:
-            if not (d := self.skin_df[self.skin_df['Skin_ID'] == part_id]).empty: info.update({'type': self.get_localized_string("Skin"), 'str': d.iloc[0]['Stat']})
+            if (d := self.part_catalog.skin(part_id)) is not None: info.update({'type': self.get_localized_string("Skin"), 'str': d['Stat']})
         elif is_elemental:
-            if not (d := self.elemental_df[self.elemental_df['Part_ID'] == part_info['sub_id']]).empty: info.update({'type': self.get_localized_string("Elemental"), 'str': self.get_localized_string(d.iloc[0]['Stat'])})
+            if (d := self.part_catalog.elemental(part_info['sub_id'])) is not None: info.update({'type': self.get_localized_string("Elemental"), 'str': self.get_localized_string(d['Stat'])})
         else:
-            d = self.all_weapon_parts_df[(self.all_weapon_parts_df['Manufacturer & Weapon Type ID'] == m_id) & (self.all_weapon_parts_df['Part ID'] == part_id)]
-            if not d.empty: info.update({'type': self.get_localized_string(d.iloc[0]['Part Type']), 'str': d.iloc[0]['String'], 'stat': d.iloc[0]['Stat']})
+            if (d := self.part_catalog.part(m_id, part_id)) is not None: info.update({'type': self.get_localized_string(d['Part Type']), 'str': d['String'], 'stat': d['Stat']})
         display_text = f"  {part_id}  " if not is_elemental else f"  {part_info['id']}:{part_info['sub_id']}  "
         id_label = QtWidgets.QLabel(display_text); id_label.setStyleSheet("background-color: #4a4a4a; border-radius: 5px; padding: 2px;")
         type_color = self.PART_TYPE_COLORS.get(info['type'], "#e0e0e0")
         type_label = QtWidgets.QLabel(info['type']); type_label.setStyleSheet(f"color: {type_color}; font-weight: bold;")
         layout.addWidget(id_label, 0, 0); layout.addWidget(type_label, 0, 1)
-        layout.addWidget(QtWidgets.QLabel(info['str']), 0, 2); layout.addWidget(QtWidgets.QLabel(str(info['stat']) if pd.notna(info['stat']) else ""), 0, 3)
+        layout.addWidget(QtWidgets.QLabel(info['str']), 0, 2); layout.addWidget(QtWidgets.QLabel(str(info['stat']) if info['stat'] is not None else ""), 0, 3)
         layout.addWidget(self._add_action_buttons(index, is_skin), 0, 4, QtCore.Qt.AlignmentFlag.AlignRight)
         return frame
 
@@ -570,9 +546,8 @@ class WeaponEditorTab(QtWidgets.QWidget):
         header, content = QtWidgets.QFrame(), QtWidgets.QFrame(); content.setVisible(False)
         header_layout, content_layout = QtWidgets.QGridLayout(header), QtWidgets.QVBoxLayout(content)
         group_id = part_info.get('id', 0); mfg_name, is_known = "未知厂商", False
-        try:
-            mfg_name = self.get_localized_string(self.all_weapon_parts_df[self.all_weapon_parts_df['Manufacturer & Weapon Type ID'] == group_id].iloc[0]['Manufacturer']); is_known = True
-        except (IndexError, KeyError): pass
+        if (m_info := self.part_catalog.weapon(group_id)) is not None:
+            mfg_name = self.get_localized_string(m_info['Manufacturer']); is_known = True
         toggle_btn = QtWidgets.QPushButton("▶"); toggle_btn.setFixedSize(24, 24)
         toggle_btn.clicked.connect(lambda checked, b=toggle_btn, c=content: self._toggle_group_visibility(b, c))
         header_layout.addWidget(toggle_btn, 0, 0); header_layout.addWidget(QtWidgets.QLabel(f"折叠组: {part_info['raw']} {'(未知)' if not is_known else ''}"), 0, 1)
@@ -583,10 +558,9 @@ class WeaponEditorTab(QtWidgets.QWidget):
             sub_frame = QtWidgets.QFrame(); sub_layout = QtWidgets.QGridLayout(sub_frame); sub_layout.setColumnStretch(2, 1)
             sub_layout.addWidget(QtWidgets.QLabel(f"  {sub_id}  "), 0, 0)
             p_type, p_str, p_stat = "未知", "无法解析", ""
-            d = self.all_weapon_parts_df[(self.all_weapon_parts_df['Manufacturer & Weapon Type ID'] == group_id) & (self.all_weapon_parts_df['Part ID'] == sub_id)]
-            if not d.empty: p_type, p_str, p_stat = self.get_localized_string(d.iloc[0]['Part Type']), d.iloc[0]['String'], d.iloc[0]['Stat']
+            if (d := self.part_catalog.part(group_id, sub_id)) is not None: p_type, p_str, p_stat = self.get_localized_string(d['Part Type']), d['String'], d['Stat']
             sub_layout.addWidget(QtWidgets.QLabel(f"{mfg_name} - {p_type}"), 0, 1); sub_layout.addWidget(QtWidgets.QLabel(p_str), 0, 2)
-            sub_layout.addWidget(QtWidgets.QLabel(str(p_stat) if pd.notna(p_stat) else ""), 0, 3)
+            sub_layout.addWidget(QtWidgets.QLabel(str(p_stat) if p_stat is not None else ""), 0, 3)
             content_layout.addWidget(sub_frame)
         content.setLayout(content_layout); container_layout.addWidget(header); container_layout.addWidget(content)
         return container
@@ -631,7 +605,42 @@ class WeaponEditorTab(QtWidgets.QWidget):
         self.main_app.log("Forcing parts list refresh..."); self.parse_and_display_weapon(decoded_str)
         QtWidgets.QMessageBox.information(self, self.get_localized_string("success"), self.get_localized_string("parts_refresh_success"))
 
-    def refresh_backpack_items(self):
+    BACKPACK_WEAPON_TYPES = {"Pistol", "Shotgun", "SMG", "Assault Rifle", "Sniper"}
+
+    def _is_backpack_weapon(self, item):
+        return item.get("type_en") in self.BACKPACK_WEAPON_TYPES and "Backpack" in item.get("container", "")
+
+    def _make_backpack_button(self, weapon):
+        try:
+            self.main_app.log(f"开始处理背包中的武器，序列号: {weapon.get('serial', 'N/A')}")
+            header, component = weapon.get('decoded_full', '').split('||', 1)
+            self.main_app.log("  - 已成功分离头部和组件")
+            
+            m_id = int(header.strip().split('|')[0].strip().split(',')[0])
+            self.main_app.log(f"  - 已解析制造商ID: {m_id}")
+
+            parsed_components = self._parse_component_string(component)
+            self.main_app.log(f"  - 已解析出 {len(parsed_components)} 个组件")
+
+            _, name, _, _ = self._get_rarity_and_weapon_name(parsed_components, m_id)
+            self.main_app.log(f"  - 已获取武器名称: {name}")
+            
+            w_name = self.get_localized_string(name, name)
+            disp_name = f"{weapon.get('manufacturer', '未知')} {weapon.get('type', '未知物品')} ({w_name})" if w_name not in ["N/A", "Unknown", "未知"] else f"{weapon.get('manufacturer', '未知')} {weapon.get('type', '未知物品')}"
+            btn_text = f"{disp_name} - {self.get_localized_string('level_label')}: {weapon.get('level', 'N/A')} - {self.get_localized_string('slot_label')}: {weapon.get('slot', 'N/A').replace('slot_', '')}"
+            btn = QtWidgets.QPushButton(btn_text)
+            btn.clicked.connect(partial(self.load_weapon_data, weapon))
+            self.main_app.log(f"  - 成功创建并添加武器按钮: {btn_text}")
+            return btn
+
+        except Exception as e:
+            self.main_app.log(f"在处理背包武器时发生严重错误。序列号: {weapon.get('serial', '未知')}，错误: {e}")
+            # 创建一个错误按钮以提供反馈
+            error_btn = QtWidgets.QPushButton(f"错误: 无法加载序列号为 {weapon.get('serial', '未知')} 的武器")
+            error_btn.setStyleSheet("background-color: #581b1b;")
+            return error_btn
+
+    def refresh_backpack_items(self, items=None):
         while self.backpack_items_layout.count():
             item = self.backpack_items_layout.takeAt(0)
             if (widget := item.widget()): widget.deleteLater()
@@ -639,44 +648,44 @@ class WeaponEditorTab(QtWidgets.QWidget):
                 while layout.count():
                     sub_item = layout.takeAt(0)
                     if (sub_widget := sub_item.widget()): sub_widget.deleteLater()
+        self.backpack_buttons = {}
         
-        if self.main_app.controller.yaml_obj is None or not (items := self.main_app.controller.get_all_items()):
+        if items is None and self.main_app.controller.yaml_obj is not None:
+            items = self.main_app.controller.get_all_items()
+        if self.main_app.controller.yaml_obj is None or not items:
             self.backpack_items_layout.addWidget(QtWidgets.QLabel(self.get_localized_string("decrypt_save_to_show_weapons"))); return
         
-        weapon_types = {"Pistol", "Shotgun", "SMG", "Assault Rifle", "Sniper"}
-        filtered = [i for i in items if i.get("type_en") in weapon_types and "Backpack" in i.get("container", "")]
+        filtered = [i for i in items if self._is_backpack_weapon(i)]
         if not filtered:
             self.backpack_items_layout.addWidget(QtWidgets.QLabel(self.get_localized_string("no_weapons_in_backpack"))); return
 
         for weapon in filtered:
-            try:
-                self.main_app.log(f"开始处理背包中的武器，序列号: {weapon.get('serial', 'N/A')}")
-                header, component = weapon.get('decoded_full', '').split('||', 1)
-                self.main_app.log("  - 已成功分离头部和组件")
-                
-                m_id = int(header.strip().split('|')[0].strip().split(',')[0])
-                self.main_app.log(f"  - 已解析制造商ID: {m_id}")
-
-                parsed_components = self._parse_component_string(component)
-                self.main_app.log(f"  - 已解析出 {len(parsed_components)} 个组件")
-
-                _, name, _, _ = self._get_rarity_and_weapon_name(parsed_components, m_id)
-                self.main_app.log(f"  - 已获取武器名称: {name}")
-                
-                w_name = self.get_localized_string(name, name)
-                disp_name = f"{weapon.get('manufacturer', '未知')} {weapon.get('type', '未知物品')} ({w_name})" if w_name not in ["N/A", "Unknown", "未知"] else f"{weapon.get('manufacturer', '未知')} {weapon.get('type', '未知物品')}"
-                btn_text = f"{disp_name} - {self.get_localized_string('level_label')}: {weapon.get('level', 'N/A')} - {self.get_localized_string('slot_label')}: {weapon.get('slot', 'N/A').replace('slot_', '')}"
-                btn = QtWidgets.QPushButton(btn_text)
-                btn.clicked.connect(partial(self.load_weapon_data, weapon))
-                self.backpack_items_layout.addWidget(btn)
-                self.main_app.log(f"  - 成功创建并添加武器按钮: {btn_text}")
-
-            except Exception as e:
-                self.main_app.log(f"在处理背包武器时发生严重错误。序列号: {weapon.get('serial', '未知')}，错误: {e}")
-                # 创建一个错误按钮以提供反馈
-                error_btn = QtWidgets.QPushButton(f"错误: 无法加载序列号为 {weapon.get('serial', '未知')} 的武器")
-                error_btn.setStyleSheet("background-color: #581b1b;")
-                self.backpack_items_layout.addWidget(error_btn)
+            btn = self._make_backpack_button(weapon)
+            self.backpack_buttons[tuple(weapon.get("original_path", []))] = btn
+            self.backpack_items_layout.addWidget(btn)
+
+    def update_backpack_items(self, items):
+        """
+        只替换发生变化的武器按钮。返回 False 表示无法增量更新，需要调用 refresh_backpack_items。
+        """
+        buttons = self.backpack_buttons
+        for weapon in items:
+            key = tuple(weapon.get("original_path", []))
+            old_btn = buttons.get(key)
+            if not self._is_backpack_weapon(weapon):
+                if old_btn is not None:
+                    return False
+                continue
+            if old_btn is None and not buttons:
+                return False
+            new_btn = self._make_backpack_button(weapon)
+            if old_btn is not None:
+                self.backpack_items_layout.replaceWidget(old_btn, new_btn)
+                old_btn.deleteLater()
+            else:
+                self.backpack_items_layout.addWidget(new_btn)
+            buttons[key] = new_btn
+        return True
 
     def update_weapon(self):
         if not self.selected_weapon_path:
@@ -746,13 +755,13 @@ class WeaponEditorTab(QtWidgets.QWidget):
         elemental_container = self._create_add_part_category(
             self.get_localized_string("Elemental"), 
             lambda p, d: self.create_elemental_list(p, d), 
-            self.elemental_df,
+            self.part_catalog.elementals,
             color="#EF9A9A"
         )
         scroll_layout.addWidget(elemental_container)
         
         # Weapon type categories
-        for wt, group in self.all_weapon_parts_df.groupby('Weapon Type'):
+        for wt, group in self.part_catalog.parts.groupby('Weapon Type'):
             localized_wt = self.get_localized_string(wt)
             scroll_layout.addWidget(self._create_add_part_category(
                 localized_wt, 
@@ -829,14 +838,14 @@ class WeaponEditorTab(QtWidgets.QWidget):
         
     def create_elemental_list(self, parent_layout, df):
         # Use English keys for localization - "elements" and "element_switch" are in weapon_localization
-        self._create_elemental_subsection(parent_layout, "elements", df[df['Part_ID'].between(10, 14)])
-        self._create_elemental_subsection(parent_layout, "element_switch", df[~df['Part_ID'].between(10, 14)])
+        self._create_elemental_subsection(parent_layout, "elements", df.filter(lambda r: 10 <= r['Part_ID'] <= 14))
+        self._create_elemental_subsection(parent_layout, "element_switch", df.filter(lambda r: not 10 <= r['Part_ID'] <= 14))
 
     def _create_elemental_subsection(self, parent_layout, title, df):
         parent_layout.addWidget(self._create_add_part_category(self.get_localized_string(title), self._populate_elemental_parts, df))
 
     def _populate_elemental_parts(self, layout, df):
-        for _, row in df.iterrows():
+        for row in df:
             var = QtWidgets.QCheckBox(f"{row['Elemental_ID']}:{row['Part_ID']} | {self.get_localized_string(row['Stat'])}")
             layout.addWidget(var)
             self.selected_parts_to_add.append({'var': var, 'id': row['Part_ID'], 'mfg_id': 1, 'type': 'elemental'})
@@ -846,9 +855,9 @@ class WeaponEditorTab(QtWidgets.QWidget):
             parent_layout.addWidget(self._create_add_part_category(self.get_localized_string(mfg), self.populate_add_part_list, mfg_group))
 
     def populate_add_part_list(self, parent_layout, parts_group):
-        for _, row in parts_group.iterrows():
+        for row in parts_group:
             part_frame = QtWidgets.QFrame(); part_layout = QtWidgets.QHBoxLayout(part_frame); part_layout.setContentsMargins(0,0,0,0); part_layout.setSpacing(5)
-            var = QtWidgets.QCheckBox(f"{row['Part ID']} | {self.get_localized_string(row['Part Type'])} | {row['String']} | {str(row['Stat']) if pd.notna(row['Stat']) else ''}")
+            var = QtWidgets.QCheckBox(f"{row['Part ID']} | {self.get_localized_string(row['Part Type'])} | {row['String']} | {str(row['Stat']) if row['Stat'] is not None else ''}")
             qty_entry = QtWidgets.QLineEdit("1"); qty_entry.setFixedWidth(40); qty_entry.setVisible(False)
             var.toggled.connect(qty_entry.setVisible)
             part_layout.addWidget(var); part_layout.addWidget(qty_entry); parent_layout.addWidget(part_frame)
@@ -921,7 +930,7 @@ class WeaponEditorTab(QtWidgets.QWidget):
         layout = QtWidgets.QVBoxLayout(win); layout.addWidget(QtWidgets.QLabel(self.get_localized_string("Select a skin to apply")))
         scroll_area = QtWidgets.QScrollArea(); scroll_area.setWidgetResizable(True)
         scroll_content = QtWidgets.QWidget(); scroll_layout = QtWidgets.QVBoxLayout(scroll_content)
-        for _, row in self.skin_df.iterrows():
+        for row in self.part_catalog.skins:
             btn = QtWidgets.QPushButton(f"{row['Skin_ID']}: {self.get_localized_string(row['Stat'], row['Stat'])}")
             btn.clicked.connect(partial(self.update_skin, part_index, row['Skin_ID'], win)); scroll_layout.addWidget(btn)
         scroll_area.setWidget(scroll_content); layout.addWidget(scroll_area); win.exec()
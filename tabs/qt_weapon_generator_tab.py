@@ -1,12 +1,12 @@
 import random
-import pandas as pd
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit,
     QComboBox, QPushButton, QMessageBox, QScrollArea, QFrame, QGroupBox
 )
 from PyQt6.QtCore import pyqtSignal, Qt
 
-from core import resource_loader
+from core.part_catalog import get_part_catalog
+from core.localization import catalog
 from core import b_encoder
 
 class QtWeaponGeneratorTab(QWidget):
@@ -35,9 +35,7 @@ class QtWeaponGeneratorTab(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.all_weapon_parts_df = None
-        self.elemental_df = None
-        self.weapon_rarity_df = None
+        self.part_catalog = None
         self.weapon_localization = None
         self.part_combos = {}
         self.legendary_frame = None # Initialize to None
@@ -53,44 +51,14 @@ class QtWeaponGeneratorTab(QWidget):
 
     def load_data(self, lang='zh-CN'):
         try:
-            suffix = "_EN" if lang in ['en-US', 'ru', 'ua'] else ""
-            
-            # Helper to get path with fallback
-            def get_path(base_name):
-                # Try with suffix first
-                name_with_suffix = base_name.replace('.csv', f'{suffix}.csv')
-                path = resource_loader.get_weapon_data_path(name_with_suffix)
-                if path and path.exists():
-                    return path
-                # Fallback to base
-                return resource_loader.get_weapon_data_path(base_name)
-
-            paths = {
-                "all_parts": get_path('all_weapon_part.csv'),
-                "elemental": get_path('elemental.csv'),
-                "rarity": get_path('weapon_rarity.csv')
-            }
-            
-            # Filter out None paths (though get_weapon_data_path usually returns path even if not exists, check implementation)
-            # resource_loader.get_resource_path returns path object. 
-            # But get_path checks .exists(). 
-            # If fallback also fails, it might return None if we changed logic, but resource_loader returns Path object usually.
-            # But resource_loader.get_weapon_data_path calls get_resource_path.
-            
-            if not all(paths.values()) or not all(p.exists() for p in paths.values()):
-                raise FileNotFoundError("One or more weapon CSV file paths not found.")
-
-            self.all_weapon_parts_df = pd.read_csv(paths["all_parts"])
-            self.all_weapon_parts_df['Part ID'] = self.all_weapon_parts_df['Part ID'].astype('Int64').astype(str).replace('<NA>', '')
-            self.elemental_df = pd.read_csv(paths["elemental"])
-            self.weapon_rarity_df = pd.read_csv(paths["rarity"])
+            # 与武器编辑器共用，每种数据语言只加载一次
+            self.part_catalog = get_part_catalog(lang)
             
             self.weapon_localization = {}
             if lang == 'zh-CN':
-                self.weapon_localization = resource_loader.load_weapon_json('weapon_localization_zh-CN.json') or {}
+                self.weapon_localization = catalog.table('weapon_edit/weapon_localization_zh-CN.json')
             
-            loc_file = resource_loader.get_ui_localization_file(lang)
-            full_loc = resource_loader.load_json_resource(loc_file) or {}
+            full_loc = catalog.ui(lang)
             self.ui_loc = full_loc.get("weapon_gen_tab", {})
             self.flags_loc = full_loc.get("weapon_editor_tab", {}).get("flags", {})
 
@@ -149,7 +117,7 @@ class QtWeaponGeneratorTab(QWidget):
             self.content_widget.deleteLater()
             self.content_widget = None
 
-        if self.all_weapon_parts_df is None: 
+        if self.part_catalog is None: 
             return
 
         # Create new content widget
@@ -226,9 +194,9 @@ class QtWeaponGeneratorTab(QWidget):
         self.on_main_selection_change()
 
     def _populate_initial_selectors(self):
-        m_list = sorted([self.get_localized_string(m) for m in self.all_weapon_parts_df['Manufacturer'].unique()])
+        m_list = sorted([self.get_localized_string(m) for m in self.part_catalog.manufacturers])
         self.manufacturer_combo.addItems(m_list)
-        wt_list = sorted([self.get_localized_string(wt) for wt in self.all_weapon_parts_df['Weapon Type'].unique()])
+        wt_list = sorted([self.get_localized_string(wt) for wt in self.part_catalog.weapon_types])
         self.weapon_type_combo.addItems(wt_list)
 
     def on_main_selection_change(self, _=None):
@@ -237,13 +205,7 @@ class QtWeaponGeneratorTab(QWidget):
 
     def _get_m_id(self, mfg_en, wt_en):
         if not mfg_en or not wt_en: return None
-        try:
-            return self.all_weapon_parts_df.loc[
-                (self.all_weapon_parts_df['Manufacturer'] == mfg_en) & 
-                (self.all_weapon_parts_df['Weapon Type'] == wt_en), 'Manufacturer & Weapon Type ID'
-            ].iloc[0]
-        except IndexError:
-            return None
+        return self.part_catalog.m_id(mfg_en, wt_en)
 
     def _create_part_dropdowns(self):
         # 清理旧的 widgets
@@ -268,8 +230,7 @@ class QtWeaponGeneratorTab(QWidget):
         for i, name in enumerate(["Element 1", "Element 2"]):
             self._create_element_selector(name, m_id, self.PART_LAYOUT[name])
 
-        filtered_df = self.all_weapon_parts_df[self.all_weapon_parts_df['Manufacturer & Weapon Type ID'] == m_id]
-        for part_type_en, group_df in filtered_df.groupby('Part Type'):
+        for part_type_en, group_rows in self.part_catalog.parts_by_type(m_id).items():
             if part_type_en not in self.PART_LAYOUT: continue
             
             row, col = self.PART_LAYOUT[part_type_en]
@@ -278,8 +239,8 @@ class QtWeaponGeneratorTab(QWidget):
             group_layout = QVBoxLayout(group_box)
             
             values = [self.get_localized_string(self._NONE_VALUE)] + \
-                     [f"{pid} - {stat}" if pd.notna(stat) else str(pid)
-                      for pid, stat in zip(group_df['Part ID'], group_df['Stat']) if pid]
+                     [f"{r['Part ID']} - {r['Stat']}" if r['Stat'] is not None else str(r['Part ID'])
+                      for r in group_rows if r['Part ID'] is not None]
 
             num_slots = self.MULTI_SELECT_SLOTS.get(part_type_en, 1)
             for i in range(num_slots):
@@ -310,11 +271,9 @@ class QtWeaponGeneratorTab(QWidget):
         
         values = [self.get_localized_string(self._NONE_VALUE)]
         if name == "Rarity":
-            df = self.weapon_rarity_df[self.weapon_rarity_df['Manufacturer & Weapon Type ID'] == m_id]
-            values.extend(sorted([self.get_localized_string(r) for r in df['Stat'].unique()]))
+            values.extend(sorted([self.get_localized_string(r) for r in self.part_catalog.rarity_stats(m_id)]))
         elif name == "Legendary Type":
-            leg_df = self.weapon_rarity_df[(self.weapon_rarity_df['Manufacturer & Weapon Type ID'] == m_id) & (self.weapon_rarity_df['Stat'] == 'Legendary')]
-            values.extend([f"{r['Part ID']} - {self.get_localized_string(r['Description'], r['Description'])}" for _, r in leg_df.iterrows() if pd.notna(r['Description'])])
+            values.extend([f"{r['Part ID']} - {self.get_localized_string(r['Description'], r['Description'])}" for r in self.part_catalog.legendaries(m_id)])
         
         # Add to dict BEFORE connecting signals
         self.part_combos[name] = combo
@@ -340,7 +299,7 @@ class QtWeaponGeneratorTab(QWidget):
 
         combo = QComboBox()
         none_val = self.get_localized_string(self._NONE_VALUE)
-        values = [none_val] + [f"{r['Part_ID']} - {self.get_localized_string(r['Stat'])}" for _, r in self.elemental_df.iterrows()]
+        values = [none_val] + [f"{r['Part_ID']} - {self.get_localized_string(r['Stat'])}" for r in self.part_catalog.elementals]
         combo.addItems(values)
         
         self.part_combos[name] = combo
@@ -365,8 +324,7 @@ class QtWeaponGeneratorTab(QWidget):
 
     def _get_english_key(self, localized_value):
         if not localized_value or not self.weapon_localization: return localized_value
-        reverse_map = {v: k for k, v in self.weapon_localization.items()}
-        return reverse_map.get(localized_value, localized_value)
+        return catalog.reverse_table('weapon_edit/weapon_localization_zh-CN.json').get(localized_value, localized_value)
 
     def randomize_seed(self):
         self.seed_var.setText(str(random.randint(100, 9999)))
@@ -397,8 +355,8 @@ class QtWeaponGeneratorTab(QWidget):
                     if part_id.isdigit(): parts_list.append(f"{{{part_id}}}")
             elif rarity_combo and rarity_combo.currentText() != localized_none:
                  selected_rarity_en = self._get_english_key(rarity_combo.currentText())
-                 rarity_id_row = self.weapon_rarity_df[(self.weapon_rarity_df['Manufacturer & Weapon Type ID'] == m_id) & (self.weapon_rarity_df['Stat'] == selected_rarity_en) & (self.weapon_rarity_df['Description'].isna())]
-                 if not rarity_id_row.empty: parts_list.append(f"{{{rarity_id_row.iloc[0]['Part ID']}}}")
+                 rarity_id = self.part_catalog.rarity_part_id(m_id, selected_rarity_en)
+                 if rarity_id is not None: parts_list.append(f"{{{rarity_id}}}")
             
             # Elements
             for i in range(1, 3):
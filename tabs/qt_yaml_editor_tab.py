@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QTreeWidget, QTreeWidgetItem, QStackedWidget, QGroupBox, QHBoxLayout, QPushButton, QMessageBox
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 import yaml
-from core import resource_loader
+from core.localization import catalog
 
 def get_yaml_loader():
     class AnyTagLoader(yaml.SafeLoader): pass
@@ -51,8 +51,7 @@ class QtYamlEditorTab(QWidget):
         print(f"DEBUG: Finished updating language for {self.__class__.__name__}.")
 
     def _load_localization(self, lang='zh-CN'):
-        file_name = resource_loader.get_ui_localization_file(lang)
-        data = resource_loader.load_json_resource(file_name)
+        data = catalog.ui(lang)
         if data and "yaml_tab" in data:
             self.loc = data["yaml_tab"]
         else:
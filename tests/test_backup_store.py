@@ -0,0 +1,106 @@
+"""
+备份库：按存档去重、按存档分别执行保留策略、同名备份不会互相覆盖、写入失败会被报告。
+
+运行: python -m pytest tests
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.backup_store import INDEX_NAME, BackupStore  # noqa: E402
+
+
+def _save(tmp_path, profile, name="1.sav"):
+    path = tmp_path / "saves" / profile / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"save")
+    return path
+
+
+def _store(tmp_path, **kwargs):
+    (tmp_path / "bak").mkdir(exist_ok=True)
+    return BackupStore(tmp_path / "bak", **kwargs)
+
+
+def _index(directory):
+    return json.loads((directory / INDEX_NAME).read_text(encoding="utf-8"))["backups"]
+
+
+def test_identical_content_is_backed_up_once(tmp_path):
+    store = _store(tmp_path)
+    save = _save(tmp_path, "a")
+    first = store.backup(save, b"data", "1.sav.t1.bak")
+    assert store.backup(save, b"data", "1.sav.t2.bak") == first
+    assert store.wait() == {}
+    assert [e["file"] for e in _index(tmp_path / "bak")] == [first]
+    # 新实例从索引中认出已有的备份
+    assert BackupStore(tmp_path / "bak").backup(save, b"data", "1.sav.t3.bak") == first
+
+
+def test_same_content_in_other_profile_is_not_deduplicated(tmp_path):
+    store = _store(tmp_path)
+    a = store.backup(_save(tmp_path, "a"), b"data", "a.bak")
+    b = store.backup(_save(tmp_path, "b"), b"data", "b.bak")
+    store.wait()
+    assert a != b
+    assert (tmp_path / "bak" / a).is_file() and (tmp_path / "bak" / b).is_file()
+
+
+def test_same_name_in_same_second_gets_a_unique_file(tmp_path):
+    store = _store(tmp_path)
+    a = store.backup(_save(tmp_path, "a"), b"profile a", "1.sav.2026-01-01-000000.bak")
+    b = store.backup(_save(tmp_path, "b"), b"profile b", "1.sav.2026-01-01-000000.bak")
+    assert store.wait() == {}
+    assert a == "1.sav.2026-01-01-000000.bak"
+    assert b == "1.sav.2026-01-01-000000-2.bak"
+    for entry in _index(tmp_path / "bak"):
+        assert hashlib.sha256((tmp_path / "bak" / entry["file"]).read_bytes()).hexdigest() == entry["sha256"]
+
+
+def test_unindexed_file_is_not_overwritten(tmp_path):
+    directory = tmp_path / "bak"
+    directory.mkdir()
+    (directory / "1.sav.t.bak").write_bytes(b"user's own backup")
+    store = BackupStore(directory)
+    name = store.backup(_save(tmp_path, "a"), b"data", "1.sav.t.bak")
+    store.wait()
+    assert name != "1.sav.t.bak"
+    assert (directory / "1.sav.t.bak").read_bytes() == b"user's own backup"
+
+
+def test_retention_is_per_save(tmp_path):
+    store = _store(tmp_path, keep_last=2, keep_daily=0)
+    a, b = _save(tmp_path, "a"), _save(tmp_path, "b")
+    only_a = store.backup(a, b"a0", "a0.bak")
+    store.wait()
+    names = []
+    for i in range(5):
+        names.append(store.backup(b, f"b{i}".encode(), f"b{i}.bak"))
+        store.wait()
+    kept = {e["file"] for e in _index(tmp_path / "bak")}
+    assert kept == {only_a, names[-1], names[-2]}
+    assert sorted(p.name for p in (tmp_path / "bak").glob("*.bak")) == sorted(kept)
+
+
+def test_size_cap_keeps_newest_backup_of_each_save(tmp_path):
+    store = _store(tmp_path, max_total_bytes=1)
+    a, b = _save(tmp_path, "a"), _save(tmp_path, "b")
+    for i in range(3):
+        store.backup(a, f"a{i}".encode(), f"a{i}.bak")
+        store.backup(b, f"b{i}".encode(), f"b{i}.bak")
+        store.wait()
+    assert {e["file"] for e in _index(tmp_path / "bak")} == {"a2.bak", "b2.bak"}
+
+
+def test_failed_write_is_reported_and_not_indexed(tmp_path):
+    store = BackupStore(tmp_path / "missing")
+    name = store.backup(_save(tmp_path, "a"), b"data", "1.sav.t.bak")
+    errors = store.wait()
+    assert name in errors
+    assert store.error(name) == errors[name]
+    assert store.list_backups() == []
@@ -0,0 +1,104 @@
+"""
+item_index.ItemIndex：插入、删除和移动物品后，增量维护的索引与重新遍历整棵树的结果相同。
+
+运行: python -m pytest tests
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.item_index import ItemIndex, iter_serial_items  # noqa: E402
+
+BACKPACK = ("state", "inventory", "items", "backpack")
+
+
+def _save():
+    return {
+        "state": {
+            "inventory": {"items": {"backpack": {"slot_0": {"serial": "@Ug0"}, "slot_1": {"serial": "@Ug1"}}}},
+            "equipped": [{"serial": "@Ug2"}, {"serial": "@Ug3"}],
+        },
+    }
+
+
+def _check(root, index):
+    assert [e.path for e in index.entries(root)] == [path for path, _, _ in iter_serial_items(root)]
+
+
+def _indexed(root):
+    index = ItemIndex()
+    _check(root, index)
+    return index
+
+
+def test_list_insert_shifts_later_items():
+    root = _save()
+    index = _indexed(root)
+    root["state"]["equipped"].insert(0, {"serial": "@Ug4"})
+    index.touch(("state", "equipped", "0"))
+    _check(root, index)
+    del root["state"]["equipped"][1]
+    index.touch(("state", "equipped", "1"))
+    _check(root, index)
+
+
+def test_item_deleted_and_added_again_moves_to_the_end():
+    root = _save()
+    index = _indexed(root)
+    backpack = root["state"]["inventory"]["items"]["backpack"]
+    item = backpack.pop("slot_0")
+    index.touch(BACKPACK + ("slot_0",))
+    backpack["slot_0"] = item
+    index.touch(BACKPACK + ("slot_0",))
+    _check(root, index)
+    assert index.entries(root)[1].path == BACKPACK + ("slot_0",)
+
+
+def test_serial_edit_keeps_entry():
+    root = _save()
+    index = _indexed(root)
+    entry = index.get(root, BACKPACK + ("slot_1",))
+    root["state"]["inventory"]["items"]["backpack"]["slot_1"]["serial"] = "@Ug9"
+    index.touch(BACKPACK + ("slot_1", "serial"))
+    _check(root, index)
+    assert index.get(root, BACKPACK + ("slot_1",)) is entry
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits_match_a_full_walk(seed):
+    rng = random.Random(seed)
+    root = _save()
+    index = _indexed(root)
+    backpack = root["state"]["inventory"]["items"]["backpack"]
+    equipped = root["state"]["equipped"]
+    for step in range(200):
+        action = rng.randrange(5)
+        if action == 0:
+            key = f"slot_{rng.randrange(20)}"
+            backpack[key] = {"serial": f"@Ug{step}"}
+            index.touch(BACKPACK + (key,))
+        elif action == 1 and backpack:
+            key = rng.choice(list(backpack))
+            del backpack[key]
+            index.touch(BACKPACK + (key,))
+        elif action == 2:
+            position = rng.randrange(len(equipped) + 1)
+            equipped.insert(position, {"serial": f"@Ue{step}"})
+            index.touch(("state", "equipped", str(position)))
+        elif action == 3 and equipped:
+            position = rng.randrange(len(equipped))
+            del equipped[position]
+            index.touch(("state", "equipped", str(position)))
+        elif backpack:
+            key = rng.choice(list(backpack))
+            backpack[key]["serial"] = f"@Uz{step}"
+            index.touch(BACKPACK + (key, "serial"))
+        if step % 5 == 0:
+            _check(root, index)
+    _check(root, index)
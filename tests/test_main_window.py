@@ -0,0 +1,48 @@
+"""
+主窗口冒烟测试：在 offscreen 平台上创建 MainWindow，确认启动过程中不会抛出异常。
+
+PyQt6 会把槽函数中未捕获的异常变成进程中止，所以这里把 sys.excepthook 换成记录异常，
+启动完成后断言没有记录到任何异常。
+
+运行: python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+
+@pytest.fixture
+def isolated_home(tmp_path, monkeypatch):
+    """存档扫描、索引和配置文件都写到临时目录，不读取真实的存档目录。"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_main_window_starts(isolated_home, monkeypatch):
+    errors = []
+    monkeypatch.setattr(sys, "excepthook", lambda *exc: errors.append(exc))
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    from main_window import MainWindow
+    window = MainWindow()
+    try:
+        app.processEvents()
+        assert window.content_stack.count() > 0
+        assert not errors, errors
+    finally:
+        window.save_watch_timer.stop()
+        window.close()
+        window.deleteLater()
+        app.processEvents()
@@ -0,0 +1,67 @@
+"""
+解析缓存：只 unpickle 本程序自己写出、之后没有被改动过的文件。
+
+运行: python -m pytest tests
+"""
+
+import os
+import pickle
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.parse_cache import CACHE_VERSION, ParseCache, cache_key  # noqa: E402
+
+ENTRY = ("steam", "state: {}\n", None, {"state": {}})
+
+
+class Boom:
+    def __reduce__(self):
+        return (os._exit, (3,))
+
+
+def test_roundtrip(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    key = cache_key(b"save", "76561198000000000")
+    cache.store_async(key, ENTRY).join()
+    assert cache.load(key) == ENTRY
+    # 新实例从清单中认出这个文件
+    assert ParseCache(str(tmp_path)).load(key) == ENTRY
+
+
+def test_foreign_pickle_is_not_loaded(tmp_path):
+    key = cache_key(b"save", "76561198000000000")
+    path = tmp_path / f"{key}.pickle"
+    path.write_bytes(pickle.dumps((CACHE_VERSION, key, Boom())))
+    assert ParseCache(str(tmp_path)).load(key) is None
+    assert not path.exists()
+
+
+def test_replaced_pickle_is_not_loaded(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    key = cache_key(b"save", "76561198000000000")
+    cache.store_async(key, ENTRY).join()
+    path = tmp_path / f"{key}.pickle"
+    path.write_bytes(pickle.dumps((CACHE_VERSION, key, Boom())) + b"\0" * 64)
+    assert ParseCache(str(tmp_path)).load(key) is None
+    assert not path.exists()
+
+
+def test_key_must_be_a_cache_key(tmp_path):
+    assert ParseCache(str(tmp_path)).load("../outside") is None
+
+
+def test_default_directory_is_not_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "cache"))
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.chdir(tmp_path)
+    directory = ParseCache().directory
+    assert directory.is_absolute()
+    assert directory.parent != tmp_path
+
+
+def test_lazy_and_full_loads_have_separate_keys():
+    assert cache_key(b"save", "1") == cache_key(b"save", "1", lazy=True)
+    assert cache_key(b"save", "1", lazy=False) != cache_key(b"save", "1", lazy=True)
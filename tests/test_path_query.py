@@ -0,0 +1,148 @@
+"""
+path_query.KeyIndex：插入和删除后只重新扫描 touch() 过的路径，查询结果与不用索引遍历整棵树相同。
+
+运行: python -m pytest tests
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.path_query import BATCH_RESCAN_THRESHOLD, KeyIndex, compile_path  # noqa: E402
+
+SELECTORS = ("**.serial", "**.cash|money", "**.backpack.*.serial", "**.missions")
+
+
+def _save():
+    return {
+        "state": {
+            "currencies": {"cash": 10, "eridium": 2},
+            "inventory": {"items": {"backpack": {
+                "slot_0": {"serial": "@Ug0", "flags": 1},
+                "slot_1": {"serial": "@Ug1", "flags": 1},
+            }}},
+            "equipped": [{"serial": "@Ug2"}, {"serial": "@Ug3"}],
+        },
+        "missions": {"local_sets": {"a": {"missions": {"m0": {"status": "active"}}}}},
+    }
+
+
+def _check(root, index):
+    for selector in SELECTORS:
+        query = compile_path(selector)
+        assert query.select(root, index) == query.select(root), selector
+
+
+def _indexed(root):
+    index = KeyIndex()
+    _check(root, index)  # 建立所有段的索引
+    return index
+
+
+def test_insert_into_dict_is_found_in_document_order():
+    root = _save()
+    index = _indexed(root)
+    backpack = root["state"]["inventory"]["items"]["backpack"]
+    backpack["slot_2"] = {"serial": "@Ug4"}
+    index.touch(("state", "inventory", "items", "backpack", "slot_2"))
+    root["state"]["currencies"]["money"] = 5
+    index.touch(("state", "currencies", "money"))
+    _check(root, index)
+    assert ("state", "inventory", "items", "backpack", "slot_2", "serial") in compile_path("**.serial").select(root, index)
+
+
+def test_delete_from_dict_is_dropped():
+    root = _save()
+    index = _indexed(root)
+    del root["state"]["inventory"]["items"]["backpack"]["slot_0"]
+    index.touch(("state", "inventory", "items", "backpack", "slot_0"))
+    del root["state"]["currencies"]["cash"]
+    index.touch(("state", "currencies", "cash"))
+    _check(root, index)
+    assert compile_path("**.cash|money").select(root, index) == []
+
+
+def test_list_insert_and_delete_shift_later_indices():
+    root = _save()
+    index = _indexed(root)
+    equipped = root["state"]["equipped"]
+    equipped.insert(0, {"serial": "@Ug5"})
+    # 物品路径使用字符串下标
+    index.touch(("state", "equipped", "0"))
+    _check(root, index)
+    del equipped[1]
+    index.touch(("state", "equipped", "1"))
+    _check(root, index)
+    equipped.pop()
+    index.touch(("state", "equipped", "1"))
+    _check(root, index)
+    assert compile_path("**.serial").select(root, index)[-1] == ("state", "equipped", 0, "serial")
+
+
+def test_key_deleted_and_added_again_moves_to_the_end():
+    root = _save()
+    index = _indexed(root)
+    backpack = root["state"]["inventory"]["items"]["backpack"]
+    # 两次修改之间没有查询，待处理的是同一个仍然存在的路径
+    item = backpack.pop("slot_0")
+    index.touch(("state", "inventory", "items", "backpack", "slot_0"))
+    backpack["slot_0"] = item
+    index.touch(("state", "inventory", "items", "backpack", "slot_0"))
+    _check(root, index)
+
+
+def test_new_and_removed_sections():
+    root = _save()
+    index = _indexed(root)
+    root["extra"] = {"serial": "@Ug6"}
+    index.touch(("extra",))
+    del root["missions"]
+    index.touch(("missions",))
+    _check(root, index)
+    assert compile_path("**.missions").select(root, index) == []
+
+
+def test_batch_of_touches_rescans_common_prefix():
+    root = _save()
+    index = _indexed(root)
+    backpack = root["state"]["inventory"]["items"]["backpack"]
+    for i in range(BATCH_RESCAN_THRESHOLD + 10):
+        backpack[f"new_{i}"] = {"serial": f"@Ugn{i}"}
+        index.touch(("state", "inventory", "items", "backpack", f"new_{i}"))
+    _check(root, index)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits_match_a_full_walk(seed):
+    rng = random.Random(seed)
+    root = _save()
+    index = _indexed(root)
+    backpack = root["state"]["inventory"]["items"]["backpack"]
+    equipped = root["state"]["equipped"]
+    base = ("state", "inventory", "items", "backpack")
+    for step in range(200):
+        action = rng.randrange(4)
+        if action == 0:
+            key = f"slot_{rng.randrange(20)}"
+            backpack[key] = {"serial": f"@Ug{step}"}
+            index.touch(base + (key,))
+        elif action == 1 and backpack:
+            key = rng.choice(list(backpack))
+            del backpack[key]
+            index.touch(base + (key,))
+        elif action == 2:
+            position = rng.randrange(len(equipped) + 1)
+            equipped.insert(position, {"serial": f"@Ue{step}"})
+            index.touch(("state", "equipped", str(position)))
+        elif equipped:
+            position = rng.randrange(len(equipped))
+            del equipped[position]
+            index.touch(("state", "equipped", str(position)))
+        if step % 5 == 0:
+            _check(root, index)
+    _check(root, index)
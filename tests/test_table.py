@@ -0,0 +1,87 @@
+"""
+resource_loader.Table：缺失值、视图上的筛选、分组顺序，以及与 pandas.read_csv 显示结果一致。
+
+运行: python -m pytest tests
+"""
+
+import glob
+import os
+import sys
+from array import array
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.resource_loader import Table, load_csv_table, open_resource  # noqa: E402
+
+# 标签页和部件目录读取的全部 CSV
+TAB_CSVS = sorted(os.path.relpath(p, ROOT).replace(os.sep, "/")
+                  for folder in ("grenade", "shield", "repkit", "heavy", "weapon_edit")
+                  for p in glob.glob(os.path.join(ROOT, folder, "*.csv")))
+
+
+def _table():
+    return Table.from_records([
+        {"id": "3", "type": "Perk", "stat": "b", "value": "1.5"},
+        {"id": "1", "type": "Rarity", "stat": "", "value": "NA"},
+        {"id": "2", "type": "Perk", "stat": "a", "value": "2"},
+        {"id": "1", "type": "Perk", "stat": "c", "value": ""},
+        {"id": "4", "type": "null", "stat": "a", "value": "3"},
+    ])
+
+
+def test_na_tokens_become_none_and_columns_are_typed():
+    table = Table.from_records([
+        {"full": "1", "gaps": "1", "floats": "1.5", "text": "x", "empty": ""},
+        {"full": "2", "gaps": "N/A", "floats": "nan", "text": "None", "empty": "NULL"},
+        {"full": "3", "gaps": "3", "floats": "2", "text": "7", "empty": None},
+    ])
+    assert isinstance(table._columns["full"], array)
+    assert table.column("gaps") == [1, None, 3]
+    assert table.column("floats") == [1.5, None, 2.0]
+    assert table.column("text") == ["x", None, "7"]
+    assert table.column("empty") == [None, None, None]
+    assert table.notna("gaps").column("full") == [1, 3]
+    assert table.unique("text") == ["x", "7"]
+
+
+def test_eq_on_views_keeps_only_the_view_rows_in_view_order():
+    table = _table()
+    perks = table.eq("type", "Perk")
+    assert perks.column("id") == [3, 2, 1]
+    # 匹配行比视图少和比视图多两种情况
+    assert perks.eq("id", 1).column("stat") == ["c"]
+    assert perks.eq("type", "Perk").column("id") == [3, 2, 1]
+    assert table.sort("id").eq("type", "Perk").column("id") == [1, 2, 3]
+    assert table.eq("id", 2).eq("type", "Rarity").empty
+    assert table.eq("type", "missing").first() is None
+    # 在视图上建立的索引不影响原表
+    assert table.eq("id", 1).column("type") == ["Rarity", "Perk"]
+
+
+def test_groupby_sorts_values_keeps_row_order_and_skips_na():
+    groups = [(value, group.column("id")) for value, group in _table().groupby("stat")]
+    assert groups == [("a", [2, 4]), ("b", [3]), ("c", [1])]
+    groups = [(value, group.column("id")) for value, group in _table().sort("id").groupby("type")]
+    assert groups == [("Perk", [1, 2, 3]), ("Rarity", [1])]
+
+
+def test_all_tab_csvs_are_covered():
+    assert len(TAB_CSVS) == 23
+
+
+@pytest.mark.parametrize("path", TAB_CSVS)
+def test_cells_render_like_pandas(path):
+    pd = pytest.importorskip("pandas")
+    table = load_csv_table(path)
+    with open_resource(path) as f:
+        df = pd.read_csv(f)
+    assert list(table.columns) == list(df.columns)
+    assert len(table) == len(df)
+    # 标签页用 f"{值}" 显示单元格，缺失值显示为空
+    for name in table.columns:
+        ours = ["" if v is None else f"{v}" for v in table.column(name)]
+        theirs = ["" if pd.isna(v) else f"{v}" for v in df[name].tolist()]
+        assert ours == theirs, name
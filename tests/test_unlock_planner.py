@@ -0,0 +1,91 @@
+"""
+解锁计划与依次调用 unlock_logic 函数的结果相同：每个预设单独执行，以及任意两个预设按顺序组合。
+
+已知的两处区别不算差异：
+  - SDU 点数按最终状态计算，只会相同或更高（见 unlock_planner 模块说明）
+  - dlblob 中地点的顺序（由集合生成，本来就不固定），按集合比较
+
+运行: python -m pytest tests
+"""
+
+import itertools
+import os
+import re
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core import unlock_logic, unlock_planner  # noqa: E402
+
+# 旧做法：每个预设调用对应的 unlock_logic 函数（set_character_class 需要参数，单独测试）
+SEQUENTIAL = {name: getattr(unlock_logic, name) for name in unlock_planner.PRESETS if name != "set_character_class"}
+SINGLE = sorted(SEQUENTIAL) + sorted(unlock_planner.COMPOSITE_PRESETS)
+PAIRS = list(itertools.permutations(sorted(SEQUENTIAL), 2))
+
+
+def _save() -> dict:
+    return {
+        "state": {
+            "char_name": "Test",
+            "player_difficulty": "Normal",
+            "currencies": {"cash": 100, "eridium": 5},
+            "experience": [{"type": "Character", "level": 10, "points": 1000},
+                           {"type": "Specialization", "level": 1, "points": 0}],
+            "inventory": {"items": {"backpack": {"slot_0": {"serial": "@Ug00000000", "state_flags": 1}}}},
+        },
+        "stats": {"challenge": {"counter_0": 3}},
+        "missions": {"local_sets": {"missionset_zoneactivity_safehouse": {"missions": {"m0": {"status": "active"}}}}},
+        "progression": {"graphs": [], "point_pools": {}},
+    }
+
+
+def _normalize(data: dict):
+    """去掉已知的区别，返回 (其余数据, SDU 点数)"""
+    pools = data.get("progression", {}).get("point_pools", {})
+    sdu = pools.pop("echotokenprogresspoints", 0)
+    pg = data.get("gbx_discovery_pg", {})
+    if "dlblob" in pg:
+        pg["dlblob"] = sorted(x for x in re.split(r":\d:", pg["dlblob"]) if x)
+    return data, sdu
+
+
+def _compare(names):
+    expected = _save()
+    for name in unlock_planner.expand_presets(names):
+        SEQUENTIAL[name](expected)
+    actual = _save()
+    unlock_planner.apply_plan(actual, unlock_planner.build_plan(names))
+
+    expected, expected_sdu = _normalize(expected)
+    actual, actual_sdu = _normalize(actual)
+    assert actual == expected
+    assert actual_sdu >= expected_sdu
+
+
+@pytest.mark.parametrize("name", SINGLE)
+def test_single_preset_matches_sequential_calls(name):
+    _compare([name])
+
+
+@pytest.mark.parametrize("first,second", PAIRS)
+def test_preset_pair_matches_sequential_calls(first, second):
+    _compare([first, second])
+
+
+def test_set_character_class_matches_direct_call():
+    class_key = next(iter(unlock_planner.CHARACTER_CLASSES))
+    expected = _save()
+    unlock_logic.set_character_class(expected, class_key)
+    actual = _save()
+    unlock_planner.apply_plan(actual, unlock_planner.build_plan(["set_character_class"], {"class_key": class_key}))
+    # 每次调用生成新的 GUID
+    assert len(actual["state"].pop("char_guid")) == len(expected["state"].pop("char_guid")) == 32
+    assert actual == expected
+
+
+def test_step_is_abstract():
+    with pytest.raises(TypeError):
+        unlock_planner.Step()